@@ -73,6 +73,94 @@ def register_commands(app):
         db.create_all()
         click.echo('✓ Base de datos inicializada.')
     
+    @app.cli.command('rebuild-stats')
+    def rebuild_stats_command():
+        """Recalcula las estadísticas agregadas del dashboard desde cero."""
+        from app.models import EstadisticaAgregada
+        total = EstadisticaAgregada.reconstruir(db.session.connection())
+        db.session.commit()
+        click.echo(f'✓ Estadísticas recalculadas ({total} artículos activos).')
+    
+    @app.cli.command('export-articles')
+    @click.option('--format', 'formato', type=click.Choice(['csv', 'jsonl', 'bibtex', 'ris']), default='csv',
+                  show_default=True, help='Formato de salida.')
+    @click.option('--output', '-o', default='-', show_default=True,
+                  help='Archivo de salida (- para la salida estándar).')
+    @click.option('--filtro', '-f', multiple=True, metavar='CLAVE=VALOR',
+                  help='Filtro con los nombres de parámetros de /articles/export '
+                       '(ej: -f anio_inicio=2020 -f tipo_id=1,2).')
+    @click.option('--since', default=None,
+                  help='Solo cambios posteriores a esta marca de agua o fecha ISO 8601.')
+    def export_articles_command(formato, output, filtro, since):
+        """Exporta artículos en CSV, JSON Lines, BibTeX o RIS por flujo (incremental con --since)."""
+        from werkzeug.datastructures import MultiDict
+        from app.controllers.report_controller import ReportController
+        from app.models.filtro_articulos import FiltroArticulos
+        
+        parametros = MultiDict()
+        for par in filtro:
+            clave, separador, valor = par.partition('=')
+            if not separador:
+                raise click.BadParameter(f'"{par}" no tiene la forma CLAVE=VALOR', param_hint='--filtro')
+            parametros.add(clave.strip(), valor.strip())
+        
+        try:
+            bloques, _, _, marca = ReportController().export_stream(
+                FiltroArticulos.desde_args(parametros), formato, since=since
+            )
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint='--since')
+        
+        with click.open_file(output, 'w', encoding='utf-8') as salida:
+            for bloque in bloques:
+                salida.write(bloque)
+        if output != '-':
+            click.echo(f'✓ Exportación guardada en {output}.', err=True)
+        if marca:
+            click.echo(f'Marca de agua: {marca}', err=True)
+    
+    @app.cli.command('import-articles')
+    @click.argument('archivo', type=click.Path(exists=True, dir_okay=False))
+    @click.option('--lote', default=500, show_default=True, type=click.IntRange(min=1),
+                  help='Filas por transacción.')
+    def import_articles_command(archivo, lote):
+        """Importa artículos desde una hoja de Excel (plantilla del CA o exportación)."""
+        from app.services.excel_import import ExcelImportService
+
+        try:
+            resultado = ExcelImportService(tamano_lote=lote).importar(archivo)
+        except ValueError as e:
+            raise click.ClickException(str(e))
+
+        for error in resultado['errores']:
+            click.echo(f"  Fila {error['fila']}: {'; '.join(error['errores'])}", err=True)
+        click.echo(
+            f"✓ {resultado['total']} filas: {resultado['creados']} creados, "
+            f"{resultado['actualizados']} actualizados, {len(resultado['errores'])} con errores."
+        )
+
+    @app.cli.command('import-references')
+    @click.argument('archivo', type=click.Path(exists=True, dir_okay=False))
+    @click.option('--formato', type=click.Choice(['bibtex', 'ris', 'crossref']), default=None,
+                  help='Formato del archivo (por omisión, según la extensión).')
+    @click.option('--lote', default=500, show_default=True, type=click.IntRange(min=1),
+                  help='Referencias por transacción.')
+    def import_references_command(archivo, formato, lote):
+        """Importa referencias desde BibTeX, RIS o Crossref JSON (sin procesar PDFs)."""
+        from app.services.bibliografia_import import BibliografiaImportService
+
+        try:
+            resultado = BibliografiaImportService(tamano_lote=lote).importar(archivo, formato=formato)
+        except ValueError as e:
+            raise click.ClickException(str(e))
+
+        for error in resultado['errores']:
+            click.echo(f"  Registro {error['registro']}: {'; '.join(error['errores'])}", err=True)
+        click.echo(
+            f"✓ {resultado['total']} referencias: {resultado['creados']} creadas, "
+            f"{resultado['duplicados']} duplicadas, {len(resultado['errores'])} con errores."
+        )
+
     @app.cli.command('reset-db')
     @click.confirmation_option(prompt='¿Estás seguro de que quieres eliminar todos los datos?')
     def reset_db_command():
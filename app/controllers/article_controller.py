@@ -7,8 +7,16 @@ from flask import flash
 from sqlalchemy import or_
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 from app import db
-from app.models import Articulo, Autor, Revista, TipoProduccion, Estado, LGAC, Proposito
+from app.models import (
+    Articulo, Autor, Revista, TipoProduccion, Estado, LGAC, Proposito, EstadisticaAgregada
+)
+from app.models.filtro_articulos import FiltroArticulos
 from app.models.relations import ArticuloAutor
+from app.services.catalog_cache import get_catalog_cache
+from app.services.facetas import get_faceta_service
+from app.utils.paginacion import (
+    CursorInvalido, PaginaCursor, get_conteo_cache, paginar_keyset, paginar_por_posicion
+)
 
 
 class ArticleController:
@@ -43,30 +51,26 @@ class ArticleController:
                 if field in data and data[field] == 0:
                     data[field] = None
             
-            # Validar que existan las referencias
+            # Validar que existan las referencias (desde el caché de catálogos)
+            catalog_cache = get_catalog_cache()
             if data.get('tipo_produccion_id'):
-                tipo = TipoProduccion.query.get(data['tipo_produccion_id'])
-                if not tipo:
+                if not catalog_cache.existe(TipoProduccion, data['tipo_produccion_id']):
                     return None, "Tipo de producción inválido"
             
             if data.get('estado_id'):
-                estado = Estado.query.get(data['estado_id'])
-                if not estado:
+                if not catalog_cache.existe(Estado, data['estado_id']):
                     return None, "Estado inválido"
             
             if data.get('proposito_id'):
-                proposito = Proposito.query.get(data['proposito_id'])
-                if not proposito:
+                if not catalog_cache.existe(Proposito, data['proposito_id']):
                     return None, "Propósito inválido"
             
             if data.get('lgac_id'):
-                lgac = LGAC.query.get(data['lgac_id'])
-                if not lgac:
+                if not catalog_cache.existe(LGAC, data['lgac_id']):
                     return None, "LGAC inválido"
             
             if data.get('revista_id'):
-                revista = Revista.query.get(data['revista_id'])
-                if not revista:
+                if not catalog_cache.existe(Revista, data['revista_id']):
                     return None, "Revista inválida"
             
             # Validar DOI si está presente
@@ -126,13 +130,8 @@ class ArticleController:
     def get_all(
         page: int = 1,
         per_page: int = 20,
-        tipo_id: Optional[int] = None,
-        estado_id: Optional[int] = None,
-        lgac_id: Optional[int] = None,
-        anio: Optional[int] = None,
-        autor_id: Optional[int] = None,
-        query: Optional[str] = None,
-        para_curriculum: Optional[bool] = None
+        filtro: Optional[FiltroArticulos] = None,
+        **filtros
     ) -> Tuple[Any, Optional[str]]:
         """
         Obtiene todos los artículos con paginación y filtros.
@@ -140,13 +139,10 @@ class ArticleController:
         Args:
             page: Número de página (1-based)
             per_page: Artículos por página
-            tipo_id: Filtrar por tipo de producción
-            estado_id: Filtrar por estado
-            lgac_id: Filtrar por LGAC
-            anio: Filtrar por año
-            autor_id: Filtrar por autor
-            query: Búsqueda por texto
-            para_curriculum: Filtrar por inclusión en curriculum
+            filtro: FiltroArticulos con los filtros a aplicar
+            **filtros: Filtros sueltos si no se pasa filtro (tipo_id, estado_id,
+                lgac_id, anio, autor_id, query, para_curriculum, indexacion_id;
+                los IDs aceptan listas, ver FiltroArticulos.desde_dict)
             
         Returns:
             Tuple (pagination, error_message)
@@ -162,22 +158,14 @@ class ArticleController:
                 return None, "Los artículos por página deben estar entre 1 y 100"
             
             # Construir query usando el método del modelo
-            articles_query = Articulo.buscar(
-                query=query,
-                tipo_id=tipo_id,
-                estado_id=estado_id,
-                lgac_id=lgac_id,
-                anio=anio,
-                autor_id=autor_id,
-                para_curriculum=para_curriculum
-            )
+            filtro = filtro or FiltroArticulos.desde_dict(filtros)
+            articles_query = Articulo.buscar(filtro)
             
             # Ordenar por fecha de creación descendente
             articles_query = articles_query.order_by(Articulo.created_at.desc())
             
-            # Paginar usando db.paginate en lugar de query.paginate
-            pagination = db.paginate(
-                articles_query,
+            # Paginar (Articulo.buscar retorna un Query, que tiene su propio paginate)
+            pagination = articles_query.options(*Articulo.opciones_carga('listado')).paginate(
                 page=page,
                 per_page=per_page,
                 error_out=False
@@ -192,12 +180,99 @@ class ArticleController:
             return None, f"Error inesperado: {str(e)}"
     
     @staticmethod
-    def get_by_id(article_id: int) -> Tuple[Optional[Articulo], Optional[str]]:
+    def get_page(
+        cursor: Optional[str] = None,
+        per_page: int = 20,
+        con_total: bool = True,
+        filtro: Optional[FiltroArticulos] = None,
+        **filtros
+    ) -> Tuple[Optional[PaginaCursor], Optional[str]]:
+        """
+        Obtiene una página de artículos por cursor (más recientes primero).
+        
+        Sin búsqueda por texto se pagina por (created_at, id), sin OFFSET:
+        cualquier página cuesta lo mismo que la primera. Con búsqueda se
+        conserva el orden por relevancia y el cursor guarda la posición.
+        
+        Args:
+            cursor: Token de la página (next_cursor/prev_cursor de otra página)
+            per_page: Artículos por página
+            con_total: Calcular el total (cacheado por versión de datos)
+            filtro, **filtros: Igual que get_all
+            
+        Returns:
+            Tuple (pagina, error_message)
+        """
+        try:
+            if per_page < 1 or per_page > 100:
+                return None, "Los artículos por página deben estar entre 1 y 100"
+            
+            filtro = filtro or FiltroArticulos.desde_dict(filtros)
+            articles_query = Articulo.buscar(filtro)
+            
+            pagina_query = articles_query.options(*Articulo.opciones_carga('listado'))
+            if filtro.query:
+                pagina = paginar_por_posicion(
+                    pagina_query.order_by(Articulo.created_at.desc(), Articulo.id.desc()),
+                    cursor=cursor,
+                    per_page=per_page
+                )
+            else:
+                pagina = paginar_keyset(
+                    pagina_query,
+                    [Articulo.created_at, Articulo.id],
+                    cursor=cursor,
+                    per_page=per_page,
+                    descendente=True
+                )
+            
+            if con_total:
+                pagina.total = get_conteo_cache().contar(
+                    articles_query, ['articulos', 'articulo_autor', 'autores']
+                )
+            
+            return pagina, None
+            
+        except CursorInvalido:
+            return None, "Cursor de paginación inválido"
+        
+        except SQLAlchemyError as e:
+            return None, f"Error al obtener artículos: {str(e)}"
+        
+        except Exception as e:
+            return None, f"Error inesperado: {str(e)}"
+    
+    @staticmethod
+    def get_facets(filtro: Optional[FiltroArticulos] = None, **filtros) -> Tuple[Optional[Dict[str, List]], Optional[str]]:
+        """
+        Obtiene los conteos por faceta (tipo, estado, año, LGAC, indexación)
+        de los artículos que cumplen los filtros.
+        
+        Args:
+            filtro, **filtros: Igual que get_all
+            
+        Returns:
+            Tuple (facetas, error_message)
+            - Si exitoso: ({faceta: [Faceta(valor, nombre, cantidad)]}, None)
+            - Si falla: (None, mensaje_error)
+        """
+        try:
+            return get_faceta_service().contar(filtro or filtros), None
+            
+        except SQLAlchemyError as e:
+            return None, f"Error al calcular facetas: {str(e)}"
+        
+        except Exception as e:
+            return None, f"Error inesperado: {str(e)}"
+    
+    @staticmethod
+    def get_by_id(article_id: int, perfil: Optional[str] = None) -> Tuple[Optional[Articulo], Optional[str]]:
         """
         Obtiene un artículo por su ID.
         
         Args:
             article_id: ID del artículo
+            perfil: Perfil de carga de relaciones (ver Articulo.opciones_carga)
             
         Returns:
             Tuple (articulo, error_message)
@@ -205,7 +280,10 @@ class ArticleController:
             - Si no existe: (None, mensaje_error)
         """
         try:
-            articulo = Articulo.query.get(article_id)
+            articulo_query = Articulo.query
+            if perfil:
+                articulo_query = articulo_query.options(*Articulo.opciones_carga(perfil))
+            articulo = articulo_query.get(article_id)
             
             if not articulo:
                 return None, f"No se encontró el artículo con ID {article_id}"
@@ -233,7 +311,7 @@ class ArticleController:
             - Si falla: (None, mensaje_error)
         """
         try:
-            articulo = Articulo.query.get(article_id)
+            articulo = Articulo.query.options(*Articulo.opciones_carga('validacion')).get(article_id)
             
             if not articulo:
                 return None, f"No se encontró el artículo con ID {article_id}"
@@ -247,30 +325,26 @@ class ArticleController:
                 if field in data and data[field] == 0:
                     data[field] = None
             
-            # Validar referencias si están presentes
+            # Validar referencias si están presentes (desde el caché de catálogos)
+            catalog_cache = get_catalog_cache()
             if 'tipo_produccion_id' in data and data['tipo_produccion_id']:
-                tipo = TipoProduccion.query.get(data['tipo_produccion_id'])
-                if not tipo:
+                if not catalog_cache.existe(TipoProduccion, data['tipo_produccion_id']):
                     return None, "Tipo de producción inválido"
             
             if 'estado_id' in data and data['estado_id']:
-                estado = Estado.query.get(data['estado_id'])
-                if not estado:
+                if not catalog_cache.existe(Estado, data['estado_id']):
                     return None, "Estado inválido"
             
             if 'proposito_id' in data and data['proposito_id']:
-                proposito = Proposito.query.get(data['proposito_id'])
-                if not proposito:
+                if not catalog_cache.existe(Proposito, data['proposito_id']):
                     return None, "Propósito inválido"
             
             if 'lgac_id' in data and data['lgac_id']:
-                lgac = LGAC.query.get(data['lgac_id'])
-                if not lgac:
+                if not catalog_cache.existe(LGAC, data['lgac_id']):
                     return None, "LGAC inválido"
             
             if 'revista_id' in data and data['revista_id']:
-                revista = Revista.query.get(data['revista_id'])
-                if not revista:
+                if not catalog_cache.existe(Revista, data['revista_id']):
                     return None, "Revista inválida"
             
             # Validar DOI si está presente
@@ -346,7 +420,7 @@ class ArticleController:
             - Si falla: (False, mensaje_error)
         """
         try:
-            articulo = Articulo.query.get(article_id)
+            articulo = Articulo.query.options(*Articulo.opciones_carga('validacion')).get(article_id)
             
             if not articulo:
                 return False, f"No se encontró el artículo con ID {article_id}"
@@ -392,7 +466,7 @@ class ArticleController:
             - Si falla: (None, mensaje_error)
         """
         try:
-            articulo = Articulo.query.get(article_id)
+            articulo = Articulo.query.options(*Articulo.opciones_carga('validacion')).get(article_id)
             
             if not articulo:
                 return None, f"No se encontró el artículo con ID {article_id}"
@@ -432,7 +506,7 @@ class ArticleController:
             - Si falla: (False, mensaje_error)
         """
         try:
-            articulo = Articulo.query.get(article_id)
+            articulo = Articulo.query.options(*Articulo.opciones_carga('validacion')).get(article_id)
             if not articulo:
                 return False, f"No se encontró el artículo con ID {article_id}"
             
@@ -478,7 +552,7 @@ class ArticleController:
             - Si falla: (False, mensaje_error)
         """
         try:
-            articulo = Articulo.query.get(article_id)
+            articulo = Articulo.query.options(*Articulo.opciones_carga('validacion')).get(article_id)
             if not articulo:
                 return False, f"No se encontró el artículo con ID {article_id}"
             
@@ -508,6 +582,8 @@ class ArticleController:
     def get_statistics() -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
         """
         Obtiene estadísticas generales de artículos.
+        Se leen de estadisticas_agregadas (una consulta); los nombres de
+        tipos y estados salen del caché de catálogos.
         
         Returns:
             Tuple (statistics, error_message)
@@ -515,54 +591,31 @@ class ArticleController:
             - Si falla: (None, mensaje_error)
         """
         try:
+            agregadas = EstadisticaAgregada.obtener()
+            catalog_cache = get_catalog_cache()
+            
+            def por_nombre(modelo, conteos):
+                resultado = {}
+                for registro_id, cantidad in conteos.items():
+                    entrada = catalog_cache.get(modelo, registro_id)
+                    if entrada:
+                        resultado[entrada.nombre] = resultado.get(entrada.nombre, 0) + cantidad
+                return resultado
+            
+            por_estado = por_nombre(Estado, agregadas.get('estado', {}))
+            
+            # Últimos 10 años con artículos
+            anios = sorted(agregadas.get('anio', {}).items(), reverse=True)[:10]
+            
             stats = {
-                'total': Articulo.query.filter_by(activo=True).count(),
-                'por_tipo': {},
-                'por_estado': {},
-                'por_anio': {},
-                'publicados': Articulo.query.join(Estado).filter(
-                    Articulo.activo == True,
-                    Estado.nombre == 'Publicado'
-                ).count(),
-                'para_curriculum': Articulo.query.filter_by(
-                    activo=True,
-                    para_curriculum=True
-                ).count()
+                'total': agregadas.get('total', {}).get(0, 0),
+                'por_tipo': por_nombre(TipoProduccion, agregadas.get('tipo', {})),
+                'por_estado': por_estado,
+                'por_anio': dict(anios),
+                'publicados': por_estado.get('Publicado', 0),
+                'para_curriculum': agregadas.get('para_curriculum', {}).get(0, 0)
             }
             
-            # Estadísticas por tipo
-            tipos = db.session.query(
-                TipoProduccion.nombre,
-                db.func.count(Articulo.id)
-            ).join(Articulo).filter(Articulo.activo == True).group_by(
-                TipoProduccion.nombre
-            ).all()
-            
-            stats['por_tipo'] = {tipo: count for tipo, count in tipos}
-            
-            # Estadísticas por estado
-            estados = db.session.query(
-                Estado.nombre,
-                db.func.count(Articulo.id)
-            ).join(Articulo).filter(Articulo.activo == True).group_by(
-                Estado.nombre
-            ).all()
-            
-            stats['por_estado'] = {estado: count for estado, count in estados}
-            
-            # Estadísticas por año
-            anios = db.session.query(
-                Articulo.anio_publicacion,
-                db.func.count(Articulo.id)
-            ).filter(
-                Articulo.activo == True,
-                Articulo.anio_publicacion.isnot(None)
-            ).group_by(Articulo.anio_publicacion).order_by(
-                Articulo.anio_publicacion.desc()
-            ).limit(10).all()
-            
-            stats['por_anio'] = {anio: count for anio, count in anios if anio}
-            
             return stats, None
             
         except SQLAlchemyError as e:
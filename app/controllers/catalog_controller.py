@@ -9,6 +9,7 @@ from app.models import (
     Indexacion, Pais, Autor, Revista
 )
 from sqlalchemy import or_
+from app.utils.paginacion import CursorInvalido, PaginaCursor, get_conteo_cache, paginar_keyset
 import logging
 
 logger = logging.getLogger(__name__)
@@ -123,30 +124,10 @@ class CatalogController:
             if not model:
                 return None, f"Catálogo '{catalog_name}' no encontrado"
             
-            config = cls.get_config(catalog_name)
-            search_fields = config.get('search_fields', ['nombre'])
-            
-            # Construir query
-            query_obj = model.query
-            
-            # Filtro de búsqueda
-            if query:
-                filters = []
-                for field in search_fields:
-                    if hasattr(model, field):
-                        filters.append(getattr(model, field).ilike(f'%{query}%'))
-                if filters:
-                    query_obj = query_obj.filter(or_(*filters))
-            
-            # Filtro de activos/inactivos
-            if not show_inactive and hasattr(model, 'activo'):
-                query_obj = query_obj.filter(model.activo == True)
+            query_obj = cls._build_query(catalog_name, model, query, show_inactive)
             
             # Ordenar por nombre o id
-            if hasattr(model, 'nombre'):
-                query_obj = query_obj.order_by(model.nombre)
-            else:
-                query_obj = query_obj.order_by(model.id)
+            query_obj = query_obj.order_by(*cls._sort_columns(model))
             
             # Paginar
             pagination = query_obj.paginate(page=page, per_page=per_page, error_out=False)
@@ -157,6 +138,77 @@ class CatalogController:
             logger.error(f"Error al obtener catálogo {catalog_name}: {str(e)}")
             return None, str(e)
     
+    @classmethod
+    def get_page(cls, catalog_name: str, cursor: str = None, per_page: int = 50,
+                 query: str = None, show_inactive: bool = False,
+                 con_total: bool = True) -> Tuple[Optional[PaginaCursor], Optional[str]]:
+        """
+        Obtiene una página de un catálogo por cursor sobre (nombre, id).
+        
+        Args:
+            catalog_name: Nombre del catálogo
+            cursor: Token de la página (None = primera página)
+            per_page: Registros por página
+            query: Búsqueda por texto
+            show_inactive: Mostrar registros inactivos
+            con_total: Calcular el total (cacheado por versión de datos)
+            
+        Returns:
+            (pagina, error_message)
+        """
+        try:
+            model = cls.get_model(catalog_name)
+            if not model:
+                return None, f"Catálogo '{catalog_name}' no encontrado"
+            
+            query_obj = cls._build_query(catalog_name, model, query, show_inactive)
+            pagina = paginar_keyset(
+                query_obj, cls._sort_columns(model), cursor=cursor, per_page=per_page
+            )
+            
+            if con_total:
+                pagina.total = get_conteo_cache().contar(query_obj, [model.__tablename__])
+            
+            return pagina, None
+            
+        except CursorInvalido:
+            return None, "Cursor de paginación inválido"
+            
+        except Exception as e:
+            logger.error(f"Error al obtener catálogo {catalog_name}: {str(e)}")
+            return None, str(e)
+    
+    @classmethod
+    def _build_query(cls, catalog_name: str, model, query: str = None,
+                     show_inactive: bool = False):
+        """Construye la consulta filtrada de un catálogo (sin ordenar)."""
+        config = cls.get_config(catalog_name)
+        search_fields = config.get('search_fields', ['nombre'])
+        
+        query_obj = model.query
+        
+        # Filtro de búsqueda
+        if query:
+            filters = []
+            for field in search_fields:
+                if hasattr(model, field):
+                    filters.append(getattr(model, field).ilike(f'%{query}%'))
+            if filters:
+                query_obj = query_obj.filter(or_(*filters))
+        
+        # Filtro de activos/inactivos
+        if not show_inactive and hasattr(model, 'activo'):
+            query_obj = query_obj.filter(model.activo == True)
+        
+        return query_obj
+    
+    @staticmethod
+    def _sort_columns(model) -> List[Any]:
+        """Columnas de orden del catálogo: (nombre, id) o solo id."""
+        if hasattr(model, 'nombre'):
+            return [model.nombre, model.id]
+        return [model.id]
+    
     @classmethod
     def get_by_id(cls, catalog_name: str, id: int) -> Tuple[Optional[Any], Optional[str]]:
         """
@@ -205,6 +257,10 @@ class CatalogController:
             # Crear instancia
             registro = model(**data)
             
+            # Mantener nombre normalizado y clave fonética de autores
+            if hasattr(registro, 'actualizar_nombre_normalizado'):
+                registro.actualizar_nombre_normalizado()
+            
             # Guardar en BD
             db.session.add(registro)
             db.session.commit()
@@ -240,6 +296,9 @@ class CatalogController:
                 if hasattr(registro, key):
                     setattr(registro, key, value)
             
+            if hasattr(registro, 'actualizar_nombre_normalizado'):
+                registro.actualizar_nombre_normalizado()
+            
             db.session.commit()
             
             logger.info(f"Registro {id} actualizado en {catalog_name}")
@@ -329,6 +388,35 @@ class CatalogController:
             logger.error(f"Error al cambiar estado de registro {id} en {catalog_name}: {str(e)}")
             return None, str(e)
     
+    @classmethod
+    def autocomplete_autores(cls, query: str = '', page: int = 1,
+                             per_page: int = 10) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Busca autores por prefijo para el autocompletado de formularios.
+        Usa el índice en memoria; los resultados se ordenan por número de artículos.
+        
+        Args:
+            query: Texto a buscar (prefijos de nombre o apellidos)
+            page: Número de página
+            per_page: Resultados por página (máximo 50)
+            
+        Returns:
+            (resultados, error_message)
+        """
+        try:
+            from app.services.autor_index import get_autor_index
+            
+            if page < 1:
+                return None, "El número de página debe ser mayor a 0"
+            
+            per_page = max(1, min(per_page, 50))
+            
+            return get_autor_index().buscar(query or '', page=page, per_page=per_page), None
+            
+        except Exception as e:
+            logger.error(f"Error en autocompletado de autores: {str(e)}")
+            return None, str(e)
+    
     @classmethod
     def get_catalog_list(cls) -> List[Dict[str, Any]]:
         """
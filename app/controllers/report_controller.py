@@ -1,16 +1,20 @@
 """
 Controlador para generación de reportes y exportaciones.
 """
-from typing import List, Optional, Dict, Any
-from flask import send_file
-from sqlalchemy import or_, and_
+from typing import Optional, Dict, Any
+from flask import current_app, send_file
+from sqlalchemy import case, func, select, union_all
 from app.models.articulo import Articulo
-from app.models.autor import Autor
-from app.models.catalogs import (
-    TipoProduccion, Estado, LGAC, Proposito, Indexacion, Pais
-)
-from app.models.revista import Revista
+from app.models.cambios_articulo import cambios_desde, leer_marca, ultima_marca
+from app.models.catalogs import TipoProduccion, Estado
+from app.models.filtro_articulos import FiltroArticulos
+from app.services.catalog_cache import get_catalog_cache
+from app.services.curriculum_bundle import CurriculumBundleService
 from app.services.excel_service import ExcelService
+from app.services.export_cache import get_export_cache
+from app.services.facetas import conteo_por_columna
+from app.services.precarga_exportacion import PrecargaExportacion
+from app.services.stream_export import StreamExportService
 from app import db
 import logging
 
@@ -20,6 +24,9 @@ logger = logging.getLogger(__name__)
 class ReportController:
     """Controlador para manejo de reportes y exportaciones."""
     
+    # Artículos leídos del cursor por lote al exportar
+    TAMANO_LOTE = 500
+    
     def __init__(self):
         """Inicializa el controlador."""
         self.excel_service = ExcelService()
@@ -30,32 +37,33 @@ class ReportController:
         Exporta artículos a Excel aplicando filtros opcionales.
         
         Args:
-            filters: Diccionario con filtros a aplicar:
-                - search: Búsqueda por texto en título o revista
-                - anio_inicio: Año de publicación desde
-                - anio_fin: Año de publicación hasta
-                - tipo_produccion_id: ID del tipo de producción
-                - estado_id: ID del estado
-                - lgac_id: ID de la LGAC
-                - autor_id: ID del autor
-                - para_curriculum: True/False
-                - completo: True/False
-                - activo: True/False (default True)
+            filters: FiltroArticulos o diccionario con filtros
+                (ver FiltroArticulos.desde_dict), ej:
+                - search: Búsqueda por texto (título, revista, autores)
+                - anio_inicio / anio_fin: Rango de años de publicación
+                - tipo_produccion_id, estado_id, lgac_id, autor_id,
+                  indexacion_id: Un ID o lista de IDs
+                - para_curriculum, completo, con_doi: True/False
+                - activo: True (default) / False / None (todos)
         
         Returns:
-            Tupla (BytesIO, filename) con el archivo Excel y su nombre
+            Tupla (archivo, filename): archivo temporal con el Excel,
+            posicionado al inicio, y su nombre
         """
         try:
-            # Construir query con filtros
-            articulos = self._build_filtered_query(filters)
+            # Los artículos llegan por lotes desde el cursor y se escriben
+            # en cuanto se leen: la memoria no depende del total
+            articulos = self._build_filtered_query(filters).yield_per(self.TAMANO_LOTE)
             
-            # Generar archivo Excel
-            excel_file = self.excel_service.generate(articulos)
+            # Generar archivo Excel (relaciones precargadas con consultas fijas por lote)
+            excel_file = self.excel_service.generate(
+                articulos, precarga=PrecargaExportacion(), tamano_lote=self.TAMANO_LOTE
+            )
             
             # Generar nombre de archivo
             filename = self._generate_filename(filters)
             
-            self.logger.info(f"Reporte generado: {len(articulos)} artículos")
+            self.logger.info(f"Reporte generado: {filename}")
             
             return excel_file, filename
             
@@ -63,74 +71,141 @@ class ReportController:
             self.logger.error(f"Error generando reporte Excel: {str(e)}")
             raise
     
-    def _build_filtered_query(self, filters: Optional[Dict[str, Any]] = None) -> List[Articulo]:
+    def export_excel_cached(self, filters: Optional[Dict[str, Any]] = None) -> tuple:
         """
-        Construye query con filtros aplicados.
+        Exporta artículos a Excel reutilizando el archivo generado por una
+        exportación idéntica mientras los datos no cambien.
         
         Args:
-            filters: Diccionario con filtros
-            
+            filters: FiltroArticulos o diccionario con filtros (ver export_excel)
+        
         Returns:
-            Lista de artículos filtrados
+            Tupla (artefacto, filename): Artefacto(ruta, clave, generado) del
+            caché de exportaciones (la clave sirve como ETag) y el nombre de
+            descarga
         """
-        query = Articulo.query
+        filtro = FiltroArticulos.desde(filters)
+        
+        def generar(destino):
+            articulos = self._build_filtered_query(filtro).yield_per(self.TAMANO_LOTE)
+            self.excel_service.generate(
+                articulos, destino=destino,
+                precarga=PrecargaExportacion(), tamano_lote=self.TAMANO_LOTE
+            )
         
-        # Filtros por defecto
-        if filters is None:
-            filters = {}
+        try:
+            artefacto = get_export_cache().obtener('xlsx', filtro, generar)
+            filename = self._generate_filename(filtro)
+            
+            origen = 'generado' if artefacto.generado else 'desde caché'
+            self.logger.info(f"Reporte {filename} ({origen})")
+            
+            return artefacto, filename
+            
+        except Exception as e:
+            self.logger.error(f"Error generando reporte Excel: {str(e)}")
+            raise
+    
+    def export_stream(self, filters: Optional[Dict[str, Any]] = None, formato: str = 'csv',
+                      since: Optional[str] = None) -> tuple:
+        """
+        Exporta artículos en CSV, JSON Lines, BibTeX o RIS como un flujo de texto.
+        Las filas se leen del cursor por lotes y se entregan a medida que se
+        generan (para Response de Flask o para escribir a un archivo).
         
-        # Filtro de activos (por defecto True)
-        if filters.get('activo', True):
-            query = query.filter(Articulo.activo == True)
+        Con `since` la exportación es incremental: solo los artículos
+        creados, modificados o dados de baja (activo = false) después de la
+        marca, en orden de cambio.
         
-        # Búsqueda por texto
-        if filters.get('search'):
-            search_term = f"%{filters['search']}%"
-            query = query.filter(
-                or_(
-                    Articulo.titulo.ilike(search_term),
-                    Articulo.titulo_revista.ilike(search_term)
-                )
-            )
+        Args:
+            filters: FiltroArticulos o diccionario con filtros (ver export_excel)
+            formato: 'csv', 'jsonl', 'bibtex' o 'ris'
+            since: Marca de agua de una exportación anterior o fecha ISO 8601
         
-        # Filtro por rango de años
-        if filters.get('anio_inicio'):
-            query = query.filter(Articulo.anio_publicacion >= filters['anio_inicio'])
+        Returns:
+            Tupla (bloques, filename, mimetype, marca): iterador de bloques
+            de texto, nombre de archivo, tipo MIME y marca de agua para la
+            siguiente exportación incremental
         
-        if filters.get('anio_fin'):
-            query = query.filter(Articulo.anio_publicacion <= filters['anio_fin'])
+        Raises:
+            ValueError: Si el formato no existe
+            MarcaInvalida: Si `since` no es una marca ni una fecha
+        """
+        if formato not in StreamExportService.FORMATOS:
+            raise ValueError(f"Formato de exportación desconocido: {formato}")
         
-        # Filtro por tipo de producción
-        if filters.get('tipo_produccion_id'):
-            query = query.filter(Articulo.tipo_produccion_id == filters['tipo_produccion_id'])
+        mimetype, extension = StreamExportService.FORMATOS[formato]
+        filtro = FiltroArticulos.desde(filters)
         
-        # Filtro por estado
-        if filters.get('estado_id'):
-            query = query.filter(Articulo.estado_id == filters['estado_id'])
+        if since:
+            # Las bajas lógicas también se entregan (activo = false)
+            marca = leer_marca(since)
+            consulta = cambios_desde(filtro.con(activo=None).aplicar(Articulo.query), marca)
+            siguiente = ultima_marca(consulta) or since
+            consulta = consulta.order_by(None).order_by(Articulo.updated_at, Articulo.id)\
+                .options(*Articulo.opciones_carga('exportacion'))
+        else:
+            siguiente = ultima_marca(filtro.con(activo=None).aplicar(Articulo.query))
+            consulta = self._build_filtered_query(filtro)
         
-        # Filtro por LGAC
-        if filters.get('lgac_id'):
-            query = query.join(Articulo.lgacs).filter(LGAC.id == filters['lgac_id'])
+        bloques = StreamExportService().generate(
+            formato, consulta.yield_per(self.TAMANO_LOTE),
+            PrecargaExportacion(autores=formato in StreamExportService.FORMATOS_CON_AUTORES),
+            tamano_lote=self.TAMANO_LOTE
+        )
+        prefijo = 'cambios' if since else None
+        filename = self._generate_filename(filtro, extension, prefijo)
         
-        # Filtro por autor
-        if filters.get('autor_id'):
-            query = query.join(Articulo.articulo_autores).filter(
-                Articulo.articulo_autores.any(autor_id=filters['autor_id'])
-            )
+        self.logger.info(f"Exportación por flujo: {filename}")
+        return bloques, filename, mimetype, siguiente
+    
+    def export_curriculum_bundle(self, filters: Optional[Dict[str, Any]] = None) -> tuple:
+        """
+        Exporta un libro de Excel por miembro del CA con sus artículos para
+        currículum, en un solo ZIP.
+        Los artículos de todos los miembros se leen en una sola pasada y los
+        libros se construyen en paralelo (CURRICULUM_MAX_PROCESSES).
         
-        # Filtro por indexación
-        if filters.get('indexacion_id'):
-            query = query.join(Articulo.indexaciones).filter(
-                Indexacion.id == filters['indexacion_id']
-            )
+        Args:
+            filters: FiltroArticulos o diccionario con filtros (ver
+                export_excel); para_curriculum siempre es True y autor_id
+                limita los miembros incluidos
         
-        # Filtro para currículum
-        if filters.get('para_curriculum') is not None:
-            query = query.filter(Articulo.para_curriculum == filters['para_curriculum'])
+        Returns:
+            Tupla (bloques, filename): iterador de bloques de bytes del ZIP
+            y su nombre
+        """
+        filtro = FiltroArticulos.desde(filters).con(para_curriculum=True)
+        servicio = CurriculumBundleService(
+            max_procesos=current_app.config.get('CURRICULUM_MAX_PROCESSES', 2),
+            tamano_lote=self.TAMANO_LOTE
+        )
+        
+        miembros = servicio.miembros(filtro.autor_ids)
+        articulos = []
+        if miembros:
+            # Artículos de cualquiera de los miembros, en el orden de la exportación
+            consulta = self._build_filtered_query(filtro.con(autor_ids=[m.id for m in miembros]))
+            articulos = consulta.yield_per(self.TAMANO_LOTE)
         
-        # Filtro por completitud
-        if filters.get('completo') is not None:
-            query = query.filter(Articulo.completo == filters['completo'])
+        filas = servicio.repartir(articulos, miembros)
+        filename = self.excel_service.generate_filename('curriculum_ca', 'zip')
+        
+        self.logger.info(f"Paquete de currículums: {filename} ({len(miembros)} miembros)")
+        return servicio.generar(miembros, filas), filename
+    
+    def _build_filtered_query(self, filters=None):
+        """
+        Construye la consulta de exportación con filtros, orden y carga
+        de relaciones.
+        
+        Args:
+            filters: FiltroArticulos o diccionario con filtros
+            
+        Returns:
+            Query de artículos (sin ejecutar)
+        """
+        query = self._filter_query(Articulo.query, filters)
         
         # Ordenar por año descendente y título
         query = query.order_by(
@@ -138,70 +213,73 @@ class ReportController:
             Articulo.titulo
         )
         
-        # Eager loading de relaciones para evitar N+1 queries
-        # Nota: no se puede hacer joinedload en backrefs dinámicos, se cargan bajo demanda
-        query = query.options(
-            db.joinedload(Articulo.tipo),
-            db.joinedload(Articulo.estado),
-            db.joinedload(Articulo.revista),
-            db.joinedload(Articulo.lgac),
-            db.joinedload(Articulo.proposito)
-        )
+        # Solo columnas: las relaciones las precarga PrecargaExportacion por lote
+        return query.options(*Articulo.opciones_carga('exportacion'))
+    
+    def _filter_query(self, query, filters=None):
+        """
+        Aplica los filtros de exportación a una consulta de artículos.
         
-        return query.all()
+        Args:
+            query: Query de SQLAlchemy sobre Articulo
+            filters: FiltroArticulos o diccionario con filtros
+            
+        Returns:
+            Query filtrado (sin ordenar)
+        """
+        return FiltroArticulos.desde(filters).aplicar(query)
     
-    def _generate_filename(self, filters: Optional[Dict[str, Any]] = None) -> str:
+    def _generate_filename(self, filters: Optional[Dict[str, Any]] = None,
+                           extension: str = 'xlsx', prefijo: Optional[str] = None) -> str:
         """
         Genera nombre descriptivo para el archivo según filtros aplicados.
         
         Args:
-            filters: Diccionario con filtros aplicados
+            filters: FiltroArticulos o diccionario con filtros aplicados
+            extension: Extensión del archivo
+            prefijo: Texto adicional después de 'articulos' (ej: 'cambios')
             
         Returns:
             Nombre de archivo descriptivo
         """
         prefix_parts = ['articulos']
+        if prefijo:
+            prefix_parts.append(prefijo)
+        filtro = FiltroArticulos.desde(filters)
+        catalog_cache = get_catalog_cache()
         
-        if filters:
-            # Agregar información de filtros al nombre
-            if filters.get('anio_inicio') and filters.get('anio_fin'):
-                prefix_parts.append(f"{filters['anio_inicio']}-{filters['anio_fin']}")
-            elif filters.get('anio_inicio'):
-                prefix_parts.append(f"desde_{filters['anio_inicio']}")
-            elif filters.get('anio_fin'):
-                prefix_parts.append(f"hasta_{filters['anio_fin']}")
-            
-            if filters.get('tipo_produccion_id'):
-                try:
-                    tipo = TipoProduccion.query.get(filters['tipo_produccion_id'])
-                    if tipo:
-                        # Sanitizar nombre para filename
-                        tipo_nombre = tipo.nombre.lower().replace(' ', '_')
-                        prefix_parts.append(tipo_nombre)
-                except:
-                    pass
-            
-            if filters.get('estado_id'):
-                try:
-                    estado = Estado.query.get(filters['estado_id'])
-                    if estado:
-                        estado_nombre = estado.nombre.lower().replace(' ', '_')
-                        prefix_parts.append(estado_nombre)
-                except:
-                    pass
-            
-            if filters.get('para_curriculum'):
-                prefix_parts.append('curriculum')
-            
-            if filters.get('completo') is False:
-                prefix_parts.append('incompletos')
+        # Agregar información de filtros al nombre
+        if filtro.anio_inicio is not None and filtro.anio_inicio == filtro.anio_fin:
+            prefix_parts.append(str(filtro.anio_inicio))
+        elif filtro.anio_inicio is not None and filtro.anio_fin is not None:
+            prefix_parts.append(f"{filtro.anio_inicio}-{filtro.anio_fin}")
+        elif filtro.anio_inicio is not None:
+            prefix_parts.append(f"desde_{filtro.anio_inicio}")
+        elif filtro.anio_fin is not None:
+            prefix_parts.append(f"hasta_{filtro.anio_fin}")
+        
+        # Nombre del tipo y del estado si se filtró por uno solo
+        for modelo, ids in ((TipoProduccion, filtro.tipo_ids), (Estado, filtro.estado_ids)):
+            if len(ids) == 1:
+                entrada = catalog_cache.get(modelo, ids[0])
+                if entrada:
+                    # Sanitizar nombre para filename
+                    prefix_parts.append(entrada.nombre.lower().replace(' ', '_'))
+        
+        if filtro.para_curriculum:
+            prefix_parts.append('curriculum')
+        
+        if filtro.completo is False:
+            prefix_parts.append('incompletos')
         
         prefix = '_'.join(prefix_parts)
-        return self.excel_service.generate_filename(prefix)
+        return self.excel_service.generate_filename(prefix, extension)
     
     def get_export_statistics(self, filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Obtiene estadísticas de los artículos que se exportarían.
+        Se calculan en SQL (COUNT/SUM/GROUP BY) sobre los mismos filtros de
+        la exportación, sin cargar artículos.
         
         Args:
             filters: Diccionario con filtros
@@ -210,42 +288,55 @@ class ReportController:
             Diccionario con estadísticas
         """
         try:
-            articulos = self._build_filtered_query(filters)
+            filtrados = self._filter_query(
+                db.session.query(
+                    Articulo.id,
+                    Articulo.completo,
+                    Articulo.para_curriculum,
+                    Articulo.anio_publicacion,
+                    Articulo.tipo_produccion_id,
+                    Articulo.estado_id
+                ),
+                filters
+            ).order_by(None).subquery('filtrados')
             
-            # Calcular estadísticas
-            total = len(articulos)
-            completos = sum(1 for a in articulos if a.completo)
-            incompletos = total - completos
-            para_curriculum = sum(1 for a in articulos if a.para_curriculum)
+            # Totales
+            total, completos, para_curriculum = db.session.execute(
+                select(
+                    func.count(),
+                    func.coalesce(func.sum(case((filtrados.c.completo == True, 1), else_=0)), 0),
+                    func.coalesce(func.sum(case((filtrados.c.para_curriculum == True, 1), else_=0)), 0)
+                ).select_from(filtrados)
+            ).one()
             
-            # Por año
-            por_anio = {}
-            for a in articulos:
-                if a.anio_publicacion:
-                    por_anio[a.anio_publicacion] = por_anio.get(a.anio_publicacion, 0) + 1
+            # Conteos por año, tipo y estado en una sola consulta
+            grupos = {'anio': {}, 'tipo': {}, 'estado': {}}
+            for grupo, valor, cantidad in db.session.execute(union_all(
+                conteo_por_columna('anio', filtrados.c.anio_publicacion),
+                conteo_por_columna('tipo', filtrados.c.tipo_produccion_id),
+                conteo_por_columna('estado', filtrados.c.estado_id)
+            )):
+                grupos[grupo][valor] = cantidad
             
-            # Por tipo de producción
-            por_tipo = {}
-            for a in articulos:
-                if a.tipo:
-                    tipo = a.tipo.nombre
-                    por_tipo[tipo] = por_tipo.get(tipo, 0) + 1
+            # Nombres de catálogos desde el caché
+            catalog_cache = get_catalog_cache()
             
-            # Por estado
-            por_estado = {}
-            for a in articulos:
-                if a.estado:
-                    estado = a.estado.nombre
-                    por_estado[estado] = por_estado.get(estado, 0) + 1
+            def por_nombre(modelo, conteos):
+                resultado = {}
+                for registro_id, cantidad in conteos.items():
+                    entrada = catalog_cache.get(modelo, registro_id)
+                    nombre = entrada.nombre if entrada else str(registro_id)
+                    resultado[nombre] = resultado.get(nombre, 0) + cantidad
+                return resultado
             
             return {
                 'total': total,
                 'completos': completos,
-                'incompletos': incompletos,
+                'incompletos': total - completos,
                 'para_curriculum': para_curriculum,
-                'por_anio': dict(sorted(por_anio.items(), reverse=True)),
-                'por_tipo': por_tipo,
-                'por_estado': por_estado
+                'por_anio': dict(sorted(grupos['anio'].items(), reverse=True)),
+                'por_tipo': por_nombre(TipoProduccion, grupos['tipo']),
+                'por_estado': por_nombre(Estado, grupos['estado'])
             }
             
         except Exception as e:
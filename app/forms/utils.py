@@ -1,10 +1,12 @@
 """
 Utilidades para formularios.
 Funciones para poblar campos dinámicos desde la base de datos.
+Los catálogos se leen del caché versionado (app.services.catalog_cache).
 """
 from app.models.catalogs import TipoProduccion, Proposito, LGAC, Estado, Indexacion
 from app.models.revista import Revista
 from app.models.autor import Autor
+from app.services.catalog_cache import get_catalog_cache
 
 
 def populate_tipo_produccion_choices():
@@ -14,8 +16,7 @@ def populate_tipo_produccion_choices():
     Returns:
         list: Lista de tuplas (id, nombre) ordenadas alfabéticamente
     """
-    tipos = TipoProduccion.query.order_by(TipoProduccion.nombre).all()
-    return [(0, '-- Seleccione --')] + [(t.id, t.nombre) for t in tipos]
+    return [(0, '-- Seleccione --')] + get_catalog_cache().choices(TipoProduccion)
 
 
 def populate_proposito_choices():
@@ -25,8 +26,7 @@ def populate_proposito_choices():
     Returns:
         list: Lista de tuplas (id, nombre) ordenadas alfabéticamente
     """
-    propositos = Proposito.query.order_by(Proposito.nombre).all()
-    return [(0, '-- Seleccione --')] + [(p.id, p.nombre) for p in propositos]
+    return [(0, '-- Seleccione --')] + get_catalog_cache().choices(Proposito)
 
 
 def populate_lgac_choices():
@@ -36,8 +36,7 @@ def populate_lgac_choices():
     Returns:
         list: Lista de tuplas (id, nombre) ordenadas alfabéticamente
     """
-    lgacs = LGAC.query.order_by(LGAC.nombre).all()
-    return [(0, '-- Seleccione --')] + [(l.id, l.nombre) for l in lgacs]
+    return [(0, '-- Seleccione --')] + get_catalog_cache().choices(LGAC)
 
 
 def populate_estado_choices():
@@ -47,8 +46,7 @@ def populate_estado_choices():
     Returns:
         list: Lista de tuplas (id, nombre) ordenadas alfabéticamente
     """
-    estados = Estado.query.order_by(Estado.nombre).all()
-    return [(0, '-- Seleccione --')] + [(e.id, e.nombre) for e in estados]
+    return [(0, '-- Seleccione --')] + get_catalog_cache().choices(Estado)
 
 
 def populate_revista_choices():
@@ -58,18 +56,30 @@ def populate_revista_choices():
     Returns:
         list: Lista de tuplas (id, nombre) ordenadas alfabéticamente
     """
-    revistas = Revista.query.order_by(Revista.nombre).all()
-    return [(0, '-- Seleccione --')] + [(r.id, r.nombre) for r in revistas]
+    return [(0, '-- Seleccione --')] + get_catalog_cache().choices(Revista)
 
 
-def populate_autor_choices():
+def populate_autor_choices(ids=None):
     """
     Obtiene las opciones para el campo autor_id.
     
+    Args:
+        ids (iterable, opcional): Si se indica, solo se cargan esos autores
+            (los seleccionados en el formulario). El resto se busca con
+            el autocompletado remoto (/catalogs/autores/autocomplete).
+    
     Returns:
         list: Lista de tuplas (id, nombre_completo) ordenadas alfabéticamente
     """
-    autores = Autor.query.order_by(Autor.nombre, Autor.apellidos).all()
+    query = Autor.query
+    
+    if ids is not None:
+        ids = {autor_id for autor_id in ids if autor_id}
+        if not ids:
+            return [(0, '-- Seleccione --')]
+        query = query.filter(Autor.id.in_(ids))
+    
+    autores = query.order_by(Autor.nombre, Autor.apellidos).all()
     return [(0, '-- Seleccione --')] + [(a.id, a.nombre_completo) for a in autores]
 
 
@@ -80,8 +90,7 @@ def populate_indexacion_choices():
     Returns:
         list: Lista de tuplas (id, nombre) ordenadas alfabéticamente
     """
-    indexaciones = Indexacion.query.filter_by(activo=True).order_by(Indexacion.nombre).all()
-    return [(i.id, i.nombre) for i in indexaciones]
+    return get_catalog_cache().choices(Indexacion, solo_activos=True)
 
 
 def populate_form_choices(form):
@@ -112,9 +121,14 @@ def populate_form_choices(form):
     if hasattr(form, 'autor_id'):
         form.autor_id.choices = populate_autor_choices()
     
-    # Poblar choices de autores en sub-formularios
+    # Poblar choices de autores en sub-formularios: solo los autores
+    # seleccionados, para no cargar el catálogo completo en cada formulario
     if hasattr(form, 'autores'):
-        autor_choices = populate_autor_choices()
+        autor_choices = populate_autor_choices(ids=[
+            autor_form.autor_id.data
+            for autor_form in form.autores
+            if hasattr(autor_form, 'autor_id')
+        ])
         for autor_form in form.autores:
             if hasattr(autor_form, 'autor_id'):
                 autor_form.autor_id.choices = autor_choices
@@ -140,7 +154,7 @@ def validate_articulo_data(form_data):
     
     # Si el estado es "Publicado", debe tener revista
     if form_data.get('estado_id'):
-        estado = Estado.query.get(form_data['estado_id'])
+        estado = get_catalog_cache().get(Estado, form_data['estado_id'])
         if estado and estado.nombre == 'Publicado':
             if not form_data.get('revista_id'):
                 errors['revista_id'] = 'La revista es obligatoria para artículos publicados'
@@ -154,7 +168,7 @@ def validate_articulo_data(form_data):
     
     # Conference paper debe tener nombre de congreso
     if form_data.get('tipo_produccion_id'):
-        tipo = TipoProduccion.query.get(form_data['tipo_produccion_id'])
+        tipo = get_catalog_cache().get(TipoProduccion, form_data['tipo_produccion_id'])
         if tipo and 'conference' in tipo.nombre.lower():
             if not form_data.get('nombre_congreso'):
                 errors['nombre_congreso'] = 'El nombre del congreso es obligatorio para conference papers'
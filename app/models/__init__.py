@@ -25,6 +25,21 @@ from app.models.relations import (
     RevistaIndexacion
 )
 
+# Versiones por tabla (invalidación de cachés)
+from app.models.versiones import VersionTabla
+
+# Estadísticas agregadas del dashboard (mantenidas por eventos de sesión)
+from app.models.estadisticas import EstadisticaAgregada
+
+# Autores desnormalizados del artículo (recalculados por eventos de sesión)
+from app.models import autores_display  # noqa: F401
+
+# Marca de cambio del artículo al cambiar sus relaciones (exportaciones incrementales)
+from app.models import cambios_articulo  # noqa: F401
+
+# Índice de texto completo (registra la creación de articulos_fts)
+from app.models import articulo_fts  # noqa: F401
+
 __all__ = [
     'Articulo',
     'Autor',
@@ -37,5 +52,7 @@ __all__ = [
     'Pais',
     'ArticuloAutor',
     'ArticuloIndexacion',
-    'RevistaIndexacion'
+    'RevistaIndexacion',
+    'VersionTabla',
+    'EstadisticaAgregada'
 ]
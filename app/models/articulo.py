@@ -3,7 +3,11 @@ Modelo de Artículo.
 Modelo principal del sistema que representa una producción académica.
 """
 from datetime import datetime
+
+from sqlalchemy import event
+
 from app import db
+from app.utils.huella import huella
 
 
 class Articulo(db.Model):
@@ -17,6 +21,9 @@ class Articulo(db.Model):
     
     # === Información básica del artículo ===
     titulo = db.Column(db.String(500), nullable=False)
+    # Huella del título (app/utils/huella.py) para detectar duplicados con
+    # consultas IN al importar; se actualiza al asignar el título
+    huella_titulo = db.Column(db.String(500), nullable=True, index=True)
     titulo_revista = db.Column(db.String(300), nullable=True)  # Puede diferir de revista.nombre
     descripcion = db.Column(db.Text, nullable=True)  # Resumen/Abstract del artículo
     
@@ -47,6 +54,12 @@ class Articulo(db.Model):
     # === Campos específicos para congresos ===
     nombre_congreso = db.Column(db.String(300), nullable=True)
     
+    # === Autores (desnormalizados) ===
+    # Nombres en orden y cantidad; los mantiene app/models/autores_display.py
+    # para mostrar, indexar y exportar sin recorrer articulo_autor
+    autores_display = db.Column(db.Text, nullable=True)
+    num_autores = db.Column(db.Integer, nullable=False, default=0)
+    
     # === Campos para el CA ===
     para_curriculum = db.Column(db.Boolean, nullable=False, default=True)
     
@@ -69,25 +82,47 @@ class Articulo(db.Model):
                           onupdate=datetime.utcnow)
     
     # === Relaciones ===
+    # Se cargan bajo demanda; cada vista pide las que muestra con
+    # Articulo.opciones_carga(perfil) para no repetir JOINs en COUNT, get, etc.
+    
     # Relación con TipoProduccion (muchos a uno)
-    tipo = db.relationship('TipoProduccion', back_populates='articulos', lazy='joined')
+    tipo = db.relationship('TipoProduccion', back_populates='articulos')
     
     # Relación con Proposito (muchos a uno)
-    proposito = db.relationship('Proposito', back_populates='articulos', lazy='joined')
+    proposito = db.relationship('Proposito', back_populates='articulos')
     
     # Relación con LGAC (muchos a uno)
-    lgac = db.relationship('LGAC', back_populates='articulos', lazy='joined')
+    lgac = db.relationship('LGAC', back_populates='articulos')
     
     # Relación con Estado (muchos a uno)
-    estado = db.relationship('Estado', back_populates='articulos', lazy='joined')
+    estado = db.relationship('Estado', back_populates='articulos')
     
     # Relación con Revista (muchos a uno)
-    revista = db.relationship('Revista', back_populates='articulos', lazy='joined')
+    revista = db.relationship('Revista', back_populates='articulos')
     
     # Nota: Las relaciones N:N con Autores e Indexaciones están definidas
     # en las tablas intermedias ArticuloAutor y ArticuloIndexacion
-    # Acceso a autores a través de: articulo.articulo_autores
-    # Acceso a indexaciones a través de: articulo.articulo_indexaciones
+    # Acceso a autores a través de: articulo.articulo_autores (lista ordenada)
+    # Acceso a indexaciones a través de: articulo.articulo_indexaciones (lista)
+    
+    # === Índices ===
+    # Parciales sobre artículos activos (los inactivos casi no se consultan).
+    # tests/test_query_plans.py verifica que las consultas frecuentes los usen.
+    __table_args__ = (
+        # Listado y paginación por cursor (más recientes primero)
+        db.Index('ix_articulos_activos_recientes', 'created_at', 'id',
+                 sqlite_where=activo == True, postgresql_where=activo == True),
+        # Rangos de años (exportaciones, estadísticas por año)
+        db.Index('ix_articulos_activos_anio', 'anio_publicacion',
+                 sqlite_where=activo == True, postgresql_where=activo == True),
+        # Filtros y agrupaciones por tipo y estado
+        db.Index('ix_articulos_activos_tipo', 'tipo_produccion_id', 'created_at', 'id',
+                 sqlite_where=activo == True, postgresql_where=activo == True),
+        db.Index('ix_articulos_activos_estado', 'estado_id', 'created_at', 'id',
+                 sqlite_where=activo == True, postgresql_where=activo == True),
+        # Exportaciones incrementales (?since=): incluye las bajas lógicas
+        db.Index('ix_articulos_cambios', 'updated_at', 'id'),
+    )
     
     def __repr__(self):
         return f'<Articulo {self.titulo[:50]}...>'
@@ -148,6 +183,8 @@ class Articulo(db.Model):
             'url': self.url,
             'issn': self.issn,
             'nombre_congreso': self.nombre_congreso,
+            'autores_display': self.autores_display,
+            'num_autores': self.num_autores,
             'para_curriculum': self.para_curriculum,
             'factor_impacto': self.factor_impacto,
             'quartil': self.quartil,
@@ -167,11 +204,15 @@ class Articulo(db.Model):
         
         return data
     
-    def calcular_completitud(self):
+    def calcular_completitud(self, num_autores=None):
         """
         Calcula si el artículo tiene todos los campos obligatorios.
         Retorna True si está completo, False si faltan campos.
         Actualiza el campo campos_faltantes con la lista de campos faltantes.
+        
+        Args:
+            num_autores: Número de autores si quien llama ya lo conoce
+                (ej: importación por lotes); evita consultar articulo_autor
         """
         import json
         from app.models.relations import ArticuloAutor
@@ -204,7 +245,10 @@ class Articulo(db.Model):
                 faltantes.append(nombre)
         
         # Verificar que tenga al menos un autor - hacer query directo si el objeto está persistido
-        if self.id:
+        if num_autores is not None:
+            if num_autores == 0:
+                faltantes.append('Autores')
+        elif self.id:
             # Si el artículo ya existe en la DB, hacer un query directo
             num_autores = db.session.query(ArticuloAutor).filter_by(articulo_id=self.id).count()
             if num_autores == 0:
@@ -224,8 +268,6 @@ class Articulo(db.Model):
         Convierte el artículo al formato de fila para Excel del CA.
         Retorna un diccionario con las columnas del Excel.
         """
-        autores_lista = [aa.autor.nombre_completo for aa in self.articulo_autores] if hasattr(self, 'articulo_autores') else []
-        
         # Obtener indexaciones de la revista
         indexaciones_lista = []
         if self.revista and hasattr(self.revista, 'revista_indexaciones'):
@@ -237,7 +279,7 @@ class Articulo(db.Model):
             'Estado': self.estado.nombre if self.estado else '',
             'Propósito': self.proposito.nombre if self.proposito else '',
             'LGAC': self.lgac.nombre if self.lgac else '',
-            'Autores': ', '.join(autores_lista),
+            'Autores': self.autores_display or '',
             'Nombre de la revista': self.revista.nombre if self.revista else self.titulo_revista or '',
             'Volumen': self.volumen or '',
             'Número': self.numero or '',
@@ -388,11 +430,8 @@ class Articulo(db.Model):
         if not relacion:
             return False
         
-        # Eliminar la relación
-        ArticuloAutor.query.filter_by(
-            articulo_id=self.id,
-            autor_id=autor.id
-        ).delete()
+        # Eliminar la relación (por la sesión, para recalcular autores_display)
+        db.session.delete(relacion)
         
         # Reorganizar órdenes
         autores = ArticuloAutor.query.filter_by(articulo_id=self.id)\
@@ -448,52 +487,157 @@ class Articulo(db.Model):
         return list(indexaciones)
     
     @staticmethod
-    def buscar(query=None, tipo_id=None, estado_id=None, lgac_id=None, 
-               anio=None, autor_id=None, para_curriculum=None):
+    def filtrar_texto(consulta, texto):
         """
-        Método estático para búsqueda avanzada de artículos.
+        Filtra una consulta de artículos por texto libre.
+        
+        Los nombres de autores (según el índice de autores) filtran con EXISTS
+        sobre articulo_autor o con el texto del nombre, porque también pueden
+        ser palabras del título (Rosa, Flores, León); el resto del texto se
+        busca en las columnas del artículo.
+        En SQLite usa el índice FTS5 (articulos_fts): busca por prefijo en
+        título, revista, descripción y autores, ignora acentos y ordena por
+        relevancia (bm25) antes de cualquier otro orden que se agregue después.
+        En otros motores usa ILIKE sobre las columnas del artículo.
         
         Args:
-            query: Texto a buscar en título o revista
-            tipo_id: ID del tipo de producción
-            estado_id: ID del estado
-            lgac_id: ID de la LGAC
-            anio: Año de publicación
-            autor_id: ID del autor
-            para_curriculum: Filtrar por artículos para currículum
+            consulta: Query de Articulo
+            texto: Texto a buscar
         
         Returns:
-            Query de SQLAlchemy (permite agregar más filtros o paginación)
+            Query filtrada
         """
+        from app.models.articulo_fts import (
+            articulos_fts, construir_consulta_fts, fts_disponible, PESOS_BM25
+        )
         from app.models.relations import ArticuloAutor
+        from app.services.autor_index import get_autor_index
         
-        articulos = Articulo.query.filter_by(activo=True)
+        usar_fts = fts_disponible()
+        tabla_fts = db.literal_column('articulos_fts')
         
-        if query:
-            articulos = articulos.filter(
-                db.or_(
-                    Articulo.titulo.ilike(f'%{query}%'),
-                    Articulo.titulo_revista.ilike(f'%{query}%')
+        def coincide_texto(palabras):
+            if usar_fts:
+                # Sin la columna de autores (la cubre el EXISTS) y sin
+                # correlación: la consulta externa también puede unir articulos_fts
+                consulta_fts = construir_consulta_fts(
+                    palabras, columnas=('titulo', 'titulo_revista', 'descripcion')
                 )
+                return Articulo.id.in_(
+                    db.select(articulos_fts.c.rowid)
+                    .where(tabla_fts.match(consulta_fts))
+                    .correlate(None)
+                )
+            patron = f'%{palabras}%'
+            return db.or_(
+                Articulo.titulo.ilike(patron),
+                Articulo.titulo_revista.ilike(patron),
+                Articulo.descripcion.ilike(patron)
+            )
+        
+        # Semi-join por autor: no duplica artículos con varios autores
+        autores, texto = get_autor_index().separar_autores(texto)
+        for autor_ids, nombre in autores:
+            consulta = consulta.filter(db.or_(
+                db.exists().where(
+                    ArticuloAutor.articulo_id == Articulo.id,
+                    ArticuloAutor.autor_id.in_(sorted(autor_ids))
+                ),
+                coincide_texto(nombre)
+            ))
+        
+        if not texto:
+            return consulta
+        
+        if usar_fts:
+            consulta_fts = construir_consulta_fts(texto)
+            if not consulta_fts:
+                return consulta
+            
+            return consulta.join(
+                articulos_fts, articulos_fts.c.rowid == Articulo.id
+            ).filter(
+                tabla_fts.match(consulta_fts)
+            ).order_by(
+                db.func.bm25(tabla_fts, *PESOS_BM25)
             )
         
-        if tipo_id:
-            articulos = articulos.filter_by(tipo_produccion_id=tipo_id)
+        return consulta.filter(coincide_texto(texto))
+    
+    @staticmethod
+    def opciones_carga(perfil):
+        """
+        Opciones de carga de relaciones según lo que muestra cada vista.
+        Las relaciones se piden por lotes (selectinload) y el resto queda
+        bloqueado (raiseload) para que un acceso no previsto falle en lugar
+        de generar una consulta por artículo.
+        
+        Perfiles:
+            listado: tipo y estado (tabla de artículos)
+            detalle: catálogos, revista, autores e indexaciones del artículo
+            exportacion: solo columnas; la exportación lee autores de
+                autores_display y el resto con PrecargaExportacion por lote
+            validacion: solo columnas (edición, borrado, cambios de autores)
+        
+        Args:
+            perfil: Nombre del perfil
+        
+        Returns:
+            list: Opciones para Query.options()
+        
+        Raises:
+            ValueError: Si el perfil no existe
+        """
+        from sqlalchemy.orm import raiseload, selectinload
+        from app.models.relations import ArticuloAutor, ArticuloIndexacion
+        
+        catalogos = [
+            selectinload(Articulo.tipo),
+            selectinload(Articulo.proposito),
+            selectinload(Articulo.lgac),
+            selectinload(Articulo.estado),
+        ]
+        autores = selectinload(Articulo.articulo_autores).selectinload(ArticuloAutor.autor)
+        indexaciones = selectinload(Articulo.articulo_indexaciones)\
+            .selectinload(ArticuloIndexacion.indexacion)
+        
+        if perfil == 'listado':
+            return [selectinload(Articulo.tipo), selectinload(Articulo.estado), raiseload('*')]
+        
+        if perfil == 'detalle':
+            return catalogos + [selectinload(Articulo.revista), autores, indexaciones, raiseload('*')]
         
-        if estado_id:
-            articulos = articulos.filter_by(estado_id=estado_id)
+        if perfil == 'exportacion':
+            return [raiseload('*')]
         
-        if lgac_id:
-            articulos = articulos.filter_by(lgac_id=lgac_id)
+        if perfil == 'validacion':
+            return [raiseload('*')]
         
-        if anio:
-            articulos = articulos.filter_by(anio_publicacion=anio)
+        raise ValueError(f"Perfil de carga desconocido: {perfil}")
+    
+    @staticmethod
+    def buscar(filtro=None, **filtros):
+        """
+        Método estático para búsqueda avanzada de artículos.
         
-        if autor_id:
-            articulos = articulos.join(ArticuloAutor)\
-                .filter(ArticuloAutor.autor_id == autor_id)
+        Args:
+            filtro: FiltroArticulos (si se indica, se ignoran los demás argumentos)
+            **filtros: Filtros sueltos (ver FiltroArticulos.desde_dict), ej:
+                query: Texto a buscar en título, revista, descripción o autores
+                tipo_id, estado_id, lgac_id, autor_id, indexacion_id: Un ID o lista de IDs
+                anio: Año de publicación; anio_inicio/anio_fin: rango
+                para_curriculum, completo, con_doi: True/False
         
-        if para_curriculum is not None:
-            articulos = articulos.filter_by(para_curriculum=para_curriculum)
+        Returns:
+            Query de SQLAlchemy (permite agregar más filtros o paginación)
+        """
+        from app.models.filtro_articulos import FiltroArticulos
         
-        return articulos
+        if filtro is None:
+            filtro = FiltroArticulos.desde_dict(filtros)
+        return filtro.aplicar(Articulo.query)
+
+
+@event.listens_for(Articulo.titulo, 'set')
+def _actualizar_huella_titulo(target, value, oldvalue, initiator):
+    target.huella_titulo = huella(value) or None
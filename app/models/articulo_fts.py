@@ -0,0 +1,117 @@
+"""
+Índice de texto completo de artículos (SQLite FTS5).
+Tabla virtual articulos_fts (rowid = articulos.id) sobre título, revista,
+descripción y nombres de autores (autores_display), con tokenizador que
+ignora acentos.
+Se mantiene sincronizada con triggers; la migración la crea en bases
+existentes y db.create_all() la crea en bases nuevas (ej: tests).
+"""
+import re
+
+import sqlalchemy as sa
+from sqlalchemy import event
+
+from app import db
+
+
+# Definición solo para construir consultas: no pertenece a db.metadata
+# porque create_all no sabe crear tablas virtuales
+articulos_fts = sa.Table(
+    'articulos_fts', sa.MetaData(),
+    sa.Column('rowid', sa.Integer, primary_key=True),
+    sa.Column('titulo', sa.Text),
+    sa.Column('titulo_revista', sa.Text),
+    sa.Column('descripcion', sa.Text),
+    sa.Column('autores', sa.Text)
+)
+
+# Pesos bm25 por columna: titulo, titulo_revista, descripcion, autores
+PESOS_BM25 = (10.0, 2.0, 1.0, 5.0)
+
+FTS_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS articulos_fts USING fts5(
+        titulo, titulo_revista, descripcion, autores,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )""",
+
+    # Los autores salen de articulos.autores_display, que se recalcula al
+    # cambiar articulo_autor o el nombre de un autor (ver autores_display.py)
+    """CREATE TRIGGER IF NOT EXISTS articulos_fts_ai AFTER INSERT ON articulos BEGIN
+        INSERT INTO articulos_fts(rowid, titulo, titulo_revista, descripcion, autores)
+        VALUES (new.id, new.titulo, new.titulo_revista, new.descripcion, new.autores_display);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS articulos_fts_au
+    AFTER UPDATE OF titulo, titulo_revista, descripcion, autores_display ON articulos BEGIN
+        DELETE FROM articulos_fts WHERE rowid = old.id;
+        INSERT INTO articulos_fts(rowid, titulo, titulo_revista, descripcion, autores)
+        VALUES (new.id, new.titulo, new.titulo_revista, new.descripcion, new.autores_display);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS articulos_fts_ad AFTER DELETE ON articulos BEGIN
+        DELETE FROM articulos_fts WHERE rowid = old.id;
+    END""",
+]
+
+FTS_RECONSTRUIR = """
+    INSERT INTO articulos_fts(rowid, titulo, titulo_revista, descripcion, autores)
+    SELECT id, titulo, titulo_revista, descripcion, autores_display FROM articulos
+"""
+
+FTS_DROP = [
+    "DROP TRIGGER IF EXISTS articulos_fts_ad",
+    "DROP TRIGGER IF EXISTS articulos_fts_au",
+    "DROP TRIGGER IF EXISTS articulos_fts_ai",
+    "DROP TABLE IF EXISTS articulos_fts",
+]
+
+
+def fts_disponible(bind=None):
+    """Indica si la base de datos actual usa el índice FTS5 (solo SQLite)."""
+    bind = bind or db.session.get_bind()
+    return bind.dialect.name == 'sqlite'
+
+
+def construir_consulta_fts(texto, columnas=None):
+    """
+    Convierte texto libre en una consulta FTS5 segura: cada palabra se
+    busca como prefijo y todas deben aparecer.
+
+    Ejemplo: 'redes "neuronales' -> '"redes"* "neuronales"*'
+
+    Args:
+        texto: Texto libre
+        columnas: Columnas de articulos_fts donde buscar (por omisión, todas)
+
+    Returns:
+        str: Consulta MATCH o None si el texto no tiene palabras
+    """
+    palabras = re.findall(r'\w+', texto or '')
+    if not palabras:
+        return None
+    consulta = ' '.join(f'"{palabra}"*' for palabra in palabras)
+    if columnas:
+        consulta = f"{{{' '.join(columnas)}}} : ({consulta})"
+    return consulta
+
+
+def reconstruir_indice(connection):
+    """Vuelve a llenar articulos_fts desde la tabla de artículos."""
+    connection.exec_driver_sql("DELETE FROM articulos_fts")
+    connection.exec_driver_sql(FTS_RECONSTRUIR)
+
+
+@event.listens_for(db.metadata, 'after_create')
+def _crear_fts(target, connection, **kw):
+    """Crea la tabla virtual y sus triggers junto con las tablas (solo SQLite)."""
+    if not fts_disponible(connection):
+        return
+    for sentencia in FTS_DDL:
+        connection.exec_driver_sql(sentencia)
+
+
+@event.listens_for(db.metadata, 'before_drop')
+def _eliminar_fts(target, connection, **kw):
+    """Elimina la tabla virtual antes de las tablas que indexa (solo SQLite)."""
+    if not fts_disponible(connection):
+        return
+    for sentencia in FTS_DROP:
+        connection.exec_driver_sql(sentencia)
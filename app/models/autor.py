@@ -4,6 +4,7 @@ Representa a los autores de artículos académicos.
 """
 from datetime import datetime
 from app import db
+from app.utils.fonetica import clave_fonetica
 
 
 class Autor(db.Model):
@@ -30,6 +31,9 @@ class Autor(db.Model):
     # Nombre normalizado para búsquedas (sin acentos, minúsculas, sin guiones)
     nombre_normalizado = db.Column(db.String(250), nullable=True, index=True)
     
+    # Clave fonética (Metaphone en español) para agrupar variantes del nombre
+    clave_fonetica = db.Column(db.String(250), nullable=True, index=True)
+    
     # Estado del registro
     activo = db.Column(db.Boolean, nullable=False, default=True)
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
@@ -124,17 +128,41 @@ class Autor(db.Model):
         return None
     
     @staticmethod
-    def buscar_fuzzy(texto_nombre, umbral=80):
+    def buscar_por_clave_fonetica(texto_nombre):
+        """
+        Busca autores activos cuya clave fonética coincide con la del texto.
+        Usa igualdad sobre la columna indexada (sin recorrer la tabla).
+        
+        Ejemplo: "Jiménez Gonsales, María" encuentra a "María Ximénez González"
+        """
+        clave = clave_fonetica(Autor.normalizar_texto(texto_nombre))
+        if not clave:
+            return []
+        
+        return Autor.query.filter_by(activo=True, clave_fonetica=clave).all()
+    
+    @staticmethod
+    def buscar_fuzzy(texto_nombre, umbral=80, candidatos=None, recorrer_catalogo=True):
         """
         Busca autores usando fuzzy matching sobre nombres normalizados.
         Retorna lista de tuplas (autor, score) ordenadas por similitud.
         
+        Primero obtiene candidatos por igualdad de clave fonética (índice).
+        La clave descarta vocales, así que personas distintas pueden
+        compartirla ("Darío Mora" y "Dora Mora"): los candidatos también
+        deben alcanzar el umbral. Solo si ninguno lo alcanza se recorren
+        todos los autores.
+        
         Args:
             texto_nombre: Texto a buscar (cualquier formato)
             umbral: Porcentaje mínimo de similitud (0-100)
+            candidatos: Candidatos fonéticos ya consultados (ej: para un lote
+                con una sola consulta); por omisión se consultan aquí
+            recorrer_catalogo: Si se recorren todos los autores cuando ningún
+                candidato fonético alcanza el umbral
         
         Returns:
-            Lista de tuplas (Autor, score) con score >= umbral
+            Lista de tuplas (Autor, score) ordenadas por score descendente
         """
         try:
             from fuzzywuzzy import fuzz
@@ -145,26 +173,46 @@ class Autor(db.Model):
         # Normalizar el texto de búsqueda
         texto_normalizado = Autor.normalizar_texto(texto_nombre)
         
-        # Obtener todos los autores activos
-        autores = Autor.query.filter_by(activo=True).all()
+        # 1. Candidatos por clave fonética
+        if candidatos is None:
+            candidatos = Autor.buscar_por_clave_fonetica(texto_nombre)
         
         resultados = []
-        for autor in autores:
-            # Calcular similitud con el nombre completo normalizado
+        for autor in candidatos:
             score = fuzz.token_sort_ratio(texto_normalizado, autor.nombre_normalizado or "")
-            
             if score >= umbral:
                 resultados.append((autor, score))
         
+        # 2. Sin candidatos fonéticos que alcancen el umbral: recorrer el catálogo compacto de autores
+        #    activos y cargar como objetos ORM solo los que superan el umbral
+        if not resultados and recorrer_catalogo:
+            from app.services.autor_catalogo import get_autor_catalogo
+            
+            scores = {}
+            for registro in get_autor_catalogo().snapshot():
+                # Calcular similitud con el nombre completo normalizado
+                score = fuzz.token_sort_ratio(texto_normalizado, registro.nombre_normalizado)
+                
+                if score >= umbral:
+                    scores[registro.id] = score
+            
+            if scores:
+                autores = Autor.query.filter(Autor.id.in_(scores)).all()
+                resultados = [(autor, scores[autor.id]) for autor in autores]
+        
         # Ordenar por score descendente
         resultados.sort(key=lambda x: x[1], reverse=True)
         
         return resultados
     
     def actualizar_nombre_normalizado(self):
-        """Actualiza el campo nombre_normalizado basado en nombre y apellidos."""
+        """
+        Actualiza los campos nombre_normalizado y clave_fonetica
+        basados en nombre y apellidos.
+        """
         texto_completo = f"{self.nombre} {self.apellidos}"
         self.nombre_normalizado = self.normalizar_texto(texto_completo)
+        self.clave_fonetica = clave_fonetica(self.nombre_normalizado)
     
     # === Métodos de validación ===
     
@@ -0,0 +1,217 @@
+"""
+Autores desnormalizados de cada artículo.
+articulos.autores_display guarda los nombres de los autores en orden
+("Nombre Apellidos, Nombre Apellidos") y articulos.num_autores su cantidad,
+para que el listado, el índice de texto completo y las exportaciones no
+recorran articulo_autor por cada artículo.
+
+Los eventos de sesión recalculan los artículos afectados después de cada
+flush (cambios en articulo_autor o nombres de autores) con una consulta de
+lectura y un UPDATE por lotes.
+"""
+from collections import defaultdict
+
+from sqlalchemy import bindparam, event, inspect as sa_inspect, select
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.util import identity_key
+
+from app.models.articulo import Articulo
+from app.models.autor import Autor
+from app.models.relations import ArticuloAutor
+
+
+# Columnas del artículo que mantiene este módulo
+COLUMNAS = ('autores_display', 'num_autores')
+
+
+def recalcular_autores(connection, articulo_ids=None, autor_ids=None):
+    """
+    Recalcula autores_display y num_autores.
+    Solo se escriben los artículos cuyo valor cambia, de modo que su
+    updated_at (marca de las exportaciones incrementales) no se mueve por
+    un recálculo que no cambió nada.
+
+    Args:
+        connection: Conexión (se usa su transacción actual)
+        articulo_ids: Artículos a recalcular
+        autor_ids: Autores renombrados (se recalculan todos sus artículos)
+        Si ambos son None se recalculan todos los artículos.
+
+    Returns:
+        int: Número de artículos recalculados
+    """
+    articulos = Articulo.__table__
+    aa = ArticuloAutor.__table__
+    autores = Autor.__table__
+
+    actuales = select(articulos.c.id, articulos.c.autores_display, articulos.c.num_autores)
+    if articulo_ids is None and autor_ids is None:
+        ids = None
+    else:
+        ids = set(articulo_ids or ())
+        if autor_ids:
+            ids.update(connection.execute(
+                select(aa.c.articulo_id).where(aa.c.autor_id.in_(autor_ids))
+            ).scalars())
+        if not ids:
+            return 0
+        actuales = actuales.where(articulos.c.id.in_(ids))
+
+    # Valores guardados: {id: (autores_display, num_autores)}
+    anteriores = {fila.id: (fila.autores_display, fila.num_autores)
+                  for fila in connection.execute(actuales)}
+    if not anteriores:
+        return 0
+    ids = set(anteriores)
+
+    nombres = defaultdict(list)
+    for articulo_id, nombre, apellidos in connection.execute(
+        select(aa.c.articulo_id, autores.c.nombre, autores.c.apellidos)
+        .join(autores, autores.c.id == aa.c.autor_id)
+        .where(aa.c.articulo_id.in_(ids))
+        .order_by(aa.c.articulo_id, aa.c.orden, aa.c.id)
+    ):
+        nombres[articulo_id].append(f"{nombre} {apellidos}".strip())
+
+    cambios = []
+    for articulo_id in sorted(ids):
+        nuevo = (', '.join(nombres[articulo_id]) or None, len(nombres[articulo_id]))
+        if nuevo != anteriores[articulo_id]:
+            cambios.append({'b_id': articulo_id, 'b_display': nuevo[0], 'b_num': nuevo[1]})
+
+    # updated_at se actualiza por el onupdate de la columna
+    if cambios:
+        connection.execute(
+            articulos.update()
+            .where(articulos.c.id == bindparam('b_id'))
+            .values(autores_display=bindparam('b_display'), num_autores=bindparam('b_num')),
+            cambios
+        )
+    return len(ids)
+
+
+def _articulos_de(obj):
+    """IDs de artículo de una relación artículo-autor, antes y después del cambio."""
+    historial = sa_inspect(obj).attrs.articulo_id.history
+    ids = set(historial.deleted or ())
+    if obj.articulo_id is not None:
+        ids.add(obj.articulo_id)
+    return ids
+
+
+def _renombrado(obj):
+    estado = sa_inspect(obj)
+    return any(estado.attrs[atributo].history.has_changes() for atributo in ('nombre', 'apellidos'))
+
+
+# === Eventos de sesión ===
+
+@event.listens_for(Session, 'after_flush')
+def _registrar_cambios_autores(session, flush_context):
+    """Anota los artículos cuyos autores cambiaron (el historial aún está disponible)."""
+    articulo_ids = set()
+    autor_ids = set()
+
+    for obj in list(session.new) + list(session.deleted):
+        if isinstance(obj, ArticuloAutor):
+            articulo_ids.update(_articulos_de(obj))
+
+    for obj in session.dirty:
+        if isinstance(obj, ArticuloAutor) and session.is_modified(obj):
+            articulo_ids.update(_articulos_de(obj))
+        elif isinstance(obj, Autor) and obj not in session.deleted and _renombrado(obj):
+            autor_ids.add(obj.id)
+
+    if articulo_ids or autor_ids:
+        pendientes = session.info.setdefault('autores_pendientes', (set(), set()))
+        pendientes[0].update(articulo_ids)
+        pendientes[1].update(autor_ids)
+
+
+@event.listens_for(Session, 'after_flush_postexec')
+def _recalcular_autores_flush(session, flush_context):
+    """Recalcula los artículos anotados y expira sus valores en memoria."""
+    pendientes = session.info.pop('autores_pendientes', None)
+    if not pendientes:
+        return
+
+    articulo_ids, autor_ids = pendientes
+    recalcular_autores(session.connection(), articulo_ids, autor_ids)
+    _expirar(session, None if autor_ids else articulo_ids)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _recalcular_autores_masivo(orm_execute_state):
+    """
+    UPDATE/DELETE masivos sobre articulo_autor o autores: antes de
+    ejecutarlos se leen los artículos de las filas afectadas y después se
+    recalculan solo esos.
+    """
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+
+    mapper = orm_execute_state.bind_mapper
+    aa = ArticuloAutor.__table__
+    if mapper is None or mapper.local_table not in (aa, Autor.__table__):
+        return
+
+    tabla = mapper.local_table
+    parametros = orm_execute_state.parameters
+    if isinstance(parametros, list):
+        # UPDATE por llave primaria (una fila por diccionario)
+        if tabla is Autor.__table__ and not any(
+            'nombre' in fila or 'apellidos' in fila for fila in parametros
+        ):
+            return
+        filas = select(tabla.c.id).where(tabla.c.id.in_([fila['id'] for fila in parametros]))
+        parametros = {}
+    else:
+        filas = select(tabla.c.id)
+        if orm_execute_state.statement.whereclause is not None:
+            filas = filas.where(orm_execute_state.statement.whereclause)
+
+    session = orm_execute_state.session
+    connection = session.connection()
+    if tabla is aa:
+        relaciones = connection.execute(
+            select(aa.c.id, aa.c.articulo_id).where(aa.c.id.in_(filas)), parametros or {}
+        ).all()
+        relacion_ids = [relacion.id for relacion in relaciones]
+        articulo_ids = {relacion.articulo_id for relacion in relaciones}
+    else:
+        relacion_ids = []
+        articulo_ids = set(connection.execute(
+            select(aa.c.articulo_id).distinct().where(aa.c.autor_id.in_(filas)), parametros or {}
+        ).scalars())
+
+    resultado = orm_execute_state.invoke_statement()
+    if relacion_ids and orm_execute_state.is_update:
+        # Relaciones movidas a otro artículo
+        articulo_ids.update(connection.execute(
+            select(aa.c.articulo_id).where(aa.c.id.in_(relacion_ids))
+        ).scalars())
+    if articulo_ids:
+        recalcular_autores(connection, articulo_ids=articulo_ids)
+        _expirar(session, articulo_ids)
+    return resultado
+
+
+@event.listens_for(Session, 'after_rollback')
+def _descartar_autores_pendientes(session):
+    session.info.pop('autores_pendientes', None)
+
+
+def _expirar(session, articulo_ids):
+    """
+    Expira las columnas recalculadas de los artículos cargados en la sesión:
+    los indicados se buscan por su llave en el identity map; con None, todos.
+    """
+    if articulo_ids is None:
+        articulos = [obj for obj in session.identity_map.values() if isinstance(obj, Articulo)]
+    else:
+        articulos = filter(None, (
+            session.identity_map.get(identity_key(Articulo, articulo_id))
+            for articulo_id in articulo_ids
+        ))
+    for articulo in articulos:
+        session.expire(articulo, COLUMNAS)
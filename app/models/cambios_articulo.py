@@ -0,0 +1,184 @@
+"""
+Seguimiento de cambios de artículos para exportaciones incrementales.
+articulos.updated_at es la marca de cambio: el ORM la actualiza al modificar
+el artículo (incluida la baja lógica) y los eventos de este módulo la
+actualizan cuando cambian sus autores o indexaciones, que viven en otras
+tablas.
+
+Una marca de agua es el par (updated_at, id) del último artículo entregado,
+codificado como token opaco; las exportaciones con ?since= devuelven los
+artículos posteriores a ese par en el índice ix_articulos_cambios.
+"""
+from datetime import datetime, timezone
+
+from sqlalchemy import event, inspect as sa_inspect, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.models.articulo import Articulo
+from app.models.relations import ArticuloAutor, ArticuloIndexacion
+from app.utils.paginacion import CursorInvalido, codificar_cursor, decodificar_cursor
+
+
+# Relaciones cuyo cambio cuenta como cambio del artículo
+RELACIONES = (ArticuloAutor, ArticuloIndexacion)
+_TABLAS_RELACIONES = tuple(modelo.__table__ for modelo in RELACIONES)
+
+
+class MarcaInvalida(ValueError):
+    """La marca de agua no es un token ni una fecha válida."""
+
+
+# === Marcas de agua ===
+
+def codificar_marca(updated_at, articulo_id):
+    """Token opaco de la marca (updated_at, id)."""
+    return codificar_cursor([updated_at, articulo_id])
+
+
+def leer_marca(texto):
+    """
+    Interpreta el parámetro since.
+
+    Args:
+        texto: Token de codificar_marca o fecha ISO 8601 (UTC si no
+            indica zona horaria, ej: 2026-01-01T00:00:00)
+
+    Returns:
+        tuple: (updated_at, id); id es None si se recibió una fecha
+
+    Raises:
+        MarcaInvalida: Si no es un token ni una fecha
+    """
+    texto = (texto or '').strip()
+    try:
+        claves, _ = decodificar_cursor(texto)
+        if len(claves) == 2 and isinstance(claves[0], datetime) and isinstance(claves[1], int):
+            return claves[0], claves[1]
+    except CursorInvalido:
+        pass
+
+    try:
+        fecha = datetime.fromisoformat(texto.replace('Z', '+00:00'))
+    except ValueError:
+        raise MarcaInvalida(f"Marca de agua inválida: {texto}") from None
+
+    # updated_at se guarda en UTC sin zona horaria
+    if fecha.tzinfo is not None:
+        fecha = fecha.astimezone(timezone.utc).replace(tzinfo=None)
+    return fecha, None
+
+
+def cambios_desde(consulta, marca):
+    """
+    Filtra los artículos cambiados después de la marca.
+
+    Args:
+        consulta: Query sobre Articulo
+        marca: (updated_at, id) de leer_marca
+
+    Returns:
+        Query filtrado
+    """
+    fecha, articulo_id = marca
+    if articulo_id is None:
+        return consulta.filter(Articulo.updated_at > fecha)
+    return consulta.filter(tuple_(Articulo.updated_at, Articulo.id) > tuple_(fecha, articulo_id))
+
+
+def ultima_marca(consulta):
+    """
+    Marca del último artículo de la consulta en orden de cambio.
+
+    Returns:
+        str: Token, o None si la consulta no tiene artículos
+    """
+    ultimo = consulta.order_by(None).with_entities(Articulo.updated_at, Articulo.id)\
+        .order_by(Articulo.updated_at.desc(), Articulo.id.desc()).first()
+    return codificar_marca(*ultimo) if ultimo else None
+
+
+# === Marca de cambio ===
+
+def marcar_cambiados(connection, articulo_ids):
+    """Actualiza updated_at de los artículos indicados."""
+    if articulo_ids:
+        tabla = Articulo.__table__
+        connection.execute(
+            tabla.update().where(tabla.c.id.in_(sorted(articulo_ids)))
+            .values(updated_at=datetime.utcnow())
+        )
+
+
+def _articulos_de(obj):
+    """IDs de artículo de una relación, antes y después del cambio."""
+    historial = sa_inspect(obj).attrs.articulo_id.history
+    ids = set(historial.deleted or ())
+    if obj.articulo_id is not None:
+        ids.add(obj.articulo_id)
+    return ids
+
+
+# === Eventos de sesión ===
+
+@event.listens_for(Session, 'after_flush')
+def _registrar_relaciones_cambiadas(session, flush_context):
+    """Anota los artículos cuyas relaciones se escribieron en el flush."""
+    articulo_ids = set()
+    for obj in list(session.new) + list(session.deleted):
+        if isinstance(obj, RELACIONES):
+            articulo_ids.update(_articulos_de(obj))
+
+    for obj in session.dirty:
+        if isinstance(obj, RELACIONES) and session.is_modified(obj):
+            articulo_ids.update(_articulos_de(obj))
+
+    if articulo_ids:
+        session.info.setdefault('articulos_cambiados', set()).update(articulo_ids)
+
+
+@event.listens_for(Session, 'after_flush_postexec')
+def _marcar_articulos_flush(session, flush_context):
+    articulo_ids = session.info.pop('articulos_cambiados', None)
+    if not articulo_ids:
+        return
+
+    marcar_cambiados(session.connection(), articulo_ids)
+    _expirar(session, articulo_ids)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _marcar_articulos_masivo(orm_execute_state):
+    """
+    UPDATE/DELETE masivos sobre relaciones: se marcan antes de ejecutarlos
+    los artículos de las filas afectadas (misma transacción).
+    """
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None or mapper.local_table not in _TABLAS_RELACIONES:
+        return
+
+    tabla = mapper.local_table
+    consulta = select(tabla.c.articulo_id).distinct()
+    if orm_execute_state.statement.whereclause is not None:
+        consulta = consulta.where(orm_execute_state.statement.whereclause)
+
+    session = orm_execute_state.session
+    articulo_ids = set(session.connection().execute(
+        consulta, orm_execute_state.parameters or {}
+    ).scalars())
+    marcar_cambiados(session.connection(), articulo_ids)
+    _expirar(session, articulo_ids)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _descartar_articulos_cambiados(session):
+    session.info.pop('articulos_cambiados', None)
+
+
+def _expirar(session, articulo_ids):
+    """Expira updated_at de los artículos marcados que están en la sesión."""
+    for obj in list(session.identity_map.values()):
+        if isinstance(obj, Articulo) and obj.id in articulo_ids:
+            session.expire(obj, ['updated_at'])
@@ -0,0 +1,228 @@
+"""
+Estadísticas agregadas de artículos (dashboard).
+La tabla estadisticas_agregadas guarda conteos de artículos activos por
+dimensión (total, para currículum, tipo, estado, año). Los eventos de sesión
+aplican la diferencia de cada artículo insertado, modificado o eliminado en
+la misma transacción, de modo que el dashboard lee una sola tabla pequeña.
+`flask rebuild-stats` la recalcula desde cero.
+"""
+from collections import Counter
+from datetime import datetime
+
+from sqlalchemy import event, func, inspect as sa_inspect, select
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models.articulo import Articulo
+
+
+class EstadisticaAgregada(db.Model):
+    """
+    Conteo de artículos activos en una dimensión.
+    No es un catálogo editable: lo mantienen los eventos de sesión.
+
+    Dimensiones:
+        total, para_curriculum: valor = 0
+        tipo, estado: valor = ID del catálogo
+        anio: valor = año de publicación
+    """
+    __tablename__ = 'estadisticas_agregadas'
+
+    dimension = db.Column(db.String(20), primary_key=True)
+    valor = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    cantidad = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<EstadisticaAgregada {self.dimension}:{self.valor}={self.cantidad}>'
+
+    @staticmethod
+    def obtener():
+        """
+        Lee todas las estadísticas con una sola consulta.
+
+        Returns:
+            dict: {dimension: {valor: cantidad}} (solo cantidades positivas)
+        """
+        tabla = EstadisticaAgregada.__table__
+        resultado = {}
+        for dimension, valor, cantidad in db.session.execute(
+            select(tabla.c.dimension, tabla.c.valor, tabla.c.cantidad)
+            .where(tabla.c.cantidad > 0)
+        ):
+            resultado.setdefault(dimension, {})[valor] = cantidad
+        return resultado
+
+    @staticmethod
+    def aplicar(connection, deltas):
+        """
+        Suma las diferencias a los conteos en la transacción actual.
+
+        Args:
+            connection: Conexión de la sesión (misma transacción que los cambios)
+            deltas: Counter {(dimension, valor): diferencia}
+        """
+        tabla = EstadisticaAgregada.__table__
+        ahora = datetime.utcnow()
+
+        for (dimension, valor), diferencia in sorted(deltas.items()):
+            if not diferencia:
+                continue
+            resultado = connection.execute(
+                tabla.update()
+                .where(tabla.c.dimension == dimension, tabla.c.valor == valor)
+                .values(cantidad=tabla.c.cantidad + diferencia, updated_at=ahora)
+            )
+            if resultado.rowcount == 0:
+                connection.execute(
+                    tabla.insert().values(dimension=dimension, valor=valor,
+                                          cantidad=diferencia, updated_at=ahora)
+                )
+
+    @staticmethod
+    def reconstruir(connection):
+        """
+        Recalcula todas las estadísticas desde la tabla de artículos.
+
+        Args:
+            connection: Conexión (se usa su transacción actual)
+
+        Returns:
+            int: Número de artículos activos
+        """
+        articulos = Articulo.__table__
+        activos = articulos.c.activo == True
+
+        deltas = Counter()
+        total, para_curriculum = connection.execute(
+            select(
+                func.count(),
+                func.count().filter(articulos.c.para_curriculum == True)
+            ).where(activos)
+        ).one()
+        deltas[('total', 0)] = total
+        deltas[('para_curriculum', 0)] = para_curriculum
+
+        for dimension, columna in _COLUMNAS.items():
+            for valor, cantidad in connection.execute(
+                select(articulos.c[columna], func.count())
+                .where(activos, articulos.c[columna].isnot(None))
+                .group_by(articulos.c[columna])
+            ):
+                deltas[(dimension, valor)] = cantidad
+
+        connection.execute(EstadisticaAgregada.__table__.delete())
+        EstadisticaAgregada.aplicar(connection, deltas)
+        return total
+
+
+# Dimensiones por columna del artículo
+_COLUMNAS = {
+    'tipo': 'tipo_produccion_id',
+    'estado': 'estado_id',
+    'anio': 'anio_publicacion',
+}
+
+# Atributos de los que dependen las estadísticas
+_ATRIBUTOS = ('activo', 'para_curriculum') + tuple(_COLUMNAS.values())
+
+
+def _claves(valores):
+    """Dimensiones a las que cuenta un artículo con esos valores."""
+    if not valores['activo']:
+        return []
+
+    claves = [('total', 0)]
+    if valores['para_curriculum']:
+        claves.append(('para_curriculum', 0))
+    for dimension, columna in _COLUMNAS.items():
+        if valores[columna] is not None:
+            claves.append((dimension, valores[columna]))
+    return claves
+
+
+def _valores_actuales(obj):
+    return {atributo: getattr(obj, atributo) for atributo in _ATRIBUTOS}
+
+
+def _valores_anteriores(obj):
+    """Valores antes de los cambios pendientes (según el historial de atributos)."""
+    estado = sa_inspect(obj)
+    valores = {}
+    for atributo in _ATRIBUTOS:
+        # Carga el valor si estaba expirado (no altera el historial)
+        getattr(obj, atributo)
+        historial = estado.attrs[atributo].history
+        valores[atributo] = (historial.deleted or historial.unchanged or historial.added)[0]
+    return valores
+
+
+def _tiene_cambios(obj):
+    estado = sa_inspect(obj)
+    return any(estado.attrs[atributo].history.has_changes() for atributo in _ATRIBUTOS)
+
+
+# === Eventos de sesión ===
+
+def _cargar_valor_anterior(target, value, oldvalue, initiator):
+    """Con active_history el valor anterior se carga antes de reemplazarlo."""
+
+
+for _atributo in _ATRIBUTOS:
+    event.listen(getattr(Articulo, _atributo), 'set', _cargar_valor_anterior, active_history=True)
+
+
+@event.listens_for(Session, 'before_flush')
+def _calcular_cambios_estadisticas(session, flush_context, instances):
+    """
+    Calcula la diferencia de los artículos modificados o eliminados mientras
+    sus valores anteriores todavía se pueden cargar.
+    """
+    deltas = Counter()
+
+    for obj in session.dirty:
+        if isinstance(obj, Articulo) and obj not in session.deleted and _tiene_cambios(obj):
+            deltas.subtract(_claves(_valores_anteriores(obj)))
+            deltas.update(_claves(_valores_actuales(obj)))
+
+    for obj in session.deleted:
+        if isinstance(obj, Articulo):
+            deltas.subtract(_claves(_valores_anteriores(obj)))
+
+    if deltas:
+        session.info.setdefault('estadisticas_deltas', Counter()).update(deltas)
+
+
+@event.listens_for(Session, 'after_flush')
+def _actualizar_estadisticas(session, flush_context):
+    """Aplica la diferencia de los artículos escritos en el flush."""
+    deltas = session.info.pop('estadisticas_deltas', Counter())
+
+    # Los nuevos se cuentan aquí: los valores por defecto se asignan en el flush
+    for obj in session.new:
+        if isinstance(obj, Articulo):
+            deltas.update(_claves(_valores_actuales(obj)))
+
+    if any(deltas.values()):
+        EstadisticaAgregada.aplicar(session.connection(), deltas)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _reconstruir_estadisticas_masivo(orm_execute_state):
+    """UPDATE/DELETE masivos sobre artículos: no se sabe qué filas cambiaron."""
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None or mapper.local_table is not Articulo.__table__:
+        return
+
+    resultado = orm_execute_state.invoke_statement()
+    EstadisticaAgregada.reconstruir(orm_execute_state.session.connection())
+    return resultado
+
+
+@event.listens_for(Session, 'after_rollback')
+def _descartar_cambios_estadisticas(session):
+    """Las diferencias de un flush revertido no se aplican."""
+    session.info.pop('estadisticas_deltas', None)
@@ -0,0 +1,274 @@
+"""
+Especificación de filtros de artículos.
+Un solo objeto describe los filtros del listado, la exportación, la vista
+previa y las facetas, y los traduce a SQL que usa los índices de
+artículos (igualdad o IN sobre columnas indexadas, rangos de años y
+semi-joins con IN (SELECT ...) en lugar de JOINs que duplican filas).
+"""
+from app import db
+from app.models.articulo import Articulo
+
+
+# Valores de texto aceptados para filtros booleanos en la URL
+_VERDADEROS = ('1', 'true', 'si', 'sí', 'on', 'yes')
+_FALSOS = ('0', 'false', 'no', 'off')
+
+# Filtros de listas: atributo -> (parámetro de URL, nombres aceptados en diccionarios)
+_LISTAS = {
+    'tipo_ids': ('tipo_id', ('tipo_id', 'tipo_ids', 'tipo_produccion_id')),
+    'estado_ids': ('estado_id', ('estado_id', 'estado_ids')),
+    'lgac_ids': ('lgac_id', ('lgac_id', 'lgac_ids')),
+    'autor_ids': ('autor_id', ('autor_id', 'autor_ids')),
+    'indexacion_ids': ('indexacion_id', ('indexacion_id', 'indexacion_ids')),
+}
+
+_BOOLEANOS = ('para_curriculum', 'completo', 'con_doi')
+
+
+def _lista_ids(valor):
+    """Convierte un ID, una lista de IDs o '1,2' a una tupla ordenada sin repetidos."""
+    if valor is None or valor == '':
+        return ()
+    if isinstance(valor, (list, tuple, set, frozenset)):
+        valores = valor
+    else:
+        valores = str(valor).split(',')
+
+    ids = set()
+    for item in valores:
+        try:
+            ids.add(int(item))
+        except (TypeError, ValueError):
+            continue
+    return tuple(sorted(ids))
+
+
+def _entero(valor):
+    try:
+        return int(valor) if valor not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _booleano(valor):
+    if valor is None or isinstance(valor, bool):
+        return valor
+    texto = str(valor).strip().lower()
+    if texto in _VERDADEROS:
+        return True
+    if texto in _FALSOS:
+        return False
+    return None
+
+
+class FiltroArticulos:
+    """
+    Filtros de una consulta de artículos.
+
+    Atributos:
+        query: Texto libre (FTS5 / nombres de autores)
+        tipo_ids, estado_ids, lgac_ids, autor_ids, indexacion_ids: Tuplas de IDs
+        anio_inicio, anio_fin: Rango de años de publicación (inclusivo)
+        para_curriculum, completo, con_doi: True/False/None (None = sin filtro)
+        activo: True (solo activos, por defecto), False (solo inactivos) o None
+    """
+
+    CAMPOS = ('query', 'tipo_ids', 'estado_ids', 'lgac_ids', 'autor_ids', 'indexacion_ids',
+              'anio_inicio', 'anio_fin', 'para_curriculum', 'completo', 'con_doi', 'activo')
+
+    def __init__(self, query=None, tipo_ids=(), estado_ids=(), lgac_ids=(), autor_ids=(),
+                 indexacion_ids=(), anio_inicio=None, anio_fin=None, para_curriculum=None,
+                 completo=None, con_doi=None, activo=True):
+        self.query = (query or '').strip() or None
+        self.tipo_ids = _lista_ids(tipo_ids)
+        self.estado_ids = _lista_ids(estado_ids)
+        self.lgac_ids = _lista_ids(lgac_ids)
+        self.autor_ids = _lista_ids(autor_ids)
+        self.indexacion_ids = _lista_ids(indexacion_ids)
+        self.anio_inicio = _entero(anio_inicio)
+        self.anio_fin = _entero(anio_fin)
+        self.para_curriculum = _booleano(para_curriculum)
+        self.completo = _booleano(completo)
+        self.con_doi = _booleano(con_doi)
+        self.activo = _booleano(activo)
+
+    def __repr__(self):
+        return f'<FiltroArticulos {self.a_params()}>'
+
+    def __eq__(self, otro):
+        return isinstance(otro, FiltroArticulos) and self.clave() == otro.clave()
+
+    def __hash__(self):
+        return hash(self.clave())
+
+    # === Construcción ===
+
+    @classmethod
+    def desde_dict(cls, datos):
+        """
+        Crea el filtro desde un diccionario de filtros (nombres de
+        Articulo.buscar o de la exportación).
+
+        Acepta: query/search, tipo_id/tipo_produccion_id, estado_id, lgac_id,
+        autor_id, indexacion_id (un ID o lista), anio (un año), anio_inicio,
+        anio_fin, para_curriculum, completo, con_doi y activo.
+        """
+        datos = dict(datos or {})
+        kwargs = {'query': datos.get('query') or datos.get('search')}
+
+        for atributo, (_, nombres) in _LISTAS.items():
+            ids = set()
+            for nombre in nombres:
+                ids.update(_lista_ids(datos.get(nombre)))
+            kwargs[atributo] = ids
+
+        anio = _entero(datos.get('anio'))
+        kwargs['anio_inicio'] = anio if anio is not None else datos.get('anio_inicio')
+        kwargs['anio_fin'] = anio if anio is not None else datos.get('anio_fin')
+
+        for nombre in _BOOLEANOS:
+            kwargs[nombre] = datos.get(nombre)
+        if 'activo' in datos:
+            kwargs['activo'] = datos['activo']
+
+        return cls(**kwargs)
+
+    @classmethod
+    def desde_args(cls, args):
+        """
+        Crea el filtro desde los parámetros de una URL (request.args).
+        Las listas se aceptan repetidas (?tipo_id=1&tipo_id=2) o separadas
+        por comas (?tipo_id=1,2). Siempre filtra artículos activos.
+        """
+        datos = {'query': args.get('query', '')}
+        for parametro, _ in _LISTAS.values():
+            datos[parametro] = [parte for valor in args.getlist(parametro) for parte in valor.split(',')]
+        for nombre in ('anio', 'anio_inicio', 'anio_fin') + _BOOLEANOS:
+            datos[nombre] = args.get(nombre)
+        return cls.desde_dict(datos)
+
+    @classmethod
+    def desde(cls, filtros):
+        """Acepta un FiltroArticulos, un diccionario de filtros o None."""
+        if isinstance(filtros, FiltroArticulos):
+            return filtros
+        return cls.desde_dict(filtros)
+
+    def con(self, **cambios):
+        """Copia del filtro con los campos indicados reemplazados."""
+        valores = {campo: getattr(self, campo) for campo in self.CAMPOS}
+        valores.update(cambios)
+        return FiltroArticulos(**valores)
+
+    # === Representación ===
+
+    def clave(self):
+        """Tupla inmutable con todos los filtros (para claves de caché)."""
+        return tuple(getattr(self, campo) for campo in self.CAMPOS)
+
+    def a_params(self):
+        """
+        Parámetros de URL equivalentes (sin valores vacíos), para enlaces
+        de paginación y facetas.
+        """
+        params = {}
+        if self.query:
+            params['query'] = self.query
+
+        for atributo, (parametro, _) in _LISTAS.items():
+            ids = getattr(self, atributo)
+            if ids:
+                params[parametro] = ids[0] if len(ids) == 1 else list(ids)
+
+        if self.anio_inicio is not None and self.anio_inicio == self.anio_fin:
+            params['anio'] = self.anio_inicio
+        else:
+            if self.anio_inicio is not None:
+                params['anio_inicio'] = self.anio_inicio
+            if self.anio_fin is not None:
+                params['anio_fin'] = self.anio_fin
+
+        for nombre in _BOOLEANOS:
+            valor = getattr(self, nombre)
+            if valor is not None:
+                params[nombre] = '1' if valor else '0'
+
+        return params
+
+    # === SQL ===
+
+    def aplicar(self, consulta):
+        """
+        Aplica los filtros a una consulta sobre Articulo (Query u otra
+        consulta con columnas de Articulo).
+
+        Un solo ID se compara con igualdad y varios con IN, de modo que los
+        índices parciales (activo = 1) sirven en ambos casos; la búsqueda
+        por texto se aplica al final porque agrega el JOIN con articulos_fts.
+
+        Returns:
+            Query filtrado (sin ordenar, salvo el orden por relevancia)
+        """
+        from app.models.relations import ArticuloAutor, ArticuloIndexacion, RevistaIndexacion
+
+        if self.activo is not None:
+            consulta = consulta.filter(Articulo.activo == self.activo)
+
+        for columna, ids in (
+            (Articulo.tipo_produccion_id, self.tipo_ids),
+            (Articulo.estado_id, self.estado_ids),
+            (Articulo.lgac_id, self.lgac_ids),
+        ):
+            if ids:
+                consulta = consulta.filter(_en(columna, ids))
+
+        if self.anio_inicio is not None and self.anio_inicio == self.anio_fin:
+            consulta = consulta.filter(Articulo.anio_publicacion == self.anio_inicio)
+        else:
+            if self.anio_inicio is not None:
+                consulta = consulta.filter(Articulo.anio_publicacion >= self.anio_inicio)
+            if self.anio_fin is not None:
+                consulta = consulta.filter(Articulo.anio_publicacion <= self.anio_fin)
+
+        # Semi-joins: ix_articulo_autor_autor resuelve los artículos de los autores
+        if self.autor_ids:
+            consulta = consulta.filter(Articulo.id.in_(
+                db.select(ArticuloAutor.articulo_id)
+                .where(_en(ArticuloAutor.autor_id, self.autor_ids))
+            ))
+
+        # Indexación propia del artículo o de su revista
+        if self.indexacion_ids:
+            consulta = consulta.filter(db.or_(
+                Articulo.id.in_(
+                    db.select(ArticuloIndexacion.articulo_id)
+                    .where(_en(ArticuloIndexacion.indexacion_id, self.indexacion_ids))
+                ),
+                Articulo.revista_id.in_(
+                    db.select(RevistaIndexacion.revista_id)
+                    .where(_en(RevistaIndexacion.indexacion_id, self.indexacion_ids),
+                           RevistaIndexacion.activo == True)
+                )
+            ))
+
+        if self.para_curriculum is not None:
+            consulta = consulta.filter(Articulo.para_curriculum == self.para_curriculum)
+
+        if self.completo is not None:
+            consulta = consulta.filter(Articulo.completo == self.completo)
+
+        if self.con_doi is True:
+            consulta = consulta.filter(Articulo.doi.isnot(None), Articulo.doi != '')
+        elif self.con_doi is False:
+            consulta = consulta.filter(db.or_(Articulo.doi.is_(None), Articulo.doi == ''))
+
+        # Al final: filter_by() posteriores se resolverían contra articulos_fts
+        if self.query:
+            consulta = Articulo.filtrar_texto(consulta, self.query)
+
+        return consulta
+
+
+def _en(columna, ids):
+    """Igualdad para un ID; IN (parámetro expandible, mismo SQL en caché) para varios."""
+    return columna == ids[0] if len(ids) == 1 else columna.in_(ids)
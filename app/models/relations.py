@@ -27,13 +27,14 @@ class ArticuloAutor(db.Model):
     
     # Relaciones
     articulo = db.relationship('Articulo', backref=db.backref('articulo_autores', 
-                                                               lazy='dynamic',
                                                                order_by='ArticuloAutor.orden'))
-    autor = db.relationship('Autor', backref=db.backref('articulo_autores', lazy='dynamic'))
+    autor = db.relationship('Autor', backref=db.backref('articulo_autores'))
     
-    # Constraint único para evitar duplicados
+    # Constraint único para evitar duplicados (también sirve como índice por articulo_id)
     __table_args__ = (
         db.UniqueConstraint('articulo_id', 'autor_id', name='uq_articulo_autor'),
+        # Artículos de un autor
+        db.Index('ix_articulo_autor_autor', 'autor_id', 'articulo_id'),
     )
     
     def __repr__(self):
@@ -60,8 +61,7 @@ class RevistaIndexacion(db.Model):
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     
     # Relaciones
-    revista = db.relationship('Revista', backref=db.backref('revista_indexaciones', 
-                                                             lazy='dynamic'))
+    revista = db.relationship('Revista', backref=db.backref('revista_indexaciones'))
     indexacion = db.relationship('Indexacion', backref=db.backref('revista_indexaciones', 
                                                                     lazy='dynamic'))
     
@@ -92,8 +92,7 @@ class ArticuloIndexacion(db.Model):
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     
     # Relaciones
-    articulo = db.relationship('Articulo', backref=db.backref('articulo_indexaciones', 
-                                                               lazy='dynamic'))
+    articulo = db.relationship('Articulo', backref=db.backref('articulo_indexaciones'))
     indexacion = db.relationship('Indexacion', backref=db.backref('articulo_indexaciones', 
                                                                     lazy='dynamic'))
     
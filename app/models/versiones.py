@@ -0,0 +1,171 @@
+"""
+Versiones de datos por tabla.
+Cada commit que modifica una tabla incrementa su versión en la misma
+transacción; los cachés en memoria (catálogos, índice de autores) comparan
+su versión con esta tabla para saber si deben recargarse, de modo que
+todos los procesos ven los cambios sin servir datos obsoletos.
+"""
+from collections import Counter
+from datetime import datetime
+
+from flask import g, has_app_context, has_request_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import db
+
+
+class VersionTabla(db.Model):
+    """
+    Contador de versión de una tabla de datos.
+    No es un catálogo editable: lo mantienen los eventos de sesión.
+    """
+    __tablename__ = 'versiones_tabla'
+
+    tabla = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<VersionTabla {self.tabla}={self.version}>'
+
+    @staticmethod
+    def obtener_todas():
+        """
+        Obtiene la versión de todas las tablas con una sola consulta.
+        Dentro de una petición el resultado se reutiliza (flask.g)
+        hasta que la sesión confirme nuevos cambios.
+
+        Returns:
+            dict: {nombre_tabla: version} (las tablas sin registro no aparecen)
+        """
+        if has_request_context() and '_versiones_tabla' in g:
+            return g._versiones_tabla
+
+        tabla = VersionTabla.__table__
+        versiones = dict(
+            db.session.execute(db.select(tabla.c.tabla, tabla.c.version)).all()
+        )
+
+        if has_request_context():
+            g._versiones_tabla = versiones
+
+        return versiones
+
+    @staticmethod
+    def obtener(nombre_tabla):
+        """
+        Obtiene la versión actual de una tabla.
+
+        Returns:
+            int: Versión (0 si la tabla nunca se ha modificado)
+        """
+        return VersionTabla.obtener_todas().get(nombre_tabla, 0)
+
+    @staticmethod
+    def incrementar(connection, tablas):
+        """
+        Incrementa la versión de las tablas indicadas en la transacción actual.
+
+        Args:
+            connection: Conexión de la sesión (misma transacción que los cambios)
+            tablas: Nombres de las tablas modificadas
+        """
+        tabla = VersionTabla.__table__
+        ahora = datetime.utcnow()
+
+        for nombre in sorted(tablas):
+            resultado = connection.execute(
+                tabla.update()
+                .where(tabla.c.tabla == nombre)
+                .values(version=tabla.c.version + 1, updated_at=ahora)
+            )
+            if resultado.rowcount == 0:
+                connection.execute(
+                    tabla.insert().values(tabla=nombre, version=1, updated_at=ahora)
+                )
+
+
+# === Eventos de sesión ===
+
+# Funciones a llamar después de cada commit (ver al_confirmar)
+_al_confirmar = []
+
+
+def al_confirmar(funcion):
+    """
+    Registra una función que se llama después de cada commit que modificó
+    tablas, con la sesión y un Counter {tabla: incrementos de versión}.
+    Permite a los cachés del proceso aplicar sus propios cambios sin
+    recargar todo.
+    Se puede usar como decorador.
+    """
+    _al_confirmar.append(funcion)
+    return funcion
+
+
+def _tabla_de(obj):
+    """Nombre de la tabla de una instancia mapeada (None si no es un modelo)."""
+    tabla = getattr(obj, '__table__', None)
+    if tabla is None or tabla.name == VersionTabla.__tablename__:
+        return None
+    return tabla.name
+
+
+def _registrar_tablas(session, tablas):
+    """Incrementa las versiones y las anota en la sesión hasta el commit."""
+    if not tablas:
+        return
+    VersionTabla.incrementar(session.connection(), tablas)
+    session.info.setdefault('tablas_modificadas', Counter()).update(tablas)
+
+
+@event.listens_for(Session, 'after_flush')
+def _versionar_flush(session, flush_context):
+    """Incrementa la versión de las tablas escritas en el flush."""
+    tablas = set()
+
+    for obj in list(session.new) + list(session.deleted):
+        tablas.add(_tabla_de(obj))
+
+    for obj in session.dirty:
+        if session.is_modified(obj, include_collections=False):
+            tablas.add(_tabla_de(obj))
+
+    tablas.discard(None)
+    _registrar_tablas(session, tablas)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _versionar_masivo(orm_execute_state):
+    """Incrementa la versión en UPDATE/DELETE masivos (query.update()/delete())."""
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None:
+        return
+
+    nombre = mapper.local_table.name
+    if nombre != VersionTabla.__tablename__:
+        _registrar_tablas(orm_execute_state.session, {nombre})
+
+
+@event.listens_for(Session, 'after_commit')
+def _versiones_confirmadas(session):
+    """Descarta las versiones leídas en la petición para releerlas."""
+    incrementos = session.info.pop('tablas_modificadas', None)
+    if not incrementos:
+        return
+
+    if has_app_context():
+        g.pop('_versiones_tabla', None)
+
+    for funcion in _al_confirmar:
+        funcion(session, incrementos)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _versiones_revertidas(session):
+    """Los incrementos revertidos no cuentan."""
+    session.info.pop('tablas_modificadas', None)
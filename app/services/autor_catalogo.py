@@ -0,0 +1,284 @@
+"""
+Catálogo compacto de autores en memoria (modelo de lectura).
+Guarda solo lo que necesitan el fuzzy matching, la detección de duplicados
+y el autocompletado: registros con __slots__ cargados con un solo SELECT
+de Core, sin objetos ORM ni identity map.
+
+Las instantáneas son inmutables y se comparten entre threads; los cambios
+confirmados por este proceso se aplican como parche (solo los autores
+modificados) y los de otros procesos se detectan por versiones_tabla.
+"""
+import logging
+import threading
+from collections import Counter
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, func, inspect as sa_inspect, select
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models.autor import Autor
+from app.models.relations import ArticuloAutor
+from app.models.versiones import VersionTabla, al_confirmar
+
+logger = logging.getLogger(__name__)
+
+
+class AutorRegistro:
+    """Datos mínimos de un autor activo."""
+
+    __slots__ = ('id', 'nombre_completo', 'nombre_normalizado', 'clave_fonetica',
+                 'orcid', 'email', 'num_articulos')
+
+    def __init__(self, id, nombre_completo, nombre_normalizado, clave_fonetica,
+                 orcid, email, num_articulos):
+        self.id = id
+        self.nombre_completo = nombre_completo
+        self.nombre_normalizado = nombre_normalizado
+        self.clave_fonetica = clave_fonetica
+        self.orcid = orcid
+        self.email = email
+        self.num_articulos = num_articulos
+
+    def __repr__(self):
+        return f'<AutorRegistro {self.id} {self.nombre_completo}>'
+
+
+class AutorSnapshot:
+    """
+    Instantánea inmutable de los autores activos.
+    Se recorre con `for registro in snapshot` y se consulta con get(id).
+    """
+
+    __slots__ = ('version', 'registros', 'por_clave')
+
+    def __init__(self, version, registros):
+        self.version = version      # (versión autores, versión articulo_autor)
+        self.registros = registros  # autor_id -> AutorRegistro
+
+        por_clave = {}
+        for registro in registros.values():
+            if registro.clave_fonetica:
+                por_clave.setdefault(registro.clave_fonetica, []).append(registro.id)
+        self.por_clave = por_clave
+
+    def __len__(self):
+        return len(self.registros)
+
+    def __iter__(self):
+        return iter(self.registros.values())
+
+    def get(self, autor_id):
+        """Registro del autor o None si no existe o está inactivo."""
+        return self.registros.get(autor_id)
+
+    def con_cambios(self, version, actualizados, ids_revisados):
+        """
+        Crea una nueva instantánea con los registros actualizados.
+        Los IDs revisados que no aparecen en `actualizados` se eliminan
+        (autor borrado o desactivado).
+        """
+        registros = dict(self.registros)
+        for autor_id in ids_revisados:
+            registros.pop(autor_id, None)
+        for registro in actualizados:
+            registros[registro.id] = registro
+        return AutorSnapshot(version, registros)
+
+
+class AutorCatalogo:
+    """
+    Mantiene la instantánea vigente de autores para una aplicación.
+    """
+
+    TABLAS = (Autor.__tablename__, ArticuloAutor.__tablename__)
+
+    def __init__(self):
+        """Inicializa el catálogo vacío; se carga en el primer uso."""
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._pendientes = set()          # IDs modificados por commits de este proceso
+        self._incrementos = Counter()     # Incrementos de versión de esos commits
+        self._recarga_completa = False
+
+    def _version_actual(self):
+        versiones = VersionTabla.obtener_todas()
+        return tuple(versiones.get(tabla, 0) for tabla in self.TABLAS)
+
+    @staticmethod
+    def _cargar(ids=None):
+        """
+        Carga registros con un solo SELECT (autores activos + número de artículos).
+
+        Args:
+            ids: Si se indica, solo esos autores
+
+        Returns:
+            list: Lista de AutorRegistro
+        """
+        autores = Autor.__table__
+        relaciones = ArticuloAutor.__table__
+
+        conteo = select(
+            relaciones.c.autor_id,
+            func.count().label('num_articulos')
+        ).group_by(relaciones.c.autor_id)
+        if ids is not None:
+            conteo = conteo.where(relaciones.c.autor_id.in_(ids))
+        conteo = conteo.subquery()
+
+        consulta = select(
+            autores.c.id,
+            autores.c.nombre,
+            autores.c.apellidos,
+            autores.c.nombre_normalizado,
+            autores.c.clave_fonetica,
+            autores.c.orcid,
+            autores.c.email,
+            func.coalesce(conteo.c.num_articulos, 0)
+        ).outerjoin(
+            conteo, conteo.c.autor_id == autores.c.id
+        ).where(autores.c.activo == True)
+        if ids is not None:
+            consulta = consulta.where(autores.c.id.in_(ids))
+
+        return [
+            AutorRegistro(
+                autor_id,
+                f"{nombre} {apellidos}",
+                normalizado or Autor.normalizar_texto(f"{nombre} {apellidos}"),
+                clave,
+                orcid,
+                email,
+                num_articulos
+            )
+            for autor_id, nombre, apellidos, normalizado, clave, orcid, email, num_articulos
+            in db.session.execute(consulta)
+        ]
+
+    def snapshot(self):
+        """
+        Obtiene la instantánea vigente.
+        Si solo cambió por commits de este proceso se parchean los autores
+        modificados; si hubo cambios de otro proceso se recarga completa.
+
+        Returns:
+            AutorSnapshot
+        """
+        version = self._version_actual()
+        actual = self._snapshot
+        if actual is not None and actual.version == version and not self._pendientes \
+                and not self._recarga_completa:
+            return actual
+
+        with self._lock:
+            actual = self._snapshot
+            pendientes = self._pendientes
+            esperada = None
+            if actual is not None:
+                esperada = tuple(
+                    v + self._incrementos[tabla]
+                    for v, tabla in zip(actual.version, self.TABLAS)
+                )
+
+            if actual is not None and not self._recarga_completa and esperada == version:
+                if pendientes:
+                    actual = actual.con_cambios(version, self._cargar(pendientes), pendientes)
+                elif actual.version != version:
+                    actual = AutorSnapshot(version, actual.registros)
+                logger.debug(f"Catálogo de autores parcheado: {len(pendientes)} autores")
+            else:
+                actual = AutorSnapshot(
+                    version, {registro.id: registro for registro in self._cargar()}
+                )
+                logger.info(f"Catálogo de autores cargado: {len(actual)} autores")
+
+            self._snapshot = actual
+            self._pendientes = set()
+            self._incrementos = Counter()
+            self._recarga_completa = False
+
+        return actual
+
+    def registrar_cambios(self, incrementos, ids, completa=False):
+        """
+        Anota cambios confirmados por este proceso para aplicarlos en
+        la siguiente lectura.
+
+        Args:
+            incrementos: Counter de incrementos de versión por tabla
+            ids: IDs de autores modificados
+            completa: Si True, la siguiente lectura recarga todo
+        """
+        with self._lock:
+            for tabla in self.TABLAS:
+                self._incrementos[tabla] += incrementos.get(tabla, 0)
+            self._pendientes |= ids
+            if completa:
+                self._recarga_completa = True
+
+    def invalidar(self):
+        """Fuerza una recarga completa en la siguiente lectura."""
+        with self._lock:
+            self._recarga_completa = True
+
+
+def get_autor_catalogo():
+    """
+    Obtiene el catálogo de autores de la aplicación actual.
+
+    Returns:
+        AutorCatalogo
+    """
+    return current_app.extensions.setdefault('autor_catalogo', AutorCatalogo())
+
+
+# === Seguimiento de autores modificados ===
+
+@event.listens_for(Session, 'after_flush')
+def _registrar_autores_modificados(session, flush_context):
+    """Anota los IDs de autores escritos (o cuyos artículos cambiaron)."""
+    ids = set()
+
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Autor):
+            ids.add(obj.id)
+        elif isinstance(obj, ArticuloAutor):
+            ids.add(obj.autor_id)
+            # Relación reasignada a otro autor (ej: fusión de autores)
+            ids.update(sa_inspect(obj).attrs.autor_id.history.deleted or ())
+
+    ids.discard(None)
+    if ids:
+        session.info.setdefault('autores_modificados', set()).update(ids)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _registrar_autores_masivo(orm_execute_state):
+    """UPDATE/DELETE masivos sobre autores: no se sabe qué filas cambiaron."""
+    if orm_execute_state.is_update or orm_execute_state.is_delete:
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None and mapper.local_table.name in AutorCatalogo.TABLAS:
+            orm_execute_state.session.info['autores_recarga_completa'] = True
+
+
+@al_confirmar
+def _aplicar_autores_confirmados(session, incrementos):
+    """Pasa los cambios confirmados al catálogo de la aplicación."""
+    ids = session.info.pop('autores_modificados', set())
+    completa = session.info.pop('autores_recarga_completa', False)
+
+    if not any(incrementos.get(tabla) for tabla in AutorCatalogo.TABLAS):
+        return
+
+    if has_app_context():
+        catalogo = current_app.extensions.get('autor_catalogo')
+        if catalogo is not None:
+            catalogo.registrar_cambios(incrementos, ids, completa)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _descartar_autores_modificados(session):
+    """Los cambios revertidos no se aplican."""
+    session.info.pop('autores_modificados', None)
+    session.info.pop('autores_recarga_completa', None)
@@ -0,0 +1,180 @@
+"""
+Índice en memoria de prefijos sobre nombres de autores.
+Sirve el autocompletado de autores sin recorrer la tabla en cada petición.
+Se construye sobre el catálogo compacto de autores y se reconstruye
+cuando este cambia (ver app.services.autor_catalogo).
+"""
+import bisect
+import logging
+import re
+import threading
+from typing import Dict, List, Set, Tuple
+
+from flask import current_app
+
+from app.models.autor import Autor
+from app.services.autor_catalogo import get_autor_catalogo
+
+logger = logging.getLogger(__name__)
+
+# Palabras más cortas no se consideran nombres (ej: "de", "la")
+LONGITUD_MINIMA_NOMBRE = 3
+
+
+class AutorPrefixIndex:
+    """
+    Índice ordenado de (token, autor_id) sobre los nombres normalizados.
+    Una búsqueda por prefijo es una bisección sobre la lista ordenada
+    (equivalente a recorrer un trie), y los resultados se ordenan por
+    número de artículos del autor.
+    """
+
+    def __init__(self):
+        """Inicializa el índice vacío; se construye en la primera búsqueda."""
+        self._lock = threading.Lock()
+        self._tokens = []      # Lista ordenada de tokens
+        self._token_ids = []   # autor_id correspondiente a cada token
+        self._snapshot = None  # Instantánea del catálogo con que se construyó
+
+    def invalidar(self):
+        """Marca el índice para reconstruirse en la siguiente búsqueda."""
+        self._snapshot = None
+
+    def construir(self, snapshot):
+        """
+        Reconstruye el índice a partir de una instantánea del catálogo de autores.
+
+        Args:
+            snapshot: AutorSnapshot (ver app.services.autor_catalogo)
+        """
+        pares = []
+        for registro in snapshot:
+            for token in set(registro.nombre_normalizado.split()):
+                pares.append((token, registro.id))
+
+        pares.sort()
+
+        with self._lock:
+            self._tokens = [token for token, _ in pares]
+            self._token_ids = [autor_id for _, autor_id in pares]
+            self._snapshot = snapshot
+
+        logger.info(f"Índice de autores construido: {len(snapshot)} autores, {len(pares)} tokens")
+
+    def _ids_con_prefijo(self, prefijo: str) -> set:
+        """Retorna los IDs de autores con algún token que empieza con el prefijo."""
+        inicio = bisect.bisect_left(self._tokens, prefijo)
+        fin = bisect.bisect_left(self._tokens, prefijo + '\uffff')
+        return set(self._token_ids[inicio:fin])
+
+    def _ids_con_token(self, token: str) -> set:
+        """Retorna los IDs de autores con un token exactamente igual."""
+        inicio = bisect.bisect_left(self._tokens, token)
+        fin = bisect.bisect_right(self._tokens, token)
+        return set(self._token_ids[inicio:fin])
+
+    def _actualizar(self):
+        """Reconstruye el índice si el catálogo de autores cambió."""
+        snapshot = get_autor_catalogo().snapshot()
+        if snapshot is not self._snapshot:
+            self.construir(snapshot)
+
+    def separar_autores(self, texto: str) -> Tuple[List[Tuple[Set[int], str]], str]:
+        """
+        Separa de un texto de búsqueda los nombres de autores.
+        Una palabra es parte de un nombre si coincide completa (sin acentos)
+        con algún token de un autor; las palabras seguidas que coinciden con
+        un mismo autor forman un solo nombre. Las demás se buscan como texto
+        libre.
+
+        Ejemplo: "Juan Pérez machine learning"
+            -> ([({12}, "Juan Pérez")], "machine learning")
+
+        Args:
+            texto: Texto libre de búsqueda
+
+        Returns:
+            Tuple (lista de (IDs de autores, palabras del nombre), texto restante)
+        """
+        self._actualizar()
+
+        grupos = []
+        resto = []
+        seguido = False  # La palabra anterior fue parte de un nombre
+        with self._lock:
+            for palabra in re.findall(r'\w+', texto or ''):
+                termino = Autor.normalizar_texto(palabra)
+                ids = self._ids_con_token(termino) if len(termino) >= LONGITUD_MINIMA_NOMBRE else set()
+                if not ids:
+                    resto.append(palabra)
+                    seguido = False
+                    continue
+
+                comunes = grupos[-1][0] & ids if seguido else set()
+                if comunes:
+                    grupos[-1] = (comunes, grupos[-1][1] + [palabra])
+                else:
+                    grupos.append((ids, [palabra]))
+                seguido = True
+
+        return [(ids, ' '.join(palabras)) for ids, palabras in grupos], ' '.join(resto)
+
+    def buscar(self, texto: str, page: int = 1, per_page: int = 10) -> Dict:
+        """
+        Busca autores cuyo nombre contiene palabras que empiezan con
+        cada uno de los términos del texto.
+
+        Args:
+            texto: Texto a buscar (ej: "compa fra")
+            page: Número de página (1-based)
+            per_page: Resultados por página
+
+        Returns:
+            Diccionario con 'results', 'page', 'per_page', 'total' y 'has_more'
+        """
+        self._actualizar()
+
+        terminos = Autor.normalizar_texto(texto).split()
+
+        with self._lock:
+            snapshot = self._snapshot
+            if terminos:
+                # Empezar por el término más largo (el más selectivo)
+                terminos.sort(key=len, reverse=True)
+                ids = self._ids_con_prefijo(terminos[0])
+                for termino in terminos[1:]:
+                    if not ids:
+                        break
+                    ids &= self._ids_con_prefijo(termino)
+            else:
+                ids = set(snapshot.registros)
+
+            candidatos = [snapshot.get(autor_id) for autor_id in ids]
+
+        # Ordenar por número de artículos y luego alfabéticamente
+        candidatos.sort(key=lambda r: (-r.num_articulos, r.nombre_normalizado))
+
+        inicio = (page - 1) * per_page
+        pagina = candidatos[inicio:inicio + per_page]
+
+        return {
+            'results': [
+                {'id': r.id, 'text': r.nombre_completo, 'num_articulos': r.num_articulos}
+                for r in pagina
+            ],
+            'page': page,
+            'per_page': per_page,
+            'total': len(candidatos),
+            'has_more': inicio + per_page < len(candidatos)
+        }
+
+
+def get_autor_index():
+    """
+    Obtiene el índice de autores de la aplicación actual
+    (compartido por todos los threads del proceso).
+
+    Returns:
+        AutorPrefixIndex
+    """
+    return current_app.extensions.setdefault('autor_index', AutorPrefixIndex())
@@ -3,8 +3,10 @@ Servicio para matching y deduplicación de autores.
 Maneja diferentes formatos de nombres y encuentra coincidencias.
 """
 import re
+from sqlalchemy import func, or_
 from app.models import Autor
 from app import db
+from app.utils.fonetica import clave_fonetica
 
 
 class AutorMatchingService:
@@ -116,6 +118,184 @@ class AutorMatchingService:
         print(f"✓ Nuevo autor creado: '{nuevo_autor.nombre_completo}'")
         return nuevo_autor, True
     
+    @staticmethod
+    def resolver_lote(autores_datos, crear_si_no_existe=True, solo_exacto=False):
+        """
+        Resuelve una lista de autores extraídos (ej: de un PDF) a instancias de Autor.
+        
+        Estrategia (en orden):
+        1. ORCID y email de todo el lote en una sola consulta IN (índices únicos)
+        2. Nombre normalizado exacto de los restantes en una sola consulta IN
+        3. Fuzzy matching: candidatos por clave fonética de los restantes en
+           una sola consulta IN; sin candidatos, recorrido del catálogo de autores
+        4. Si no encuentra y crear_si_no_existe=True, crea uno nuevo con su ORCID/email
+        
+        Autores repetidos dentro del lote se resuelven a la misma instancia.
+        Un autor con ORCID o email distinto al del lote no se considera la
+        misma persona en los pasos 2 y 3 (ni en el email si el ORCID difiere).
+        Los autores encontrados por identificador o por nombre exacto (y los
+        nuevos) sin ORCID/email los reciben del lote si ningún otro autor los
+        tiene; un match fuzzy nunca los recibe.
+        
+        Args:
+            autores_datos: Lista de dicts {'nombre', 'apellidos', 'email', 'orcid'}
+            crear_si_no_existe: Si crear nuevos autores cuando no se encuentran
+            solo_exacto: Si se omite el paso 3; sin revisión humana (ej:
+                importaciones masivas) un match aproximado uniría personas
+                distintas, así que solo cuentan ORCID, email y nombre exacto
+        
+        Returns:
+            list: Tuplas (Autor o None, es_nuevo) en el mismo orden que la entrada
+        """
+        datos = []
+        for autor_data in autores_datos:
+            email = (autor_data.get('email') or '').strip().lower() or None
+            orcid = (autor_data.get('orcid') or '').strip().upper() or None
+            nombre = (autor_data.get('nombre') or '').strip()
+            apellidos = (autor_data.get('apellidos') or '').strip()
+            datos.append({
+                'nombre': nombre,
+                'apellidos': apellidos,
+                'email': email,
+                'orcid': orcid,
+                'normalizado': Autor.normalizar_texto(f"{nombre} {apellidos}")
+            })
+        
+        def en_conflicto(autor, d):
+            """Indica si el autor tiene un identificador distinto al del lote."""
+            if d['orcid'] and autor.orcid and autor.orcid.upper() != d['orcid']:
+                return True
+            if d['email'] and autor.email and autor.email.lower() != d['email']:
+                return True
+            return False
+        
+        # 1. Identificadores únicos en una sola consulta
+        emails = {d['email'] for d in datos if d['email']}
+        orcids = {d['orcid'] for d in datos if d['orcid']}
+        por_email, por_orcid = {}, {}
+        
+        if emails or orcids:
+            condiciones = []
+            if emails:
+                condiciones.append(func.lower(Autor.email).in_(emails))
+            if orcids:
+                condiciones.append(Autor.orcid.in_(orcids))
+            
+            for autor in Autor.query.filter(or_(*condiciones)).all():
+                if autor.email:
+                    por_email[autor.email.lower()] = autor
+                if autor.orcid:
+                    por_orcid[autor.orcid.upper()] = autor
+        
+        # 2. Nombre normalizado exacto en una sola consulta
+        normalizados = {
+            d['normalizado'] for d in datos
+            if d['normalizado']
+            and not por_orcid.get(d['orcid'])
+            and not por_email.get(d['email'])
+        }
+        por_nombre = {}
+        
+        if normalizados:
+            for autor in Autor.query.filter(
+                Autor.nombre_normalizado.in_(normalizados)
+            ).order_by(Autor.activo.desc(), Autor.id).all():
+                por_nombre.setdefault(autor.nombre_normalizado, []).append(autor)
+        
+        # 3. Candidatos fonéticos de los restantes en una sola consulta
+        for d in datos:
+            d['clave_fonetica'] = clave_fonetica(d['normalizado'])
+        claves = set() if solo_exacto else {
+            d['clave_fonetica'] for d in datos
+            if d['clave_fonetica']
+            and not any(not en_conflicto(a, d) for a in por_nombre.get(d['normalizado'], []))
+            and not por_orcid.get(d['orcid']) and not por_email.get(d['email'])
+        }
+        por_clave = {}
+        
+        if claves:
+            for autor in Autor.query.filter(
+                Autor.activo == True, Autor.clave_fonetica.in_(claves)
+            ).all():
+                por_clave.setdefault(autor.clave_fonetica, []).append(autor)
+        
+        resultados = []
+        
+        for d in datos:
+            if not d['normalizado'] and not d['email'] and not d['orcid']:
+                resultados.append((None, False))
+                continue
+            
+            es_nuevo = False
+            recibe_identificadores = True
+            
+            # 1. Identificadores (el ORCID manda; el email, si no lo contradice)
+            autor = por_orcid.get(d['orcid'])
+            if not autor:
+                autor = por_email.get(d['email'])
+                if autor and en_conflicto(autor, d):
+                    autor = None
+            
+            # 2. Nombre exacto sin identificadores en conflicto
+            if not autor:
+                autor = next(
+                    (a for a in por_nombre.get(d['normalizado'], [])
+                     if not en_conflicto(a, d)),
+                    None
+                )
+            
+            # 3. Fuzzy / fonético
+            if not autor and d['normalizado'] and not solo_exacto:
+                coincidencias = Autor.buscar_fuzzy(
+                    f"{d['nombre']} {d['apellidos']}", umbral=85,
+                    candidatos=por_clave.get(d['clave_fonetica'], [])
+                )
+                autor = next(
+                    (a for a, _ in coincidencias if not en_conflicto(a, d)),
+                    None
+                )
+                recibe_identificadores = autor is None
+            
+            # 4. Crear nuevo
+            if not autor:
+                if not crear_si_no_existe or not d['normalizado']:
+                    resultados.append((None, False))
+                    continue
+                
+                autor = Autor(
+                    nombre=d['nombre'],
+                    apellidos=d['apellidos'],
+                    es_miembro_ca=False,
+                    activo=True
+                )
+                autor.actualizar_nombre_normalizado()
+                db.session.add(autor)
+                es_nuevo = True
+                # Candidato fonético para los siguientes del lote
+                por_clave.setdefault(autor.clave_fonetica, []).append(autor)
+            
+            # Completar identificadores que nadie más tiene
+            if recibe_identificadores:
+                if d['orcid'] and not autor.orcid and d['orcid'] not in por_orcid:
+                    autor.orcid = d['orcid']
+                if d['email'] and not autor.email and d['email'] not in por_email:
+                    autor.email = d['email']
+            
+            # Registrar para resolver repetidos del mismo lote
+            if autor.orcid:
+                por_orcid[autor.orcid.upper()] = autor
+            if autor.email:
+                por_email[autor.email.lower()] = autor
+            if d['normalizado']:
+                mismos = por_nombre.setdefault(d['normalizado'], [])
+                if autor in mismos:
+                    mismos.remove(autor)
+                mismos.insert(0, autor)
+            
+            resultados.append((autor, es_nuevo))
+        
+        return resultados
+    
     @staticmethod
     def detectar_duplicados(umbral=90):
         """
@@ -127,28 +307,36 @@ class AutorMatchingService:
         Returns:
             list: Lista de tuplas (autor1, autor2, score)
         """
-        autores = Autor.query.filter_by(activo=True).all()
-        duplicados = []
-        
         try:
             from fuzzywuzzy import fuzz
         except ImportError:
             print("⚠️  Instala 'fuzzywuzzy' para detección de duplicados: pip install fuzzywuzzy python-Levenshtein")
             return []
         
-        # Comparar cada par de autores
-        for i, autor1 in enumerate(autores):
-            for autor2 in autores[i+1:]:
-                if not autor1.nombre_normalizado or not autor2.nombre_normalizado:
-                    continue
-                
+        from app.services.autor_catalogo import get_autor_catalogo
+        
+        # Comparar cada par sobre el catálogo compacto (sin objetos ORM)
+        registros = sorted(get_autor_catalogo().snapshot(), key=lambda r: r.id)
+        pares = []
+        
+        for i, registro1 in enumerate(registros):
+            for registro2 in registros[i+1:]:
                 score = fuzz.token_sort_ratio(
-                    autor1.nombre_normalizado,
-                    autor2.nombre_normalizado
+                    registro1.nombre_normalizado,
+                    registro2.nombre_normalizado
                 )
                 
                 if score >= umbral:
-                    duplicados.append((autor1, autor2, score))
+                    pares.append((registro1.id, registro2.id, score))
+        
+        # Cargar solo los autores involucrados en algún par
+        ids = {autor_id for par in pares for autor_id in par[:2]}
+        autores = {a.id: a for a in Autor.query.filter(Autor.id.in_(ids)).all()} if ids else {}
+        duplicados = [
+            (autores[id1], autores[id2], score)
+            for id1, id2, score in pares
+            if id1 in autores and id2 in autores
+        ]
         
         # Ordenar por score descendente
         duplicados.sort(key=lambda x: x[2], reverse=True)
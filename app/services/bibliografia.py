@@ -0,0 +1,655 @@
+"""
+Referencias bibliográficas en BibTeX, RIS y Crossref JSON.
+Una Referencia reúne los datos bibliográficos de un artículo (autores en
+orden, revista o congreso, volumen, número, páginas, DOI, ISSN...); las
+funciones de este módulo la convierten en una entrada BibTeX o en un
+registro RIS para gestores de referencias, y leen referencias de archivos
+BibTeX, RIS y Crossref JSON por flujo (una referencia a la vez, sin cargar
+el archivo completo).
+"""
+import html
+import json
+import re
+import unicodedata
+from collections import namedtuple
+
+
+Referencia = namedtuple('Referencia', [
+    'id', 'tipo', 'titulo', 'autores', 'anio', 'revista', 'congreso', 'volumen', 'numero',
+    'pagina_inicio', 'pagina_fin', 'doi', 'issn', 'url', 'resumen',
+])
+Referencia.__doc__ = """
+Datos bibliográficos de un artículo.
+tipo es 'articulo' (revista) o 'congreso'; autores es una tupla de
+(nombre, apellidos) en orden; los demás campos son None si no hay dato.
+Al leer un archivo, id es la clave de la entrada (BibTeX o RIS) y las
+páginas son texto.
+"""
+
+ARTICULO = 'articulo'
+CONGRESO = 'congreso'
+
+# Palabras del tipo de producción que indican un trabajo en congreso
+_TIPOS_CONGRESO = ('conference', 'congreso', 'memorias')
+
+# Caracteres especiales de LaTeX dentro de un valor BibTeX
+_ESCAPES_BIBTEX = {
+    '\\': r'\textbackslash{}', '{': r'\{', '}': r'\}', '&': r'\&', '%': r'\%',
+    '$': r'\$', '#': r'\#', '_': r'\_', '~': r'\textasciitilde{}', '^': r'\textasciicircum{}',
+}
+_PATRON_BIBTEX = re.compile('|'.join(re.escape(c) for c in _ESCAPES_BIBTEX))
+
+
+def tipo_referencia(tipo_produccion, nombre_congreso=None):
+    """Tipo de referencia según el tipo de producción y el congreso."""
+    nombre = (tipo_produccion or '').lower()
+    if nombre_congreso or any(palabra in nombre for palabra in _TIPOS_CONGRESO):
+        return CONGRESO
+    return ARTICULO
+
+
+def _una_linea(texto):
+    return re.sub(r'\s+', ' ', str(texto)).strip()
+
+
+def _nombre_cita(nombre, apellidos):
+    """'Apellidos, Nombre' (o solo el que exista)."""
+    nombre, apellidos = (nombre or '').strip(), (apellidos or '').strip()
+    if nombre and apellidos:
+        return f"{apellidos}, {nombre}"
+    return apellidos or nombre
+
+
+def _paginas(referencia, separador):
+    if referencia.pagina_inicio and referencia.pagina_fin:
+        return f"{referencia.pagina_inicio}{separador}{referencia.pagina_fin}"
+    return referencia.pagina_inicio or None
+
+
+# === BibTeX ===
+
+def clave_bibtex(referencia):
+    """
+    Clave de cita: apellido del primer autor, año e ID del artículo.
+    Ejemplo: perez2024_15
+    """
+    apellido = 'articulo'
+    if referencia.autores:
+        nombre, apellidos = referencia.autores[0]
+        texto = unicodedata.normalize('NFKD', apellidos or nombre or '')
+        palabras = re.findall(r'[a-z0-9]+', texto.encode('ASCII', 'ignore').decode().lower())
+        if palabras:
+            apellido = palabras[0]
+    return f"{apellido}{referencia.anio or ''}_{referencia.id}"
+
+
+def escapar_bibtex(texto):
+    """Escapa los caracteres especiales de LaTeX."""
+    return _PATRON_BIBTEX.sub(lambda m: _ESCAPES_BIBTEX[m.group()], _una_linea(texto))
+
+
+def bibtex(referencia):
+    """
+    Entrada BibTeX (@article o @inproceedings) de una referencia.
+
+    Returns:
+        str: Entrada terminada en línea en blanco
+    """
+    congreso = referencia.tipo == CONGRESO
+    contenedor = (referencia.congreso or referencia.revista) if congreso else referencia.revista
+    campos = [
+        ('title', referencia.titulo),
+        ('author', ' and '.join(_nombre_cita(*autor) for autor in referencia.autores)),
+        ('booktitle' if congreso else 'journal', contenedor),
+        ('year', referencia.anio),
+        ('volume', referencia.volumen),
+        ('number', referencia.numero),
+        ('pages', _paginas(referencia, '--')),
+        ('issn', referencia.issn),
+        ('doi', referencia.doi),
+        ('url', referencia.url),
+        ('abstract', referencia.resumen),
+    ]
+
+    lineas = [f"@{'inproceedings' if congreso else 'article'}{{{clave_bibtex(referencia)},"]
+    for nombre, valor in campos:
+        if valor in (None, ''):
+            continue
+        # DOI y URL van literales; el título con doble llave conserva sus mayúsculas
+        valor = _una_linea(valor) if nombre in ('doi', 'url') else escapar_bibtex(valor)
+        if nombre == 'title':
+            valor = f"{{{valor}}}"
+        lineas.append(f"  {nombre} = {{{valor}}},")
+    lineas.append('}')
+    return '\n'.join(lineas) + '\n\n'
+
+
+# === RIS ===
+
+def ris(referencia):
+    """
+    Registro RIS (TY JOUR o CONF ... ER) de una referencia.
+
+    Returns:
+        str: Registro terminado en línea en blanco
+    """
+    congreso = referencia.tipo == CONGRESO
+    etiquetas = [('TY', 'CONF' if congreso else 'JOUR'), ('ID', referencia.id),
+                 ('TI', referencia.titulo)]
+    etiquetas.extend(('AU', _nombre_cita(*autor)) for autor in referencia.autores)
+    etiquetas.extend([
+        ('PY', referencia.anio),
+        ('T2', (referencia.congreso or referencia.revista) if congreso else referencia.revista),
+        ('VL', referencia.volumen),
+        ('IS', referencia.numero),
+        ('SP', referencia.pagina_inicio),
+        ('EP', referencia.pagina_fin),
+        ('SN', referencia.issn),
+        ('DO', referencia.doi),
+        ('UR', referencia.url),
+        ('AB', referencia.resumen),
+    ])
+
+    lineas = [f"{etiqueta}  - {_una_linea(valor)}" for etiqueta, valor in etiquetas
+              if valor not in (None, '')]
+    lineas.append('ER  - ')
+    return '\n'.join(lineas) + '\n\n'
+
+
+# === Lectura ===
+
+def _nombre_autor(texto):
+    """
+    (nombre, apellidos) de un autor en "Apellidos, Nombre" o "Nombre
+    Apellidos" (el primer término es el nombre, como en
+    AutorMatchingService.parsear_nombre_autor).
+    """
+    texto = _una_linea(texto).strip(' ,')
+    if ',' in texto:
+        partes = [parte.strip() for parte in texto.split(',')]
+        # "Apellidos, Jr., Nombre" (BibTeX): el sufijo se descarta
+        return partes[-1], partes[0]
+    partes = texto.split(' ', 1)
+    return partes[0], partes[1] if len(partes) > 1 else ''
+
+
+def _separar_paginas(texto):
+    """(inicio, fin) de un rango de páginas como "10--25" o "10-25"."""
+    if not texto:
+        return None, None
+    partes = [parte.strip() for parte in
+              re.split(r'\s*[-\u2013\u2014]+\s*', str(texto).strip(), maxsplit=1)]
+    return partes[0] or None, partes[1] if len(partes) > 1 and partes[1] else None
+
+
+def _anio(texto):
+    encontrado = re.search(r'\b(\d{4})\b', str(texto or ''))
+    return int(encontrado.group(1)) if encontrado else None
+
+
+def _limpio(texto):
+    """Texto en una línea o None si queda vacío."""
+    if texto is None:
+        return None
+    return _una_linea(texto) or None
+
+
+# --- BibTeX ---
+
+_INICIO_BIBTEX = re.compile(r'^\s*@\s*([A-Za-z]+)\s*')
+_ENCABEZADO_BIBTEX = re.compile(r'\s*@\s*([A-Za-z]+)\s*([{(])')
+_CAMPO_BIBTEX = re.compile(r'[\s,]*([A-Za-z][\w\-:.]*)\s*=\s*')
+_PALABRA_BIBTEX = re.compile(r'[^\s,#})]+')
+_TIPOS_BIBTEX_CONGRESO = ('inproceedings', 'conference', 'proceedings')
+_MESES = {mes: str(numero) for numero, mes in enumerate(
+    ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'), start=1)}
+
+# Acentos de LaTeX -> marca combinante de Unicode
+_ACENTOS_LATEX = {
+    "'": '\u0301', '`': '\u0300', '^': '\u0302', '"': '\u0308', '~': '\u0303',
+    '=': '\u0304', '.': '\u0307', 'u': '\u0306', 'v': '\u030c', 'H': '\u030b',
+    'c': '\u0327', 'k': '\u0328', 'r': '\u030a',
+}
+_ACENTO_SIMBOLO = re.compile(r"""\\([`'^"~=.])\s*(?:\{\s*(\\?[A-Za-z])\s*\}|(\\?[A-Za-z]))""")
+_ACENTO_LETRA = re.compile(r'\\([uvHckr])(?:\s*\{\s*(\\?[A-Za-z])\s*\}|\s+(\\?[A-Za-z]))')
+_SIMBOLOS_LATEX = {
+    'ss': 'ß', 'o': 'ø', 'O': 'Ø', 'ae': 'æ', 'AE': 'Æ', 'aa': 'å', 'AA': 'Å',
+    'l': 'ł', 'L': 'Ł', 'i': 'i', 'j': 'j', 'textbackslash': '\\',
+    'textasciitilde': '~', 'textasciicircum': '^', 'textendash': '–', 'textemdash': '—',
+}
+_COMANDO_LATEX = re.compile(r'\\([A-Za-z]+)\s*(?:\{\})?')
+_ESCAPADO_LATEX = re.compile(r'\\([&%$#_{}])')
+_MARCAS_LATEX = re.compile(r'[\\{}~]|--')
+
+
+def texto_latex(valor):
+    """
+    Texto legible de un valor BibTeX: acentos de LaTeX a Unicode, sin
+    llaves de agrupación ni comandos de formato.
+    Ejemplo: "{\\'A}lvarez \\& Mu\\~{n}oz" -> "Álvarez & Muñoz"
+    """
+    if not _MARCAS_LATEX.search(valor):
+        return _una_linea(valor)
+
+    def acento(m):
+        letra = (m.group(2) or m.group(3)).lstrip('\\')
+        return letra + _ACENTOS_LATEX[m.group(1)]
+
+    # Los caracteres escapados se apartan para no confundirlos con llaves
+    apartados = []
+
+    def apartar(m):
+        apartados.append(m.group(1))
+        return f'\x00{len(apartados) - 1}\x00'
+
+    texto = _ESCAPADO_LATEX.sub(apartar, valor)
+    texto = _ACENTO_SIMBOLO.sub(acento, texto)
+    texto = _ACENTO_LETRA.sub(acento, texto)
+    texto = re.sub(r'(?<!\\)~', ' ', texto)
+    texto = _COMANDO_LATEX.sub(lambda m: _SIMBOLOS_LATEX.get(m.group(1), ''), texto)
+    texto = texto.replace('---', '—').replace('--', '–').replace('{', '').replace('}', '')
+    texto = re.sub(r'\x00(\d+)\x00', lambda m: apartados[int(m.group(1))], texto)
+    return unicodedata.normalize('NFC', _una_linea(texto))
+
+
+def _balance(texto, abre, cierra):
+    """Delimitadores abiertos menos cerrados (sin contar los escapados)."""
+    texto = texto.replace('\\\\', '').replace('\\' + abre, '').replace('\\' + cierra, '')
+    return texto.count(abre) - texto.count(cierra)
+
+
+def _entradas_bibtex(lineas):
+    """
+    Texto de cada entrada (@tipo{...}) de un archivo BibTeX.
+    Una entrada empieza con @ al inicio de una línea y termina cuando se
+    cierran sus llaves; el texto fuera de las entradas se ignora.
+
+    Yields:
+        tuple: (línea donde empieza, texto de la entrada)
+    """
+    partes, inicio, delimitador, profundidad = [], None, None, 0
+    for numero, linea in enumerate(lineas, start=1):
+        if not partes:
+            if not _INICIO_BIBTEX.match(linea):
+                continue
+            inicio = numero
+        partes.append(linea)
+
+        if delimitador is None:
+            texto = ''.join(partes)
+            encontrado = _ENCABEZADO_BIBTEX.match(texto)
+            if not encontrado:
+                if texto.strip() and not _INICIO_BIBTEX.fullmatch(texto.rstrip()):
+                    partes = []  # "@" sin entrada (ej: una dirección de correo)
+                continue
+            delimitador = encontrado.group(2)
+            profundidad = _balance(texto, delimitador, '}' if delimitador == '{' else ')')
+        else:
+            profundidad += _balance(linea, delimitador, '}' if delimitador == '{' else ')')
+
+        if profundidad <= 0:
+            yield inicio, ''.join(partes)
+            partes, delimitador = [], None
+
+    if partes:
+        raise ValueError(f"La entrada BibTeX de la línea {inicio} no está cerrada")
+
+
+def _valor_bibtex(texto, posicion, macros):
+    """
+    Lee un valor (llaves, comillas, número o macro, concatenados con #).
+
+    Returns:
+        tuple: (valor sin delimitadores, posición siguiente)
+    """
+    partes = []
+    while True:
+        while posicion < len(texto) and texto[posicion].isspace():
+            posicion += 1
+        if posicion >= len(texto):
+            break
+        caracter = texto[posicion]
+        if caracter in '{"':
+            cierre = '}' if caracter == '{' else '"'
+            profundidad, fin = 0, posicion + 1
+            while fin < len(texto):
+                actual = texto[fin]
+                if actual == '\\':
+                    fin += 2
+                    continue
+                if actual == cierre and profundidad == 0:
+                    break
+                if actual == '{':
+                    profundidad += 1
+                elif actual == '}':
+                    profundidad -= 1
+                fin += 1
+            partes.append(texto[posicion + 1:fin])
+            posicion = fin + 1
+        else:
+            encontrado = _PALABRA_BIBTEX.match(texto, posicion)
+            if not encontrado:
+                break
+            palabra = encontrado.group()
+            partes.append(palabra if palabra.isdigit() else macros.get(palabra.lower(), ''))
+            posicion = encontrado.end()
+
+        while posicion < len(texto) and texto[posicion].isspace():
+            posicion += 1
+        if posicion < len(texto) and texto[posicion] == '#':
+            posicion += 1
+            continue
+        break
+    return ''.join(partes), posicion
+
+
+def _campos_bibtex(texto, posicion, macros):
+    """Campos nombre = valor desde la posición indicada (nombres en minúsculas)."""
+    campos = {}
+    while True:
+        encontrado = _CAMPO_BIBTEX.match(texto, posicion)
+        if not encontrado:
+            return campos
+        valor, posicion = _valor_bibtex(texto, encontrado.end(), macros)
+        campos[encontrado.group(1).lower()] = valor
+
+
+def _separar_autores_bibtex(valor):
+    """Nombres de un campo author separados por "and" fuera de llaves."""
+    nombres, inicio, profundidad = [], 0, 0
+    for encontrado in re.finditer(r'[{}]|\s+and\s+', valor):
+        marca = encontrado.group()
+        if marca == '{':
+            profundidad += 1
+        elif marca == '}':
+            profundidad -= 1
+        elif profundidad == 0:
+            nombres.append(valor[inicio:encontrado.start()])
+            inicio = encontrado.end()
+    nombres.append(valor[inicio:])
+    return [nombre for nombre in nombres if nombre.strip() and nombre.strip() != 'others']
+
+
+def _autor_bibtex(valor):
+    """(nombre, apellidos) de un autor; un nombre entre llaves es institucional."""
+    valor = valor.strip()
+    if valor.startswith('{') and valor.endswith('}') and _balance(valor[1:-1], '{', '}') == 0 \
+            and '}' not in valor[1:-1].split('{')[0]:
+        return texto_latex(valor), ''
+    return _nombre_autor(texto_latex(valor))
+
+
+def leer_bibtex(lineas):
+    """
+    Referencias de un archivo BibTeX, leído línea por línea.
+    Resuelve @string y las abreviaturas de meses; ignora @comment y @preamble.
+
+    Args:
+        lineas: Iterable de líneas de texto (ej: archivo abierto en modo texto)
+
+    Yields:
+        tuple: (línea donde empieza la entrada, Referencia)
+
+    Raises:
+        ValueError: Si el archivo termina con una entrada sin cerrar
+    """
+    macros = dict(_MESES)
+    for numero, texto in _entradas_bibtex(lineas):
+        encabezado = _ENCABEZADO_BIBTEX.match(texto)
+        tipo, cuerpo = encabezado.group(1).lower(), encabezado.end()
+        if tipo in ('comment', 'preamble'):
+            continue
+        if tipo == 'string':
+            macros.update(_campos_bibtex(texto, cuerpo, macros))
+            continue
+
+        clave, separador, _ = texto[cuerpo:].partition(',')
+        campos = _campos_bibtex(texto, cuerpo + len(clave) + len(separador), macros)
+        campos = {nombre: valor for nombre, valor in campos.items() if valor.strip()}
+        congreso = tipo in _TIPOS_BIBTEX_CONGRESO
+        inicio, fin = _separar_paginas(campos.get('pages'))
+
+        def campo(*nombres):
+            for nombre in nombres:
+                if nombre in campos:
+                    return _limpio(texto_latex(campos[nombre]))
+            return None
+
+        yield numero, Referencia(
+            id=clave.strip() or None,
+            tipo=CONGRESO if congreso else ARTICULO,
+            titulo=campo('title'),
+            autores=tuple(_autor_bibtex(nombre)
+                          for nombre in _separar_autores_bibtex(campos.get('author', ''))),
+            anio=_anio(campos.get('year') or campos.get('date')),
+            revista=campo('journal', 'journaltitle'),
+            congreso=campo('booktitle', 'eventtitle') if congreso else None,
+            volumen=campo('volume'),
+            numero=campo('number', 'issue'),
+            pagina_inicio=inicio,
+            pagina_fin=fin,
+            doi=_limpio(campos.get('doi')),
+            issn=campo('issn'),
+            url=_limpio(campos.get('url')),
+            resumen=campo('abstract'),
+        )
+
+
+# --- RIS ---
+
+_LINEA_RIS = re.compile(r'^([A-Z][A-Z0-9])  -(?: (.*))?$')
+_TIPOS_RIS_CONGRESO = ('CONF', 'CPAPER')
+
+
+def leer_ris(lineas):
+    """
+    Referencias de un archivo RIS, leído línea por línea.
+    Las líneas sin etiqueta continúan el valor anterior (resúmenes largos).
+
+    Args:
+        lineas: Iterable de líneas de texto
+
+    Yields:
+        tuple: (línea donde empieza el registro, Referencia)
+    """
+    etiquetas, ultima, inicio = None, None, None
+    for numero, linea in enumerate(lineas, start=1):
+        linea = linea.rstrip('\r\n').lstrip('\ufeff')
+        encontrado = _LINEA_RIS.match(linea)
+        if not encontrado:
+            if etiquetas is not None and ultima and linea.strip():
+                etiquetas[ultima][-1] += ' ' + linea.strip()
+            continue
+
+        etiqueta, valor = encontrado.group(1), (encontrado.group(2) or '').strip()
+        if etiqueta == 'TY':
+            etiquetas, ultima, inicio = {'TY': [valor]}, 'TY', numero
+        elif etiquetas is None:
+            continue
+        elif etiqueta == 'ER':
+            yield inicio, _referencia_ris(etiquetas)
+            etiquetas, ultima = None, None
+        else:
+            etiquetas.setdefault(etiqueta, []).append(valor)
+            ultima = etiqueta
+
+    if etiquetas is not None:
+        # Último registro sin ER
+        yield inicio, _referencia_ris(etiquetas)
+
+
+def _referencia_ris(etiquetas):
+    def valor(*nombres):
+        for nombre in nombres:
+            for texto in etiquetas.get(nombre, ()):
+                if texto:
+                    return _limpio(texto)
+        return None
+
+    congreso = (valor('TY') or '').upper() in _TIPOS_RIS_CONGRESO
+    inicio, fin = valor('SP'), valor('EP')
+    if inicio and not fin:
+        inicio, fin = _separar_paginas(inicio)
+    contenedor = valor('T2', 'JF', 'JO', 'BT', 'JA', 'J2')
+    return Referencia(
+        id=valor('ID'),
+        tipo=CONGRESO if congreso else ARTICULO,
+        titulo=valor('TI', 'T1', 'CT'),
+        autores=tuple(_nombre_autor(texto)
+                      for texto in etiquetas.get('AU', []) + etiquetas.get('A1', []) if texto),
+        anio=_anio(valor('PY', 'Y1', 'DA')),
+        revista=None if congreso else contenedor,
+        congreso=contenedor if congreso else None,
+        volumen=valor('VL'),
+        numero=valor('IS'),
+        pagina_inicio=inicio,
+        pagina_fin=fin,
+        doi=valor('DO'),
+        issn=valor('SN'),
+        url=valor('UR', 'L2'),
+        resumen=valor('AB', 'N2'),
+    )
+
+
+# --- Crossref JSON ---
+
+def _valores_json(lector, tamano_bloque=1 << 16):
+    """
+    Valores JSON de un archivo por flujo: los elementos de un arreglo de
+    nivel superior o valores seguidos (JSON Lines); un objeto se lee
+    completo antes de entregarlo.
+    """
+    decodificador = json.JSONDecoder()
+    buffer, posicion, agotado, arreglo = '', 0, False, False
+    while True:
+        while posicion < len(buffer) and buffer[posicion] in ' \t\r\n,\ufeff':
+            posicion += 1
+        if posicion >= len(buffer):
+            if agotado:
+                return
+            buffer, posicion = lector.read(tamano_bloque), 0
+            agotado = not buffer
+            continue
+
+        caracter = buffer[posicion]
+        if caracter == '[' and not arreglo:
+            arreglo, posicion = True, posicion + 1
+            continue
+        if caracter == ']' and arreglo:
+            arreglo, posicion = False, posicion + 1
+            continue
+
+        try:
+            valor, posicion = decodificador.raw_decode(buffer, posicion)
+        except json.JSONDecodeError as e:
+            if agotado:
+                raise ValueError(f"JSON inválido: {e.msg} (posición {e.pos})") from None
+            # Valor incompleto: se lee otro tanto de lo pendiente (crece al doble
+            # para no volver a decodificar muchas veces un objeto grande)
+            pendiente = buffer[posicion:]
+            bloque = lector.read(max(tamano_bloque, len(pendiente)))
+            agotado = not bloque
+            buffer, posicion = pendiente + bloque, 0
+            continue
+        yield valor
+
+
+def _obras_crossref(valor):
+    """Obras de una respuesta de la API (work o lista de items) o de una obra suelta."""
+    if isinstance(valor, list):
+        for elemento in valor:
+            yield from _obras_crossref(elemento)
+        return
+    if not isinstance(valor, dict):
+        return
+    mensaje = valor.get('message') if 'message-type' in valor or 'status' in valor else None
+    if isinstance(mensaje, dict):
+        if isinstance(mensaje.get('items'), list):
+            yield from (obra for obra in mensaje['items'] if isinstance(obra, dict))
+        else:
+            yield mensaje
+    else:
+        yield valor
+
+
+def _texto_crossref(valor):
+    """Primer texto de un campo de Crossref (listas, JATS/HTML y entidades)."""
+    if isinstance(valor, list):
+        valor = next((elemento for elemento in valor if elemento), None)
+    if not valor or not isinstance(valor, str):
+        return None
+    return _limpio(html.unescape(re.sub(r'<[^>]+>', ' ', valor)))
+
+
+def _referencia_crossref(obra):
+    congreso = obra.get('type') == 'proceedings-article' or bool(obra.get('event'))
+    contenedor = _texto_crossref(obra.get('container-title'))
+    evento = obra.get('event') if isinstance(obra.get('event'), dict) else {}
+
+    autores = []
+    for autor in obra.get('author') or ():
+        if not isinstance(autor, dict):
+            continue
+        if autor.get('family') or autor.get('given'):
+            autores.append(((autor.get('given') or '').strip(), (autor.get('family') or '').strip()))
+        elif autor.get('name'):
+            autores.append((autor['name'].strip(), ''))
+
+    anio = None
+    for campo in ('published-print', 'published-online', 'issued', 'published', 'created'):
+        partes = (obra.get(campo) or {}).get('date-parts') or [[None]]
+        if partes[0] and partes[0][0]:
+            anio = int(partes[0][0])
+            break
+
+    inicio, fin = _separar_paginas(obra.get('page'))
+    url = obra.get('URL')
+    if url and re.match(r'https?://(dx\.)?doi\.org/', url):
+        url = None  # El DOI ya la da
+
+    return Referencia(
+        id=obra.get('DOI'),
+        tipo=CONGRESO if congreso else ARTICULO,
+        titulo=_texto_crossref(obra.get('title')),
+        autores=tuple(autores),
+        anio=anio,
+        revista=None if congreso else contenedor,
+        congreso=(_texto_crossref(evento.get('name')) or contenedor) if congreso else None,
+        volumen=_limpio(obra.get('volume')),
+        numero=_limpio(obra.get('issue')),
+        pagina_inicio=inicio,
+        pagina_fin=fin,
+        doi=_limpio(obra.get('DOI')),
+        issn=_texto_crossref(obra.get('ISSN')),
+        url=url,
+        resumen=_texto_crossref(obra.get('abstract')),
+    )
+
+
+def leer_crossref(lector):
+    """
+    Referencias de un archivo JSON de Crossref: respuesta de /works/{doi},
+    página de /works (message.items), arreglo de obras o JSON Lines.
+
+    Args:
+        lector: Archivo abierto en modo texto
+
+    Yields:
+        tuple: (número de obra en el archivo, Referencia)
+
+    Raises:
+        ValueError: Si el JSON no es válido
+    """
+    numero = 0
+    for valor in _valores_json(lector):
+        for obra in _obras_crossref(valor):
+            numero += 1
+            yield numero, _referencia_crossref(obra)
+
+
+# Formato -> (lector, extensiones)
+LECTORES = {
+    'bibtex': (leer_bibtex, ('.bib', '.bibtex')),
+    'ris': (leer_ris, ('.ris',)),
+    'crossref': (leer_crossref, ('.json', '.jsonl')),
+}
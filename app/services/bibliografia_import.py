@@ -0,0 +1,449 @@
+"""
+Importación masiva de referencias bibliográficas (BibTeX, RIS y Crossref
+JSON), sin pasar por la extracción de PDFs.
+El archivo se lee por flujo (app/services/bibliografia.py) y las
+referencias se escriben en lotes con una transacción por lote. Por cada
+lote se buscan los duplicados en una sola consulta (DOI y huella del
+título con IN) y los autores se resuelven todos juntos con
+AutorMatchingService.resolver_lote.
+
+Una referencia que ya existe (mismo DOI, o misma huella de título sin un
+DOI distinto) o que se repite en el archivo se omite y se cuenta como
+duplicada. Las referencias con errores se reportan y no detienen la
+importación.
+"""
+import io
+import logging
+import os
+import re
+
+from sqlalchemy import or_, select
+
+from app import db
+from app.models.articulo import Articulo
+from app.models.autor import Autor
+from app.models.catalogs import Estado, TipoProduccion
+from app.models.relations import ArticuloAutor
+from app.models.revista import Revista
+from app.services import bibliografia
+from app.services.autor_matching import AutorMatchingService
+from app.services.catalog_cache import get_catalog_cache
+from app.services.excel_import import FilaInvalida
+from app.utils.huella import huella
+
+logger = logging.getLogger(__name__)
+
+
+class BibliografiaImportService:
+    """
+    Importa referencias bibliográficas como artículos.
+    Se crea una instancia por importación (los mapas de revistas son de esa
+    importación).
+    """
+
+    FORMATOS = tuple(bibliografia.LECTORES)
+
+    # Campos de texto de la referencia -> columna del artículo
+    CAMPOS_TEXTO = {
+        'titulo': 'titulo',
+        'revista': 'titulo_revista',
+        'congreso': 'nombre_congreso',
+        'volumen': 'volumen',
+        'numero': 'numero',
+        'doi': 'doi',
+        'issn': 'issn',
+        'url': 'url',
+        'resumen': 'descripcion',
+    }
+
+    _PREFIJO_DOI = re.compile(r'^(?:https?://(?:dx\.)?doi\.org/|doi:\s*)', re.IGNORECASE)
+    _ISSN = re.compile(r'\b(\d{4})-?(\d{3}[\dX])\b', re.IGNORECASE)
+
+    def __init__(self, tamano_lote=500):
+        """
+        Args:
+            tamano_lote: Referencias por transacción
+        """
+        self.tamano_lote = tamano_lote
+
+    @classmethod
+    def formato_de(cls, nombre_archivo):
+        """
+        Formato según la extensión del archivo.
+
+        Raises:
+            ValueError: Si la extensión no corresponde a ningún formato
+        """
+        extension = os.path.splitext(nombre_archivo or '')[1].lower()
+        for formato, (_, extensiones) in bibliografia.LECTORES.items():
+            if extension in extensiones:
+                return formato
+        aceptadas = ', '.join(extension for _, extensiones in bibliografia.LECTORES.values()
+                              for extension in extensiones)
+        raise ValueError(f"Formato de referencias desconocido ({aceptadas})")
+
+    # === Entrada ===
+
+    def importar(self, archivo, formato=None, nombre_archivo=None):
+        """
+        Importa las referencias de un archivo.
+
+        Args:
+            archivo: Ruta o archivo abierto (binario en UTF-8 o de texto)
+            formato: 'bibtex', 'ris' o 'crossref' (por omisión, según la
+                extensión del archivo)
+            nombre_archivo: Nombre que se guarda como archivo_origen de los
+                artículos nuevos
+
+        Returns:
+            dict: total, creados, duplicados, autores_nuevos,
+            revistas_nuevas y errores (lista de {'registro', 'errores'};
+            registro es la línea donde empieza la entrada en BibTeX y RIS,
+            o el número de obra en Crossref)
+
+        Raises:
+            ValueError: Si el formato no existe o no hay tipos de producción
+                o estados en los catálogos
+        """
+        if nombre_archivo is None and isinstance(archivo, (str, os.PathLike)):
+            nombre_archivo = os.path.basename(archivo)
+        formato = formato or self.formato_de(nombre_archivo)
+        if formato not in bibliografia.LECTORES:
+            raise ValueError(f"Formato de referencias desconocido: {formato}")
+        leer, _ = bibliografia.LECTORES[formato]
+
+        self.nombre_archivo = nombre_archivo
+        self._cargar_catalogos()
+        self._cargar_revistas()
+        resultado = {
+            'total': 0,
+            'creados': 0,
+            'duplicados': 0,
+            'autores_nuevos': 0,
+            'revistas_nuevas': 0,
+            'errores': [],
+        }
+
+        texto = self._abrir(archivo)
+        registro = 0
+        try:
+            lote, claves_lote = [], set()
+            for registro, referencia in leer(texto):
+                resultado['total'] += 1
+                try:
+                    datos = self._preparar(registro, referencia)
+                except FilaInvalida as e:
+                    resultado['errores'].append({'registro': registro, 'errores': e.errores})
+                    continue
+
+                # Repetida dentro del lote (las de lotes anteriores ya están
+                # en la base y se detectan al escribir)
+                if datos['claves'] & claves_lote:
+                    resultado['duplicados'] += 1
+                    continue
+
+                lote.append(datos)
+                claves_lote |= datos['claves']
+                if len(lote) >= self.tamano_lote:
+                    self._confirmar(lote, resultado)
+                    lote, claves_lote = [], set()
+        except (ValueError, UnicodeDecodeError) as e:
+            # Archivo mal formado: se conserva lo leído hasta ese punto
+            resultado['errores'].append({'registro': registro + 1, 'errores': [str(e)]})
+        finally:
+            if isinstance(archivo, (str, os.PathLike)):
+                texto.close()
+            elif texto is not archivo:
+                texto.detach()  # El archivo de quien llama queda abierto
+
+        self._confirmar(lote, resultado)
+
+        logger.info(
+            f"Importación de referencias de {self.nombre_archivo or formato}: "
+            f"{resultado['total']} referencias, {resultado['creados']} creadas, "
+            f"{resultado['duplicados']} duplicadas, {len(resultado['errores'])} con errores"
+        )
+        return resultado
+
+    @staticmethod
+    def _abrir(archivo):
+        """Archivo de texto en UTF-8 (con o sin BOM) a partir de una ruta o un archivo."""
+        if isinstance(archivo, (str, os.PathLike)):
+            return open(archivo, encoding='utf-8-sig')
+        if isinstance(archivo, io.TextIOBase):
+            return archivo
+        return io.TextIOWrapper(archivo, encoding='utf-8-sig')
+
+    def _cargar_catalogos(self):
+        """
+        Tipo de producción (artículo o congreso) y estado de los artículos
+        nuevos: 'Artículo científico' y 'Publicado' si existen, como en la
+        carga de PDFs.
+        """
+        catalog_cache = get_catalog_cache()
+        tipos = [tipo for tipo in catalog_cache.entradas(TipoProduccion) if tipo.activo]
+        estados = [estado for estado in catalog_cache.entradas(Estado) if estado.activo]
+        if not tipos or not estados:
+            raise ValueError("No hay tipos de producción o estados en la base de datos. "
+                             "Ejecuta: python scripts/seed_catalogs.py")
+
+        articulo = next((tipo for tipo in tipos if huella(tipo.nombre) == 'articulo cientifico'),
+                        tipos[0])
+        congreso = next((tipo for tipo in tipos
+                         if bibliografia.tipo_referencia(tipo.nombre) == bibliografia.CONGRESO),
+                        articulo)
+        self._tipos = {bibliografia.ARTICULO: articulo.id, bibliografia.CONGRESO: congreso.id}
+        self._estado_id = next((estado for estado in estados
+                                if huella(estado.nombre) == 'publicado'), estados[0]).id
+
+    def _cargar_revistas(self):
+        """
+        Mapas de revistas por ISSN y por huella del nombre (una consulta).
+        Reinicia también los autores ya resueltos en la importación.
+        """
+        self._autores = {}  # nombre normalizado -> autor_id
+        self._revistas_issn, self._revistas_nombre = {}, {}
+        for revista_id, nombre, issn, issn_electronico in db.session.execute(
+            select(Revista.id, Revista.nombre, Revista.issn, Revista.issn_electronico)
+            .order_by(Revista.activo.desc(), Revista.id)
+        ):
+            for clave in (issn, issn_electronico):
+                if clave:
+                    self._revistas_issn.setdefault(clave.upper(), revista_id)
+            self._revistas_nombre.setdefault(huella(nombre), revista_id)
+
+    # === Lectura de referencias ===
+
+    def _preparar(self, registro, referencia):
+        """
+        Convierte y valida una referencia (sin escribir nada).
+
+        Returns:
+            dict: registro, campos del artículo, tipo, autores, doi, huella
+            y claves
+
+        Raises:
+            FilaInvalida: Con la lista de errores de la referencia
+        """
+        campos = {
+            columna: self._recortar(columna, getattr(referencia, campo))
+            for campo, columna in self.CAMPOS_TEXTO.items()
+        }
+        if campos['doi']:
+            campos['doi'] = self._PREFIJO_DOI.sub('', campos['doi']) or None
+        issn = self._ISSN.search(campos['issn'] or '')
+        campos['issn'] = f"{issn.group(1)}-{issn.group(2).upper()}" if issn else None
+        campos['anio_publicacion'] = referencia.anio
+        campos['pagina_inicio'] = self._pagina(referencia.pagina_inicio)
+        campos['pagina_fin'] = self._pagina(referencia.pagina_fin)
+
+        errores = []
+        if not campos['titulo']:
+            errores.append('El título es obligatorio')
+        _, errores_modelo = Articulo(**{
+            campo: campos[campo]
+            for campo in ('doi', 'issn', 'anio_publicacion', 'pagina_inicio', 'pagina_fin')
+        }).validar()
+        errores.extend(errores_modelo)
+        if errores:
+            raise FilaInvalida(errores)
+
+        doi = campos['doi'].lower() if campos['doi'] else None
+        huella_titulo = huella(campos['titulo'])
+        claves = {('huella', huella_titulo)}
+        if doi:
+            claves.add(('doi', doi))
+
+        return {
+            'registro': registro,
+            'campos': campos,
+            'tipo': referencia.tipo,
+            'autores': referencia.autores,
+            'doi': doi,
+            'huella': huella_titulo,
+            'claves': claves,
+        }
+
+    @staticmethod
+    def _recortar(columna, valor):
+        """Texto recortado al largo de la columna del artículo."""
+        if not valor:
+            return None
+        largo = Articulo.__table__.c[columna].type.length
+        if largo and len(valor) > largo:
+            return valor[:largo - 3].rstrip() + '...'
+        return valor
+
+    @staticmethod
+    def _pagina(valor):
+        """Página como número (None si no es numérica, ej: 'e1234')."""
+        return int(valor) if valor and str(valor).isdigit() else None
+
+    # === Escritura por lotes ===
+
+    def _confirmar(self, lote, resultado):
+        """
+        Escribe un lote en una transacción. Si falla, se reintenta
+        referencia por referencia para reportar solo las que tienen error.
+        """
+        if not lote:
+            return
+
+        try:
+            contadores = self._escribir(lote)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            # Los mapas pueden tener autores y revistas del lote descartado
+            self._cargar_revistas()
+            if len(lote) == 1:
+                logger.warning(f"Referencia {lote[0]['registro']} no importada: {e}")
+                resultado['errores'].append({'registro': lote[0]['registro'], 'errores': [str(e)]})
+            else:
+                for datos in lote:
+                    self._confirmar([datos], resultado)
+            return
+
+        for clave, cantidad in contadores.items():
+            resultado[clave] += cantidad
+
+    def _existentes(self, lote):
+        """
+        Claves de los artículos existentes que coinciden con el lote, en una
+        sola consulta.
+
+        Returns:
+            tuple: (DOIs en minúsculas, huella -> DOIs en minúsculas o None)
+        """
+        dois = {datos['campos']['doi'] for datos in lote if datos['doi']}
+        # El índice único del DOI distingue mayúsculas: se buscan las formas comunes
+        candidatos = dois | {doi.lower() for doi in dois} | {doi.upper() for doi in dois}
+        condiciones = [Articulo.huella_titulo.in_({datos['huella'] for datos in lote})]
+        if candidatos:
+            condiciones.append(Articulo.doi.in_(candidatos))
+
+        existentes_doi, existentes_huella = set(), {}
+        for doi, huella_titulo in db.session.execute(
+            select(Articulo.doi, Articulo.huella_titulo).where(or_(*condiciones))
+        ):
+            doi = doi.lower() if doi else None
+            if doi:
+                existentes_doi.add(doi)
+            existentes_huella.setdefault(huella_titulo, set()).add(doi)
+        return existentes_doi, existentes_huella
+
+    def _escribir(self, lote):
+        """
+        Agrega al lote los artículos que no existen y hace flush.
+
+        Returns:
+            dict: Contadores del lote
+        """
+        contadores = dict(creados=0, duplicados=0, autores_nuevos=0, revistas_nuevas=0)
+        existentes_doi, existentes_huella = self._existentes(lote)
+
+        nuevos = []
+        for datos in lote:
+            dois = existentes_huella.get(datos['huella'], set())
+            if datos['doi'] in existentes_doi or (
+                dois and (not datos['doi'] or None in dois or datos['doi'] in dois)
+            ):
+                contadores['duplicados'] += 1
+            else:
+                nuevos.append(datos)
+        if not nuevos:
+            return contadores
+
+        # Autores de todo el lote en una sola resolución (cada nombre una vez
+        # por importación). Solo coincidencias exactas: nadie revisa un match
+        # aproximado y unir a dos personas distintas no se deshace solo
+        unicos = {}
+        for datos in nuevos:
+            for nombre, apellidos in datos['autores']:
+                clave = Autor.normalizar_texto(f"{nombre} {apellidos}")
+                if clave and clave not in self._autores:
+                    unicos.setdefault(clave, {'nombre': nombre, 'apellidos': apellidos})
+        autores = dict(self._autores)
+        for clave, (autor, es_nuevo) in zip(unicos, AutorMatchingService.resolver_lote(
+            list(unicos.values()), solo_exacto=True
+        )):
+            autores[clave] = autor
+            contadores['autores_nuevos'] += es_nuevo
+
+        with db.session.no_autoflush:
+            for datos in nuevos:
+                articulo = Articulo(
+                    tipo_produccion_id=self._tipos[datos['tipo']],
+                    estado_id=self._estado_id,
+                    archivo_origen=self.nombre_archivo,
+                    para_curriculum=True,
+                    activo=True,
+                    **datos['campos']
+                )
+                # Relaciones que usa calcular_completitud
+                articulo.tipo = db.session.get(TipoProduccion, articulo.tipo_produccion_id)
+                articulo.estado = db.session.get(Estado, articulo.estado_id)
+
+                if datos['tipo'] == bibliografia.ARTICULO:
+                    revista = self._revista(articulo.titulo_revista, articulo.issn, contadores)
+                    if isinstance(revista, Revista):
+                        articulo.revista = revista
+                    else:
+                        articulo.revista_id = revista
+                db.session.add(articulo)
+
+                # Un autor puede llegar como ID (lotes anteriores) o como objeto;
+                # los nuevos aún no tienen ID y se distinguen por identidad
+                agregados = set()
+                for nombre, apellidos in datos['autores']:
+                    autor = autores.get(Autor.normalizar_texto(f"{nombre} {apellidos}"))
+                    if autor is None:
+                        continue
+                    if isinstance(autor, Autor):
+                        clave, referencia = autor.id or id(autor), {'autor': autor}
+                    else:
+                        clave, referencia = autor, {'autor_id': autor}
+                    if clave in agregados:
+                        continue
+                    agregados.add(clave)
+                    db.session.add(ArticuloAutor(articulo=articulo, orden=len(agregados),
+                                                 **referencia))
+                articulo.calcular_completitud(num_autores=len(agregados))
+                contadores['creados'] += 1
+
+            db.session.flush()
+
+        # Autores y revistas quedan con su ID para los lotes siguientes (los
+        # objetos expiran con el commit)
+        self._autores.update({
+            clave: autor.id for clave, autor in autores.items() if isinstance(autor, Autor)
+        })
+        for mapa in (self._revistas_issn, self._revistas_nombre):
+            for clave, revista in mapa.items():
+                if isinstance(revista, Revista):
+                    mapa[clave] = revista.id
+        return contadores
+
+    def _revista(self, nombre, issn, contadores):
+        """
+        Revista por ISSN o nombre; si no existe y hay nombre, se crea.
+
+        Returns:
+            int (ID), Revista (nueva) o None
+        """
+        issn = issn.upper() if issn else None
+        if issn and issn in self._revistas_issn:
+            return self._revistas_issn[issn]
+        if not nombre:
+            return None
+        clave = huella(nombre)
+        if clave in self._revistas_nombre:
+            return self._revistas_nombre[clave]
+
+        revista = Revista(nombre=nombre, issn=issn, activo=True)
+        db.session.add(revista)
+        self._revistas_nombre[clave] = revista
+        if issn:
+            self._revistas_issn[issn] = revista
+        contadores['revistas_nuevas'] += 1
+        return revista
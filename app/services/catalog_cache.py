@@ -0,0 +1,125 @@
+"""
+Caché de lectura de catálogos (tipos, propósitos, LGAC, estados, revistas...).
+Los formularios y validaciones consultan estas tablas pequeñas en cada
+petición; el caché las sirve desde memoria y las recarga solo cuando
+cambia su versión en versiones_tabla (ver app.models.versiones).
+"""
+import logging
+import threading
+from collections import namedtuple
+
+from flask import current_app
+
+from app import db
+from app.models.versiones import VersionTabla
+
+logger = logging.getLogger(__name__)
+
+
+CatalogoEntrada = namedtuple('CatalogoEntrada', ['id', 'nombre', 'activo'])
+
+
+class _TablaCacheada:
+    """Contenido cacheado de una tabla en una versión dada."""
+
+    __slots__ = ('version', 'entradas', 'por_id')
+
+    def __init__(self, version, entradas):
+        self.version = version
+        self.entradas = entradas  # Ordenadas por nombre
+        self.por_id = {entrada.id: entrada for entrada in entradas}
+
+
+class CatalogCache:
+    """
+    Caché versionado de catálogos por aplicación.
+    Cualquier modelo con columnas id, nombre y activo puede cachearse.
+    """
+
+    def __init__(self):
+        """Inicializa el caché vacío."""
+        self._lock = threading.Lock()
+        self._tablas = {}  # nombre_tabla -> _TablaCacheada
+
+    def _cargar(self, modelo):
+        """
+        Obtiene el contenido vigente de la tabla del modelo,
+        recargándolo si su versión cambió.
+        """
+        nombre_tabla = modelo.__tablename__
+        version = VersionTabla.obtener(nombre_tabla)
+
+        cacheada = self._tablas.get(nombre_tabla)
+        if cacheada is not None and cacheada.version == version:
+            return cacheada
+
+        with self._lock:
+            cacheada = self._tablas.get(nombre_tabla)
+            if cacheada is not None and cacheada.version == version:
+                return cacheada
+
+            filas = db.session.execute(
+                db.select(modelo.id, modelo.nombre, modelo.activo).order_by(modelo.nombre)
+            ).all()
+            cacheada = _TablaCacheada(version, [CatalogoEntrada(*fila) for fila in filas])
+            self._tablas[nombre_tabla] = cacheada
+
+        logger.debug(f"Catálogo {nombre_tabla} cargado en caché (versión {version})")
+        return cacheada
+
+    def entradas(self, modelo, solo_activos=False):
+        """
+        Lista las entradas del catálogo ordenadas por nombre.
+
+        Args:
+            modelo: Clase del modelo (ej: Estado)
+            solo_activos: Si True, omite los registros inactivos
+
+        Returns:
+            list: Lista de CatalogoEntrada
+        """
+        entradas = self._cargar(modelo).entradas
+        if solo_activos:
+            return [entrada for entrada in entradas if entrada.activo]
+        return list(entradas)
+
+    def choices(self, modelo, solo_activos=False):
+        """
+        Opciones (id, nombre) para un SelectField.
+
+        Returns:
+            list: Lista de tuplas (id, nombre) ordenadas alfabéticamente
+        """
+        return [(e.id, e.nombre) for e in self.entradas(modelo, solo_activos)]
+
+    def get(self, modelo, registro_id):
+        """
+        Busca una entrada por ID.
+
+        Returns:
+            CatalogoEntrada o None si no existe
+        """
+        try:
+            registro_id = int(registro_id)
+        except (TypeError, ValueError):
+            return None
+        return self._cargar(modelo).por_id.get(registro_id)
+
+    def existe(self, modelo, registro_id):
+        """Indica si existe un registro con ese ID en el catálogo."""
+        return self.get(modelo, registro_id) is not None
+
+    def limpiar(self):
+        """Descarta todo el contenido cacheado."""
+        with self._lock:
+            self._tablas = {}
+
+
+def get_catalog_cache():
+    """
+    Obtiene el caché de catálogos de la aplicación actual.
+
+    Returns:
+        CatalogCache
+    """
+    return current_app.extensions.setdefault('catalog_cache', CatalogCache())
@@ -0,0 +1,172 @@
+"""
+Paquete de currículums del CA: un libro de Excel por miembro del cuerpo
+académico (Autor.es_miembro_ca) con sus artículos para currículum, todos en
+un solo ZIP.
+
+Los artículos de todos los miembros se leen en una sola pasada del cursor,
+con las relaciones precargadas por lote, y se reparten en memoria por
+autor. Los libros se construyen en paralelo en procesos aparte (openpyxl
+ocupa CPU y el GIL impide aprovechar threads) y el ZIP se entrega por
+bloques a medida que cada libro termina.
+"""
+import io
+import logging
+import multiprocessing
+import zipfile
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from sqlalchemy import select
+from werkzeug.utils import secure_filename
+
+from app import db
+from app.models.autor import Autor
+from app.models.relations import ArticuloAutor
+from app.services.excel_service import ExcelService
+from app.services.precarga_exportacion import PrecargaExportacion
+
+logger = logging.getLogger(__name__)
+
+
+# Miembro del CA incluido en el paquete y nombre de su libro dentro del ZIP
+Miembro = namedtuple('Miembro', ['id', 'nombre_completo', 'archivo'])
+
+
+def _renderizar_libro(nombre_completo, filas):
+    """Libro de Excel de un miembro; se ejecuta en un proceso del grupo."""
+    salida = io.BytesIO()
+    ExcelService().generate_rows(filas, destino=salida, metadatos=[('Autor:', nombre_completo)])
+    return salida.getvalue()
+
+
+class _SalidaZip:
+    """Destino no posicionable para ZipFile que guarda los bytes hasta leerlos."""
+
+    def __init__(self):
+        self._partes = []
+
+    def write(self, datos):
+        self._partes.append(bytes(datos))
+        return len(datos)
+
+    def flush(self):
+        pass
+
+    def vaciar(self):
+        datos = b''.join(self._partes)
+        self._partes = []
+        return datos
+
+
+class CurriculumBundleService:
+    """Genera el ZIP con un libro de Excel por miembro del CA."""
+
+    def __init__(self, max_procesos=2, tamano_lote=500):
+        """
+        Args:
+            max_procesos: Procesos que construyen libros a la vez (1 = en
+                el proceso actual)
+            tamano_lote: Artículos por lote de precarga (conviene igualar
+                el yield_per de la consulta)
+        """
+        self.max_procesos = max_procesos
+        self.tamano_lote = tamano_lote
+        self.excel_service = ExcelService()
+
+    @staticmethod
+    def miembros(autor_ids=()):
+        """
+        Miembros activos del CA, por apellidos.
+
+        Args:
+            autor_ids: Si se indica, solo esos autores
+
+        Returns:
+            list: Miembro(id, nombre_completo, archivo)
+        """
+        consulta = select(Autor.id, Autor.nombre, Autor.apellidos)\
+            .where(Autor.es_miembro_ca == True, Autor.activo == True)\
+            .order_by(Autor.apellidos, Autor.nombre, Autor.id)
+        if autor_ids:
+            consulta = consulta.where(Autor.id.in_(autor_ids))
+
+        miembros = []
+        for autor_id, nombre, apellidos in db.session.execute(consulta):
+            nombre_completo = f"{nombre} {apellidos}".strip()
+            archivo = secure_filename(f"curriculum_{autor_id}_{apellidos}_{nombre}") + '.xlsx'
+            miembros.append(Miembro(autor_id, nombre_completo, archivo))
+        return miembros
+
+    def repartir(self, articulos, miembros):
+        """
+        Reparte las filas de los artículos entre sus autores miembros del CA.
+
+        Args:
+            articulos: Iterable de Articulo en el orden de la exportación
+                (ej: Query.yield_per), ya limitado a artículos de miembros
+            miembros: Lista de Miembro
+
+        Returns:
+            dict: autor_id -> lista de filas (valores en el orden de
+            ExcelService.COLUMNS)
+        """
+        filas = {miembro.id: [] for miembro in miembros}
+        if not filas:
+            return filas
+
+        aa = ArticuloAutor.__table__
+        autores_de = {}
+        for articulo_id, autor_id in db.session.execute(
+            select(aa.c.articulo_id, aa.c.autor_id).where(aa.c.autor_id.in_(list(filas)))
+        ):
+            autores_de.setdefault(articulo_id, []).append(autor_id)
+
+        total = 0
+        for valores in self.excel_service.filas(articulos, PrecargaExportacion(), self.tamano_lote):
+            # La primera columna es el ID del artículo; la lista de valores se
+            # comparte entre los coautores miembros
+            for autor_id in autores_de.get(valores[0], ()):
+                filas[autor_id].append(valores)
+            total += 1
+
+        logger.info(f"Paquete de currículums: {total} artículos para {len(filas)} miembros")
+        return filas
+
+    def generar(self, miembros, filas):
+        """
+        Construye los libros y los entrega como un ZIP por bloques.
+
+        Args:
+            miembros: Lista de Miembro (un libro por miembro, aunque no
+                tenga artículos)
+            filas: Resultado de repartir(); se vacía a medida que se usa
+
+        Returns:
+            Iterador de bloques de bytes del ZIP
+        """
+        salida = _SalidaZip()
+        # Los .xlsx ya están comprimidos: se guardan sin volver a comprimir
+        with zipfile.ZipFile(salida, 'w', compression=zipfile.ZIP_STORED) as zip_file:
+            for archivo, contenido in self._libros(miembros, filas):
+                zip_file.writestr(archivo, contenido)
+                yield salida.vaciar()
+        yield salida.vaciar()
+
+    def _libros(self, miembros, filas):
+        """Pares (archivo, contenido) en el orden en que terminan los libros."""
+        if self.max_procesos <= 1 or len(miembros) <= 1:
+            for miembro in miembros:
+                yield miembro.archivo, _renderizar_libro(miembro.nombre_completo,
+                                                         filas.pop(miembro.id, []))
+            return
+
+        # spawn: los procesos no heredan threads ni conexiones de la aplicación
+        with ProcessPoolExecutor(max_workers=min(self.max_procesos, len(miembros)),
+                                 mp_context=multiprocessing.get_context('spawn')) as grupo:
+            futuros = {
+                grupo.submit(_renderizar_libro, miembro.nombre_completo,
+                             filas.pop(miembro.id, [])): miembro
+                for miembro in miembros
+            }
+            for futuro in as_completed(futuros):
+                yield futuros[futuro].archivo, futuro.result()
@@ -0,0 +1,694 @@
+"""
+Importación masiva de artículos desde hojas de Excel.
+Acepta la plantilla institucional del CA (docs/MAPEO_EXCEL.md) y el archivo
+de la propia exportación. La hoja se lee por flujo (openpyxl read_only) y
+cada fila se resuelve contra mapas en memoria de catálogos, revistas,
+autores y artículos existentes, cargados una vez por importación; las filas
+se escriben en lotes con una transacción por lote.
+
+Un artículo que ya existe (mismo DOI o misma huella de título) se actualiza
+en lugar de duplicarse. Las filas con errores se reportan con su número de
+fila y no detienen la importación.
+"""
+import logging
+import os
+import re
+import zipfile
+from datetime import date, datetime
+
+from openpyxl import load_workbook
+from openpyxl.utils.exceptions import InvalidFileException
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.models.articulo import Articulo
+from app.models.autor import Autor
+from app.models.catalogs import Estado, Indexacion, LGAC, Pais, Proposito, TipoProduccion
+from app.models.relations import ArticuloAutor, ArticuloIndexacion
+from app.models.revista import Revista
+from app.services.autor_matching import AutorMatchingService
+from app.services.catalog_cache import get_catalog_cache
+from app.utils.huella import huella
+
+logger = logging.getLogger(__name__)
+
+
+class FilaInvalida(ValueError):
+    """Una fila de la hoja no se puede importar."""
+
+    def __init__(self, errores):
+        super().__init__('; '.join(errores))
+        self.errores = errores
+
+
+class ExcelImportService:
+    """
+    Importa artículos desde un archivo .xlsx.
+    Se crea una instancia por importación (los mapas en memoria son de esa
+    importación).
+    """
+
+    # Campo -> encabezados aceptados (plantilla del CA y exportación)
+    COLUMNAS = {
+        'tipo_produccion': ('Tipo de producción',),
+        'titulo': ('Título del artículo', 'Título'),
+        'autores': ('Autor(es) participante(s)', 'Autores'),
+        'registro': ('Registro del autor',),
+        'titulo_revista': ('Título de la revista', 'Revista'),
+        'editorial': ('Editorial',),
+        'issn': ('ISSN',),
+        'volumen': ('Volumen',),
+        'numero': ('Número',),
+        'pagina_inicio': ('Página inicial',),
+        'pagina_fin': ('Página final',),
+        'anio_publicacion': ('Año',),
+        'pais': ('País',),
+        'lgac': ('LGAC',),
+        'indexaciones': ('Indexación', 'Indexaciones'),
+        'estado': ('Estado actual', 'Estado'),
+        'descripcion': ('Descripción', 'Descripción/Resumen'),
+        'url': ('Dirección electrónica', 'URL'),
+        'proposito': ('Propósito del artículo', 'Propósito'),
+        'para_curriculum': ('Considera para curriculum del CA', 'Para Currículum'),
+        'nombre_congreso': ('Nombre del congreso', 'Congreso'),
+        'doi': ('DOI',),
+    }
+
+    COLUMNAS_OBLIGATORIAS = ('titulo', 'tipo_produccion', 'estado')
+
+    # Grados y tratamientos antes del nombre ("Dr. Juan Pérez", "Pérez, Dra. Ana")
+    TITULOS = re.compile(
+        r'(^|,)\s*(?:(?:dra?|mtr[oa]|ing|lic|profa?|m\.\s?c|ph\.\s?d)\.?\s+)+',
+        re.IGNORECASE
+    )
+
+    # Columnas que se copian tal cual (texto) al artículo
+    CAMPOS_TEXTO = ('titulo', 'titulo_revista', 'volumen', 'numero', 'descripcion',
+                    'url', 'nombre_congreso')
+
+    # Catálogos con su campo en el artículo y su nombre en los mensajes
+    CATALOGOS = {
+        'tipo_produccion': (TipoProduccion, 'tipo_produccion_id', 'Tipo de producción'),
+        'estado': (Estado, 'estado_id', 'Estado'),
+        'lgac': (LGAC, 'lgac_id', 'LGAC'),
+        'proposito': (Proposito, 'proposito_id', 'Propósito'),
+    }
+
+    # Filas donde se busca el encabezado (la plantilla puede tener un título arriba)
+    MAX_FILAS_ENCABEZADO = 10
+
+    _PREFIJO_VOLUMEN = re.compile(r'^(?:volumen|vol\.?|v\.)\s*(?=\d)', re.IGNORECASE)
+    _PREFIJO_NUMERO = re.compile(r'^(?:n[uú]mero|n[uú]m\.?|no\.?|n\.|#)\s*(?=\d)', re.IGNORECASE)
+    _PREFIJO_DOI = re.compile(r'^(?:https?://(?:dx\.)?doi\.org/|doi:\s*)', re.IGNORECASE)
+
+    _SI = {'si', 's', 'yes', 'y', 'true', 'verdadero', '1', 'x'}
+    _NO = {'no', 'n', 'false', 'falso', '0'}
+
+    def __init__(self, tamano_lote=500):
+        """
+        Args:
+            tamano_lote: Filas por transacción
+        """
+        self.tamano_lote = tamano_lote
+        self._encabezados = {
+            huella(alias): campo
+            for campo, aliases in self.COLUMNAS.items()
+            for alias in aliases
+        }
+
+    # === Entrada ===
+
+    def importar(self, archivo, nombre_archivo=None):
+        """
+        Importa los artículos de la hoja activa del libro.
+
+        Args:
+            archivo: Ruta o archivo binario abierto (.xlsx)
+            nombre_archivo: Nombre que se guarda como archivo_origen de los
+                artículos nuevos
+
+        Returns:
+            dict: total, creados, actualizados, autores_nuevos,
+            revistas_nuevas, errores (lista de {'fila', 'errores'}) y
+            columnas_ignoradas
+
+        Raises:
+            ValueError: Si el archivo no es un .xlsx o le faltan columnas
+                obligatorias
+        """
+        try:
+            libro = load_workbook(archivo, read_only=True, data_only=True)
+        except (InvalidFileException, zipfile.BadZipFile, KeyError, OSError) as e:
+            raise ValueError(f"El archivo no es un libro de Excel válido (.xlsx): {e}") from None
+
+        if nombre_archivo is None and isinstance(archivo, (str, os.PathLike)):
+            nombre_archivo = os.path.basename(archivo)
+        self.nombre_archivo = nombre_archivo
+        resultado = {
+            'total': 0,
+            'creados': 0,
+            'actualizados': 0,
+            'autores_nuevos': 0,
+            'revistas_nuevas': 0,
+            'errores': [],
+            'columnas_ignoradas': [],
+        }
+
+        try:
+            filas = libro.active.iter_rows(values_only=True)
+            columnas = self._leer_encabezado(filas, resultado)
+            self._cargar_mapas()
+
+            lote, claves_lote = [], set()
+            for numero, valores in enumerate(filas, start=self._fila_encabezado + 1):
+                crudos = {campo: valores[indice] for indice, campo in columnas
+                          if indice < len(valores)}
+                if all(valor is None or (isinstance(valor, str) and not valor.strip())
+                       for valor in crudos.values()):
+                    continue
+
+                resultado['total'] += 1
+                try:
+                    datos = self._preparar(numero, crudos)
+                except FilaInvalida as e:
+                    resultado['errores'].append({'fila': numero, 'errores': e.errores})
+                    continue
+
+                # Dos filas del mismo artículo no van en el mismo lote: la
+                # segunda debe encontrar el artículo que creó la primera
+                if datos['claves'] & claves_lote:
+                    self._confirmar(lote, resultado)
+                    lote, claves_lote = [], set()
+                    datos['destino'] = self._buscar_articulo(datos['doi'], datos['huella'])
+
+                lote.append(datos)
+                claves_lote |= datos['claves']
+                if len(lote) >= self.tamano_lote:
+                    self._confirmar(lote, resultado)
+                    lote, claves_lote = [], set()
+
+            self._confirmar(lote, resultado)
+        finally:
+            libro.close()
+
+        logger.info(
+            f"Importación de {self.nombre_archivo or 'Excel'}: {resultado['total']} filas, "
+            f"{resultado['creados']} creados, {resultado['actualizados']} actualizados, "
+            f"{len(resultado['errores'])} con errores"
+        )
+        return resultado
+
+    def _leer_encabezado(self, filas, resultado):
+        """
+        Busca la fila de encabezados entre las primeras filas.
+
+        Returns:
+            list: Pares (índice de columna, campo)
+        """
+        for numero, valores in enumerate(filas, start=1):
+            columnas, ignoradas, vistos = [], [], set()
+            for indice, valor in enumerate(valores):
+                if valor is None or not str(valor).strip():
+                    continue
+                campo = self._encabezados.get(huella(valor))
+                if campo is None or campo in vistos:
+                    ignoradas.append(str(valor).strip())
+                else:
+                    columnas.append((indice, campo))
+                    vistos.add(campo)
+
+            if 'titulo' in vistos:
+                faltantes = [self.COLUMNAS[campo][0] for campo in self.COLUMNAS_OBLIGATORIAS
+                             if campo not in vistos]
+                if faltantes:
+                    raise ValueError(f"Faltan columnas obligatorias: {', '.join(faltantes)}")
+                self._fila_encabezado = numero
+                self._columnas = vistos
+                resultado['columnas_ignoradas'] = ignoradas
+                return columnas
+
+            if numero >= self.MAX_FILAS_ENCABEZADO:
+                break
+
+        raise ValueError(
+            f"No se encontró la fila de encabezados (columna '{self.COLUMNAS['titulo'][0]}') "
+            f"en las primeras {self.MAX_FILAS_ENCABEZADO} filas"
+        )
+
+    # === Mapas en memoria ===
+
+    def _cargar_mapas(self):
+        """
+        Carga los mapas de búsqueda (una consulta por tabla). Los registros
+        creados durante la importación se agregan a los mapas.
+        """
+        catalog_cache = get_catalog_cache()
+        self._catalogos = {}
+        for modelo in (TipoProduccion, Estado, LGAC, Proposito, Pais):
+            mapa = {}
+            # Los activos tienen preferencia sobre un inactivo del mismo nombre
+            for entrada in sorted(catalog_cache.entradas(modelo), key=lambda e: not e.activo):
+                mapa.setdefault(huella(entrada.nombre), entrada.id)
+            self._catalogos[modelo] = mapa
+
+        self._indexaciones = {}
+        for indexacion_id, nombre, acronimo in db.session.execute(
+            select(Indexacion.id, Indexacion.nombre, Indexacion.acronimo)
+            .order_by(Indexacion.activo.desc(), Indexacion.id)
+        ):
+            self._indexaciones.setdefault(huella(nombre), indexacion_id)
+            if acronimo:
+                self._indexaciones.setdefault(huella(acronimo), indexacion_id)
+
+        self._revistas_issn, self._revistas_nombre = {}, {}
+        for revista_id, nombre, issn, issn_electronico in db.session.execute(
+            select(Revista.id, Revista.nombre, Revista.issn, Revista.issn_electronico)
+            .order_by(Revista.activo.desc(), Revista.id)
+        ):
+            for clave in (issn, issn_electronico):
+                if clave:
+                    self._revistas_issn.setdefault(clave.upper(), revista_id)
+            self._revistas_nombre.setdefault(huella(nombre), revista_id)
+
+        self._autores_nombre, self._autores_registro = {}, {}
+        self._autores_con_registro = set()
+        for autor_id, normalizado, registro in db.session.execute(
+            select(Autor.id, Autor.nombre_normalizado, Autor.registro)
+            .order_by(Autor.activo.desc(), Autor.id)
+        ):
+            if normalizado:
+                self._autores_nombre.setdefault(normalizado, autor_id)
+            if registro:
+                self._autores_registro.setdefault(registro.strip(), autor_id)
+                self._autores_con_registro.add(autor_id)
+
+        # huella -> (id, doi en minúsculas) para no confundir artículos con el
+        # mismo título y distinto DOI
+        self._articulos_doi, self._articulos_huella = {}, {}
+        for articulo_id, doi, titulo in db.session.execute(
+            select(Articulo.id, Articulo.doi, Articulo.titulo).order_by(Articulo.id)
+        ):
+            doi = doi.lower() if doi else None
+            if doi:
+                self._articulos_doi[doi] = articulo_id
+            self._articulos_huella.setdefault(huella(titulo), (articulo_id, doi))
+
+        # Registros creados en el lote en curso: (mapa, clave, objeto)
+        self._pendientes = []
+
+    def _registrar(self, mapa, clave, objeto, valor=None):
+        """Agrega un registro nuevo (aún sin ID) a un mapa."""
+        mapa[clave] = objeto if valor is None else valor
+        self._pendientes.append((mapa, clave, objeto))
+
+    def _consolidar(self):
+        """Reemplaza en los mapas los objetos nuevos por su ID (después del flush)."""
+        for mapa, clave, objeto in self._pendientes:
+            valor = mapa[clave]
+            mapa[clave] = (objeto.id, valor[1]) if isinstance(valor, tuple) else objeto.id
+        self._pendientes = []
+
+    def _buscar_articulo(self, doi, huella_titulo):
+        """
+        Artículo existente de la fila: por DOI, o por huella del título si
+        el artículo encontrado no tiene un DOI distinto.
+
+        Returns:
+            int (ID), Articulo (creado en esta importación) o None
+        """
+        if doi and doi in self._articulos_doi:
+            return self._articulos_doi[doi]
+        encontrado = self._articulos_huella.get(huella_titulo)
+        if encontrado and (not doi or not encontrado[1] or encontrado[1] == doi):
+            return encontrado[0]
+        return None
+
+    # === Lectura de filas ===
+
+    def _preparar(self, numero, crudos):
+        """
+        Convierte y valida los valores de una fila (sin escribir nada).
+
+        Returns:
+            dict: fila, campos del artículo, autores, indexaciones, revista,
+            doi, huella, claves y destino
+
+        Raises:
+            FilaInvalida: Con la lista de errores de la fila
+        """
+        errores = []
+        campos = {}
+
+        def convertir(campo, conversion):
+            try:
+                return conversion(crudos.get(campo))
+            except ValueError as e:
+                errores.append(f"{self.COLUMNAS[campo][0]}: {e}")
+                return None
+
+        for campo in self.CAMPOS_TEXTO:
+            if campo in self._columnas:
+                campos[campo] = self._texto(crudos.get(campo))
+
+        if 'volumen' in campos and campos['volumen']:
+            campos['volumen'] = self._PREFIJO_VOLUMEN.sub('', campos['volumen'])
+        if 'numero' in campos and campos['numero']:
+            campos['numero'] = self._PREFIJO_NUMERO.sub('', campos['numero'])
+
+        for campo in ('anio_publicacion', 'pagina_inicio', 'pagina_fin'):
+            if campo in self._columnas:
+                campos[campo] = convertir(campo, self._entero)
+
+        if 'para_curriculum' in self._columnas:
+            campos['para_curriculum'] = convertir('para_curriculum', self._booleano)
+
+        if 'doi' in self._columnas:
+            doi = self._texto(crudos.get('doi'))
+            campos['doi'] = self._PREFIJO_DOI.sub('', doi) if doi else None
+        if 'issn' in self._columnas:
+            campos['issn'] = self._issn(crudos.get('issn'))
+
+        if not campos.get('titulo'):
+            errores.append('El título es obligatorio')
+
+        for campo, (modelo, atributo, etiqueta) in self.CATALOGOS.items():
+            if campo not in self._columnas:
+                continue
+            nombre = self._texto(crudos.get(campo))
+            if not nombre:
+                if campo in self.COLUMNAS_OBLIGATORIAS:
+                    errores.append(f"{etiqueta}: es obligatorio")
+                campos[atributo] = None
+                continue
+            campos[atributo] = self._catalogos[modelo].get(huella(nombre))
+            if campos[atributo] is None:
+                errores.append(f"{etiqueta}: '{nombre}' no existe en el catálogo")
+
+        indexacion_ids = None
+        if 'indexaciones' in self._columnas:
+            indexacion_ids = []
+            for nombre in self._separar(self._texto(crudos.get('indexaciones'))):
+                indexacion_id = self._indexaciones.get(huella(nombre))
+                if indexacion_id is None:
+                    errores.append(f"Indexación: '{nombre}' no existe en el catálogo")
+                elif indexacion_id not in indexacion_ids:
+                    indexacion_ids.append(indexacion_id)
+
+        pais_id = None
+        pais = self._texto(crudos.get('pais'))
+        if pais:
+            pais_id = self._catalogos[Pais].get(huella(pais))
+            if pais_id is None:
+                errores.append(f"País: '{pais}' no existe en el catálogo")
+
+        autores = None
+        if 'autores' in self._columnas:
+            nombres = self._separar(self._texto(crudos.get('autores')))
+            registros = self._separar(self._texto(crudos.get('registro')))
+            autores = [(nombre, registros[posicion] if posicion < len(registros) else None)
+                       for posicion, nombre in enumerate(nombres)]
+
+        # Validaciones del modelo sobre un artículo transitorio
+        _, errores_modelo = Articulo(**{
+            campo: campos.get(campo)
+            for campo in ('doi', 'issn', 'anio_publicacion', 'pagina_inicio', 'pagina_fin')
+        }).validar()
+        errores.extend(errores_modelo)
+
+        if errores:
+            raise FilaInvalida(errores)
+
+        doi = campos['doi'].lower() if campos.get('doi') else None
+        huella_titulo = huella(campos['titulo'])
+        claves = {('huella', huella_titulo)}
+        if doi:
+            claves.add(('doi', doi))
+
+        return {
+            'fila': numero,
+            'campos': campos,
+            'autores': autores,
+            'indexacion_ids': indexacion_ids,
+            'revista': {
+                'nombre': campos.get('titulo_revista'),
+                'issn': campos.get('issn'),
+                'editorial': self._texto(crudos.get('editorial')),
+                'pais_id': pais_id,
+            },
+            'doi': doi,
+            'huella': huella_titulo,
+            'claves': claves,
+            'destino': self._buscar_articulo(doi, huella_titulo),
+        }
+
+    @staticmethod
+    def _texto(valor):
+        """Texto de una celda sin espacios sobrantes (None si está vacía)."""
+        if valor is None:
+            return None
+        if isinstance(valor, float) and valor.is_integer():
+            valor = int(valor)
+        elif isinstance(valor, (datetime, date)):
+            valor = valor.isoformat()
+        texto = re.sub(r'\s+', ' ', str(valor)).strip()
+        return texto or None
+
+    @classmethod
+    def _entero(cls, valor):
+        if valor is None or isinstance(valor, bool):
+            return None
+        if isinstance(valor, float):
+            if not valor.is_integer():
+                raise ValueError(f"'{valor}' no es un número entero")
+            return int(valor)
+        if isinstance(valor, int):
+            return valor
+        texto = cls._texto(valor)
+        if texto is None:
+            return None
+        try:
+            return int(float(texto))
+        except ValueError:
+            raise ValueError(f"'{texto}' no es un número entero") from None
+
+    @classmethod
+    def _booleano(cls, valor):
+        """Sí/No de la plantilla; vacío es Sí (valor por omisión del CA)."""
+        if isinstance(valor, bool):
+            return valor
+        texto = huella(cls._texto(valor))
+        if not texto:
+            return True
+        if texto in cls._SI:
+            return True
+        if texto in cls._NO:
+            return False
+        raise ValueError(f"'{valor}' no es Sí/No")
+
+    @classmethod
+    def _issn(cls, valor):
+        texto = cls._texto(valor)
+        if not texto:
+            return None
+        texto = texto.upper().replace(' ', '')
+        if re.fullmatch(r'\d{7}[\dX]', texto):
+            texto = f'{texto[:4]}-{texto[4:]}'
+        return texto
+
+    @staticmethod
+    def _separar(texto):
+        """Lista separada por punto y coma o, si no hay, por comas."""
+        if not texto:
+            return []
+        separador = ';' if ';' in texto else ','
+        return [parte.strip() for parte in texto.split(separador) if parte.strip()]
+
+    # === Escritura por lotes ===
+
+    def _confirmar(self, lote, resultado):
+        """
+        Escribe un lote en una transacción. Si falla, se reintenta fila por
+        fila para reportar solo las filas con error.
+        """
+        if not lote:
+            return
+
+        try:
+            contadores = self._escribir(lote)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            # Los mapas pueden tener registros del lote descartado
+            self._cargar_mapas()
+            if len(lote) == 1:
+                logger.warning(f"Fila {lote[0]['fila']} no importada: {e}")
+                resultado['errores'].append({'fila': lote[0]['fila'],
+                                             'errores': [self._mensaje_error(e)]})
+            else:
+                for datos in lote:
+                    datos['destino'] = self._buscar_articulo(datos['doi'], datos['huella'])
+                    self._confirmar([datos], resultado)
+            return
+
+        for clave, cantidad in contadores.items():
+            resultado[clave] += cantidad
+
+    def _escribir(self, lote):
+        """
+        Aplica las filas del lote a la sesión y hace flush.
+
+        Returns:
+            dict: Contadores del lote
+        """
+        contadores = dict(creados=0, actualizados=0, autores_nuevos=0, revistas_nuevas=0)
+        existentes = {}
+        ids = [datos['destino'] for datos in lote if isinstance(datos['destino'], int)]
+        if ids:
+            existentes = {articulo.id: articulo
+                          for articulo in Articulo.query.filter(Articulo.id.in_(ids))}
+            # Autores e indexaciones se reemplazan por los de la hoja
+            if 'autores' in self._columnas:
+                db.session.execute(delete(ArticuloAutor).where(ArticuloAutor.articulo_id.in_(ids)))
+            if 'indexaciones' in self._columnas:
+                db.session.execute(
+                    delete(ArticuloIndexacion).where(ArticuloIndexacion.articulo_id.in_(ids))
+                )
+
+        registros = {}  # autor_id -> registro para autores existentes sin registro
+        with db.session.no_autoflush:
+            for datos in lote:
+                destino = datos['destino']
+                if destino is None:
+                    articulo = Articulo(archivo_origen=self.nombre_archivo, activo=True)
+                    db.session.add(articulo)
+                    self._registrar(self._articulos_huella, datos['huella'], articulo,
+                                    (articulo, datos['doi']))
+                    if datos['doi']:
+                        self._registrar(self._articulos_doi, datos['doi'], articulo)
+                    contadores['creados'] += 1
+                else:
+                    articulo = existentes[destino]
+                    articulo.activo = True
+                    contadores['actualizados'] += 1
+
+                self._aplicar(articulo, datos, contadores, registros)
+
+            db.session.flush()
+
+        if registros:
+            db.session.execute(update(Autor), [
+                {'id': autor_id, 'registro': registro} for autor_id, registro in registros.items()
+            ])
+            self._autores_con_registro.update(registros)
+
+        self._consolidar()
+        return contadores
+
+    def _aplicar(self, articulo, datos, contadores, registros):
+        """Copia los datos de la fila al artículo y reemplaza sus relaciones."""
+        for campo, valor in datos['campos'].items():
+            setattr(articulo, campo, valor)
+        if articulo.para_curriculum is None:
+            articulo.para_curriculum = True
+
+        # Relaciones que usa calcular_completitud (los objetos pendientes no
+        # las cargan a partir de la llave foránea)
+        articulo.tipo = db.session.get(TipoProduccion, articulo.tipo_produccion_id)
+        articulo.estado = db.session.get(Estado, articulo.estado_id)
+
+        if 'titulo_revista' in self._columnas or 'issn' in self._columnas:
+            revista = self._revista(datos['revista'], contadores)
+            if isinstance(revista, Revista):
+                articulo.revista = revista
+            else:
+                articulo.revista_id = revista
+
+        enlace = {'articulo_id': articulo.id} if articulo.id else {'articulo': articulo}
+
+        num_autores = None
+        if datos['autores'] is not None:
+            autores = []
+            for nombre, registro in datos['autores']:
+                autor = self._autor(nombre, registro, contadores, registros)
+                if autor is not None and not any(autor is otro for otro in autores):
+                    autores.append(autor)
+            for orden, autor in enumerate(autores, start=1):
+                referencia = {'autor': autor} if isinstance(autor, Autor) else {'autor_id': autor}
+                db.session.add(ArticuloAutor(orden=orden, **enlace, **referencia))
+            num_autores = len(autores)
+
+        if datos['indexacion_ids'] is not None:
+            for indexacion_id in datos['indexacion_ids']:
+                db.session.add(ArticuloIndexacion(indexacion_id=indexacion_id, **enlace))
+
+        articulo.calcular_completitud(num_autores=num_autores)
+
+    def _revista(self, datos, contadores):
+        """
+        Revista de la fila por ISSN o nombre; si no existe y hay nombre, se crea.
+
+        Returns:
+            int (ID), Revista (nueva) o None
+        """
+        issn = datos['issn'].upper() if datos['issn'] else None
+        if issn and issn in self._revistas_issn:
+            return self._revistas_issn[issn]
+
+        nombre = datos['nombre']
+        if not nombre:
+            return None
+        clave = huella(nombre)
+        if clave in self._revistas_nombre:
+            return self._revistas_nombre[clave]
+
+        revista = Revista(nombre=nombre, issn=issn, editorial=datos['editorial'],
+                          pais_id=datos['pais_id'], activo=True)
+        db.session.add(revista)
+        self._registrar(self._revistas_nombre, clave, revista)
+        if issn:
+            self._registrar(self._revistas_issn, issn, revista)
+        contadores['revistas_nuevas'] += 1
+        return revista
+
+    def _autor(self, texto, registro, contadores, registros):
+        """
+        Autor por registro institucional o nombre normalizado (sin grados
+        como "Dr." o "Mtra."); si no existe, se crea.
+
+        Returns:
+            int (ID), Autor (nuevo) o None si el texto no tiene nombre
+        """
+        if registro and registro in self._autores_registro:
+            return self._autores_registro[registro]
+
+        # Misma llave que nombre_normalizado ("Nombre Apellidos"), también
+        # para el formato "Apellidos, Nombre"
+        nombre, apellidos = AutorMatchingService.parsear_nombre_autor(
+            self.TITULOS.sub(r'\1 ', texto).strip()
+        )
+        normalizado = Autor.normalizar_texto(f"{nombre} {apellidos}")
+        if not normalizado:
+            return None
+
+        autor = self._autores_nombre.get(normalizado)
+        if autor is None:
+            autor = Autor(nombre=nombre, apellidos=apellidos, registro=registro,
+                          es_miembro_ca=False, activo=True)
+            autor.actualizar_nombre_normalizado()
+            db.session.add(autor)
+            self._registrar(self._autores_nombre, normalizado, autor)
+            if registro:
+                self._registrar(self._autores_registro, registro, autor)
+            contadores['autores_nuevos'] += 1
+        elif registro and isinstance(autor, int) and autor not in self._autores_con_registro:
+            # Autor existente sin registro: se completa con el de la hoja
+            registros.setdefault(autor, registro)
+            self._autores_registro[registro] = autor
+        return autor
+
+    @staticmethod
+    def _mensaje_error(error):
+        if isinstance(error, IntegrityError):
+            return f"Registro duplicado o inválido: {error.orig}"
+        return str(error)
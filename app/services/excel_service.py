@@ -3,12 +3,15 @@ Servicio para generación de archivos Excel con formato institucional.
 Exporta artículos académicos con todas sus relaciones y metadatos.
 """
 from datetime import datetime
-from typing import List, Optional
+from typing import BinaryIO, Iterable, Iterator, Optional
 from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils import get_column_letter
-from io import BytesIO
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
 import logging
+import tempfile
+
+from app.models.catalogs import Estado, LGAC, Proposito, TipoProduccion
+from app.services.precarga_exportacion import lotes
 
 logger = logging.getLogger(__name__)
 
@@ -42,178 +45,240 @@ class ExcelService:
     COLOR_HEADER = 'FF1F4E78'  # Azul institucional
     COLOR_ALT_ROW = 'FFE7E6E6'  # Gris claro para filas alternas
     
+    # Columnas centradas (ID, año e indicadores Sí/No)
+    COLUMNAS_CENTRADAS = ('ID', 'Año', 'Para Currículum', 'Completo')
+    
+    # Tamaño a partir del cual el archivo temporal pasa de memoria a disco
+    MAX_EN_MEMORIA = 1024 * 1024
+    
     def __init__(self):
         """Inicializa el servicio."""
         self.logger = logger
     
-    def generate(self, articulos: List, filename: Optional[str] = None) -> BytesIO:
+    def generate(self, articulos: Iterable, destino: Optional[BinaryIO] = None,
+                 precarga=None, tamano_lote: int = 500) -> BinaryIO:
         """
         Genera archivo Excel con los artículos proporcionados.
         
+        La hoja se escribe en modo write_only: cada fila se envía al archivo
+        en cuanto se construye y todas las celdas comparten unos pocos
+        estilos con nombre, por lo que la memoria no crece con el número de
+        artículos si estos llegan de un cursor (ej: Query.yield_per).
+        
         Args:
-            articulos: Lista de objetos Articulo
-            filename: Nombre base del archivo (opcional)
+            articulos: Iterable de objetos Articulo
+            destino: Archivo binario donde escribir (por defecto, un archivo
+                temporal que pasa a disco al superar MAX_EN_MEMORIA)
+            precarga: PrecargaExportacion para leer catálogos, indexaciones
+                y países por lotes de tamano_lote artículos; sin ella se
+                recorren las relaciones de cada artículo
+            tamano_lote: Artículos por lote (conviene igualar el yield_per
+                de la consulta)
             
         Returns:
-            BytesIO con el contenido del archivo Excel
+            El archivo destino, posicionado al inicio (listo para send_file)
         """
-        try:
-            # Crear workbook
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "Artículos Académicos"
-            
-            # Configurar encabezados
-            self._setup_headers(ws)
-            
-            # Agregar datos
-            self._add_data(ws, articulos)
+        return self._generar(self.filas(articulos, precarga, tamano_lote), destino)
+    
+    def generate_rows(self, filas: Iterable, destino: Optional[BinaryIO] = None,
+                      metadatos: Iterable = ()) -> BinaryIO:
+        """
+        Genera el archivo Excel a partir de filas ya calculadas con filas()
+        (ej: en otro proceso, sin acceso a la base de datos).
+        
+        Args:
+            filas: Iterable de listas de valores en el orden de COLUMNS
+            destino: Archivo binario donde escribir (ver generate)
+            metadatos: Pares (etiqueta, valor) adicionales para la hoja de
+                información del reporte
             
-            # Aplicar formato
-            self._apply_formatting(ws, len(articulos))
+        Returns:
+            El archivo destino, posicionado al inicio
+        """
+        return self._generar(filas, destino, metadatos)
+    
+    def _generar(self, filas, destino=None, metadatos=()):
+        salida = destino if destino is not None else \
+            tempfile.SpooledTemporaryFile(max_size=self.MAX_EN_MEMORIA)
+        
+        try:
+            wb = Workbook(write_only=True)
+            estilos = self._registrar_estilos(wb)
             
-            # Agregar metadatos
-            self._add_metadata(wb, len(articulos))
+            ws = wb.create_sheet("Artículos Académicos")
+            self._setup_headers(ws, estilos)
+            num_articulos = self._add_data(ws, filas, estilos)
+            self._add_metadata(wb, num_articulos, metadatos)
             
-            # Guardar en BytesIO
-            output = BytesIO()
-            wb.save(output)
-            output.seek(0)
+            wb.save(salida)
+            salida.seek(0)
             
-            self.logger.info(f"Excel generado exitosamente con {len(articulos)} artículos")
-            return output
+            self.logger.info(f"Excel generado exitosamente con {num_articulos} artículos")
+            return salida
             
         except Exception as e:
             self.logger.error(f"Error generando Excel: {str(e)}")
+            if destino is None:
+                salida.close()
             raise
     
-    def _setup_headers(self, ws):
-        """Configura los encabezados de las columnas."""
-        # Estilos de encabezado
-        header_font = Font(bold=True, color='FFFFFF', size=11)
-        header_fill = PatternFill(start_color=self.COLOR_HEADER, 
-                                   end_color=self.COLOR_HEADER, 
-                                   fill_type='solid')
-        header_alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
+    def _registrar_estilos(self, wb) -> dict:
+        """
+        Registra en el libro los estilos con nombre que usan las celdas.
         
-        # Aplicar encabezados
-        for col_letter, col_name, col_width in self.COLUMNS:
-            cell = ws[f'{col_letter}1']
-            cell.value = col_name
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = header_alignment
-            
-            # Ajustar ancho de columna
+        Returns:
+            dict: {(fila_alterna, centrada): nombre_estilo} y 'encabezado'
+        """
+        borde = Border(left=Side(style='thin'), right=Side(style='thin'),
+                       top=Side(style='thin'), bottom=Side(style='thin'))
+        relleno_alterno = PatternFill(start_color=self.COLOR_ALT_ROW,
+                                      end_color=self.COLOR_ALT_ROW, fill_type='solid')
+        
+        wb.add_named_style(NamedStyle(
+            name='encabezado',
+            font=Font(bold=True, color='FFFFFF', size=11),
+            fill=PatternFill(start_color=self.COLOR_HEADER, end_color=self.COLOR_HEADER,
+                             fill_type='solid'),
+            alignment=Alignment(horizontal='center', vertical='center', wrap_text=True)
+        ))
+        
+        estilos = {'encabezado': 'encabezado'}
+        for alterna in (False, True):
+            for centrada in (False, True):
+                nombre = 'dato' + ('_alterno' if alterna else '') + ('_centrado' if centrada else '')
+                wb.add_named_style(NamedStyle(
+                    name=nombre,
+                    border=borde,
+                    fill=relleno_alterno if alterna else PatternFill(),
+                    alignment=Alignment(horizontal='center', vertical='center') if centrada
+                    else Alignment(vertical='top', wrap_text=True)
+                ))
+                estilos[(alterna, centrada)] = nombre
+        
+        return estilos
+    
+    def _setup_headers(self, ws, estilos: dict):
+        """Configura anchos, encabezados y la fila congelada."""
+        for col_letter, _, col_width in self.COLUMNS:
             ws.column_dimensions[col_letter].width = col_width
         
         # Congelar primera fila
         ws.freeze_panes = 'A2'
+        
+        encabezados = []
+        for _, col_name, _ in self.COLUMNS:
+            cell = WriteOnlyCell(ws, value=col_name)
+            cell.style = estilos['encabezado']
+            encabezados.append(cell)
+        ws.append(encabezados)
     
-    def _add_data(self, ws, articulos: List):
-        """Agrega los datos de los artículos al worksheet."""
-        for idx, articulo in enumerate(articulos, start=2):
-            try:
-                # Obtener datos relacionados
-                autores = self._get_autores(articulo)
-                lgacs = self._get_lgacs(articulo)
-                propositos = self._get_propositos(articulo)
-                indexaciones = self._get_indexaciones(articulo)
-                
-                # Llenar fila
-                ws[f'A{idx}'] = articulo.id
-                ws[f'B{idx}'] = articulo.titulo or ''
-                ws[f'C{idx}'] = autores
-                ws[f'D{idx}'] = articulo.anio_publicacion or ''
-                ws[f'E{idx}'] = articulo.titulo_revista or ''
-                ws[f'F{idx}'] = articulo.nombre_congreso or ''
-                ws[f'G{idx}'] = articulo.issn or ''
-                ws[f'H{idx}'] = articulo.doi or ''
-                ws[f'I{idx}'] = articulo.tipo.nombre if articulo.tipo else ''
-                ws[f'J{idx}'] = articulo.estado.nombre if articulo.estado else ''
-                ws[f'K{idx}'] = lgacs
-                ws[f'L{idx}'] = propositos
-                ws[f'M{idx}'] = indexaciones
-                ws[f'N{idx}'] = articulo.revista.pais.nombre if articulo.revista and articulo.revista.pais else ''
-                ws[f'O{idx}'] = articulo.url or ''
-                ws[f'P{idx}'] = 'Sí' if articulo.para_curriculum else 'No'
-                ws[f'Q{idx}'] = 'Sí' if articulo.completo else 'No'
-                ws[f'R{idx}'] = articulo.descripcion or ''
-                
-            except Exception as e:
-                self.logger.warning(f"Error procesando artículo {articulo.id}: {str(e)}")
-                continue
+    def filas(self, articulos: Iterable, precarga=None, tamano_lote: int = 500) -> Iterator[list]:
+        """
+        Valores de las filas de los artículos, en el orden de COLUMNS (la
+        primera columna es el ID del artículo).
+        
+        Args:
+            articulos: Iterable de objetos Articulo
+            precarga: PrecargaExportacion (ver generate)
+            tamano_lote: Artículos por lote de precarga
+        """
+        for lote in lotes(articulos, tamano_lote if precarga is not None else 1):
+            if precarga is not None:
+                precarga.cargar(lote)
+            
+            for articulo in lote:
+                try:
+                    yield self._valores_fila(articulo, precarga)
+                except Exception as e:
+                    self.logger.warning(f"Error procesando artículo {articulo.id}: {str(e)}")
     
-    def _apply_formatting(self, ws, num_rows: int):
-        """Aplica formato a todas las celdas."""
-        # Bordes
-        thin_border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
+    def _add_data(self, ws, filas: Iterable, estilos: dict) -> int:
+        """
+        Escribe una fila por artículo.
         
-        # Alineación para datos
-        data_alignment = Alignment(vertical='top', wrap_text=True)
+        Returns:
+            int: Número de filas escritas
+        """
+        centradas = [col_name in self.COLUMNAS_CENTRADAS for _, col_name, _ in self.COLUMNS]
+        num_filas = 0
         
-        # Aplicar a todas las celdas de datos
-        for row_idx in range(2, num_rows + 2):
-            # Filas alternas
-            if row_idx % 2 == 0:
-                fill = PatternFill(start_color=self.COLOR_ALT_ROW, 
-                                   end_color=self.COLOR_ALT_ROW, 
-                                   fill_type='solid')
-            else:
-                fill = PatternFill()
-            
-            for col_letter, _, _ in self.COLUMNS:
-                cell = ws[f'{col_letter}{row_idx}']
-                cell.border = thin_border
-                cell.alignment = data_alignment
-                cell.fill = fill
-                
-                # Centrar columnas específicas
-                if col_letter in ['A', 'D', 'O', 'P']:
-                    cell.alignment = Alignment(horizontal='center', vertical='center')
+        for valores in filas:
+            # Filas alternas (la primera fila de datos es la 2 de la hoja)
+            alterna = num_filas % 2 == 0
+            fila = []
+            for valor, centrada in zip(valores, centradas):
+                cell = WriteOnlyCell(ws, value=valor)
+                cell.style = estilos[(alterna, centrada)]
+                fila.append(cell)
+            ws.append(fila)
+            num_filas += 1
+        
+        return num_filas
+    
+    def _valores_fila(self, articulo, precarga=None) -> list:
+        """Valores de la fila de un artículo, en el orden de COLUMNS."""
+        if precarga is not None:
+            tipo = precarga.nombre(TipoProduccion, articulo.tipo_produccion_id)
+            estado = precarga.nombre(Estado, articulo.estado_id)
+            lgac = precarga.nombre(LGAC, articulo.lgac_id, solo_activos=True)
+            proposito = precarga.nombre(Proposito, articulo.proposito_id, solo_activos=True)
+            indexaciones = precarga.indexaciones(articulo)
+            pais = precarga.pais(articulo)
+        else:
+            tipo = articulo.tipo.nombre if articulo.tipo else ''
+            estado = articulo.estado.nombre if articulo.estado else ''
+            lgac = self._get_lgacs(articulo)
+            proposito = self._get_propositos(articulo)
+            indexaciones = self._get_indexaciones(articulo)
+            pais = articulo.revista.pais.nombre if articulo.revista and articulo.revista.pais else ''
+        
+        return [
+            articulo.id,
+            articulo.titulo or '',
+            self._get_autores(articulo),
+            articulo.anio_publicacion or '',
+            articulo.titulo_revista or '',
+            articulo.nombre_congreso or '',
+            articulo.issn or '',
+            articulo.doi or '',
+            tipo,
+            estado,
+            lgac,
+            proposito,
+            indexaciones,
+            pais,
+            articulo.url or '',
+            'Sí' if articulo.para_curriculum else 'No',
+            'Sí' if articulo.completo else 'No',
+            articulo.descripcion or '',
+        ]
     
-    def _add_metadata(self, wb, num_articulos: int):
+    def _add_metadata(self, wb, num_articulos: int, metadatos: Iterable = ()):
         """Agrega una hoja con metadatos del reporte."""
         ws_meta = wb.create_sheet("Información del Reporte")
         
+        # Ajustar anchos
+        ws_meta.column_dimensions['A'].width = 25
+        ws_meta.column_dimensions['B'].width = 40
+        
         # Información del reporte
         metadata = [
             ('Fecha de Generación:', datetime.now().strftime('%Y-%m-%d %H:%M:%S')),
             ('Total de Artículos:', num_articulos),
             ('Sistema:', 'Sistema de Gestión de Artículos Académicos'),
             ('Versión:', '1.0'),
+            *metadatos,
         ]
         
-        for idx, (label, value) in enumerate(metadata, start=1):
-            ws_meta[f'A{idx}'] = label
-            ws_meta[f'B{idx}'] = value
-            ws_meta[f'A{idx}'].font = Font(bold=True)
-        
-        # Ajustar anchos
-        ws_meta.column_dimensions['A'].width = 25
-        ws_meta.column_dimensions['B'].width = 40
+        fuente = Font(bold=True)
+        for label, value in metadata:
+            etiqueta = WriteOnlyCell(ws_meta, value=label)
+            etiqueta.font = fuente
+            ws_meta.append([etiqueta, value])
     
     def _get_autores(self, articulo) -> str:
-        """Obtiene los autores como string separado por comas."""
-        try:
-            if not articulo.articulo_autores:
-                return ''
-            
-            autores = []
-            for aa in sorted(articulo.articulo_autores, key=lambda x: x.orden):
-                autor = aa.autor
-                nombre_completo = f"{autor.apellidos}, {autor.nombres}"
-                autores.append(nombre_completo)
-            
-            return '; '.join(autores)
-        except Exception as e:
-            self.logger.warning(f"Error obteniendo autores: {str(e)}")
-            return ''
+        """Obtiene los autores en orden (columna desnormalizada autores_display)."""
+        return articulo.autores_display or ''
     
     def _get_lgacs(self, articulo) -> str:
         """Obtiene la LGAC como string."""
@@ -257,15 +322,16 @@ class ExcelService:
             self.logger.warning(f"Error obteniendo indexaciones: {str(e)}")
             return ''
     
-    def generate_filename(self, prefix: str = 'articulos') -> str:
+    def generate_filename(self, prefix: str = 'articulos', extension: str = 'xlsx') -> str:
         """
         Genera nombre de archivo con timestamp.
         
         Args:
             prefix: Prefijo del nombre del archivo
+            extension: Extensión del archivo
             
         Returns:
-            Nombre de archivo con formato: prefix_YYYYMMDD_HHMMSS.xlsx
+            Nombre de archivo con formato: prefix_YYYYMMDD_HHMMSS.extension
         """
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        return f"{prefix}_{timestamp}.xlsx"
+        return f"{prefix}_{timestamp}.{extension}"
@@ -0,0 +1,256 @@
+"""
+Caché en disco de archivos exportados.
+Cada exportación se guarda en EXPORT_FOLDER con una clave calculada a partir
+de los filtros normalizados, el formato y las versiones de datos de todas
+las tablas (VersionTabla). Mientras ningún commit cambie los datos, pedir la
+misma exportación devuelve el archivo ya generado; la clave sirve también
+como ETag para respuestas 304.
+
+Los archivos se desalojan por antigüedad y, al superar el número o tamaño
+máximo, los menos usados primero (la fecha de acceso se actualiza en cada
+acierto). El archivo que se acaba de generar nunca se desaloja en la misma
+llamada; aun así otro proceso puede eliminarlo antes de enviarse, así que
+quien lo sirve debe tolerar que ya no exista.
+"""
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import Counter, namedtuple
+
+from flask import current_app
+
+from app.models.filtro_articulos import FiltroArticulos
+from app.models.versiones import VersionTabla
+
+logger = logging.getLogger(__name__)
+
+
+# Archivo en caché: ruta en disco, clave (ETag) y si se generó en esta llamada
+Artefacto = namedtuple('Artefacto', ['ruta', 'clave', 'generado'])
+
+
+class ExportCache:
+    """
+    Archivos exportados en una carpeta, identificados por su clave.
+    Los contadores son del proceso; los archivos se comparten entre procesos.
+    """
+
+    def __init__(self, carpeta, max_entradas=50, max_antiguedad=24 * 3600,
+                 max_bytes=500 * 1024 * 1024):
+        """
+        Args:
+            carpeta: Carpeta donde se guardan los archivos
+            max_entradas: Número máximo de archivos
+            max_antiguedad: Segundos que un archivo es válido desde su generación
+            max_bytes: Tamaño total máximo de los archivos
+        """
+        self.carpeta = carpeta
+        self.max_entradas = max_entradas
+        self.max_antiguedad = max_antiguedad
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._contadores = Counter()
+
+    @staticmethod
+    def clave(formato, filtros):
+        """
+        Clave de una exportación: formato, filtros normalizados y versión
+        de los datos.
+
+        Args:
+            formato: Extensión del archivo (ej: 'xlsx')
+            filtros: FiltroArticulos o diccionario de filtros
+
+        Returns:
+            str: Hash hexadecimal de 32 caracteres
+        """
+        filtro = FiltroArticulos.desde(filtros)
+        versiones = tuple(sorted(VersionTabla.obtener_todas().items()))
+        contenido = repr((formato, filtro.clave(), versiones))
+        return hashlib.sha256(contenido.encode('utf-8')).hexdigest()[:32]
+
+    def _ruta(self, clave, formato):
+        return os.path.join(self.carpeta, f'{clave}.{formato}')
+
+    def obtener(self, formato, filtros, generar):
+        """
+        Devuelve el archivo de la exportación, generándolo si no está en caché.
+
+        Args:
+            formato: Extensión del archivo (ej: 'xlsx')
+            filtros: FiltroArticulos o diccionario de filtros
+            generar: Función que recibe un archivo binario abierto y escribe
+                la exportación en él
+
+        Returns:
+            Artefacto(ruta, clave, generado)
+        """
+        clave = self.clave(formato, filtros)
+        ruta = self._ruta(clave, formato)
+
+        if self._vigente(ruta):
+            self._contar('aciertos')
+            logger.debug(f"Exportación {clave}.{formato} servida desde caché")
+            return Artefacto(ruta, clave, False)
+
+        self._contar('fallos')
+        self._escribir(ruta, generar)
+        self._contar('generados')
+        self.depurar(conservar=ruta)
+        return Artefacto(ruta, clave, True)
+
+    def _vigente(self, ruta):
+        """Indica si el archivo existe y no ha expirado; si es así, marca su uso."""
+        try:
+            estado = os.stat(ruta)
+        except FileNotFoundError:
+            return False
+
+        ahora = time.time()
+        if ahora - estado.st_mtime > self.max_antiguedad:
+            return False
+
+        # La fecha de acceso registra el último uso (orden LRU) sin alterar
+        # la de generación
+        try:
+            os.utime(ruta, (ahora, estado.st_mtime))
+        except OSError:
+            pass
+        return True
+
+    def _escribir(self, ruta, generar):
+        """Genera el archivo en uno temporal y lo mueve a su lugar (atómico)."""
+        os.makedirs(self.carpeta, exist_ok=True)
+        descriptor, temporal = tempfile.mkstemp(dir=self.carpeta, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'w+b') as destino:
+                generar(destino)
+            os.replace(temporal, ruta)
+        except BaseException:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+            raise
+
+    def _archivos(self):
+        """Archivos en caché como (ruta, stat), sin temporales."""
+        try:
+            nombres = os.listdir(self.carpeta)
+        except FileNotFoundError:
+            return []
+
+        archivos = []
+        for nombre in nombres:
+            if nombre.endswith('.tmp'):
+                continue
+            ruta = os.path.join(self.carpeta, nombre)
+            try:
+                estado = os.stat(ruta)
+            except FileNotFoundError:
+                continue
+            if os.path.isfile(ruta):
+                archivos.append((ruta, estado))
+        return archivos
+
+    def depurar(self, conservar=None):
+        """
+        Elimina los archivos expirados y, si se supera el número o tamaño
+        máximo, los usados hace más tiempo.
+
+        Args:
+            conservar: Ruta que no se elimina aunque exceda los límites
+                (el archivo que se está por devolver)
+
+        Returns:
+            int: Número de archivos eliminados
+        """
+        ahora = time.time()
+        conservados = []
+        eliminar = []
+        for ruta, estado in self._archivos():
+            if ruta == conservar:
+                continue
+            if ahora - estado.st_mtime > self.max_antiguedad:
+                eliminar.append(ruta)
+            else:
+                conservados.append((ruta, estado))
+
+        # Más recientes primero; el archivo a conservar ocupa el primer lugar
+        conservados.sort(key=lambda archivo: archivo[1].st_atime, reverse=True)
+        total_bytes = 0
+        if conservar:
+            try:
+                total_bytes = os.stat(conservar).st_size
+            except FileNotFoundError:
+                conservar = None
+        for posicion, (ruta, estado) in enumerate(conservados, start=1 if conservar else 0):
+            total_bytes += estado.st_size
+            if posicion >= self.max_entradas or total_bytes > self.max_bytes:
+                eliminar.append(ruta)
+
+        eliminados = 0
+        for ruta in eliminar:
+            try:
+                os.remove(ruta)
+                eliminados += 1
+            except FileNotFoundError:
+                continue
+
+        if eliminados:
+            self._contar('desalojados', eliminados)
+            logger.info(f"Caché de exportaciones: {eliminados} archivos desalojados")
+        return eliminados
+
+    def _contar(self, contador, cantidad=1):
+        with self._lock:
+            self._contadores[contador] += cantidad
+
+    def estadisticas(self):
+        """
+        Contadores de efectividad del caché y ocupación actual.
+
+        Returns:
+            dict: aciertos, fallos, generados, desalojados, tasa_aciertos
+            (0 a 1), entradas y bytes
+        """
+        with self._lock:
+            contadores = {nombre: self._contadores[nombre]
+                          for nombre in ('aciertos', 'fallos', 'generados', 'desalojados')}
+
+        consultas = contadores['aciertos'] + contadores['fallos']
+        archivos = self._archivos()
+        contadores.update(
+            tasa_aciertos=round(contadores['aciertos'] / consultas, 4) if consultas else 0.0,
+            entradas=len(archivos),
+            bytes=sum(estado.st_size for _, estado in archivos),
+        )
+        return contadores
+
+    def limpiar(self):
+        """Elimina todos los archivos en caché."""
+        for ruta, _ in self._archivos():
+            try:
+                os.remove(ruta)
+            except FileNotFoundError:
+                continue
+
+
+def get_export_cache():
+    """
+    Obtiene el caché de exportaciones de la aplicación actual.
+
+    Returns:
+        ExportCache
+    """
+    cache = current_app.extensions.get('export_cache')
+    if cache is None:
+        config = current_app.config
+        cache = current_app.extensions.setdefault('export_cache', ExportCache(
+            config['EXPORT_FOLDER'],
+            max_entradas=config.get('EXPORT_CACHE_MAX_ENTRIES', 50),
+            max_antiguedad=config.get('EXPORT_CACHE_MAX_AGE', 24 * 3600),
+            max_bytes=config.get('EXPORT_CACHE_MAX_MB', 500) * 1024 * 1024,
+        ))
+    return cache
@@ -0,0 +1,174 @@
+"""
+Exportaciones en segundo plano.
+La petición solo encola la exportación y devuelve el ID del trabajo; un
+grupo acotado de threads (EXPORT_MAX_CONCURRENT) genera los archivos en el
+caché de exportaciones y el cliente consulta el estado hasta poder
+descargarlo. Los trabajos que esperan turno no ocupan memoria más allá de
+sus filtros, de modo que el pico no depende de cuántas personas exporten a
+la vez.
+"""
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from flask import current_app
+
+from app import db
+from app.models.filtro_articulos import FiltroArticulos
+
+logger = logging.getLogger(__name__)
+
+
+class ExportJob:
+    """Estado de una exportación en segundo plano."""
+
+    PENDIENTE = 'pendiente'
+    PROCESANDO = 'procesando'
+    COMPLETADO = 'completado'
+    ERROR = 'error'
+
+    def __init__(self, filtro):
+        self.job_id = f"export_{uuid.uuid4().hex}"
+        self.filtro = filtro
+        self.status = self.PENDIENTE
+        self.created_at = datetime.now()
+        self.started_at = None
+        self.finished_at = None
+        self.artefacto = None
+        self.filename = None
+        self.error = None
+        self._terminado = threading.Event()
+
+    @property
+    def terminado(self):
+        return self._terminado.is_set()
+
+    def esperar(self, timeout=None):
+        """Espera a que el trabajo termine; devuelve False si se agotó el tiempo."""
+        return self._terminado.wait(timeout)
+
+    def to_dict(self):
+        """Estado del trabajo para la respuesta JSON."""
+        return {
+            'job_id': self.job_id,
+            'status': self.status,
+            'filename': self.filename,
+            'error': self.error,
+            'created_at': self.created_at.isoformat(),
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+class ExportJobService:
+    """
+    Cola de exportaciones con un número máximo de exportaciones simultáneas.
+    Los trabajos se guardan en memoria del proceso (en producción con varios
+    procesos, el cliente debe volver al mismo proceso o usar un solo worker
+    para exportaciones).
+    """
+
+    def __init__(self, app, max_concurrentes=2, max_edad_horas=24):
+        """
+        Args:
+            app: Instancia de la aplicación Flask (para el contexto de los threads)
+            max_concurrentes: Exportaciones que se generan a la vez
+            max_edad_horas: Horas que se conserva un trabajo terminado
+        """
+        self.app = app
+        self.max_concurrentes = max_concurrentes
+        self.max_edad_horas = max_edad_horas
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrentes,
+                                            thread_name_prefix='exportacion')
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def encolar(self, filtros):
+        """
+        Encola una exportación a Excel.
+        Si ya hay un trabajo sin terminar con los mismos filtros, se
+        devuelve ese trabajo en lugar de generar el archivo dos veces.
+
+        Args:
+            filtros: FiltroArticulos o diccionario de filtros
+
+        Returns:
+            ExportJob
+        """
+        filtro = FiltroArticulos.desde(filtros)
+        self.limpiar()
+
+        with self._lock:
+            for job in self._jobs.values():
+                if not job.terminado and job.filtro == filtro:
+                    return job
+
+            job = ExportJob(filtro)
+            self._jobs[job.job_id] = job
+
+        self._executor.submit(self._ejecutar, job)
+        logger.info(f"Exportación {job.job_id} encolada: {filtro}")
+        return job
+
+    def obtener(self, job_id):
+        """Obtiene un trabajo por ID (None si no existe o ya se descartó)."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _ejecutar(self, job):
+        """Genera el archivo del trabajo dentro de un contexto de aplicación."""
+        from app.controllers.report_controller import ReportController
+
+        job.status = ExportJob.PROCESANDO
+        job.started_at = datetime.now()
+
+        with self.app.app_context():
+            try:
+                job.artefacto, job.filename = ReportController().export_excel_cached(job.filtro)
+                job.status = ExportJob.COMPLETADO
+            except Exception as e:
+                logger.error(f"Error en exportación {job.job_id}: {e}", exc_info=True)
+                job.error = str(e)
+                job.status = ExportJob.ERROR
+            finally:
+                db.session.remove()
+                job.finished_at = datetime.now()
+                job._terminado.set()
+
+    def limpiar(self):
+        """
+        Descarta los trabajos terminados hace más de max_edad_horas.
+
+        Returns:
+            int: Número de trabajos descartados
+        """
+        ahora = datetime.now()
+        with self._lock:
+            viejos = [
+                job_id for job_id, job in self._jobs.items()
+                if job.terminado
+                and (ahora - job.finished_at).total_seconds() / 3600 > self.max_edad_horas
+            ]
+            for job_id in viejos:
+                del self._jobs[job_id]
+        return len(viejos)
+
+
+def get_export_jobs():
+    """
+    Obtiene la cola de exportaciones de la aplicación actual.
+
+    Returns:
+        ExportJobService
+    """
+    servicio = current_app.extensions.get('export_jobs')
+    if servicio is None:
+        config = current_app.config
+        servicio = current_app.extensions.setdefault('export_jobs', ExportJobService(
+            current_app._get_current_object(),
+            max_concurrentes=config.get('EXPORT_MAX_CONCURRENT', 2),
+            max_edad_horas=config.get('EXPORT_CACHE_MAX_AGE', 24 * 3600) / 3600,
+        ))
+    return servicio
@@ -0,0 +1,175 @@
+"""
+Conteos por faceta (tipo, estado, año, LGAC, indexación) de una búsqueda.
+Todas las facetas salen de una sola consulta agrupada (UNION ALL sobre los
+artículos filtrados) y los conteos se cachean por filtros y versión de
+datos, de modo que la navegación por facetas no repite el trabajo mientras
+no cambien los artículos. Los nombres se agregan en cada lectura desde el
+caché de catálogos, que ya sigue sus propios cambios.
+"""
+import logging
+import threading
+from collections import OrderedDict, namedtuple
+
+from flask import current_app
+from sqlalchemy import func, literal, select, union, union_all
+
+from app import db
+from app.models.articulo import Articulo
+from app.models.catalogs import Estado, Indexacion, LGAC, TipoProduccion
+from app.models.filtro_articulos import FiltroArticulos
+from app.models.relations import ArticuloIndexacion, RevistaIndexacion
+from app.models.versiones import VersionTabla
+from app.services.catalog_cache import get_catalog_cache
+
+logger = logging.getLogger(__name__)
+
+
+Faceta = namedtuple('Faceta', ['valor', 'nombre', 'cantidad'])
+
+# Faceta -> (filtro que aplica al seleccionarla, modelo del catálogo o None)
+FACETAS = OrderedDict([
+    ('tipo', ('tipo_id', TipoProduccion)),
+    ('estado', ('estado_id', Estado)),
+    ('anio', ('anio', None)),
+    ('lgac', ('lgac_id', LGAC)),
+    ('indexacion', ('indexacion_id', Indexacion)),
+])
+
+
+def conteo_por_columna(grupo, columna):
+    """
+    Conteo agrupado por los valores no nulos de una columna, para combinar
+    varios con UNION ALL en una sola consulta.
+
+    Returns:
+        Select con columnas (grupo, valor, cantidad)
+    """
+    return select(
+        literal(grupo).label('grupo'),
+        columna.label('valor'),
+        func.count().label('cantidad')
+    ).where(columna.isnot(None)).group_by(columna)
+
+
+class FacetaService:
+    """
+    Calcula y cachea los conteos por faceta de un conjunto de filtros.
+    """
+
+    # Tablas de las que dependen los conteos (filtros + facetas)
+    TABLAS = ('articulos', 'articulo_autor', 'autores', 'articulo_indexacion',
+              'revista_indexacion')
+
+    def __init__(self, max_entradas=128):
+        """Inicializa el caché vacío."""
+        self._lock = threading.Lock()
+        self._entradas = OrderedDict()
+        self._max_entradas = max_entradas
+
+    @staticmethod
+    def _consulta(filtro):
+        """
+        Construye la consulta única de conteos.
+
+        Returns:
+            Select con columnas (grupo, valor, cantidad); el grupo es la faceta
+        """
+        base = Articulo.buscar(filtro).order_by(None).with_entities(
+            Articulo.id,
+            Articulo.tipo_produccion_id,
+            Articulo.estado_id,
+            Articulo.anio_publicacion,
+            Articulo.lgac_id,
+            Articulo.revista_id
+        ).subquery('filtrados')
+
+        # Un artículo cuenta una vez por indexación, sea propia o de su revista
+        ai = ArticuloIndexacion.__table__
+        ri = RevistaIndexacion.__table__
+        pares = union(
+            select(base.c.id.label('articulo_id'), ai.c.indexacion_id)
+            .join(ai, ai.c.articulo_id == base.c.id),
+            select(base.c.id.label('articulo_id'), ri.c.indexacion_id)
+            .join(ri, ri.c.revista_id == base.c.revista_id)
+            .where(ri.c.activo == True)
+        ).subquery('pares')
+
+        return union_all(
+            conteo_por_columna('tipo', base.c.tipo_produccion_id),
+            conteo_por_columna('estado', base.c.estado_id),
+            conteo_por_columna('anio', base.c.anio_publicacion),
+            conteo_por_columna('lgac', base.c.lgac_id),
+            conteo_por_columna('indexacion', pares.c.indexacion_id),
+        )
+
+    def contar(self, filtros):
+        """
+        Obtiene los conteos por faceta para los filtros indicados.
+
+        Args:
+            filtros: FiltroArticulos o diccionario de filtros de Articulo.buscar
+                (ej: {'tipo_id': 1, 'query': 'redes'})
+
+        Returns:
+            dict: {faceta: [Faceta(valor, nombre, cantidad), ...]}; los
+            catálogos se ordenan por cantidad y los años de más reciente
+            a más antiguo
+        """
+        filtro = FiltroArticulos.desde(filtros)
+        versiones = VersionTabla.obtener_todas()
+        clave = (
+            filtro.clave(),
+            tuple(versiones.get(tabla, 0) for tabla in self.TABLAS)
+        )
+
+        with self._lock:
+            conteos = self._entradas.get(clave)
+            if conteos is not None:
+                self._entradas.move_to_end(clave)
+
+        if conteos is None:
+            conteos = {faceta: {} for faceta in FACETAS}
+            for faceta, valor, cantidad in db.session.execute(self._consulta(filtro)):
+                conteos[faceta][valor] = cantidad
+            logger.debug(f"Facetas calculadas para {filtro}")
+
+            with self._lock:
+                self._entradas[clave] = conteos
+                while len(self._entradas) > self._max_entradas:
+                    self._entradas.popitem(last=False)
+
+        return self._etiquetar(conteos)
+
+    @staticmethod
+    def _etiquetar(conteos):
+        """Agrega los nombres (desde el caché de catálogos) y ordena cada faceta."""
+        catalog_cache = get_catalog_cache()
+        facetas = {}
+
+        for faceta, (_, modelo) in FACETAS.items():
+            valores = conteos[faceta]
+            if modelo is None:
+                facetas[faceta] = [
+                    Faceta(valor, str(valor), cantidad)
+                    for valor, cantidad in sorted(valores.items(), reverse=True)
+                ]
+                continue
+
+            lista = []
+            for valor, cantidad in valores.items():
+                entrada = catalog_cache.get(modelo, valor)
+                lista.append(Faceta(valor, entrada.nombre if entrada else str(valor), cantidad))
+            lista.sort(key=lambda f: (-f.cantidad, f.nombre))
+            facetas[faceta] = lista
+
+        return facetas
+
+
+def get_faceta_service():
+    """
+    Obtiene el servicio de facetas de la aplicación actual.
+
+    Returns:
+        FacetaService
+    """
+    return current_app.extensions.setdefault('faceta_service', FacetaService())
@@ -278,18 +278,19 @@ class PDFBatchProcessor:
         db.session.add(articulo)
         db.session.flush()  # Para obtener el ID del artículo
         
-        # Crear autores si se extrajeron
+        # Resolver autores si se extrajeron (ORCID/email primero, luego nombre)
         if metadata.get('autores'):
-            from app.models.autor import Autor
             from app.models.relations import ArticuloAutor
+            from app.services.autor_matching import AutorMatchingService
             
+            autores_datos = []
             for idx, autor_data in enumerate(metadata['autores'], start=1):
                 # Manejar formato dict (GROBID/Crossref) o string (heurísticas)
                 if isinstance(autor_data, dict):
-                    # Formato nuevo: {'nombre': 'John', 'apellidos': 'Doe', 'orden': 1}
-                    nombre = autor_data.get('nombre', '').strip()
-                    apellidos = autor_data.get('apellidos', '').strip()
-                    orden = autor_data.get('orden', idx)
+                    # Formato nuevo: {'nombre': 'John', 'apellidos': 'Doe', 'orden': 1,
+                    #                 'email': ..., 'orcid': ...}
+                    autor_data = dict(autor_data)
+                    autor_data.setdefault('orden', idx)
                 else:
                     # Formato legacy: string "John Doe"
                     autor_nombre = str(autor_data).strip()
@@ -300,27 +301,26 @@ class PDFBatchProcessor:
                     else:
                         nombre = autor_nombre
                         apellidos = ''
-                    orden = idx
+                    autor_data = {'nombre': nombre, 'apellidos': apellidos, 'orden': idx}
                 
                 # Validar que hay al menos nombre o apellidos
-                if not nombre and not apellidos:
+                if not (autor_data.get('nombre') or '').strip() and \
+                        not (autor_data.get('apellidos') or '').strip():
                     continue
                 
-                # Buscar o crear autor
-                autor = Autor.query.filter_by(
-                    nombre=nombre,
-                    apellidos=apellidos
-                ).first()
+                autores_datos.append(autor_data)
+            
+            resueltos = AutorMatchingService.resolver_lote(autores_datos)
+            db.session.flush()
+            
+            autores_agregados = set()
+            for autor_data, (autor, _) in zip(autores_datos, resueltos):
+                # Un mismo autor no se relaciona dos veces con el artículo
+                if autor is None or autor.id in autores_agregados:
+                    continue
+                autores_agregados.add(autor.id)
                 
-                if not autor:
-                    autor = Autor(
-                        nombre=nombre,
-                        apellidos=apellidos,
-                        es_miembro_ca=False,
-                        activo=True
-                    )
-                    db.session.add(autor)
-                    db.session.flush()
+                orden = autor_data['orden']
                 
                 # Crear relación artículo-autor
                 articulo_autor = ArticuloAutor(
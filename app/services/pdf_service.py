@@ -4,6 +4,7 @@ Soporta múltiples estrategias de extracción para manejar diferentes formatos.
 """
 import re
 import logging
+import unicodedata
 from pathlib import Path
 from typing import Dict, Optional, List, Tuple
 from datetime import datetime
@@ -51,6 +52,10 @@ class PDFService:
         r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
     )
     
+    ORCID_PATTERN = re.compile(
+        r'(\d{4}-\d{4}-\d{4}-\d{3}[\dXx])'
+    )
+    
     # Palabras clave para identificar secciones
     ABSTRACT_KEYWORDS = [
         'abstract', 'resumen', 'resumo', 'résumé',
@@ -215,6 +220,8 @@ class PDFService:
                         'extraction_method': 'grobid'
                     })
                     
+                    result['emails'] = [a['email'] for a in result['autores'] if a.get('email')]
+                    
                     # Si hay DOI, intentar Crossref para mejorar metadatos
                     if result['doi']:
                         try:
@@ -224,7 +231,9 @@ class PDFService:
                             if crossref_data:
                                 # Crossref es más confiable, sobrescribir campos
                                 result['titulo'] = crossref_data.get('title') or result['titulo']
-                                result['autores'] = crossref_data.get('authors') or result['autores']
+                                result['autores'] = self._merge_author_identifiers(
+                                    crossref_data.get('authors'), result['autores']
+                                )
                                 result['anio_publicacion'] = crossref_data.get('year') or result['anio_publicacion']
                                 result['issn'] = crossref_data.get('issn')
                                 result['extraction_method'] = 'grobid+crossref'
@@ -272,6 +281,9 @@ class PDFService:
                     result['anio_publicacion'] = crossref_data.get('year') or result['anio_publicacion']
                     result['issn'] = crossref_data.get('issn')
                     result['extraction_method'] = 'heuristic+crossref'
+                    
+                    # Asociar los emails del texto a los autores de Crossref
+                    self._assign_emails_to_authors(result['autores'], result['emails'])
             except Exception as e:
                 self.logger.warning(f"Error consultando Crossref: {e}")
         
@@ -553,6 +565,77 @@ class PDFService:
         
         return valid_emails[:10]  # Máximo 10 emails
     
+    def _normalize_orcid(self, value: Optional[str]) -> Optional[str]:
+        """
+        Normaliza un ORCID (acepta URL https://orcid.org/...) al formato 0000-0002-1825-0097.
+        """
+        if not value:
+            return None
+        
+        match = self.ORCID_PATTERN.search(value)
+        return match.group(1).upper() if match else None
+    
+    def _merge_author_identifiers(self, primary: Optional[List[Dict]],
+                                  secondary: List) -> List:
+        """
+        Combina dos listas de autores: usa los nombres de la primaria
+        (Crossref) y completa email/ORCID faltantes con la secundaria (GROBID),
+        emparejando por primer apellido.
+        
+        Returns:
+            Lista de autores primaria enriquecida, o la secundaria si no hay primaria
+        """
+        if not primary:
+            return secondary
+        
+        por_apellido = {}
+        for author in secondary or []:
+            if isinstance(author, dict) and author.get('apellidos'):
+                clave = self._author_key(author['apellidos']).split()[0]
+                por_apellido.setdefault(clave, author)
+        
+        for author in primary:
+            apellidos = self._author_key(author.get('apellidos', '')).split()
+            previo = por_apellido.get(apellidos[0]) if apellidos else None
+            if not previo:
+                continue
+            for campo in ('email', 'orcid'):
+                if previo.get(campo) and not author.get(campo):
+                    author[campo] = previo[campo]
+        
+        return primary
+    
+    def _assign_emails_to_authors(self, authors: List, emails: List[str]):
+        """
+        Asigna emails sueltos del texto a autores sin email cuando la parte
+        local del email contiene el primer apellido (ej: jperez@... -> Pérez).
+        Solo se asignan coincidencias sin ambigüedad.
+        """
+        usados = {a.get('email') for a in authors if isinstance(a, dict)}
+        
+        for email in emails or []:
+            if email in usados:
+                continue
+            
+            local = re.sub(r'[^a-z]', '', self._author_key(email.split('@')[0]))
+            candidatos = []
+            for author in authors:
+                if not isinstance(author, dict) or author.get('email'):
+                    continue
+                apellidos = self._author_key(author.get('apellidos', '')).split()
+                if apellidos and len(apellidos[0]) >= 3 and apellidos[0] in local:
+                    candidatos.append(author)
+            
+            if len(candidatos) == 1:
+                candidatos[0]['email'] = email
+                usados.add(email)
+    
+    @staticmethod
+    def _author_key(text: str) -> str:
+        """Texto en minúsculas y sin acentos para comparar nombres."""
+        text = unicodedata.normalize('NFKD', text or '')
+        return ''.join(c for c in text if not unicodedata.combining(c)).lower().strip()
+    
     def get_pdf_info(self, pdf_path: str) -> Dict[str, any]:
         """
         Obtiene información básica del PDF (metadatos del archivo).
@@ -668,7 +751,13 @@ class PDFService:
             
             # Autores
             authors = []
-            for idx, pers in enumerate(root.findall(".//tei:sourceDesc//tei:author/tei:persName", self.TEI_NS), 1):
+            idx = 0
+            for author_el in root.findall(".//tei:sourceDesc//tei:author", self.TEI_NS):
+                pers = author_el.find("./tei:persName", self.TEI_NS)
+                if pers is None:
+                    continue
+                idx += 1
+                
                 forenames = [
                     fn.text for fn in pers.findall("./tei:forename", self.TEI_NS) 
                     if fn.text
@@ -683,6 +772,19 @@ class PDFService:
                         'apellidos': surname.strip(),
                         'orden': idx
                     }
+                    
+                    # Identificadores del autor (<email> e <idno type="ORCID">)
+                    email_el = author_el.find("./tei:email", self.TEI_NS)
+                    if email_el is not None and email_el.text:
+                        author_dict['email'] = email_el.text.strip().lower()
+                    
+                    for idno in author_el.findall("./tei:idno", self.TEI_NS):
+                        if idno.attrib.get("type", "").lower() == "orcid":
+                            orcid = self._normalize_orcid(idno.text)
+                            if orcid:
+                                author_dict['orcid'] = orcid
+                                break
+                    
                     authors.append(author_dict)
             
             if authors:
@@ -774,6 +876,9 @@ class PDFService:
                     'apellidos': family.strip(),
                     'orden': idx
                 }
+                orcid = self._normalize_orcid(author.get('ORCID'))
+                if orcid:
+                    author_dict['orcid'] = orcid
                 authors.append(author_dict)
         
         if authors:
@@ -0,0 +1,141 @@
+"""
+Precarga por lotes de los datos relacionados que escribe la exportación.
+En lugar de recorrer las relaciones de cada artículo (una consulta por
+revista, indexación, catálogo...), cada lote de artículos hace dos
+consultas fijas: las indexaciones de los artículos y de sus revistas, y
+el país y nombre de cada revista (más una tercera con los autores en orden
+si la exportación los necesita). Los nombres salen del caché de catálogos,
+que se lee una vez por exportación.
+"""
+import logging
+from itertools import islice
+
+from sqlalchemy import literal, select, union_all
+
+from app import db
+from app.models.catalogs import Estado, Indexacion, LGAC, Pais, Proposito, TipoProduccion
+from app.models.autor import Autor
+from app.models.relations import ArticuloAutor, ArticuloIndexacion, RevistaIndexacion
+from app.models.revista import Revista
+from app.services.catalog_cache import get_catalog_cache
+
+logger = logging.getLogger(__name__)
+
+
+def lotes(articulos, tamano):
+    """Agrupa un iterable de artículos en listas de hasta `tamano` elementos."""
+    pendientes = iter(articulos)
+    while True:
+        lote = list(islice(pendientes, tamano))
+        if not lote:
+            return
+        yield lote
+
+
+class PrecargaExportacion:
+    """
+    Datos relacionados de un lote de artículos.
+    Se crea una vez por exportación y se recarga con cargar(lote).
+    """
+
+    CATALOGOS = (TipoProduccion, Estado, LGAC, Proposito, Indexacion, Pais)
+
+    def __init__(self, autores=False):
+        """
+        Toma una instantánea de los catálogos que usa la exportación.
+
+        Args:
+            autores: Si se precargan también los autores de cada artículo
+                (nombre y apellidos en orden), para formatos bibliográficos
+        """
+        self.con_autores = autores
+        catalog_cache = get_catalog_cache()
+        self._catalogos = {
+            modelo: {entrada.id: entrada for entrada in catalog_cache.entradas(modelo)}
+            for modelo in self.CATALOGOS
+        }
+        self._indexaciones = {}  # articulo_id -> set(indexacion_id)
+        self._revistas = {}      # revista_id -> (nombre, pais_id)
+        self._autores = {}       # articulo_id -> [(nombre, apellidos)]
+
+    def cargar(self, articulos):
+        """
+        Carga los datos relacionados de un lote (reemplaza al lote anterior).
+
+        Args:
+            articulos: Lista de artículos del lote
+        """
+        articulo_ids = [articulo.id for articulo in articulos]
+        revista_ids = sorted({articulo.revista_id for articulo in articulos if articulo.revista_id})
+
+        ai = ArticuloIndexacion.__table__
+        ri = RevistaIndexacion.__table__
+        propias = select(literal('articulo').label('origen'), ai.c.articulo_id.label('id'),
+                         ai.c.indexacion_id).where(ai.c.articulo_id.in_(articulo_ids))
+        consultas = [propias]
+        if revista_ids:
+            consultas.append(
+                select(literal('revista').label('origen'), ri.c.revista_id.label('id'),
+                       ri.c.indexacion_id)
+                .where(ri.c.revista_id.in_(revista_ids), ri.c.activo == True)
+            )
+
+        de_articulo = {}
+        de_revista = {}
+        for origen, registro_id, indexacion_id in db.session.execute(union_all(*consultas)):
+            destino = de_articulo if origen == 'articulo' else de_revista
+            destino.setdefault(registro_id, set()).add(indexacion_id)
+
+        self._indexaciones = {
+            articulo.id: de_articulo.get(articulo.id, set()) | de_revista.get(articulo.revista_id, set())
+            for articulo in articulos
+        }
+
+        self._revistas = {}
+        if revista_ids:
+            self._revistas = {
+                revista_id: (nombre, pais_id)
+                for revista_id, nombre, pais_id in db.session.execute(
+                    select(Revista.id, Revista.nombre, Revista.pais_id)
+                    .where(Revista.id.in_(revista_ids))
+                )
+            }
+
+        self._autores = {}
+        if self.con_autores and articulo_ids:
+            aa = ArticuloAutor.__table__
+            for articulo_id, nombre, apellidos in db.session.execute(
+                select(aa.c.articulo_id, Autor.nombre, Autor.apellidos)
+                .join(Autor, Autor.id == aa.c.autor_id)
+                .where(aa.c.articulo_id.in_(articulo_ids))
+                .order_by(aa.c.articulo_id, aa.c.orden, aa.c.id)
+            ):
+                self._autores.setdefault(articulo_id, []).append((nombre, apellidos))
+
+    def nombre(self, modelo, registro_id, solo_activos=False):
+        """Nombre de un registro de catálogo ('' si no existe o está inactivo)."""
+        entrada = self._catalogos[modelo].get(registro_id)
+        if entrada is None or (solo_activos and not entrada.activo):
+            return ''
+        return entrada.nombre
+
+    def indexaciones(self, articulo):
+        """Indexaciones activas del artículo y de su revista, separadas por comas."""
+        nombres = {
+            self.nombre(Indexacion, indexacion_id, solo_activos=True)
+            for indexacion_id in self._indexaciones.get(articulo.id, ())
+        }
+        nombres.discard('')
+        return ', '.join(sorted(nombres))
+
+    def pais(self, articulo):
+        """País de la revista del artículo."""
+        return self.nombre(Pais, self._revistas.get(articulo.revista_id, (None, None))[1])
+
+    def revista(self, articulo):
+        """Nombre de la revista del artículo ('' si no tiene)."""
+        return self._revistas.get(articulo.revista_id, ('', None))[0]
+
+    def autores(self, articulo):
+        """Autores del artículo en orden, como tupla de (nombre, apellidos)."""
+        return tuple(self._autores.get(articulo.id, ()))
@@ -0,0 +1,173 @@
+"""
+Exportación de artículos en texto plano por flujo (CSV, JSON Lines y los
+formatos bibliográficos BibTeX y RIS).
+Las filas se producen a medida que llegan del cursor, con los datos
+relacionados precargados por lote (PrecargaExportacion), y se entregan en
+bloques de un lote: no se construye ningún libro y el consumidor recibe los
+primeros bytes en cuanto se lee el primer lote.
+"""
+import csv
+import io
+import json
+import logging
+from typing import Iterable, Iterator
+
+from app.models.catalogs import Estado, LGAC, Proposito, TipoProduccion
+from app.services import bibliografia
+from app.services.precarga_exportacion import lotes
+
+logger = logging.getLogger(__name__)
+
+
+class StreamExportService:
+    """Genera exportaciones CSV, JSON Lines, BibTeX y RIS como iteradores de texto."""
+
+    # Formato -> (tipo MIME, extensión)
+    FORMATOS = {
+        'csv': ('text/csv; charset=utf-8', 'csv'),
+        'jsonl': ('application/x-ndjson; charset=utf-8', 'jsonl'),
+        'bibtex': ('application/x-bibtex; charset=utf-8', 'bib'),
+        'ris': ('application/x-research-info-systems; charset=utf-8', 'ris'),
+    }
+
+    # Formatos que necesitan los autores por separado (PrecargaExportacion(autores=True))
+    FORMATOS_CON_AUTORES = ('bibtex', 'ris')
+
+    # Campos de cada registro (mismo orden que las columnas del Excel, más
+    # num_autores, activo y updated_at para procesos que cargan cambios)
+    CAMPOS = [
+        'id', 'titulo', 'autores', 'num_autores', 'anio_publicacion', 'titulo_revista',
+        'nombre_congreso', 'issn', 'doi', 'tipo_produccion', 'estado', 'lgac', 'proposito',
+        'indexaciones', 'pais', 'url', 'para_curriculum', 'completo', 'descripcion',
+        'activo', 'updated_at',
+    ]
+
+    def generate(self, formato: str, articulos: Iterable, precarga,
+                 tamano_lote: int = 500) -> Iterator[str]:
+        """
+        Genera la exportación en el formato indicado.
+
+        Args:
+            formato: 'csv', 'jsonl', 'bibtex' o 'ris'
+            articulos: Iterable de Articulo (ej: Query.yield_per)
+            precarga: PrecargaExportacion para catálogos, indexaciones y
+                países (con autores=True para BibTeX y RIS)
+            tamano_lote: Artículos por lote (conviene igualar el yield_per)
+
+        Returns:
+            Iterador de bloques de texto (uno por lote; el CSV empieza con
+            el encabezado)
+
+        Raises:
+            ValueError: Si el formato no existe
+        """
+        if formato == 'csv':
+            return self._csv(articulos, precarga, tamano_lote)
+        if formato == 'jsonl':
+            return self._jsonl(articulos, precarga, tamano_lote)
+        if formato == 'bibtex':
+            return self._bibliografia(bibliografia.bibtex, articulos, precarga, tamano_lote)
+        if formato == 'ris':
+            return self._bibliografia(bibliografia.ris, articulos, precarga, tamano_lote)
+        raise ValueError(f"Formato de exportación desconocido: {formato}")
+
+    def _registros(self, articulos, precarga, tamano_lote):
+        """Lotes de registros (diccionarios) con los datos del lote precargados."""
+        total = 0
+        for lote in lotes(articulos, tamano_lote):
+            precarga.cargar(lote)
+            yield [self._registro(articulo, precarga) for articulo in lote]
+            total += len(lote)
+        logger.info(f"Exportación por flujo terminada con {total} artículos")
+
+    @staticmethod
+    def _registro(articulo, precarga):
+        """Valores de un artículo con sus tipos (None si no hay dato)."""
+        return {
+            'id': articulo.id,
+            'titulo': articulo.titulo,
+            'autores': articulo.autores_display,
+            'num_autores': articulo.num_autores,
+            'anio_publicacion': articulo.anio_publicacion,
+            'titulo_revista': articulo.titulo_revista,
+            'nombre_congreso': articulo.nombre_congreso,
+            'issn': articulo.issn,
+            'doi': articulo.doi,
+            'tipo_produccion': precarga.nombre(TipoProduccion, articulo.tipo_produccion_id) or None,
+            'estado': precarga.nombre(Estado, articulo.estado_id) or None,
+            'lgac': precarga.nombre(LGAC, articulo.lgac_id, solo_activos=True) or None,
+            'proposito': precarga.nombre(Proposito, articulo.proposito_id, solo_activos=True) or None,
+            'indexaciones': precarga.indexaciones(articulo) or None,
+            'pais': precarga.pais(articulo) or None,
+            'url': articulo.url,
+            'para_curriculum': articulo.para_curriculum,
+            'completo': articulo.completo,
+            'descripcion': articulo.descripcion,
+            'activo': articulo.activo,
+            'updated_at': articulo.updated_at.isoformat() if articulo.updated_at else None,
+        }
+
+    def _csv(self, articulos, precarga, tamano_lote):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        writer.writerow(self.CAMPOS)
+        yield self._vaciar(buffer)
+
+        for registros in self._registros(articulos, precarga, tamano_lote):
+            for registro in registros:
+                writer.writerow([self._texto_csv(registro[campo]) for campo in self.CAMPOS])
+            yield self._vaciar(buffer)
+
+    @staticmethod
+    def _texto_csv(valor):
+        if valor is None:
+            return ''
+        if isinstance(valor, bool):
+            return 'true' if valor else 'false'
+        return valor
+
+    @staticmethod
+    def _vaciar(buffer):
+        """Devuelve el contenido del buffer y lo reinicia."""
+        texto = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return texto
+
+    def _jsonl(self, articulos, precarga, tamano_lote):
+        for registros in self._registros(articulos, precarga, tamano_lote):
+            yield ''.join(json.dumps(registro, ensure_ascii=False) + '\n' for registro in registros)
+
+    def _bibliografia(self, serializar, articulos, precarga, tamano_lote):
+        """Entradas BibTeX o RIS, un bloque por lote."""
+        total = 0
+        for lote in lotes(articulos, tamano_lote):
+            precarga.cargar(lote)
+            yield ''.join(serializar(self._referencia(articulo, precarga)) for articulo in lote)
+            total += len(lote)
+        logger.info(f"Exportación bibliográfica terminada con {total} artículos")
+
+    @staticmethod
+    def _referencia(articulo, precarga):
+        """Referencia bibliográfica de un artículo con los datos del lote precargados."""
+        return bibliografia.Referencia(
+            id=articulo.id,
+            tipo=bibliografia.tipo_referencia(
+                precarga.nombre(TipoProduccion, articulo.tipo_produccion_id),
+                articulo.nombre_congreso
+            ),
+            titulo=articulo.titulo,
+            autores=precarga.autores(articulo),
+            anio=articulo.anio_publicacion,
+            revista=articulo.titulo_revista or precarga.revista(articulo) or None,
+            congreso=articulo.nombre_congreso,
+            volumen=articulo.volumen,
+            numero=articulo.numero,
+            pagina_inicio=articulo.pagina_inicio,
+            pagina_fin=articulo.pagina_fin,
+            doi=articulo.doi,
+            issn=articulo.issn,
+            url=articulo.url,
+            resumen=articulo.descripcion,
+        )
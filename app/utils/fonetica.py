@@ -0,0 +1,163 @@
+"""
+Claves fonéticas para nombres de autores.
+Variante de Metaphone adaptada al español (con algunas reglas del inglés)
+para agrupar variantes comunes de nombres latinoamericanos:
+Gonzalez/Gonsales, Ximénez/Jiménez, Chávez/Chaves, etc.
+"""
+import re
+
+# Partículas que no aportan a la identidad del apellido ("de la Cruz" == "Cruz")
+PARTICULAS = {'de', 'del', 'la', 'las', 'los', 'y', 'e', 'da', 'das', 'do', 'dos',
+              'van', 'von', 'der', 'di', 'le', 'mc', 'mac'}
+
+VOCALES = frozenset('aeiou')
+
+
+def metaphone_es(token):
+    """
+    Calcula el código fonético de una palabra ya normalizada (a-z, minúsculas).
+
+    Ejemplos:
+        "gonzalez" -> "GNSLS"
+        "gonsales" -> "GNSLS"
+        "ximenez"  -> "JMNS"
+        "jimenez"  -> "JMNS"
+
+    Returns:
+        str: Código fonético (vacío si el token no tiene letras)
+    """
+    palabra = re.sub(r'[^a-z]', '', token or '')
+    if not palabra:
+        return ''
+
+    # Reglas de inicio de palabra
+    if palabra.startswith(('kn', 'gn', 'pn', 'wr')):
+        palabra = palabra[1:]
+    elif palabra.startswith('x'):
+        palabra = 'j' + palabra[1:]  # Ximénez, Xavier
+    elif palabra.startswith('wh'):
+        palabra = 'w' + palabra[2:]
+    elif palabra.startswith('h') and palabra[1:2] in VOCALES:
+        palabra = palabra[1:]  # Hernández == Ernández
+
+    codigo = []
+    i = 0
+    n = len(palabra)
+
+    while i < n:
+        c = palabra[i]
+        sig = palabra[i + 1] if i + 1 < n else ''
+
+        if c in VOCALES:
+            # Solo la vocal inicial se conserva
+            if i == 0:
+                codigo.append('A')
+            i += 1
+            continue
+
+        if c == 'h':
+            # Muda en español; "ch"/"sh" se tratan en la consonante previa
+            i += 1
+            continue
+
+        if c == 'c':
+            if sig == 'h':
+                codigo.append('X')
+                i += 2
+                continue
+            if sig == 'k':
+                codigo.append('K')
+                i += 2
+                continue
+            codigo.append('S' if sig in ('e', 'i', 'y') else 'K')
+        elif c == 's':
+            if sig == 'h':
+                codigo.append('X')
+                i += 2
+                continue
+            if palabra[i:i + 3] == 'sch':
+                codigo.append('SK')
+                i += 3
+                continue
+            codigo.append('S')
+        elif c == 'z':
+            codigo.append('S')
+        elif c == 'q':
+            codigo.append('K')
+            if sig == 'u':
+                i += 1
+        elif c == 'k':
+            codigo.append('K')
+        elif c == 'g':
+            if sig in ('e', 'i', 'y'):
+                codigo.append('J')
+            else:
+                codigo.append('G')
+                # "gue"/"gui": la u es muda
+                if sig == 'u' and palabra[i + 2:i + 3] in ('e', 'i'):
+                    i += 1
+        elif c == 'j':
+            codigo.append('J')
+        elif c == 'x':
+            codigo.append('KS')
+        elif c in ('b', 'v', 'w'):
+            codigo.append('B')
+        elif c == 'p':
+            if sig == 'h':
+                codigo.append('F')
+                i += 2
+                continue
+            codigo.append('P')
+        elif c == 't':
+            codigo.append('T')
+            if sig == 'h':
+                i += 1
+        elif c == 'l':
+            if sig == 'l':
+                codigo.append('Y')
+                i += 2
+                continue
+            codigo.append('L')
+        elif c == 'y':
+            # "y" final se pronuncia como vocal (Godoy, Leroy)
+            if i + 1 < n:
+                codigo.append('Y')
+        else:
+            # d, f, m, n, r y demás consonantes se conservan
+            codigo.append(c.upper())
+
+        i += 1
+
+    # Colapsar códigos repetidos consecutivos (rr -> R, ss -> S)
+    resultado = []
+    for letra in ''.join(codigo):
+        if not resultado or resultado[-1] != letra:
+            resultado.append(letra)
+
+    return ''.join(resultado)
+
+
+def clave_fonetica(texto_normalizado):
+    """
+    Genera la clave fonética de un nombre completo normalizado.
+
+    Los códigos de cada palabra se ordenan alfabéticamente para que el orden
+    de los apellidos compuestos no afecte la clave, y se descartan partículas
+    como "de", "del" o "la".
+
+    Ejemplo: "francisco comparan pantoja" == "pantoja comparan francisco"
+
+    Returns:
+        str: Clave fonética o None si el texto está vacío
+    """
+    if not texto_normalizado:
+        return None
+
+    codigos = [
+        metaphone_es(token)
+        for token in texto_normalizado.split()
+        if token not in PARTICULAS
+    ]
+    codigos = sorted(c for c in codigos if c)
+
+    return ' '.join(codigos) or None
@@ -0,0 +1,18 @@
+"""
+Huella de un texto para compararlo sin importar acentos, mayúsculas ni
+puntuación (títulos de artículos, nombres de revistas y de catálogos).
+"""
+import re
+import unicodedata
+
+
+def huella(texto):
+    """
+    Forma normalizada de un texto para compararlo: sin acentos, en
+    minúsculas y sin puntuación (conserva los dígitos).
+    Ejemplo: "Redes Neuronales: Parte 2." -> "redes neuronales parte 2"
+    """
+    if not texto:
+        return ''
+    texto = unicodedata.normalize('NFKD', str(texto)).encode('ASCII', 'ignore').decode('utf-8')
+    return re.sub(r'[^a-z0-9]+', ' ', texto.lower()).strip()
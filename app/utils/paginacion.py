@@ -0,0 +1,253 @@
+"""
+Paginación por cursor (keyset) y conteos cacheados.
+
+En lugar de OFFSET, cada página continúa desde la clave de orden del último
+registro mostrado (ej: created_at, id), de modo que la página N cuesta lo
+mismo que la primera. Los cursores son tokens opacos (base64 de JSON).
+"""
+import base64
+import binascii
+import json
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+
+from flask import current_app
+from sqlalchemy import literal, tuple_
+
+from app.models.versiones import VersionTabla
+
+
+class CursorInvalido(ValueError):
+    """El token de cursor no se pudo decodificar."""
+
+
+def _a_json(valor):
+    if isinstance(valor, datetime):
+        return {'$dt': valor.isoformat()}
+    if isinstance(valor, date):
+        return {'$d': valor.isoformat()}
+    return valor
+
+
+def _de_json(valor):
+    if isinstance(valor, dict):
+        if '$dt' in valor:
+            return datetime.fromisoformat(valor['$dt'])
+        if '$d' in valor:
+            return date.fromisoformat(valor['$d'])
+    return valor
+
+
+def codificar_cursor(claves, direccion='n'):
+    """
+    Genera un token opaco a partir de los valores de la clave de orden.
+
+    Args:
+        claves: Valores de las columnas de orden del registro frontera
+        direccion: 'n' (página siguiente) o 'p' (página anterior)
+
+    Returns:
+        str: Token seguro para URL
+    """
+    datos = json.dumps({'k': [_a_json(v) for v in claves], 'd': direccion},
+                       separators=(',', ':'))
+    return base64.urlsafe_b64encode(datos.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decodificar_cursor(token):
+    """
+    Decodifica un token generado por codificar_cursor.
+
+    Returns:
+        tuple: (lista de claves, dirección)
+
+    Raises:
+        CursorInvalido: Si el token está mal formado
+    """
+    try:
+        relleno = '=' * (-len(token) % 4)
+        datos = json.loads(base64.urlsafe_b64decode(token + relleno).decode('utf-8'))
+        claves = [_de_json(v) for v in datos['k']]
+        direccion = datos.get('d', 'n')
+    except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError) as e:
+        raise CursorInvalido(f"Cursor inválido: {token}") from e
+
+    if direccion not in ('n', 'p') or not isinstance(claves, list):
+        raise CursorInvalido(f"Cursor inválido: {token}")
+
+    return claves, direccion
+
+
+class PaginaCursor:
+    """
+    Página de resultados por cursor.
+    Expone items, has_next/has_prev, next_cursor/prev_cursor y
+    total (None si no se pidió el conteo).
+    """
+
+    def __init__(self, items, per_page, has_next, has_prev,
+                 next_cursor=None, prev_cursor=None, total=None):
+        self.items = items
+        self.per_page = per_page
+        self.has_next = has_next
+        self.has_prev = has_prev
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+        self.total = total
+
+    def __repr__(self):
+        return f'<PaginaCursor items={len(self.items)} next={self.has_next} prev={self.has_prev}>'
+
+
+def paginar_keyset(consulta, columnas, cursor=None, per_page=20, descendente=False):
+    """
+    Pagina una consulta por cursor sobre columnas de orden únicas en conjunto
+    (la última debe ser la llave primaria para desempatar).
+
+    Args:
+        consulta: Query de SQLAlchemy sin ORDER BY
+        columnas: Columnas de orden (ej: [Articulo.created_at, Articulo.id])
+        cursor: Token de la página a obtener (None = primera página)
+        per_page: Registros por página
+        descendente: Orden descendente (ej: más recientes primero)
+
+    Returns:
+        PaginaCursor
+
+    Raises:
+        CursorInvalido: Si el cursor no corresponde a las columnas
+    """
+    direccion = 'n'
+    if cursor:
+        claves, direccion = decodificar_cursor(cursor)
+        if len(claves) != len(columnas):
+            raise CursorInvalido(f"Cursor inválido: {cursor}")
+
+        # Hacia adelante en orden descendente (o hacia atrás en ascendente) se
+        # buscan claves menores; en los otros dos casos, mayores
+        frontera = tuple_(*columnas)
+        valores = tuple_(*[
+            literal(valor, type_=columna.type) for columna, valor in zip(columnas, claves)
+        ])
+        if (direccion == 'n') == descendente:
+            consulta = consulta.filter(frontera < valores)
+        else:
+            consulta = consulta.filter(frontera > valores)
+
+    # La página anterior se lee en orden inverso y se voltea
+    invertir = direccion == 'p'
+    if descendente != invertir:
+        consulta = consulta.order_by(*[columna.desc() for columna in columnas])
+    else:
+        consulta = consulta.order_by(*[columna.asc() for columna in columnas])
+
+    # Un registro extra indica si hay más en la dirección de lectura
+    items = consulta.limit(per_page + 1).all()
+    hay_mas = len(items) > per_page
+    items = items[:per_page]
+
+    if invertir:
+        items.reverse()
+        has_prev, has_next = hay_mas, True
+    else:
+        has_prev, has_next = bool(cursor), hay_mas
+
+    def claves_de(item):
+        return [getattr(item, columna.key) for columna in columnas]
+
+    return PaginaCursor(
+        items=items,
+        per_page=per_page,
+        has_next=has_next and bool(items),
+        has_prev=has_prev and bool(items),
+        next_cursor=codificar_cursor(claves_de(items[-1]), 'n') if has_next and items else None,
+        prev_cursor=codificar_cursor(claves_de(items[0]), 'p') if has_prev and items else None
+    )
+
+
+def paginar_por_posicion(consulta, cursor=None, per_page=20):
+    """
+    Pagina una consulta ya ordenada por una expresión que no sirve como
+    clave (ej: relevancia bm25). El cursor guarda la posición; se usa solo
+    para resultados de búsqueda, que el motor ya tiene que ordenar completos.
+
+    Args:
+        consulta: Query de SQLAlchemy con ORDER BY
+        cursor: Token de la página a obtener (None = primera página)
+        per_page: Registros por página
+
+    Returns:
+        PaginaCursor
+    """
+    inicio = 0
+    if cursor:
+        claves, _ = decodificar_cursor(cursor)
+        if len(claves) != 1 or not isinstance(claves[0], int) or claves[0] < 0:
+            raise CursorInvalido(f"Cursor inválido: {cursor}")
+        inicio = claves[0]
+
+    items = consulta.offset(inicio).limit(per_page + 1).all()
+    has_next = len(items) > per_page
+    items = items[:per_page]
+    has_prev = inicio > 0
+
+    return PaginaCursor(
+        items=items,
+        per_page=per_page,
+        has_next=has_next,
+        has_prev=has_prev,
+        next_cursor=codificar_cursor([inicio + per_page]) if has_next else None,
+        prev_cursor=codificar_cursor([max(inicio - per_page, 0)], 'p') if has_prev else None
+    )
+
+
+class ConteoCache:
+    """
+    Conteos de consultas cacheados por versión de datos: el COUNT(*) de
+    un filtro se repite solo cuando cambia alguna de las tablas consultadas.
+    """
+
+    def __init__(self, max_entradas=256):
+        self._lock = threading.Lock()
+        self._entradas = OrderedDict()
+        self._max_entradas = max_entradas
+
+    def contar(self, consulta, tablas):
+        """
+        Cuenta los resultados de una consulta, usando el caché si los datos
+        no han cambiado.
+
+        Args:
+            consulta: Query de SQLAlchemy (sin ORDER BY ni LIMIT)
+            tablas: Nombres de las tablas de las que depende el conteo
+
+        Returns:
+            int: Número de resultados
+        """
+        versiones = VersionTabla.obtener_todas()
+        compilada = consulta.statement.compile()
+        clave = (
+            str(compilada),
+            tuple(sorted((k, repr(v)) for k, v in compilada.params.items())),
+            tuple(versiones.get(tabla, 0) for tabla in sorted(tablas))
+        )
+
+        with self._lock:
+            if clave in self._entradas:
+                self._entradas.move_to_end(clave)
+                return self._entradas[clave]
+
+        total = consulta.order_by(None).count()
+
+        with self._lock:
+            self._entradas[clave] = total
+            while len(self._entradas) > self._max_entradas:
+                self._entradas.popitem(last=False)
+
+        return total
+
+
+def get_conteo_cache():
+    """Obtiene el caché de conteos de la aplicación actual."""
+    return current_app.extensions.setdefault('conteo_cache', ConteoCache())
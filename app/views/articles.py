@@ -1,12 +1,15 @@
 """
 Blueprint de artículos - CRUD y gestión de artículos
 """
-from flask import Blueprint, render_template, request, redirect, url_for, flash, abort, jsonify, send_file
+from flask import (Blueprint, render_template, request, redirect, url_for, flash, abort, jsonify,
+                   send_file, Response, stream_with_context)
 from app.controllers.article_controller import ArticleController
 from app.controllers.report_controller import ReportController
 from app.forms.article_form import ArticleForm, ArticleSearchForm
 from app.forms.utils import populate_form_choices
 from app.models import Articulo
+from app.models.filtro_articulos import FiltroArticulos
+from app.services.export_jobs import ExportJob, get_export_jobs
 from app.services.pdf_batch_processor import PDFBatchProcessor
 from config import Config
 import logging
@@ -19,36 +22,32 @@ articles_bp = Blueprint('articles', __name__, url_prefix='/articles')
 @articles_bp.route('/')
 def index():
     """
-    Lista de artículos con paginación y filtros.
-    GET /articles?page=1&per_page=20&tipo_id=1&estado_id=2&query=machine+learning
+    Lista de artículos con paginación por cursor y filtros.
+    GET /articles?cursor=<token>&per_page=20&tipo_id=1&estado_id=2&query=machine+learning
     """
     # Obtener parámetros de la URL
-    page = request.args.get('page', 1, type=int)
+    cursor = request.args.get('cursor') or None
     per_page = request.args.get('per_page', 20, type=int)
     
-    # Filtros
-    filters = {
-        'tipo_id': request.args.get('tipo_id', type=int),
-        'estado_id': request.args.get('estado_id', type=int),
-        'lgac_id': request.args.get('lgac_id', type=int),
-        'anio': request.args.get('anio', type=int),
-        'autor_id': request.args.get('autor_id', type=int),
-        'query': request.args.get('query', '').strip()
-    }
-    
-    # Remover filtros vacíos
-    filters = {k: v for k, v in filters.items() if v}
+    # Filtros (los IDs aceptan varios valores: ?tipo_id=1&tipo_id=2)
+    filtro = FiltroArticulos.desde_args(request.args)
     
     # Obtener artículos del controlador
-    pagination, error = ArticleController.get_all(
-        page=page,
+    pagination, error = ArticleController.get_page(
+        cursor=cursor,
         per_page=per_page,
-        **filters
+        filtro=filtro
     )
     
     if error:
         flash(error, 'error')
-        return render_template('articles/list.html', pagination=None, search_form=ArticleSearchForm())
+        return render_template('articles/list.html', pagination=None, search_form=ArticleSearchForm(),
+                               url_params={}, facetas=None)
+    
+    # Conteos por faceta para navegar por los resultados
+    facetas, error = ArticleController.get_facets(filtro)
+    if error:
+        logger.warning(f"No se pudieron calcular las facetas: {error}")
     
     # Crear formulario de búsqueda pre-llenado con filtros actuales
     search_form = ArticleSearchForm(formdata=request.args)
@@ -56,7 +55,9 @@ def index():
     return render_template(
         'articles/list.html',
         pagination=pagination,
-        search_form=search_form
+        search_form=search_form,
+        url_params=dict(filtro.a_params(), per_page=per_page),
+        facetas=facetas
     )
 
 
@@ -67,16 +68,11 @@ def new():
     GET /articles/new - Muestra formulario vacío
     POST /articles/new - Procesa creación
     """
-    from app.forms.utils import populate_autor_choices
-    
     form = ArticleForm()
     
     # Poblar campos de selección (catálogos)
     populate_form_choices(form)
     
-    # Obtener opciones de autores para JavaScript
-    autor_choices = populate_autor_choices()
-    
     if form.validate_on_submit():
         # Extraer datos del formulario
         data = {
@@ -154,7 +150,7 @@ def new():
             flash(f'Artículo "{articulo.titulo}" creado exitosamente', 'success')
             return redirect(url_for('articles.show', id=articulo.id))
     
-    return render_template('articles/form.html', form=form, articulo=None, autor_choices=autor_choices)
+    return render_template('articles/form.html', form=form, articulo=None)
 
 
 @articles_bp.route('/<int:id>')
@@ -163,7 +159,7 @@ def show(id):
     Ver detalle de un artículo.
     GET /articles/<id>
     """
-    articulo, error = ArticleController.get_by_id(id)
+    articulo, error = ArticleController.get_by_id(id, perfil='detalle')
     
     if error:
         flash(error, 'error')
@@ -179,10 +175,8 @@ def edit(id):
     GET /articles/<id>/edit - Muestra formulario pre-llenado
     POST /articles/<id>/edit - Procesa actualización
     """
-    from app.forms.utils import populate_autor_choices
-    
-    # Obtener artículo actual
-    articulo, error = ArticleController.get_by_id(id)
+    # Obtener artículo actual (el formulario solo lee columnas)
+    articulo, error = ArticleController.get_by_id(id, perfil='validacion')
     
     if error:
         flash(error, 'error')
@@ -194,9 +188,6 @@ def edit(id):
     # Poblar campos de selección
     populate_form_choices(form)
     
-    # Obtener opciones de autores para JavaScript
-    autor_choices = populate_autor_choices()
-    
     # Cargar autores e indexaciones existentes en modo GET
     if request.method == 'GET':
         from app.models import ArticuloAutor
@@ -311,7 +302,7 @@ def edit(id):
             db.session.rollback()
             logger.error(f"Error al actualizar autores: {str(e)}")
             flash('Error al actualizar autores', 'error')
-            return render_template('articles/form.html', form=form, articulo=articulo, autor_choices=autor_choices)
+            return render_template('articles/form.html', form=form, articulo=articulo)
         
         # Si hay cambios en el artículo, actualizar
         if data:
@@ -326,7 +317,7 @@ def edit(id):
             flash('Artículo actualizado exitosamente', 'success')
             return redirect(url_for('articles.show', id=id))
     
-    return render_template('articles/form.html', form=form, articulo=articulo, autor_choices=autor_choices)
+    return render_template('articles/form.html', form=form, articulo=articulo)
 @articles_bp.route('/<int:id>/delete', methods=['POST'])
 def delete(id):
     """
@@ -438,44 +429,113 @@ def upload_pdfs():
         }), 500
 
 
+@articles_bp.route('/import', methods=['POST'])
+def import_excel():
+    """
+    Importar artículos desde una hoja de Excel (plantilla del CA o exportación).
+    POST /articles/import
+
+    Recibe:
+        - archivo: Archivo .xlsx
+
+    Retorna:
+        - JSON con totales y errores por fila
+    """
+    from flask import current_app
+    from app.services.excel_import import ExcelImportService
+
+    archivo = request.files.get('archivo')
+    if not archivo or not archivo.filename:
+        return jsonify({'success': False, 'error': 'No se recibió ningún archivo'}), 400
+
+    extension = archivo.filename.rsplit('.', 1)[-1].lower() if '.' in archivo.filename else ''
+    if extension != 'xlsx' or extension not in current_app.config['ALLOWED_EXTENSIONS']:
+        return jsonify({'success': False, 'error': 'Solo se aceptan archivos .xlsx'}), 400
+
+    try:
+        resultado = ExcelImportService().importar(archivo.stream, nombre_archivo=archivo.filename)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    logger.info(f"Importación de {archivo.filename}: {resultado['creados']} creados, "
+                f"{resultado['actualizados']} actualizados, {len(resultado['errores'])} errores")
+    return jsonify({'success': True, **resultado}), 200
+
+
+@articles_bp.route('/import/references', methods=['POST'])
+def import_references():
+    """
+    Importar referencias bibliográficas (BibTeX, RIS o Crossref JSON).
+    POST /articles/import/references
+
+    Recibe:
+        - archivo: Archivo .bib, .ris, .json o .jsonl
+        - formato: 'bibtex', 'ris' o 'crossref' (opcional, por omisión
+          según la extensión)
+
+    Retorna:
+        - JSON con totales, duplicados y errores por referencia
+    """
+    from flask import current_app
+    from app.services.bibliografia_import import BibliografiaImportService
+
+    archivo = request.files.get('archivo')
+    if not archivo or not archivo.filename:
+        return jsonify({'success': False, 'error': 'No se recibió ningún archivo'}), 400
+
+    extension = archivo.filename.rsplit('.', 1)[-1].lower() if '.' in archivo.filename else ''
+    if extension not in current_app.config['ALLOWED_EXTENSIONS']:
+        return jsonify({'success': False, 'error': f'Extensión no permitida: .{extension}'}), 400
+
+    try:
+        resultado = BibliografiaImportService().importar(
+            archivo.stream, formato=request.form.get('formato') or None,
+            nombre_archivo=archivo.filename
+        )
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    logger.info(f"Importación de {archivo.filename}: {resultado['creados']} creados, "
+                f"{resultado['duplicados']} duplicados, {len(resultado['errores'])} errores")
+    return jsonify({'success': True, **resultado}), 200
+
+
 @articles_bp.route('/export')
 def export_excel():
     """
-    Exporta artículos a Excel con filtros opcionales.
-    GET /articles/export?anio_inicio=2020&anio_fin=2024&tipo_produccion_id=1
+    Exporta artículos a Excel (o CSV / JSON Lines / BibTeX / RIS) con filtros opcionales.
+    GET /articles/export?anio_inicio=2020&anio_fin=2024&tipo_id=1
+    GET /articles/export?format=csv|jsonl|bibtex|ris&anio_inicio=2020
+    GET /articles/export?format=jsonl&since=<marca X-Watermark o fecha ISO>
+    
+    El Excel se genera en la cola de exportaciones; si no termina en
+    EXPORT_SYNC_TIMEOUT segundos se responde 202 con el estado del trabajo.
     """
     try:
-        # Obtener filtros de la URL (mismos que en la lista)
-        filters = {
-            'tipo_id': request.args.get('tipo_id', type=int),
-            'estado_id': request.args.get('estado_id', type=int),
-            'lgac_id': request.args.get('lgac_id', type=int),
-            'anio_inicio': request.args.get('anio_inicio', type=int),
-            'anio_fin': request.args.get('anio_fin', type=int),
-            'autor_id': request.args.get('autor_id', type=int),
-            'indexacion_id': request.args.get('indexacion_id', type=int),
-            'para_curriculum': request.args.get('para_curriculum', type=bool),
-            'completo': request.args.get('completo', type=bool),
-            'search': request.args.get('query', '').strip(),
-            'activo': True  # Solo artículos activos por defecto
-        }
-        
-        # Remover filtros vacíos
-        filters = {k: v for k, v in filters.items() if v is not None and v != ''}
-        
-        logger.info(f"Exportando artículos con filtros: {filters}")
+        # Mismos filtros que en la lista (solo artículos activos)
+        filtro = FiltroArticulos.desde_args(request.args)
+        formato = request.args.get('format', 'xlsx')
+        
+        logger.info(f"Exportando artículos ({formato}) con filtros: {filtro}")
+        
+        # Los formatos de texto se envían por lotes desde el cursor; con
+        # ?since= solo los cambios posteriores a la marca de agua
+        if formato != 'xlsx':
+            try:
+                bloques, filename, mimetype, marca = ReportController().export_stream(
+                    filtro, formato, since=request.args.get('since')
+                )
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            
+            headers = {'Content-Disposition': f'attachment; filename="{filename}"'}
+            if marca:
+                headers['X-Watermark'] = marca
+            return Response(stream_with_context(bloques), mimetype=mimetype, headers=headers)
         
-        # Generar reporte
-        controller = ReportController()
-        excel_file, filename = controller.export_excel(filters)
-        
-        # Enviar archivo
-        return send_file(
-            excel_file,
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            as_attachment=True,
-            download_name=filename
-        )
+        # La exportación espera turno en la cola (máximo EXPORT_MAX_CONCURRENT
+        # a la vez) y reutiliza el archivo de una exportación idéntica
+        return responder_exportacion(get_export_jobs().encolar(filtro))
         
     except Exception as e:
         logger.error(f"Error exportando a Excel: {str(e)}", exc_info=True)
@@ -483,6 +543,101 @@ def export_excel():
         return redirect(url_for('articles.index'))
 
 
+def responder_exportacion(job):
+    """
+    Respuesta de una exportación encolada: el archivo si el trabajo termina
+    dentro de EXPORT_SYNC_TIMEOUT segundos; si no, 202 con su estado y las
+    URLs de consulta y descarga, para no retener el worker mientras espera
+    turno en la cola.
+    """
+    from flask import current_app
+    
+    if not job.esperar(timeout=current_app.config['EXPORT_SYNC_TIMEOUT']):
+        return jsonify(_estado_exportacion(job)), 202
+    if job.status == ExportJob.ERROR:
+        raise RuntimeError(job.error)
+    return _enviar_exportacion(job)
+
+
+def _enviar_exportacion(job):
+    """
+    Envía el archivo de un trabajo completado (304 si el cliente ya tiene esta versión).
+    Si el caché ya lo desalojó, la exportación se vuelve a encolar y se
+    responde 410 con el estado del nuevo trabajo.
+    """
+    try:
+        # Abierto, el archivo se puede enviar aunque luego se desaloje
+        archivo = open(job.artefacto.ruta, 'rb')
+    except FileNotFoundError:
+        logger.warning(f"Archivo de la exportación {job.job_id} desalojado; se vuelve a encolar")
+        nuevo = get_export_jobs().encolar(job.filtro)
+        return jsonify({'error': 'El archivo de la exportación ya no está disponible',
+                        **_estado_exportacion(nuevo)}), 410
+    
+    return send_file(
+        archivo,
+        mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        as_attachment=True,
+        download_name=job.filename,
+        etag=job.artefacto.clave,
+        conditional=True,
+        max_age=0
+    )
+
+
+def _estado_exportacion(job):
+    """Estado del trabajo con las URLs de consulta y descarga."""
+    datos = job.to_dict()
+    datos['status_url'] = url_for('articles.export_job_status', job_id=job.job_id)
+    datos['download_url'] = url_for('articles.export_job_download', job_id=job.job_id)
+    return datos
+
+
+@articles_bp.route('/export/jobs', methods=['POST'])
+def export_job_create():
+    """
+    Encola una exportación a Excel en segundo plano.
+    POST /articles/export/jobs?anio_inicio=2020&tipo_id=1
+    
+    Returns:
+        202 con el estado del trabajo (job_id, status_url, download_url)
+    """
+    try:
+        filtro = FiltroArticulos.desde_args(request.values)
+        job = get_export_jobs().encolar(filtro)
+        return jsonify(_estado_exportacion(job)), 202
+        
+    except Exception as e:
+        logger.error(f"Error encolando exportación: {str(e)}", exc_info=True)
+        return jsonify({'error': str(e)}), 500
+
+
+@articles_bp.route('/export/jobs/<job_id>')
+def export_job_status(job_id):
+    """Estado de una exportación en segundo plano."""
+    job = get_export_jobs().obtener(job_id)
+    if job is None:
+        return jsonify({'error': 'Exportación no encontrada'}), 404
+    return jsonify(_estado_exportacion(job))
+
+
+@articles_bp.route('/export/jobs/<job_id>/download')
+def export_job_download(job_id):
+    """
+    Descarga el archivo de una exportación en segundo plano.
+    409 mientras se genera; 500 si falló; 410 si el archivo ya se desalojó
+    (con el estado del trabajo que lo vuelve a generar).
+    """
+    job = get_export_jobs().obtener(job_id)
+    if job is None:
+        return jsonify({'error': 'Exportación no encontrada'}), 404
+    if job.status == ExportJob.ERROR:
+        return jsonify(_estado_exportacion(job)), 500
+    if job.status != ExportJob.COMPLETADO:
+        return jsonify(_estado_exportacion(job)), 409
+    return _enviar_exportacion(job)
+
+
 @articles_bp.route('/export/preview')
 def export_preview():
     """
@@ -490,27 +645,12 @@ def export_preview():
     GET /articles/export/preview?anio_inicio=2020
     """
     try:
-        # Obtener filtros
-        filters = {
-            'tipo_id': request.args.get('tipo_id', type=int),
-            'estado_id': request.args.get('estado_id', type=int),
-            'lgac_id': request.args.get('lgac_id', type=int),
-            'anio_inicio': request.args.get('anio_inicio', type=int),
-            'anio_fin': request.args.get('anio_fin', type=int),
-            'autor_id': request.args.get('autor_id', type=int),
-            'indexacion_id': request.args.get('indexacion_id', type=int),
-            'para_curriculum': request.args.get('para_curriculum', type=bool),
-            'completo': request.args.get('completo', type=bool),
-            'search': request.args.get('query', '').strip(),
-            'activo': True
-        }
-        
-        # Remover filtros vacíos
-        filters = {k: v for k, v in filters.items() if v is not None and v != ''}
+        # Mismos filtros que en la lista (solo artículos activos)
+        filtro = FiltroArticulos.desde_args(request.args)
         
         # Obtener estadísticas
         controller = ReportController()
-        stats = controller.get_export_statistics(filters)
+        stats = controller.get_export_statistics(filtro)
         
         return jsonify(stats)
         
@@ -1,7 +1,7 @@
 """
 Blueprint de catálogos - Gestión de catálogos maestros
 """
-from flask import Blueprint, render_template, request, redirect, url_for, flash, abort
+from flask import Blueprint, render_template, request, redirect, url_for, flash, abort, jsonify
 from app.controllers.catalog_controller import CatalogController
 from app.forms.catalog_forms import get_catalog_form
 import logging
@@ -21,11 +21,29 @@ def index():
     return render_template('catalogs/index.html', catalogs=catalogs)
 
 
+@catalogs_bp.route('/autores/autocomplete')
+def autocomplete_autores():
+    """
+    Autocompletado de autores (JSON) para los formularios de artículos.
+    GET /catalogs/autores/autocomplete?q=compa&page=1&per_page=10
+    """
+    resultados, error = CatalogController.autocomplete_autores(
+        query=request.args.get('q', '').strip(),
+        page=request.args.get('page', 1, type=int),
+        per_page=request.args.get('per_page', 10, type=int)
+    )
+    
+    if error:
+        return jsonify({'error': error}), 400
+    
+    return jsonify(resultados)
+
+
 @catalogs_bp.route('/<catalog_name>')
 def list_catalog(catalog_name):
     """
     Lista registros de un catálogo específico.
-    GET /catalogs/<catalog_name>?page=1&query=texto&show_inactive=false
+    GET /catalogs/<catalog_name>?cursor=<token>&query=texto&show_inactive=false
     """
     # Verificar que el catálogo existe
     config = CatalogController.get_config(catalog_name)
@@ -34,14 +52,14 @@ def list_catalog(catalog_name):
         return redirect(url_for('catalogs.index'))
     
     # Obtener parámetros
-    page = request.args.get('page', 1, type=int)
+    cursor = request.args.get('cursor') or None
     query = request.args.get('query', '').strip()
     show_inactive = request.args.get('show_inactive', 'false').lower() == 'true'
     
     # Obtener registros
-    pagination, error = CatalogController.get_all(
+    pagination, error = CatalogController.get_page(
         catalog_name,
-        page=page,
+        cursor=cursor,
         per_page=50,
         query=query,
         show_inactive=show_inactive
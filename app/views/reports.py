@@ -1,7 +1,16 @@
 """
 Blueprint de reportes - Generación de reportes y exportación
 """
-from flask import Blueprint, render_template, send_file
+from flask import (Blueprint, render_template, request, redirect, url_for, flash, jsonify,
+                   Response, stream_with_context)
+from app.controllers.report_controller import ReportController
+from app.models.filtro_articulos import FiltroArticulos
+from app.services.export_cache import get_export_cache
+from app.services.export_jobs import get_export_jobs
+from app.views.articles import responder_exportacion
+import logging
+
+logger = logging.getLogger(__name__)
 
 reports_bp = Blueprint('reports', __name__, url_prefix='/reports')
 
@@ -14,9 +23,49 @@ def index():
 
 @reports_bp.route('/export/excel')
 def export_excel():
-    """Exportar artículos a Excel."""
-    # TODO: Implementar exportación a Excel
-    return "Exportación a Excel - Por implementar"
+    """
+    Exportar artículos a Excel (mismos filtros que /articles/export).
+    GET /reports/export/excel?anio_inicio=2020&tipo_id=1
+    
+    Si el trabajo no termina a tiempo responde 202 con su estado (ver
+    responder_exportacion).
+    """
+    try:
+        filtro = FiltroArticulos.desde_args(request.args)
+        return responder_exportacion(get_export_jobs().encolar(filtro))
+        
+    except Exception as e:
+        logger.error(f"Error exportando a Excel: {str(e)}", exc_info=True)
+        flash(f'Error al generar el archivo Excel: {str(e)}', 'error')
+        return redirect(url_for('reports.index'))
+
+
+@reports_bp.route('/export/curriculum')
+def export_curriculum():
+    """
+    Exportar un libro de Excel por miembro del CA (artículos para currículum) en un ZIP.
+    GET /reports/export/curriculum?anio_inicio=2023&anio_fin=2025
+    """
+    try:
+        bloques, filename = ReportController().export_curriculum_bundle(
+            FiltroArticulos.desde_args(request.args)
+        )
+    except Exception as e:
+        logger.error(f"Error exportando currículums: {str(e)}", exc_info=True)
+        flash(f'Error al generar los currículums: {str(e)}', 'error')
+        return redirect(url_for('reports.index'))
+    
+    return Response(
+        stream_with_context(bloques),
+        mimetype='application/zip',
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
+
+
+@reports_bp.route('/export/cache')
+def export_cache():
+    """Contadores del caché de exportaciones (aciertos, fallos, desalojos)."""
+    return jsonify(get_export_cache().estadisticas())
 
 
 @reports_bp.route('/incomplete')
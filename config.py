@@ -31,7 +31,17 @@ class Config:
     MAX_CONTENT_LENGTH = 120 * 1024 * 1024  # 120 MB máximo (10 archivos × 10 MB + overhead)
     MAX_FILE_SIZE_MB = int(os.environ.get('MAX_FILE_SIZE_MB', 10))
     CLEANUP_DAYS = int(os.environ.get('CLEANUP_DAYS', 30))
-    ALLOWED_EXTENSIONS = {'pdf', 'xlsx'}
+    ALLOWED_EXTENSIONS = {'pdf', 'xlsx', 'bib', 'bibtex', 'ris', 'json', 'jsonl'}
+    
+    # Caché de exportaciones en EXPORT_FOLDER
+    EXPORT_CACHE_MAX_ENTRIES = int(os.environ.get('EXPORT_CACHE_MAX_ENTRIES', 50))
+    EXPORT_CACHE_MAX_AGE = int(os.environ.get('EXPORT_CACHE_MAX_AGE', 24 * 3600))  # segundos
+    EXPORT_CACHE_MAX_MB = int(os.environ.get('EXPORT_CACHE_MAX_MB', 500))
+    EXPORT_MAX_CONCURRENT = int(os.environ.get('EXPORT_MAX_CONCURRENT', 2))  # exportaciones simultáneas
+    # Espera máxima de /articles/export antes de responder 202 con el trabajo
+    EXPORT_SYNC_TIMEOUT = float(os.environ.get('EXPORT_SYNC_TIMEOUT', 10))  # segundos
+    # Procesos que construyen los libros del paquete de currículums del CA
+    CURRICULUM_MAX_PROCESSES = int(os.environ.get('CURRICULUM_MAX_PROCESSES', min(4, os.cpu_count() or 1)))
     
     # Paginación
     ARTICLES_PER_PAGE = 20
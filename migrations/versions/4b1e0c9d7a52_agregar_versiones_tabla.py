@@ -0,0 +1,29 @@
+"""Agregar versiones_tabla para invalidar cachés
+
+Revision ID: 4b1e0c9d7a52
+Revises: 6ea2ae2bc6b2
+Create Date: 2026-01-14 09:42:17.305118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4b1e0c9d7a52'
+down_revision = '6ea2ae2bc6b2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('versiones_tabla',
+    sa.Column('tabla', sa.String(length=64), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('tabla')
+    )
+
+
+def downgrade():
+    op.drop_table('versiones_tabla')
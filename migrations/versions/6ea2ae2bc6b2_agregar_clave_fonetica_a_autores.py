@@ -0,0 +1,50 @@
+"""Agregar clave_fonetica a autores
+
+Revision ID: 6ea2ae2bc6b2
+Revises: dc3c768208ee
+Create Date: 2026-01-12 10:21:04.118532
+
+"""
+import re
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6ea2ae2bc6b2'
+down_revision = 'dc3c768208ee'
+branch_labels = None
+depends_on = None
+
+
+def _normalizar(texto):
+    """Copia de Autor.normalizar_texto al momento de esta migración."""
+    texto = unicodedata.normalize('NFKD', texto or '').encode('ASCII', 'ignore').decode('utf-8')
+    return re.sub(r'\s+', ' ', re.sub(r'[^a-z\s]', ' ', texto.lower())).strip()
+
+
+def upgrade():
+    with op.batch_alter_table('autores', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('clave_fonetica', sa.String(length=250), nullable=True))
+        batch_op.create_index(batch_op.f('ix_autores_clave_fonetica'), ['clave_fonetica'], unique=False)
+
+    # Calcular nombre normalizado y clave fonética de los autores existentes
+    from app.utils.fonetica import clave_fonetica
+
+    conn = op.get_bind()
+    autores = conn.execute(sa.text('SELECT id, nombre, apellidos FROM autores')).fetchall()
+    for autor_id, nombre, apellidos in autores:
+        normalizado = _normalizar(f"{nombre} {apellidos}")
+        conn.execute(
+            sa.text('UPDATE autores SET nombre_normalizado = :normalizado, '
+                    'clave_fonetica = :clave WHERE id = :id'),
+            {'normalizado': normalizado, 'clave': clave_fonetica(normalizado), 'id': autor_id}
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('autores', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_autores_clave_fonetica'))
+        batch_op.drop_column('clave_fonetica')
@@ -0,0 +1,118 @@
+"""Agregar indice FTS5 articulos_fts
+
+Revision ID: 9f3a6c1d2e84
+Revises: 4b1e0c9d7a52
+Create Date: 2026-01-16 11:05:42.611930
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9f3a6c1d2e84'
+down_revision = '4b1e0c9d7a52'
+branch_labels = None
+depends_on = None
+
+
+# Copia de app/models/articulo_fts.py al momento de esta migración
+FTS_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS articulos_fts USING fts5(
+        titulo, titulo_revista, descripcion, autores,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )""",
+
+    """CREATE TRIGGER IF NOT EXISTS articulos_fts_ai AFTER INSERT ON articulos BEGIN
+        INSERT INTO articulos_fts(rowid, titulo, titulo_revista, descripcion, autores)
+        VALUES (new.id, new.titulo, new.titulo_revista, new.descripcion,
+                (SELECT group_concat(au.nombre || ' ' || au.apellidos, ', ')
+      FROM articulo_autor aa JOIN autores au ON au.id = aa.autor_id
+      WHERE aa.articulo_id = new.id));
+    END""",
+
+    """CREATE TRIGGER IF NOT EXISTS articulos_fts_au
+    AFTER UPDATE OF titulo, titulo_revista, descripcion ON articulos BEGIN
+        DELETE FROM articulos_fts WHERE rowid = old.id;
+        INSERT INTO articulos_fts(rowid, titulo, titulo_revista, descripcion, autores)
+        VALUES (new.id, new.titulo, new.titulo_revista, new.descripcion,
+                (SELECT group_concat(au.nombre || ' ' || au.apellidos, ', ')
+      FROM articulo_autor aa JOIN autores au ON au.id = aa.autor_id
+      WHERE aa.articulo_id = new.id));
+    END""",
+
+    """CREATE TRIGGER IF NOT EXISTS articulos_fts_ad AFTER DELETE ON articulos BEGIN
+        DELETE FROM articulos_fts WHERE rowid = old.id;
+    END""",
+
+    """CREATE TRIGGER IF NOT EXISTS articulo_autor_fts_ai AFTER INSERT ON articulo_autor BEGIN
+        UPDATE articulos_fts SET autores = (SELECT group_concat(au.nombre || ' ' || au.apellidos, ', ')
+      FROM articulo_autor aa JOIN autores au ON au.id = aa.autor_id
+      WHERE aa.articulo_id = new.articulo_id)
+        WHERE rowid = new.articulo_id;
+    END""",
+
+    """CREATE TRIGGER IF NOT EXISTS articulo_autor_fts_au AFTER UPDATE ON articulo_autor BEGIN
+        UPDATE articulos_fts SET autores = (SELECT group_concat(au.nombre || ' ' || au.apellidos, ', ')
+      FROM articulo_autor aa JOIN autores au ON au.id = aa.autor_id
+      WHERE aa.articulo_id = old.articulo_id)
+        WHERE rowid = old.articulo_id;
+        UPDATE articulos_fts SET autores = (SELECT group_concat(au.nombre || ' ' || au.apellidos, ', ')
+      FROM articulo_autor aa JOIN autores au ON au.id = aa.autor_id
+      WHERE aa.articulo_id = new.articulo_id)
+        WHERE rowid = new.articulo_id;
+    END""",
+
+    """CREATE TRIGGER IF NOT EXISTS articulo_autor_fts_ad AFTER DELETE ON articulo_autor BEGIN
+        UPDATE articulos_fts SET autores = (SELECT group_concat(au.nombre || ' ' || au.apellidos, ', ')
+      FROM articulo_autor aa JOIN autores au ON au.id = aa.autor_id
+      WHERE aa.articulo_id = old.articulo_id)
+        WHERE rowid = old.articulo_id;
+    END""",
+
+    """CREATE TRIGGER IF NOT EXISTS autores_fts_au AFTER UPDATE OF nombre, apellidos ON autores BEGIN
+        UPDATE articulos_fts SET autores = (SELECT group_concat(au.nombre || ' ' || au.apellidos, ', ')
+      FROM articulo_autor aa JOIN autores au ON au.id = aa.autor_id
+      WHERE aa.articulo_id = articulos_fts.rowid)
+        WHERE rowid IN (SELECT articulo_id FROM articulo_autor WHERE autor_id = new.id);
+    END"""
+]
+
+FTS_RECONSTRUIR = """INSERT INTO articulos_fts(rowid, titulo, titulo_revista, descripcion, autores)
+    SELECT a.id, a.titulo, a.titulo_revista, a.descripcion, (SELECT group_concat(au.nombre || ' ' || au.apellidos, ', ')
+      FROM articulo_autor aa JOIN autores au ON au.id = aa.autor_id
+      WHERE aa.articulo_id = a.id)
+    FROM articulos a"""
+
+FTS_DROP = [
+    "DROP TRIGGER IF EXISTS autores_fts_au",
+    "DROP TRIGGER IF EXISTS articulo_autor_fts_ad",
+    "DROP TRIGGER IF EXISTS articulo_autor_fts_au",
+    "DROP TRIGGER IF EXISTS articulo_autor_fts_ai",
+    "DROP TRIGGER IF EXISTS articulos_fts_ad",
+    "DROP TRIGGER IF EXISTS articulos_fts_au",
+    "DROP TRIGGER IF EXISTS articulos_fts_ai",
+    "DROP TABLE IF EXISTS articulos_fts"
+]
+
+
+def upgrade():
+    conn = op.get_bind()
+    if conn.dialect.name != 'sqlite':
+        # FTS5 es exclusivo de SQLite; otros motores usan ILIKE (Articulo.filtrar_texto)
+        return
+
+    for sentencia in FTS_DDL:
+        conn.exec_driver_sql(sentencia)
+
+    # Indexar artículos existentes
+    conn.exec_driver_sql(FTS_RECONSTRUIR)
+
+
+def downgrade():
+    conn = op.get_bind()
+    if conn.dialect.name != 'sqlite':
+        return
+
+    for sentencia in FTS_DROP:
+        conn.exec_driver_sql(sentencia)
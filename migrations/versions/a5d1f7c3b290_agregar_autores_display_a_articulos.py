@@ -0,0 +1,164 @@
+"""Agregar autores_display y num_autores a articulos
+
+Revision ID: a5d1f7c3b290
+Revises: e4a8b7c2d615
+Create Date: 2026-01-23 09:47:18.302554
+
+"""
+from collections import defaultdict
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a5d1f7c3b290'
+down_revision = 'e4a8b7c2d615'
+branch_labels = None
+depends_on = None
+
+
+# Nombres de autores de un artículo (triggers anteriores, 9f3a6c1d2e84)
+_AUTORES_DE = """(SELECT group_concat(au.nombre || ' ' || au.apellidos, ', ')
+      FROM articulo_autor aa JOIN autores au ON au.id = aa.autor_id
+      WHERE aa.articulo_id = {articulo_id})"""
+
+TRIGGERS_ANTERIORES = [
+    f"""CREATE TRIGGER IF NOT EXISTS articulos_fts_ai AFTER INSERT ON articulos BEGIN
+        INSERT INTO articulos_fts(rowid, titulo, titulo_revista, descripcion, autores)
+        VALUES (new.id, new.titulo, new.titulo_revista, new.descripcion,
+                {_AUTORES_DE.format(articulo_id='new.id')});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS articulos_fts_au
+    AFTER UPDATE OF titulo, titulo_revista, descripcion ON articulos BEGIN
+        DELETE FROM articulos_fts WHERE rowid = old.id;
+        INSERT INTO articulos_fts(rowid, titulo, titulo_revista, descripcion, autores)
+        VALUES (new.id, new.titulo, new.titulo_revista, new.descripcion,
+                {_AUTORES_DE.format(articulo_id='new.id')});
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS articulos_fts_ad AFTER DELETE ON articulos BEGIN
+        DELETE FROM articulos_fts WHERE rowid = old.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS articulo_autor_fts_ai AFTER INSERT ON articulo_autor BEGIN
+        UPDATE articulos_fts SET autores = {_AUTORES_DE.format(articulo_id='new.articulo_id')}
+        WHERE rowid = new.articulo_id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS articulo_autor_fts_au AFTER UPDATE ON articulo_autor BEGIN
+        UPDATE articulos_fts SET autores = {_AUTORES_DE.format(articulo_id='old.articulo_id')}
+        WHERE rowid = old.articulo_id;
+        UPDATE articulos_fts SET autores = {_AUTORES_DE.format(articulo_id='new.articulo_id')}
+        WHERE rowid = new.articulo_id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS articulo_autor_fts_ad AFTER DELETE ON articulo_autor BEGIN
+        UPDATE articulos_fts SET autores = {_AUTORES_DE.format(articulo_id='old.articulo_id')}
+        WHERE rowid = old.articulo_id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS autores_fts_au AFTER UPDATE OF nombre, apellidos ON autores BEGIN
+        UPDATE articulos_fts SET autores = {_AUTORES_DE.format(articulo_id='articulos_fts.rowid')}
+        WHERE rowid IN (SELECT articulo_id FROM articulo_autor WHERE autor_id = new.id);
+    END""",
+]
+
+DROP_TRIGGERS_ANTERIORES = [
+    "DROP TRIGGER IF EXISTS autores_fts_au",
+    "DROP TRIGGER IF EXISTS articulo_autor_fts_ad",
+    "DROP TRIGGER IF EXISTS articulo_autor_fts_au",
+    "DROP TRIGGER IF EXISTS articulo_autor_fts_ai",
+    "DROP TRIGGER IF EXISTS articulos_fts_ad",
+    "DROP TRIGGER IF EXISTS articulos_fts_au",
+    "DROP TRIGGER IF EXISTS articulos_fts_ai",
+]
+
+RECONSTRUIR_ANTERIOR = f"""INSERT INTO articulos_fts(rowid, titulo, titulo_revista, descripcion, autores)
+    SELECT a.id, a.titulo, a.titulo_revista, a.descripcion, {_AUTORES_DE.format(articulo_id='a.id')}
+    FROM articulos a"""
+
+# Copia de app/models/articulo_fts.py al momento de esta migración
+TRIGGERS = [
+    """CREATE TRIGGER IF NOT EXISTS articulos_fts_ai AFTER INSERT ON articulos BEGIN
+        INSERT INTO articulos_fts(rowid, titulo, titulo_revista, descripcion, autores)
+        VALUES (new.id, new.titulo, new.titulo_revista, new.descripcion, new.autores_display);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS articulos_fts_au
+    AFTER UPDATE OF titulo, titulo_revista, descripcion, autores_display ON articulos BEGIN
+        DELETE FROM articulos_fts WHERE rowid = old.id;
+        INSERT INTO articulos_fts(rowid, titulo, titulo_revista, descripcion, autores)
+        VALUES (new.id, new.titulo, new.titulo_revista, new.descripcion, new.autores_display);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS articulos_fts_ad AFTER DELETE ON articulos BEGIN
+        DELETE FROM articulos_fts WHERE rowid = old.id;
+    END""",
+]
+
+DROP_TRIGGERS = [
+    "DROP TRIGGER IF EXISTS articulos_fts_ad",
+    "DROP TRIGGER IF EXISTS articulos_fts_au",
+    "DROP TRIGGER IF EXISTS articulos_fts_ai",
+]
+
+RECONSTRUIR = """INSERT INTO articulos_fts(rowid, titulo, titulo_revista, descripcion, autores)
+    SELECT id, titulo, titulo_revista, descripcion, autores_display FROM articulos"""
+
+
+def _reindexar(conn, triggers, reconstruir):
+    for sentencia in triggers:
+        conn.exec_driver_sql(sentencia)
+    conn.exec_driver_sql("DELETE FROM articulos_fts")
+    conn.exec_driver_sql(reconstruir)
+
+
+def upgrade():
+    conn = op.get_bind()
+    sqlite = conn.dialect.name == 'sqlite'
+
+    # Los triggers sobre articulos se quitan antes de alterar la tabla
+    if sqlite:
+        for sentencia in DROP_TRIGGERS_ANTERIORES:
+            conn.exec_driver_sql(sentencia)
+
+    with op.batch_alter_table('articulos', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('autores_display', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('num_autores', sa.Integer(), nullable=False,
+                                      server_default='0'))
+
+    # Calcular los autores de los artículos existentes (sin tocar updated_at)
+    articulos = sa.table('articulos', sa.column('id'), sa.column('autores_display'),
+                         sa.column('num_autores'))
+    aa = sa.table('articulo_autor', sa.column('id'), sa.column('articulo_id'),
+                  sa.column('autor_id'), sa.column('orden'))
+    autores = sa.table('autores', sa.column('id'), sa.column('nombre'), sa.column('apellidos'))
+
+    nombres = defaultdict(list)
+    for articulo_id, nombre, apellidos in conn.execute(
+        sa.select(aa.c.articulo_id, autores.c.nombre, autores.c.apellidos)
+        .join(autores, autores.c.id == aa.c.autor_id)
+        .order_by(aa.c.articulo_id, aa.c.orden, aa.c.id)
+    ):
+        nombres[articulo_id].append(f"{nombre} {apellidos}".strip())
+    if nombres:
+        conn.execute(
+            articulos.update()
+            .where(articulos.c.id == sa.bindparam('articulo_id'))
+            .values(autores_display=sa.bindparam('display'), num_autores=sa.bindparam('num')),
+            [{'articulo_id': articulo_id, 'display': ', '.join(lista), 'num': len(lista)}
+             for articulo_id, lista in nombres.items()]
+        )
+
+    if sqlite:
+        _reindexar(conn, TRIGGERS, RECONSTRUIR)
+
+
+def downgrade():
+    conn = op.get_bind()
+    sqlite = conn.dialect.name == 'sqlite'
+
+    if sqlite:
+        for sentencia in DROP_TRIGGERS:
+            conn.exec_driver_sql(sentencia)
+
+    with op.batch_alter_table('articulos', schema=None) as batch_op:
+        batch_op.drop_column('num_autores')
+        batch_op.drop_column('autores_display')
+
+    if sqlite:
+        _reindexar(conn, TRIGGERS_ANTERIORES, RECONSTRUIR_ANTERIOR)
@@ -0,0 +1,47 @@
+"""Agregar índices para consultas frecuentes
+
+Revision ID: c7d2e5f8a913
+Revises: 9f3a6c1d2e84
+Create Date: 2026-01-19 11:08:42.517903
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7d2e5f8a913'
+down_revision = '9f3a6c1d2e84'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    solo_activos = sa.text('activo = 1')
+    solo_activos_pg = sa.text('activo = true')
+
+    with op.batch_alter_table('articulos', schema=None) as batch_op:
+        batch_op.create_index('ix_articulos_activos_recientes', ['created_at', 'id'], unique=False,
+                              sqlite_where=solo_activos, postgresql_where=solo_activos_pg)
+        batch_op.create_index('ix_articulos_activos_anio', ['anio_publicacion'], unique=False,
+                              sqlite_where=solo_activos, postgresql_where=solo_activos_pg)
+        batch_op.create_index('ix_articulos_activos_tipo', ['tipo_produccion_id', 'created_at', 'id'],
+                              unique=False,
+                              sqlite_where=solo_activos, postgresql_where=solo_activos_pg)
+        batch_op.create_index('ix_articulos_activos_estado', ['estado_id', 'created_at', 'id'],
+                              unique=False,
+                              sqlite_where=solo_activos, postgresql_where=solo_activos_pg)
+
+    with op.batch_alter_table('articulo_autor', schema=None) as batch_op:
+        batch_op.create_index('ix_articulo_autor_autor', ['autor_id', 'articulo_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('articulo_autor', schema=None) as batch_op:
+        batch_op.drop_index('ix_articulo_autor_autor')
+
+    with op.batch_alter_table('articulos', schema=None) as batch_op:
+        batch_op.drop_index('ix_articulos_activos_estado')
+        batch_op.drop_index('ix_articulos_activos_tipo')
+        batch_op.drop_index('ix_articulos_activos_anio')
+        batch_op.drop_index('ix_articulos_activos_recientes')
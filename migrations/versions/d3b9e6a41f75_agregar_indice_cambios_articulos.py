@@ -0,0 +1,26 @@
+"""Agregar índice de cambios de artículos (exportaciones incrementales)
+
+Revision ID: d3b9e6a41f75
+Revises: a5d1f7c3b290
+Create Date: 2026-01-27 10:15:36.418207
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd3b9e6a41f75'
+down_revision = 'a5d1f7c3b290'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('articulos', schema=None) as batch_op:
+        batch_op.create_index('ix_articulos_cambios', ['updated_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('articulos', schema=None) as batch_op:
+        batch_op.drop_index('ix_articulos_cambios')
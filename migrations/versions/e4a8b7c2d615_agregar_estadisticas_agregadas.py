@@ -0,0 +1,63 @@
+"""Agregar estadisticas_agregadas para el dashboard
+
+Revision ID: e4a8b7c2d615
+Revises: c7d2e5f8a913
+Create Date: 2026-01-21 16:34:09.842617
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4a8b7c2d615'
+down_revision = 'c7d2e5f8a913'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    estadisticas = op.create_table('estadisticas_agregadas',
+    sa.Column('dimension', sa.String(length=20), nullable=False),
+    sa.Column('valor', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('cantidad', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('dimension', 'valor')
+    )
+
+    # Calcular las estadísticas de los artículos existentes
+    conn = op.get_bind()
+    articulos = sa.table('articulos', sa.column('activo', sa.Boolean),
+                         sa.column('para_curriculum', sa.Boolean),
+                         sa.column('tipo_produccion_id'), sa.column('estado_id'),
+                         sa.column('anio_publicacion'))
+    activos = articulos.c.activo == sa.true()
+
+    total, para_curriculum = conn.execute(
+        sa.select(sa.func.count(),
+                  sa.func.count().filter(articulos.c.para_curriculum == sa.true()))
+        .where(activos)
+    ).one()
+    conteos = [('total', 0, total), ('para_curriculum', 0, para_curriculum)]
+    for dimension, nombre in (('tipo', 'tipo_produccion_id'), ('estado', 'estado_id'),
+                              ('anio', 'anio_publicacion')):
+        columna = articulos.c[nombre]
+        conteos.extend(
+            (dimension, valor, cantidad) for valor, cantidad in conn.execute(
+                sa.select(columna, sa.func.count())
+                .where(activos, columna.isnot(None))
+                .group_by(columna)
+            )
+        )
+
+    ahora = datetime.utcnow()
+    op.bulk_insert(estadisticas, [
+        {'dimension': dimension, 'valor': valor, 'cantidad': cantidad, 'updated_at': ahora}
+        for dimension, valor, cantidad in conteos if cantidad
+    ])
+
+
+def downgrade():
+    op.drop_table('estadisticas_agregadas')
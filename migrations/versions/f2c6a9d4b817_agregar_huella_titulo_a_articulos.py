@@ -0,0 +1,83 @@
+"""Agregar huella_titulo a articulos (deduplicación al importar)
+
+Revision ID: f2c6a9d4b817
+Revises: d3b9e6a41f75
+Create Date: 2026-02-03 11:22:47.915306
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2c6a9d4b817'
+down_revision = 'd3b9e6a41f75'
+branch_labels = None
+depends_on = None
+
+
+# Triggers FTS vigentes (copia de a5d1f7c3b290): el batch de SQLite recrea la
+# tabla articulos y los triggers sobre ella se perderían
+TRIGGERS = [
+    """CREATE TRIGGER IF NOT EXISTS articulos_fts_ai AFTER INSERT ON articulos BEGIN
+        INSERT INTO articulos_fts(rowid, titulo, titulo_revista, descripcion, autores)
+        VALUES (new.id, new.titulo, new.titulo_revista, new.descripcion, new.autores_display);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS articulos_fts_au
+    AFTER UPDATE OF titulo, titulo_revista, descripcion, autores_display ON articulos BEGIN
+        DELETE FROM articulos_fts WHERE rowid = old.id;
+        INSERT INTO articulos_fts(rowid, titulo, titulo_revista, descripcion, autores)
+        VALUES (new.id, new.titulo, new.titulo_revista, new.descripcion, new.autores_display);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS articulos_fts_ad AFTER DELETE ON articulos BEGIN
+        DELETE FROM articulos_fts WHERE rowid = old.id;
+    END""",
+]
+
+DROP_TRIGGERS = [
+    "DROP TRIGGER IF EXISTS articulos_fts_ad",
+    "DROP TRIGGER IF EXISTS articulos_fts_au",
+    "DROP TRIGGER IF EXISTS articulos_fts_ai",
+]
+
+
+def upgrade():
+    with op.batch_alter_table('articulos', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('huella_titulo', sa.String(length=500), nullable=True))
+        batch_op.create_index('ix_articulos_huella_titulo', ['huella_titulo'], unique=False)
+
+    # Calcular la huella de los artículos existentes (sin tocar updated_at)
+    from app.utils.huella import huella
+    conn = op.get_bind()
+    articulos = sa.table('articulos', sa.column('id'), sa.column('titulo'),
+                         sa.column('huella_titulo'))
+    valores = [
+        {'articulo_id': articulo_id, 'huella': huella(titulo) or None}
+        for articulo_id, titulo in conn.execute(sa.select(articulos.c.id, articulos.c.titulo))
+    ]
+    if valores:
+        conn.execute(
+            articulos.update()
+            .where(articulos.c.id == sa.bindparam('articulo_id'))
+            .values(huella_titulo=sa.bindparam('huella')),
+            valores
+        )
+
+
+def downgrade():
+    conn = op.get_bind()
+    sqlite = conn.dialect.name == 'sqlite'
+
+    # Los triggers sobre articulos se quitan antes de recrear la tabla
+    if sqlite:
+        for sentencia in DROP_TRIGGERS:
+            conn.exec_driver_sql(sentencia)
+
+    with op.batch_alter_table('articulos', schema=None) as batch_op:
+        batch_op.drop_index('ix_articulos_huella_titulo')
+        batch_op.drop_column('huella_titulo')
+
+    # Los ids se conservan, así que el índice FTS sigue vigente
+    if sqlite:
+        for sentencia in TRIGGERS:
+            conn.exec_driver_sql(sentencia)
@@ -1,5 +1,5 @@
 """
-Script para actualizar el campo nombre_normalizado de todos los autores existentes.
+Script para actualizar los campos nombre_normalizado y clave_fonetica de todos los autores existentes.
 Este script debe ejecutarse después de aplicar la migración que agrega el campo.
 
 Uso:
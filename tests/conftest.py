@@ -1,7 +1,11 @@
 """
 Configuración compartida para tests.
 """
+from contextlib import contextmanager
+
 import pytest
+from sqlalchemy import event
+
 from app import create_app, db
 from app.models import (
     TipoProduccion, Estado, LGAC, Proposito, 
@@ -10,11 +14,12 @@ from app.models import (
 
 
 @pytest.fixture
-def app():
+def app(tmp_path):
     """Crea la aplicación para testing."""
     app = create_app()
     app.config['TESTING'] = True
     app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['EXPORT_FOLDER'] = str(tmp_path / 'exports')
     app.config['WTF_CSRF_ENABLED'] = False  # Desactiva CSRF para tests
     app.config['SECRET_KEY'] = 'test-secret-key'
     
@@ -38,6 +43,48 @@ def db_session(app):
         yield db.session
 
 
+class _Consultas(list):
+    """Sentencias capturadas; sus parámetros quedan en el mismo orden en parametros."""
+
+    def __init__(self):
+        super().__init__()
+        self.parametros = []
+
+
+@pytest.fixture
+def capturar_consultas(app):
+    """
+    Context manager que registra las sentencias SQL ejecutadas dentro del bloque.
+
+        with capturar_consultas(solo_lecturas=True) as consultas:
+            ...
+        assert len(consultas) == 2
+
+    Args del context manager:
+        solo_lecturas: Solo SELECT y WITH
+        contiene: Solo las sentencias que incluyen este texto
+    """
+    @contextmanager
+    def capturar(solo_lecturas=False, contiene=None):
+        consultas = _Consultas()
+
+        def registrar(conn, cursor, statement, parameters, context, executemany):
+            if solo_lecturas and not statement.lstrip().upper().startswith(('SELECT', 'WITH')):
+                return
+            if contiene is not None and contiene not in statement:
+                return
+            consultas.append(statement)
+            consultas.parametros.append(parameters)
+
+        event.listen(db.engine, 'before_cursor_execute', registrar)
+        try:
+            yield consultas
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', registrar)
+
+    return capturar
+
+
 @pytest.fixture
 def catalogs(app, db_session):
     """Crea catálogos básicos para testing."""
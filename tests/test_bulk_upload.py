@@ -334,5 +334,77 @@ class TestArticleCreation:
                 assert len(articulo.campos_faltantes) > 0
 
 
+class TestAuthorResolution:
+    """Tests de resolución de autores por ORCID/email al crear artículos"""
+    
+    def test_resolves_by_orcid_and_email(self, app, processor):
+        """Autores existentes se encuentran por ORCID o email aunque el nombre difiera"""
+        from app.models.autor import Autor
+        
+        with app.app_context():
+            existente = Autor(nombre='María', apellidos='Pérez García',
+                              orcid='0000-0002-1825-0097', activo=True)
+            por_email = Autor(nombre='Juan', apellidos='López', email='jlopez@ucol.mx', activo=True)
+            for autor in (existente, por_email):
+                autor.actualizar_nombre_normalizado()
+            db.session.add_all([existente, por_email])
+            db.session.commit()
+            
+            metadata = {
+                'titulo': 'Artículo con identificadores',
+                'doi': None,
+                'autores': [
+                    {'nombre': 'M.', 'apellidos': 'Pérez', 'orden': 1, 'orcid': '0000-0002-1825-0097'},
+                    {'nombre': 'J. A.', 'apellidos': 'López-Ruiz', 'orden': 2, 'email': 'JLopez@ucol.mx'},
+                    {'nombre': 'Nuevo', 'apellidos': 'Autor', 'orden': 3,
+                     'email': 'nuevo@ucol.mx', 'orcid': '0000-0001-5109-3700'},
+                    {'nombre': 'Nuevo', 'apellidos': 'Autor', 'orden': 4}
+                ]
+            }
+            
+            articulo = processor._create_article_from_metadata(
+                metadata, original_filename='test.pdf', stored_filepath='/tmp/test.pdf'
+            )
+            
+            autores = [aa.autor for aa in articulo.articulo_autores]
+            assert [a.id for a in autores[:2]] == [existente.id, por_email.id]
+            assert len(autores) == 3  # El autor repetido se resuelve a la misma instancia
+            
+            nuevo = autores[2]
+            assert nuevo.email == 'nuevo@ucol.mx'
+            assert nuevo.orcid == '0000-0001-5109-3700'
+            assert Autor.query.count() == 3
+    
+    def test_identificadores_solo_con_match_confiable(self, app):
+        """Un match fuzzy no recibe identificadores y uno en conflicto no es el mismo autor"""
+        from app.models.autor import Autor
+        from app.services.autor_matching import AutorMatchingService
+        
+        with app.app_context():
+            fonetico = Autor(nombre='Francisco', apellidos='González Ximénez', activo=True)
+            con_orcid = Autor(nombre='Ana', apellidos='Ruiz', orcid='0000-0002-1825-0097', activo=True)
+            con_email = Autor(nombre='Marta', apellidos='García', email='MGarcia@UCol.mx', activo=True)
+            for autor in (fonetico, con_orcid, con_email):
+                autor.actualizar_nombre_normalizado()
+            db.session.add_all([fonetico, con_orcid, con_email])
+            db.session.commit()
+            
+            resultados = AutorMatchingService.resolver_lote([
+                {'nombre': 'Francisco', 'apellidos': 'Gonzales Jimenez',
+                 'orcid': '0000-0001-5109-3700', 'email': 'fgonzalez@ucol.mx'},
+                {'nombre': 'Ana', 'apellidos': 'Ruiz', 'orcid': '0000-0003-1415-9269'},
+                {'nombre': 'M.', 'apellidos': 'García López', 'email': 'mgarcia@ucol.mx'},
+            ])
+            
+            (fuzzy, fuzzy_nuevo), (homonimo, homonimo_nuevo), (email, email_nuevo) = resultados
+            assert fuzzy.id == fonetico.id and not fuzzy_nuevo
+            assert fuzzy.orcid is None and fuzzy.email is None
+            
+            assert homonimo_nuevo and homonimo.id != con_orcid.id
+            assert homonimo.orcid == '0000-0003-1415-9269'
+            
+            assert email.id == con_email.id and not email_nuevo
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
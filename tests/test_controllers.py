@@ -215,6 +215,71 @@ class TestArticleControllerGetAll:
             assert 'entre 1 y 100' in error
 
 
+class TestArticleControllerGetPage:
+    """Tests para la paginación por cursor (get_page)."""
+    
+    def _crear_articulos(self, catalogs, cantidad, prefijo='Article'):
+        for i in range(cantidad):
+            ArticleController.create({
+                'titulo': f'{prefijo} {i}',
+                'tipo_produccion_id': catalogs['tipo'].id,
+                'estado_id': catalogs['estado'].id
+            })
+    
+    def test_get_page_recorre_todas_las_paginas(self, app, db_session, catalogs):
+        """Siguiente/anterior recorren todos los artículos sin repetir."""
+        with app.app_context():
+            self._crear_articulos(catalogs, 25)
+            
+            paginas = []
+            cursor = None
+            while True:
+                pagina, error = ArticleController.get_page(cursor=cursor, per_page=10)
+                assert error is None
+                assert pagina.total == 25
+                paginas.append([a.id for a in pagina.items])
+                if not pagina.has_next:
+                    break
+                cursor = pagina.next_cursor
+            
+            ids = [articulo_id for ids_pagina in paginas for articulo_id in ids_pagina]
+            assert [len(p) for p in paginas] == [10, 10, 5]
+            assert len(set(ids)) == 25
+            
+            # Desde la última página, "anterior" regresa a la segunda
+            anterior, error = ArticleController.get_page(cursor=pagina.prev_cursor, per_page=10)
+            assert error is None
+            assert [a.id for a in anterior.items] == paginas[1]
+            assert anterior.has_next and anterior.has_prev
+    
+    def test_get_page_con_busqueda(self, app, db_session, catalogs):
+        """Con búsqueda por texto el cursor conserva el orden por relevancia."""
+        with app.app_context():
+            self._crear_articulos(catalogs, 3, prefijo='Redes neuronales')
+            self._crear_articulos(catalogs, 2, prefijo='Otro tema')
+            
+            primera, error = ArticleController.get_page(query='redes', per_page=2)
+            assert error is None
+            assert primera.total == 3
+            assert primera.has_next
+            
+            segunda, error = ArticleController.get_page(
+                query='redes', per_page=2, cursor=primera.next_cursor
+            )
+            assert error is None
+            assert len(segunda.items) == 1
+            assert not segunda.has_next
+            assert segunda.has_prev
+    
+    def test_get_page_cursor_invalido(self, app, db_session, catalogs):
+        """Un cursor alterado devuelve un error, no una excepción."""
+        with app.app_context():
+            pagina, error = ArticleController.get_page(cursor='no-es-un-cursor')
+            
+            assert pagina is None
+            assert 'cursor' in error.lower()
+
+
 class TestArticleControllerGetById:
     """Tests para el método get_by_id del controlador."""
     
@@ -496,3 +561,95 @@ class TestArticleControllerStatistics:
             assert stats['para_curriculum'] == 5
             assert len(stats['por_tipo']) > 0
             assert len(stats['por_estado']) > 0
+
+
+class TestArticleControllerFacets:
+    """Tests para los conteos por faceta."""
+    
+    def _crear_datos(self, db_session, catalogs):
+        from app.models.relations import ArticuloIndexacion, RevistaIndexacion
+        
+        enviado = Estado.query.filter_by(nombre='Enviado').first()
+        revista = Revista(nombre='Revista Indexada', issn='1234-5678')
+        db_session.add(revista)
+        db_session.flush()
+        db_session.add(RevistaIndexacion(revista_id=revista.id,
+                                         indexacion_id=catalogs['indexacion'].id))
+        
+        datos = [
+            ('Redes A', catalogs['estado'].id, 2023, revista.id),
+            ('Redes B', catalogs['estado'].id, 2023, None),
+            ('Grafos C', enviado.id, 2022, None),
+        ]
+        articulos = []
+        for titulo, estado_id, anio, revista_id in datos:
+            articulo = Articulo(titulo=titulo, tipo_produccion_id=catalogs['tipo'].id,
+                                estado_id=estado_id, anio_publicacion=anio,
+                                revista_id=revista_id, lgac_id=catalogs['lgac'].id)
+            db_session.add(articulo)
+            articulos.append(articulo)
+        db_session.flush()
+        
+        # Indexación propia del artículo, además de la de su revista: cuenta una vez
+        db_session.add(ArticuloIndexacion(articulo_id=articulos[0].id,
+                                          indexacion_id=catalogs['indexacion'].id))
+        db_session.commit()
+        return articulos
+    
+    def test_get_facets_conteos(self, app, db_session, catalogs):
+        """Test: Conteos por faceta de todos los artículos."""
+        with app.app_context():
+            self._crear_datos(db_session, catalogs)
+            
+            facetas, error = ArticleController.get_facets()
+            
+            assert error is None
+            assert [(f.nombre, f.cantidad) for f in facetas['estado']] == [('Publicado', 2), ('Enviado', 1)]
+            assert [(f.valor, f.cantidad) for f in facetas['anio']] == [(2023, 2), (2022, 1)]
+            assert [(f.nombre, f.cantidad) for f in facetas['tipo']] == [('Artículo científico', 3)]
+            assert [(f.nombre, f.cantidad) for f in facetas['lgac']] == [('LGAC de prueba', 3)]
+            assert [(f.nombre, f.cantidad) for f in facetas['indexacion']] == [('Scopus', 1)]
+    
+    def test_get_facets_con_filtros(self, app, db_session, catalogs):
+        """Test: Las facetas respetan los filtros actuales (incluida la búsqueda)."""
+        with app.app_context():
+            self._crear_datos(db_session, catalogs)
+            
+            facetas, error = ArticleController.get_facets(query='redes')
+            assert error is None
+            assert [f.cantidad for f in facetas['estado']] == [2]
+            
+            facetas, error = ArticleController.get_facets(indexacion_id=catalogs['indexacion'].id)
+            assert error is None
+            assert [(f.valor, f.cantidad) for f in facetas['anio']] == [(2023, 1)]
+    
+    def test_get_facets_cacheadas(self, app, db_session, catalogs, capturar_consultas):
+        """Test: Las facetas se calculan en una consulta y se cachean hasta que cambian los datos."""
+        from flask import g
+        
+        with app.app_context():
+            self._crear_datos(db_session, catalogs)
+            
+            with capturar_consultas(contiene='UNION ALL') as consultas:
+                ArticleController.get_facets(anio=2023)
+                ArticleController.get_facets(anio=2023)
+                assert len(consultas) == 1
+                
+                ArticleController.create({
+                    'titulo': 'Nuevo',
+                    'tipo_produccion_id': catalogs['tipo'].id,
+                    'estado_id': catalogs['estado'].id,
+                    'anio_publicacion': 2023
+                })
+                g.pop('_versiones_tabla', None)
+                facetas, _ = ArticleController.get_facets(anio=2023)
+                assert len(consultas) == 2
+                assert sum(f.cantidad for f in facetas['estado']) == 3
+                
+                # Renombrar un catálogo cambia la etiqueta sin recalcular conteos
+                db_session.get(Estado, catalogs['estado'].id).nombre = 'Publicado (final)'
+                db_session.commit()
+                g.pop('_versiones_tabla', None)
+                facetas, _ = ArticleController.get_facets(anio=2023)
+                assert len(consultas) == 2
+                assert 'Publicado (final)' in [f.nombre for f in facetas['estado']]
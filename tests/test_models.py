@@ -212,6 +212,52 @@ def test_autor_normalizar_nombre(init_database):
     assert autor.nombre_normalizado == 'jose maria garcia lopez'
 
 
+def test_autor_clave_fonetica(init_database):
+    """Test: Variantes comunes del nombre comparten clave fonética."""
+    autor1 = Autor(nombre='María', apellidos='Ximénez González')
+    autor2 = Autor(nombre='Maria', apellidos='Gonsales Jiménez')
+    autor3 = Autor(nombre='María', apellidos='de la Cruz Hernández')
+    autor4 = Autor(nombre='Maria', apellidos='Cruz Ernández')
+
+    for autor in (autor1, autor2, autor3, autor4):
+        autor.actualizar_nombre_normalizado()
+
+    assert autor1.clave_fonetica is not None
+    assert autor1.clave_fonetica == autor2.clave_fonetica
+    assert autor3.clave_fonetica == autor4.clave_fonetica
+    assert autor1.clave_fonetica != autor3.clave_fonetica
+
+
+def test_autor_buscar_fuzzy_por_clave_fonetica(init_database):
+    """Test: La búsqueda fuzzy encuentra variantes fonéticas que alcanzan el umbral."""
+    autor = Autor(nombre='Francisco', apellidos='González Ximénez')
+    autor.actualizar_nombre_normalizado()
+    otro = Autor(nombre='Francisco', apellidos='Pérez')
+    otro.actualizar_nombre_normalizado()
+    db.session.add_all([autor, otro])
+    db.session.commit()
+
+    resultados = Autor.buscar_fuzzy('Jimenez Gonsales, Francisco', umbral=85)
+
+    assert len(resultados) == 1
+    assert resultados[0][0].id == autor.id
+
+
+def test_autor_buscar_fuzzy_misma_clave_otra_persona(init_database):
+    """Test: Compartir clave fonética no basta si el nombre no alcanza el umbral."""
+    dora = Autor(nombre='Dora', apellidos='Mora')
+    dora.actualizar_nombre_normalizado()
+    db.session.add(dora)
+    db.session.commit()
+
+    dario = Autor(nombre='Darío', apellidos='Mora')
+    dario.actualizar_nombre_normalizado()
+    assert dario.clave_fonetica == dora.clave_fonetica
+
+    assert Autor.buscar_fuzzy('Darío Mora', umbral=85) == []
+    assert Autor.buscar_fuzzy('Darío Mora', umbral=85, recorrer_catalogo=False) == []
+
+
 def test_autor_validaciones(init_database):
     """Test: Validaciones del modelo Autor."""
     # ORCID válido
@@ -276,6 +322,97 @@ def test_articulo_autores(init_database):
     assert primer_autor.es_corresponsal == True
 
 
+
+def test_articulo_autores_display(init_database):
+    """Test: autores_display y num_autores se recalculan al cambiar autores."""
+    from app.models.autores_display import recalcular_autores
+    
+    tipo = TipoProduccion.query.first()
+    estado = Estado.query.first()
+    articulo = Articulo(titulo='Autores en orden', tipo_produccion_id=tipo.id,
+                        estado_id=estado.id)
+    juan = Autor(nombre='Juan', apellidos='Pérez')
+    maria = Autor(nombre='María', apellidos='García')
+    db.session.add_all([articulo, juan, maria])
+    db.session.commit()
+    assert articulo.autores_display is None
+    assert articulo.num_autores == 0
+    
+    articulo.agregar_autor(maria, orden=2)
+    articulo.agregar_autor(juan, orden=1)
+    db.session.commit()
+    assert articulo.autores_display == 'Juan Pérez, María García'
+    assert articulo.num_autores == 2
+    
+    # Renombrar un autor actualiza sus artículos
+    maria.apellidos = 'Gómez'
+    db.session.commit()
+    assert articulo.autores_display == 'Juan Pérez, María Gómez'
+    
+    # Remover un autor (y reordenar)
+    articulo.remover_autor(juan)
+    db.session.commit()
+    assert articulo.autores_display == 'María Gómez'
+    assert articulo.num_autores == 1
+    
+    # DELETE masivo sobre articulo_autor recalcula el artículo afectado
+    ArticuloAutor.query.filter_by(articulo_id=articulo.id).delete()
+    db.session.commit()
+    assert articulo.autores_display is None
+    assert articulo.num_autores == 0
+    
+    # El recálculo completo coincide con el incremental
+    articulo.agregar_autor(juan)
+    db.session.commit()
+    assert recalcular_autores(db.session.connection()) == 1
+    db.session.expire(articulo)
+    assert articulo.autores_display == 'Juan Pérez'
+    assert articulo.to_excel_row()['Autores'] == 'Juan Pérez'
+
+def test_autores_display_masivo_solo_afectados(init_database, capturar_consultas):
+    """Test: UPDATE/DELETE masivos recalculan solo los artículos de las filas afectadas."""
+    from sqlalchemy import update
+    
+    tipo = TipoProduccion.query.first()
+    estado = Estado.query.first()
+    juan = Autor(nombre='Juan', apellidos='Pérez')
+    maria = Autor(nombre='María', apellidos='García')
+    articulos = [Articulo(titulo=f'Masivo {i}', tipo_produccion_id=tipo.id, estado_id=estado.id)
+                 for i in range(5)]
+    db.session.add_all([juan, maria] + articulos)
+    db.session.flush()
+    for articulo in articulos:
+        articulo.agregar_autor(juan)
+    articulos[0].agregar_autor(maria)
+    db.session.commit()
+    primero, segundo = articulos[0], articulos[1]
+    
+    with capturar_consultas(contiene='FROM articulos') as consultas:
+        ArticuloAutor.query.filter_by(articulo_id=primero.id, autor_id=juan.id).delete()
+    assert consultas and all('WHERE' in consulta for consulta in consultas)
+    assert all(len(parametros) <= 2 for parametros in consultas.parametros)
+    db.session.commit()
+    assert primero.autores_display == 'María García'
+    assert segundo.autores_display == 'Juan Pérez'
+    
+    # Relación movida a otro artículo: se recalculan el origen y el destino
+    ArticuloAutor.query.filter_by(articulo_id=primero.id).update({'articulo_id': segundo.id})
+    db.session.commit()
+    assert (primero.autores_display, primero.num_autores) == (None, 0)
+    assert segundo.autores_display == 'Juan Pérez, María García'
+    
+    # Renombrado masivo por llave primaria
+    db.session.execute(update(Autor), [{'id': maria.id, 'apellidos': 'Gómez'}])
+    db.session.commit()
+    assert segundo.autores_display == 'Juan Pérez, María Gómez'
+    assert articulos[2].autores_display == 'Juan Pérez'
+    
+    # Cambios masivos que no tocan nombres no recalculan
+    with capturar_consultas(contiene='FROM articulos') as consultas:
+        db.session.execute(update(Autor), [{'id': juan.id, 'email': 'juan@ucol.mx'}])
+    assert consultas == []
+
+
 def test_revista_indexaciones(init_database):
     """Test: Relación N:N entre Revista e Indexación."""
     pais = Pais.query.first()
@@ -339,6 +476,141 @@ def test_busqueda_articulos(init_database):
     assert resultados[0].titulo == 'Deep Learning with Python'
 
 
+def test_busqueda_texto_completo(init_database):
+    """Test: Búsqueda FTS5 sin acentos, por prefijo, en descripción y autores, con ranking."""
+    tipo = TipoProduccion.query.first()
+    estado = Estado.query.first()
+    
+    art1 = Articulo(titulo='Optimización de redes eléctricas', tipo_produccion_id=tipo.id,
+                    estado_id=estado.id)
+    art2 = Articulo(titulo='Estudio de caso', tipo_produccion_id=tipo.id, estado_id=estado.id,
+                    descripcion='Se analizan redes de distribución en Colima')
+    art3 = Articulo(titulo='Sin relación', tipo_produccion_id=tipo.id, estado_id=estado.id)
+    db.session.add_all([art1, art2, art3])
+    db.session.flush()
+    
+    autora = Autor(nombre='María', apellidos='Núñez')
+    db.session.add(autora)
+    db.session.flush()
+    art3.agregar_autor(autora)
+    db.session.commit()
+    
+    # Sin acentos, por prefijo y en descripción; el título pesa más (bm25)
+    resultados = Articulo.buscar(query='optimizacion').all()
+    assert [a.id for a in resultados] == [art1.id]
+    resultados = Articulo.buscar(query='red').all()
+    assert [a.id for a in resultados] == [art1.id, art2.id]
+    
+    # Nombres de autores (se actualizan al renombrar)
+    assert [a.id for a in Articulo.buscar(query='nunez').all()] == [art3.id]
+    autora.apellidos = 'Ochoa'
+    db.session.commit()
+    assert Articulo.buscar(query='nunez').all() == []
+    assert [a.id for a in Articulo.buscar(query='ochoa').all()] == [art3.id]
+    
+    # Caracteres especiales de FTS5 no rompen la consulta
+    assert [a.id for a in Articulo.buscar(query='"redes eléctricas*').all()] == [art1.id]
+    
+    # Artículos eliminados salen del índice
+    db.session.delete(art1)
+    db.session.commit()
+    assert [a.id for a in Articulo.buscar(query='redes').all()] == [art2.id]
+
+
+def test_busqueda_por_nombre_de_autor(init_database):
+    """Test: Las palabras que son nombres de autores filtran por autor (EXISTS)."""
+    tipo = TipoProduccion.query.first()
+    estado = Estado.query.first()
+    
+    ml = Articulo(titulo='Machine learning aplicado', tipo_produccion_id=tipo.id,
+                  estado_id=estado.id)
+    otro_ml = Articulo(titulo='Machine learning en redes', tipo_produccion_id=tipo.id,
+                       estado_id=estado.id)
+    grafos = Articulo(titulo='Teoría de grafos', tipo_produccion_id=tipo.id,
+                      estado_id=estado.id)
+    francisco = Autor(nombre='Francisco', apellidos='Comparán Pantoja')
+    rosa = Autor(nombre='Rosa', apellidos='De la Cruz')
+    db.session.add_all([ml, otro_ml, grafos, francisco, rosa])
+    db.session.flush()
+    for articulo in (ml, grafos):
+        articulo.agregar_autor(francisco)
+        articulo.agregar_autor(rosa)
+    otro_ml.agregar_autor(rosa)
+    db.session.commit()
+    
+    # Apellido sin acento + texto libre, sin duplicar por coautores
+    resultados = Articulo.buscar(query='Comparan machine learning').all()
+    assert [a.id for a in resultados] == [ml.id]
+    assert {a.id for a in Articulo.buscar(query='comparán').all()} == {ml.id, grafos.id}
+    assert Articulo.buscar(query='Cruz').count() == 3
+    
+    # Palabras cortas no se toman como nombres ("de" en "De la Cruz")
+    assert [a.id for a in Articulo.buscar(query='teoria de grafos').all()] == [grafos.id]
+
+
+def test_busqueda_nombre_de_autor_en_titulo(init_database):
+    """Test: Un nombre de autor que también es palabra del título encuentra ambos."""
+    tipo = TipoProduccion.query.first()
+    estado = Estado.query.first()
+    
+    de_ana = Articulo(titulo='Sensores de humedad', tipo_produccion_id=tipo.id,
+                      estado_id=estado.id)
+    flores = Articulo(titulo='Clasificación de flores con redes neuronales',
+                      tipo_produccion_id=tipo.id, estado_id=estado.id)
+    de_juan = Articulo(titulo='Sensores de temperatura', tipo_produccion_id=tipo.id,
+                       estado_id=estado.id)
+    ana = Autor(nombre='Ana', apellidos='Flores')
+    juan = Autor(nombre='Juan', apellidos='Pérez')
+    juan_ruiz = Autor(nombre='Juan', apellidos='Ruiz')
+    ana_perez = Autor(nombre='Ana', apellidos='Pérez')
+    db.session.add_all([de_ana, flores, de_juan, ana, juan, juan_ruiz, ana_perez])
+    db.session.flush()
+    de_ana.agregar_autor(ana)
+    de_juan.agregar_autor(juan)
+    # Un Juan y un Pérez distintos no son "Juan Pérez"
+    flores.agregar_autor(juan_ruiz)
+    flores.agregar_autor(ana_perez)
+    db.session.commit()
+    
+    assert {a.id for a in Articulo.buscar(query='flores').all()} == {de_ana.id, flores.id}
+    assert [a.id for a in Articulo.buscar(query='flores redes').all()] == [flores.id]
+    assert [a.id for a in Articulo.buscar(query='Ana Flores sensores').all()] == [de_ana.id]
+    assert [a.id for a in Articulo.buscar(query='Juan Pérez').all()] == [de_juan.id]
+
+
+def test_filtro_articulos(init_database):
+    """Test: FiltroArticulos (listas, rangos, DOI) desde la URL y de ida y vuelta."""
+    from werkzeug.datastructures import MultiDict
+    from app.models.filtro_articulos import FiltroArticulos
+    
+    tipo = TipoProduccion.query.first()
+    estado = Estado.query.first()
+    datos = [(2020, '10.1000/a'), (2021, None), (2022, ''), (2023, '10.1000/b')]
+    for anio, doi in datos:
+        db.session.add(Articulo(titulo=f'Artículo {anio}', tipo_produccion_id=tipo.id,
+                                estado_id=estado.id, anio_publicacion=anio, doi=doi))
+    db.session.commit()
+    
+    filtro = FiltroArticulos.desde_args(MultiDict([
+        ('tipo_id', str(tipo.id)), ('tipo_id', f'{tipo.id},999'), ('tipo_id', 'x'),
+        ('anio_inicio', '2021'), ('anio_fin', '2023'), ('con_doi', 'no'), ('completo', '')
+    ]))
+    assert filtro.tipo_ids == (tipo.id, 999)
+    assert (filtro.anio_inicio, filtro.anio_fin) == (2021, 2023)
+    assert filtro.con_doi is False and filtro.completo is None
+    assert sorted(a.anio_publicacion for a in Articulo.buscar(filtro).all()) == [2021, 2022]
+    
+    # Los parámetros generados reconstruyen el mismo filtro
+    assert FiltroArticulos.desde_args(MultiDict(
+        [(k, str(v)) for k, vs in filtro.a_params().items()
+         for v in (vs if isinstance(vs, list) else [vs])]
+    )) == filtro
+    
+    # Un año es un rango de un solo año
+    assert FiltroArticulos.desde_dict({'anio': 2020}).a_params() == {'anio': 2020}
+    assert Articulo.buscar(anio=2020, con_doi=True).count() == 1
+    assert Articulo.buscar(estado_id=[estado.id], anio_fin=2021).count() == 2
+
 def test_articulo_completitud(init_database):
     """Test: Cálculo de completitud del artículo."""
     tipo = TipoProduccion.query.first()
@@ -376,5 +648,247 @@ def test_articulo_completitud(init_database):
     assert articulo.completo == True
 
 
+# === Tests de versiones por tabla y caché de catálogos ===
+
+def test_versiones_tabla_incrementan(init_database):
+    """Test: Cada commit que modifica una tabla incrementa su versión."""
+    from app.models import VersionTabla
+    
+    version_inicial = VersionTabla.obtener('estados')
+    assert version_inicial >= 1  # init_database creó estados
+    
+    estado = Estado(nombre='En revisión', activo=True)
+    db.session.add(estado)
+    db.session.commit()
+    assert VersionTabla.obtener('estados') == version_inicial + 1
+    
+    # Un commit sin cambios reales no incrementa
+    version_lgac = VersionTabla.obtener('lgac')
+    db.session.commit()
+    assert VersionTabla.obtener('lgac') == version_lgac
+    
+    # UPDATE masivo
+    Estado.query.filter_by(nombre='En revisión').update({'activo': False})
+    db.session.commit()
+    assert VersionTabla.obtener('estados') == version_inicial + 2
+    
+    # Los cambios revertidos no cuentan
+    db.session.add(Estado(nombre='Descartado', activo=True))
+    db.session.flush()
+    db.session.rollback()
+    assert VersionTabla.obtener('estados') == version_inicial + 2
+
+
+def test_catalog_cache_versionado(app, init_database, capturar_consultas):
+    """Test: El caché de catálogos sirve desde memoria y se recarga al cambiar la versión."""
+    from app.services.catalog_cache import get_catalog_cache
+    
+    cache = get_catalog_cache()
+    estado = Estado.query.filter_by(nombre='Publicado').first()
+    
+    assert cache.get(Estado, estado.id).nombre == 'Publicado'
+    assert cache.existe(Estado, str(estado.id))
+    assert not cache.existe(Estado, 9999)
+    assert not cache.existe(Estado, 'abc')
+    
+    with capturar_consultas(contiene='FROM estados ORDER BY') as consultas:
+        cache.choices(Estado)
+        cache.get(Estado, estado.id)
+        assert consultas == []
+        
+        # Un cambio confirmado se ve en la siguiente lectura
+        estado.nombre = 'Publicado (final)'
+        db.session.commit()
+        assert (estado.id, 'Publicado (final)') in cache.choices(Estado)
+        assert len(consultas) == 1
+    
+    # Filtro de activos
+    db.session.add(Estado(nombre='Obsoleto', activo=False))
+    db.session.commit()
+    nombres_activos = [nombre for _, nombre in cache.choices(Estado, solo_activos=True)]
+    assert 'Obsoleto' not in nombres_activos
+    assert 'Obsoleto' in [nombre for _, nombre in cache.choices(Estado)]
+
+
+# === Tests del catálogo compacto de autores ===
+
+def test_autor_catalogo_parche_incremental(init_database, capturar_consultas):
+    """Test: Los commits locales se aplican como parche sin recargar el catálogo."""
+    from app.services.autor_catalogo import get_autor_catalogo
+    
+    catalogo = get_autor_catalogo()
+    ana = Autor(nombre='Ana', apellidos='Ruiz', email='ana@ucol.mx')
+    luis = Autor(nombre='Luis', apellidos='Soto')
+    for autor in (ana, luis):
+        autor.actualizar_nombre_normalizado()
+    db.session.add_all([ana, luis])
+    db.session.commit()
+    
+    snapshot = catalogo.snapshot()
+    assert len(snapshot) == 2
+    assert snapshot.get(ana.id).email == 'ana@ucol.mx'
+    assert snapshot.get(ana.id).num_articulos == 0
+    assert catalogo.snapshot() is snapshot  # Sin cambios: misma instantánea
+    
+    with capturar_consultas(contiene='FROM autores') as consultas:
+        # Artículo nuevo de Ana y Luis desactivado
+        articulo = Articulo(
+            titulo='Artículo de Ana',
+            tipo_produccion_id=TipoProduccion.query.first().id,
+            estado_id=Estado.query.first().id
+        )
+        db.session.add(articulo)
+        db.session.flush()
+        articulo.agregar_autor(ana)
+        luis.activo = False
+        db.session.commit()
+        
+        del consultas[:]
+        nuevo = catalogo.snapshot()
+    
+    assert nuevo is not snapshot
+    assert nuevo.get(ana.id).num_articulos == 1
+    assert nuevo.get(luis.id) is None
+    # Solo se consultaron los autores modificados
+    assert len(consultas) == 1 and ' IN (' in consultas[0]
+    # La instantánea anterior no se modificó
+    assert snapshot.get(luis.id) is not None
+
+
+def test_autor_catalogo_cambios_externos(init_database):
+    """Test: Cambios de otro proceso (solo versión) provocan recarga completa."""
+    from flask import g
+    from sqlalchemy import text
+    from app.models import VersionTabla
+    from app.services.autor_catalogo import get_autor_catalogo
+    
+    autor = Autor(nombre='Eva', apellidos='Mora')
+    autor.actualizar_nombre_normalizado()
+    db.session.add(autor)
+    db.session.commit()
+    
+    catalogo = get_autor_catalogo()
+    assert catalogo.snapshot().get(autor.id).nombre_normalizado == 'eva mora'
+    
+    # Simular otro proceso: SQL directo + incremento de versión sin eventos de sesión
+    db.session.execute(text("UPDATE autores SET nombre_normalizado = 'eva mora lopez'"))
+    VersionTabla.incrementar(db.session.connection(), {'autores'})
+    db.session.commit()
+    
+    # Las versiones se leen una vez por petición: simular una petición nueva
+    g.pop('_versiones_tabla', None)
+    assert catalogo.snapshot().get(autor.id).nombre_normalizado == 'eva mora lopez'
+
+
+
+# === Tests de paginación por cursor ===
+
+def test_cursor_codificacion(init_database):
+    """Test: Los cursores conservan fechas y rechazan tokens alterados."""
+    from app.utils.paginacion import CursorInvalido, codificar_cursor, decodificar_cursor
+    
+    fecha = datetime(2024, 5, 17, 10, 30, 15, 123456)
+    token = codificar_cursor([fecha, 42], 'p')
+    assert decodificar_cursor(token) == ([fecha, 42], 'p')
+    
+    for alterado in ('', '%%%', token[:-3] + 'xyz'):
+        with pytest.raises(CursorInvalido):
+            decodificar_cursor(alterado or 'e30')
+
+
+def test_paginar_keyset_catalogo(init_database, capturar_consultas):
+    """Test: Paginación por (nombre, id) en ambas direcciones, con conteo cacheado."""
+    from app.utils.paginacion import get_conteo_cache, paginar_keyset
+    
+    for i in range(7):
+        db.session.add(Pais(nombre=f'País {i}', codigo_iso=f'P{i:02d}', activo=True))
+    db.session.commit()
+    
+    consulta = Pais.query.filter(Pais.nombre.like('País %'))
+    columnas = [Pais.nombre, Pais.id]
+    
+    primera = paginar_keyset(consulta, columnas, per_page=3)
+    segunda = paginar_keyset(consulta, columnas, cursor=primera.next_cursor, per_page=3)
+    tercera = paginar_keyset(consulta, columnas, cursor=segunda.next_cursor, per_page=3)
+    
+    nombres = [p.nombre for p in primera.items + segunda.items + tercera.items]
+    assert nombres == [f'País {i}' for i in range(7)]
+    assert not primera.has_prev and primera.has_next
+    assert not tercera.has_next and tercera.has_prev
+    
+    regreso = paginar_keyset(consulta, columnas, cursor=tercera.prev_cursor, per_page=3)
+    assert [p.id for p in regreso.items] == [p.id for p in segunda.items]
+    
+    # El conteo se repite solo cuando cambia la tabla
+    cache = get_conteo_cache()
+    with capturar_consultas(contiene='count(*)') as conteos:
+        assert cache.contar(consulta, ['paises']) == 7
+        assert cache.contar(consulta, ['paises']) == 7
+        assert len(conteos) == 1
+        
+        db.session.add(Pais(nombre='País 7', codigo_iso='P07', activo=True))
+        db.session.commit()
+        assert cache.contar(consulta, ['paises']) == 8
+        assert len(conteos) == 2
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
+
+
+def test_estadisticas_agregadas_incrementales(init_database):
+    """Test: Las estadísticas se mantienen por diferencias y coinciden con reconstruir."""
+    from app.models import EstadisticaAgregada
+    
+    tipo = TipoProduccion.query.first()
+    publicado = Estado.query.filter_by(nombre='Publicado').first()
+    enviado = Estado(nombre='Enviado', activo=True)
+    db.session.add(enviado)
+    db.session.commit()
+    
+    articulos = [
+        Articulo(titulo=f'Artículo {i}', tipo_produccion_id=tipo.id,
+                 estado_id=publicado.id, anio_publicacion=2020 + i % 2,
+                 para_curriculum=False)
+        for i in range(4)
+    ]
+    db.session.add_all(articulos)
+    db.session.commit()
+    
+    stats = EstadisticaAgregada.obtener()
+    assert stats['total'] == {0: 4}
+    assert stats['estado'] == {publicado.id: 4}
+    assert stats['anio'] == {2020: 2, 2021: 2}
+    assert 'para_curriculum' not in stats
+    
+    # Cambio de estado, año y bandera
+    articulos[0].estado_id = enviado.id
+    articulos[0].anio_publicacion = 2022
+    articulos[1].para_curriculum = True
+    db.session.commit()
+    
+    stats = EstadisticaAgregada.obtener()
+    assert stats['estado'] == {publicado.id: 3, enviado.id: 1}
+    assert stats['anio'] == {2020: 1, 2021: 2, 2022: 1}
+    assert stats['para_curriculum'] == {0: 1}
+    
+    # Eliminación lógica, eliminación física y cambios revertidos
+    articulos[1].activo = False
+    db.session.delete(articulos[2])
+    db.session.commit()
+    articulos[3].activo = False
+    db.session.flush()
+    db.session.rollback()
+    
+    stats = EstadisticaAgregada.obtener()
+    assert stats['total'] == {0: 2}
+    assert stats['anio'] == {2021: 1, 2022: 1}
+    assert 'para_curriculum' not in stats
+    
+    # UPDATE masivo reconstruye
+    Articulo.query.filter_by(estado_id=enviado.id).update({'activo': False})
+    db.session.commit()
+    assert EstadisticaAgregada.obtener()['total'] == {0: 1}
+    
+    incremental = EstadisticaAgregada.obtener()
+    assert EstadisticaAgregada.reconstruir(db.session.connection()) == 1
+    assert EstadisticaAgregada.obtener() == incremental
@@ -369,6 +369,82 @@ class TestEmailExtraction:
             assert any('university.edu' in email or 'research.org' in email for email in emails)
 
 
+class TestAuthorIdentifiers:
+    """Tests de extracción de email y ORCID por autor"""
+    
+    TEI = """<?xml version="1.0" encoding="UTF-8"?>
+    <TEI xmlns="http://www.tei-c.org/ns/1.0">
+      <teiHeader>
+        <fileDesc>
+          <titleStmt><title>Estudio de prueba</title></titleStmt>
+          <sourceDesc><biblStruct><analytic>
+            <author>
+              <persName><forename>María</forename><surname>Pérez</surname></persName>
+              <email>MPerez@ucol.mx</email>
+              <idno type="ORCID">https://orcid.org/0000-0002-1825-009x</idno>
+            </author>
+            <author>
+              <persName><forename>Juan</forename><surname>López</surname></persName>
+            </author>
+            <author><affiliation>Sin nombre</affiliation></author>
+          </analytic></biblStruct></sourceDesc>
+        </fileDesc>
+      </teiHeader>
+    </TEI>"""
+    
+    def test_parse_grobid_tei_identifiers(self, pdf_service):
+        """GROBID: email e idno ORCID se asocian a cada autor"""
+        authors = pdf_service._parse_grobid_tei(self.TEI)['authors']
+        
+        assert len(authors) == 2
+        assert authors[0]['email'] == 'mperez@ucol.mx'
+        assert authors[0]['orcid'] == '0000-0002-1825-009X'
+        assert authors[1]['orden'] == 2
+        assert 'email' not in authors[1]
+    
+    def test_parse_crossref_orcid(self, pdf_service):
+        """Crossref: el ORCID del autor se normaliza"""
+        response = {'message': {'author': [
+            {'given': 'María', 'family': 'Pérez', 'ORCID': 'http://orcid.org/0000-0002-1825-0097'},
+            {'given': 'Juan', 'family': 'López'}
+        ]}}
+        
+        authors = pdf_service._parse_crossref_response(response)['authors']
+        
+        assert authors[0]['orcid'] == '0000-0002-1825-0097'
+        assert 'orcid' not in authors[1]
+    
+    def test_merge_author_identifiers(self, pdf_service):
+        """Los autores de Crossref conservan los identificadores de GROBID"""
+        grobid = pdf_service._parse_grobid_tei(self.TEI)['authors']
+        crossref = [
+            {'nombre': 'M.', 'apellidos': 'Pérez García', 'orden': 1},
+            {'nombre': 'J.', 'apellidos': 'López', 'orden': 2}
+        ]
+        
+        merged = pdf_service._merge_author_identifiers(crossref, grobid)
+        
+        assert merged[0]['nombre'] == 'M.'
+        assert merged[0]['email'] == 'mperez@ucol.mx'
+        assert merged[0]['orcid'] == '0000-0002-1825-009X'
+        assert 'email' not in merged[1]
+        assert pdf_service._merge_author_identifiers(None, grobid) is grobid
+    
+    def test_assign_emails_to_authors(self, pdf_service):
+        """Los emails del texto se asignan solo si el apellido coincide sin ambigüedad"""
+        authors = [
+            {'nombre': 'Ana', 'apellidos': 'Núñez', 'orden': 1},
+            {'nombre': 'Luis', 'apellidos': 'Ortiz', 'orden': 2}
+        ]
+        
+        pdf_service._assign_emails_to_authors(
+            authors, ['anunez@ucol.mx', 'contacto@ucol.mx']
+        )
+        
+        assert authors[0]['email'] == 'anunez@ucol.mx'
+        assert 'email' not in authors[1]
+
+
 class TestPDFInfo:
     """Tests de información del PDF"""
     
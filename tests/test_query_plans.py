@@ -0,0 +1,189 @@
+"""
+Tests de planes de ejecución de las consultas frecuentes.
+Ejecutan EXPLAIN QUERY PLAN (SQLite) y fallan si alguna vuelve a recorrer
+tablas completas o a ordenar en un B-tree temporal en lugar de usar los
+índices de la migración c7d2e5f8a913.
+"""
+import pytest
+
+from app import db
+from app.controllers import ArticleController
+from app.models import Articulo, Autor
+from app.models.cambios_articulo import cambios_desde, leer_marca
+from app.models.relations import ArticuloAutor
+
+
+@pytest.fixture
+def planes_de(capturar_consultas):
+    """
+    Función que ejecuta otra y obtiene el plan de cada SELECT que emitió
+    sobre artículos.
+
+    Returns:
+        list: Una lista de pasos (detalle de EXPLAIN QUERY PLAN) por consulta
+    """
+    def planes(ejecutar):
+        with capturar_consultas(contiene='articulo') as consultas:
+            ejecutar()
+
+        conexion = db.session.connection()
+        return [
+            [fila[-1] for fila in conexion.exec_driver_sql('EXPLAIN QUERY PLAN ' + sentencia,
+                                                            parametros)]
+            for sentencia, parametros in zip(consultas, consultas.parametros)
+            if sentencia.lstrip().upper().startswith('SELECT')
+        ]
+
+    return planes
+
+
+def assert_sin_escaneo_completo(pasos, *tablas):
+    """Falla si el plan recorre alguna de las tablas sin índice."""
+    for paso in pasos:
+        for tabla in tablas:
+            if paso.startswith(f'SCAN {tabla}') and 'INDEX' not in paso:
+                pytest.fail(f'Escaneo completo de {tabla}: {pasos}')
+
+
+def assert_sin_ordenamiento_temporal(pasos):
+    """Falla si el plan ordena en un B-tree temporal."""
+    if any('TEMP B-TREE' in paso for paso in pasos):
+        pytest.fail(f'Ordenamiento temporal: {pasos}')
+
+
+@pytest.fixture
+def articulos(app, db_session, catalogs):
+    """Algunos artículos con autores para que las consultas tengan datos."""
+    autor = Autor(nombre='Ana', apellidos='Pérez')
+    db_session.add(autor)
+    creados = []
+    for i in range(5):
+        articulo = Articulo(
+            titulo=f'Artículo {i}',
+            tipo_produccion_id=catalogs['tipo'].id,
+            estado_id=catalogs['estado'].id,
+            anio_publicacion=2020 + i
+        )
+        db_session.add(articulo)
+        db_session.flush()
+        db_session.add(ArticuloAutor(articulo_id=articulo.id, autor_id=autor.id, orden=1))
+        creados.append(articulo)
+    db_session.commit()
+    return {'autor': autor, 'articulos': creados}
+
+
+class TestPlanesListado:
+    """Listado de artículos (paginación por cursor)."""
+
+    def test_primera_pagina_usa_indice_de_recientes(self, app, articulos, planes_de):
+        planes = planes_de(lambda: ArticleController.get_page(per_page=2, con_total=False))
+        pasos = planes[0]
+
+        assert any('ix_articulos_activos_recientes' in paso for paso in pasos), pasos
+        assert_sin_ordenamiento_temporal(pasos)
+
+    def test_pagina_por_cursor_usa_indice_de_recientes(self, app, articulos, planes_de):
+        primera, _ = ArticleController.get_page(per_page=2, con_total=False)
+        planes = planes_de(lambda: ArticleController.get_page(
+            cursor=primera.next_cursor, per_page=2, con_total=False
+        ))
+        pasos = planes[0]
+
+        assert any('ix_articulos_activos_recientes' in paso for paso in pasos), pasos
+        assert_sin_escaneo_completo(pasos, 'articulos')
+        assert_sin_ordenamiento_temporal(pasos)
+
+    def test_filtro_por_tipo_usa_indice_compuesto(self, app, articulos, catalogs, planes_de):
+        planes = planes_de(lambda: ArticleController.get_page(
+            tipo_id=catalogs['tipo'].id, per_page=2, con_total=False
+        ))
+        pasos = planes[0]
+
+        assert any('ix_articulos_activos_tipo' in paso for paso in pasos), pasos
+        assert_sin_ordenamiento_temporal(pasos)
+
+    def test_filtro_por_estado_usa_indice_compuesto(self, app, articulos, catalogs, planes_de):
+        planes = planes_de(lambda: ArticleController.get_page(
+            estado_id=catalogs['estado'].id, per_page=2, con_total=False
+        ))
+        pasos = planes[0]
+
+        assert any('ix_articulos_activos_estado' in paso for paso in pasos), pasos
+        assert_sin_ordenamiento_temporal(pasos)
+
+
+    def test_varios_tipos_y_rango_de_anios(self, app, articulos, catalogs, planes_de):
+        """IN sobre el tipo y rango de años siguen usando índices parciales."""
+        planes = planes_de(lambda: ArticleController.get_page(
+            tipo_id=[catalogs['tipo'].id, catalogs['tipo'].id + 1],
+            anio_inicio=2021, anio_fin=2023, per_page=2, con_total=False
+        ))
+        pasos = planes[0]
+
+        assert any('ix_articulos_activos' in paso for paso in pasos), pasos
+        assert_sin_escaneo_completo(pasos, 'articulos')
+
+
+class TestPlanesAutores:
+    """Uniones con articulo_autor."""
+
+    def test_articulos_de_un_autor(self, app, articulos, planes_de):
+        autor_id = articulos['autor'].id
+        planes = planes_de(lambda: ArticleController.get_page(
+            autor_id=autor_id, per_page=2, con_total=False
+        ))
+        pasos = planes[0]
+
+        assert any('ix_articulo_autor_autor' in paso for paso in pasos), pasos
+        assert_sin_escaneo_completo(pasos, 'articulos', 'articulo_autor')
+
+    def test_busqueda_por_nombre_de_autor(self, app, articulos, planes_de):
+        """El apellido se resuelve con el índice de autores y filtra con EXISTS indexado."""
+        def buscar():
+            return ArticleController.get_page(query='Pérez', per_page=2, con_total=False)
+
+        buscar()  # Carga el catálogo de autores
+        planes = planes_de(buscar)
+        pasos = planes[0]
+
+        assert any('articulo_autor' in paso and 'INDEX' in paso for paso in pasos), pasos
+        assert_sin_escaneo_completo(pasos, 'articulo_autor')
+
+    def test_autores_de_un_articulo(self, app, articulos, planes_de):
+        articulo_id = articulos['articulos'][0].id
+        planes = planes_de(lambda: ArticuloAutor.query.filter_by(articulo_id=articulo_id).all())
+
+        for pasos in planes:
+            assert_sin_escaneo_completo(pasos, 'articulo_autor')
+
+
+class TestPlanesReportes:
+    """Consultas de exportación y estadísticas."""
+
+    def test_rango_de_anios(self, app, articulos, planes_de):
+        planes = planes_de(lambda: Articulo.query.filter(
+            Articulo.activo == True,
+            Articulo.anio_publicacion.between(2021, 2023)
+        ).all())
+        pasos = planes[0]
+
+        assert any('ix_articulos_activos_anio' in paso for paso in pasos), pasos
+        assert_sin_escaneo_completo(pasos, 'articulos')
+
+    def test_estadisticas_no_consultan_articulos(self, app, articulos, planes_de):
+        """El dashboard lee estadisticas_agregadas, no la tabla de artículos."""
+        planes = planes_de(ArticleController.get_statistics)
+
+        assert planes == []
+
+    def test_cambios_desde_marca_usan_indice_de_cambios(self, app, articulos, planes_de):
+        """La exportación incremental recorre solo el tramo posterior a la marca."""
+        ultimo = articulos['articulos'][2]
+        marca = leer_marca(f'{ultimo.updated_at.isoformat()}')
+        planes = planes_de(lambda: cambios_desde(Articulo.query, marca)
+                           .order_by(Articulo.updated_at, Articulo.id).all())
+        pasos = planes[0]
+
+        assert any('ix_articulos_cambios' in paso for paso in pasos), pasos
+        assert_sin_escaneo_completo(pasos, 'articulos')
+        assert_sin_ordenamiento_temporal(pasos)
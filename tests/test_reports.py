@@ -0,0 +1,906 @@
+"""
+Tests para el controlador de reportes y exportaciones.
+"""
+import io
+import json
+import os
+import threading
+import time
+import tracemalloc
+import zipfile
+from types import SimpleNamespace
+
+import pytest
+from flask import g
+from openpyxl import Workbook, load_workbook
+
+from app.controllers.report_controller import ReportController
+from app.services.bibliografia_import import BibliografiaImportService
+from app.services.excel_import import ExcelImportService
+from app.services.excel_service import ExcelService
+from app.services.export_cache import ExportCache
+from app.services.export_jobs import ExportJob, ExportJobService
+from app.models import Articulo, Autor, Estado
+from app.models.filtro_articulos import FiltroArticulos
+from app.models.cambios_articulo import MarcaInvalida
+from app.models.relations import ArticuloAutor, ArticuloIndexacion, RevistaIndexacion
+from app.models.revista import Revista
+
+
+@pytest.fixture
+def articulos(app, db_session, catalogs):
+    """Artículos con distintos años, estados y completitud."""
+    enviado = Estado.query.filter_by(nombre='Enviado').first()
+    datos = [
+        ('Redes neuronales', catalogs['estado'].id, 2023, True, True),
+        ('Redes de sensores', catalogs['estado'].id, 2022, False, True),
+        ('Grafos', enviado.id, 2022, False, False),
+        ('Sin año', enviado.id, None, True, True),
+    ]
+    for titulo, estado_id, anio, completo, para_curriculum in datos:
+        db_session.add(Articulo(
+            titulo=titulo,
+            tipo_produccion_id=catalogs['tipo'].id,
+            estado_id=estado_id,
+            anio_publicacion=anio,
+            completo=completo,
+            para_curriculum=para_curriculum
+        ))
+    db_session.add(Articulo(
+        titulo='Inactivo',
+        tipo_produccion_id=catalogs['tipo'].id,
+        estado_id=catalogs['estado'].id,
+        anio_publicacion=2023,
+        activo=False
+    ))
+    db_session.commit()
+
+
+class TestExportStatistics:
+    """Tests para get_export_statistics."""
+
+    def test_estadisticas_sin_filtros(self, app, articulos):
+        stats = ReportController().get_export_statistics({'activo': True})
+
+        assert stats == {
+            'total': 4,
+            'completos': 2,
+            'incompletos': 2,
+            'para_curriculum': 3,
+            'por_anio': {2023: 1, 2022: 2},
+            'por_tipo': {'Artículo científico': 4},
+            'por_estado': {'Publicado': 2, 'Enviado': 2}
+        }
+
+    def test_estadisticas_con_filtros(self, app, articulos):
+        stats = ReportController().get_export_statistics({
+            'activo': True, 'anio_inicio': 2022, 'search': 'redes'
+        })
+
+        assert stats['total'] == 2
+        assert stats['por_anio'] == {2023: 1, 2022: 1}
+        assert stats['por_estado'] == {'Publicado': 2}
+
+    def test_estadisticas_sin_resultados(self, app, articulos):
+        stats = ReportController().get_export_statistics({'activo': True, 'anio_inicio': 2030})
+
+        assert stats['total'] == 0
+        assert stats['completos'] == 0
+        assert stats['por_anio'] == {}
+
+    def test_estadisticas_no_cargan_articulos(self, app, articulos, capturar_consultas):
+        """Las estadísticas solo leen agregados: ninguna consulta trae filas de artículos."""
+        with capturar_consultas() as consultas:
+            ReportController().get_export_statistics({'activo': True})
+
+        agregadas = [c for c in consultas if 'filtrados' in c]
+        assert len(agregadas) == 2
+        assert not any('articulos.titulo' in c for c in consultas)
+
+
+class TestExportFilters:
+    """Los filtros de exportación usan la misma especificación que el listado."""
+
+    def test_filtros_por_lgac_autor_e_indexacion(self, app, db_session, articulos, catalogs):
+        redes = Articulo.query.filter_by(titulo='Redes neuronales').one()
+        grafos = Articulo.query.filter_by(titulo='Grafos').one()
+        redes.lgac_id = catalogs['lgac'].id
+        scopus = catalogs['indexacion']
+        autor = Autor(nombre='Ana', apellidos='Pérez')
+        db_session.add(autor)
+        db_session.flush()
+        db_session.add(ArticuloIndexacion(articulo_id=grafos.id, indexacion_id=scopus.id))
+        grafos.agregar_autor(autor)
+        db_session.commit()
+
+        controller = ReportController()
+        assert controller.get_export_statistics({'lgac_id': catalogs['lgac'].id})['total'] == 1
+        assert controller.get_export_statistics({'indexacion_id': scopus.id})['total'] == 1
+        assert controller.get_export_statistics({'autor_id': autor.id})['total'] == 1
+
+    def test_listas_y_tipo_produccion_id(self, app, articulos, catalogs):
+        enviado = Estado.query.filter_by(nombre='Enviado').first()
+        controller = ReportController()
+
+        stats = controller.get_export_statistics({
+            'tipo_produccion_id': catalogs['tipo'].id,
+            'estado_id': [catalogs['estado'].id, enviado.id],
+            'anio_inicio': 2022, 'anio_fin': 2022
+        })
+        assert stats['total'] == 2
+
+        filtro = FiltroArticulos(estado_ids=[enviado.id], con_doi=False)
+        assert controller.get_export_statistics(filtro)['total'] == 2
+
+    def test_nombre_de_archivo(self, app, articulos, catalogs):
+        filtro = FiltroArticulos(tipo_ids=[catalogs['tipo'].id], anio_inicio=2020, anio_fin=2024,
+                                 completo=False)
+        nombre = ReportController()._generate_filename(filtro)
+
+        assert nombre.startswith('articulos_2020-2024_artículo_científico_incompletos')
+
+
+class TestExportExcel:
+    """Exportación a Excel en modo write_only."""
+
+    def test_exportacion_con_estilos_y_metadatos(self, app, db_session, articulos):
+        redes = Articulo.query.filter_by(titulo='Redes neuronales').one()
+        autor = Autor(nombre='Ana', apellidos='Pérez')
+        db_session.add(autor)
+        db_session.flush()
+        redes.agregar_autor(autor)
+        db_session.commit()
+
+        archivo, nombre = ReportController().export_excel({'activo': True})
+        libro = load_workbook(archivo)
+        hoja = libro['Artículos Académicos']
+
+        assert nombre.endswith('.xlsx')
+        assert hoja.max_row == 5
+        assert hoja.freeze_panes == 'A2'
+        assert hoja['A1'].style == 'encabezado' and hoja['A1'].font.b
+        assert [hoja.cell(row=fila, column=2).value for fila in range(2, 6)] == [
+            'Redes neuronales', 'Grafos', 'Redes de sensores', 'Sin año'
+        ]
+        assert hoja['B2'].style == 'dato_alterno' and hoja['B3'].style == 'dato'
+        assert hoja['A2'].style == 'dato_alterno_centrado'
+        assert hoja['C2'].value == 'Ana Pérez'
+        assert libro['Información del Reporte']['B2'].value == 4
+
+    def test_consultas_fijas_por_lote(self, app, db_session, catalogs, monkeypatch,
+                                      capturar_consultas):
+        """Las relaciones se precargan con las mismas consultas sin importar las filas del lote."""
+        revista = Revista(nombre='Revista indexada', pais_id=catalogs['pais'].id)
+        db_session.add(revista)
+        db_session.flush()
+        db_session.add(RevistaIndexacion(revista_id=revista.id,
+                                         indexacion_id=catalogs['indexacion'].id))
+
+        def crear(cantidad):
+            for i in range(cantidad):
+                db_session.add(Articulo(
+                    titulo=f'Artículo {i}', tipo_produccion_id=catalogs['tipo'].id,
+                    estado_id=catalogs['estado'].id, lgac_id=catalogs['lgac'].id,
+                    proposito_id=catalogs['proposito'].id, revista_id=revista.id,
+                    anio_publicacion=2024
+                ))
+            db_session.commit()
+
+        def exportar():
+            g.pop('_versiones_tabla', None)
+            with capturar_consultas(solo_lecturas=True) as consultas:
+                archivo, _ = ReportController().export_excel({'activo': True})
+            return load_workbook(archivo)['Artículos Académicos'], len(consultas)
+
+        crear(3)
+        exportar()  # calienta el caché de catálogos
+        _, pocas = exportar()
+        crear(9)
+        hoja, muchas = exportar()
+
+        assert muchas == pocas
+        assert hoja.max_row == 13
+        fila = [celda.value for celda in hoja[2]]
+        assert fila[8:14] == ['Artículo científico', 'Publicado', 'LGAC de prueba',
+                              'Investigación básica', 'Scopus', 'México']
+
+        # Con lotes de 4 artículos: 3 lotes, dos consultas más por cada lote extra
+        monkeypatch.setattr(ReportController, 'TAMANO_LOTE', 4)
+        _, por_lotes = exportar()
+        assert por_lotes == muchas + 2 * 2
+
+    def test_memoria_constante(self, app):
+        """El pico de memoria no crece con el número de filas."""
+        def filas(cantidad):
+            for i in range(cantidad):
+                yield SimpleNamespace(
+                    id=i, titulo=f'Artículo {i}', autores_display='Ana Pérez, Luis Gómez',
+                    anio_publicacion=2024, titulo_revista='Revista', nombre_congreso=None,
+                    issn='1234-5678', doi=f'10.1000/{i}', tipo=None, estado=None, lgac=None,
+                    proposito=None, revista=None, articulo_indexaciones=[], url=None,
+                    para_curriculum=True, completo=False, descripcion='Resumen ' * 20
+                )
+
+        def pico(cantidad):
+            tracemalloc.start()
+            ExcelService().generate(filas(cantidad)).close()
+            _, maximo = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            return maximo
+
+        assert pico(1200) < pico(300) * 1.5
+
+
+class TestExportCache:
+    """Caché en disco de exportaciones por filtros y versión de datos."""
+
+    @staticmethod
+    def escribir(contenido):
+        def generar(destino):
+            destino.write(contenido)
+        return generar
+
+    def test_aciertos_y_version_de_datos(self, app, db_session, articulos, tmp_path):
+        cache = ExportCache(str(tmp_path))
+        generaciones = []
+
+        def generar(destino):
+            generaciones.append(1)
+            destino.write(b'xlsx')
+
+        primero = cache.obtener('xlsx', {'anio': 2022}, generar)
+        segundo = cache.obtener('xlsx', FiltroArticulos(anio_inicio=2022, anio_fin=2022), generar)
+        assert primero.generado and not segundo.generado
+        assert segundo.ruta == primero.ruta and segundo.clave == primero.clave
+        assert len(generaciones) == 1
+
+        Articulo.query.filter_by(titulo='Grafos').one().completo = True
+        db_session.commit()
+        tercero = cache.obtener('xlsx', {'anio': 2022}, generar)
+        assert tercero.generado and tercero.clave != primero.clave
+
+        stats = cache.estadisticas()
+        assert (stats['aciertos'], stats['fallos'], stats['generados']) == (1, 2, 2)
+        assert stats['tasa_aciertos'] == round(1 / 3, 4)
+
+    def test_desalojo_lru_y_por_antiguedad(self, app, db_session, tmp_path):
+        cache = ExportCache(str(tmp_path), max_entradas=2, max_antiguedad=3600)
+        a = cache.obtener('xlsx', {'anio': 2020}, self.escribir(b'a'))
+        b = cache.obtener('xlsx', {'anio': 2021}, self.escribir(b'b'))
+
+        # a se usó más recientemente que b: al agregar c se desaloja b
+        os.utime(b.ruta, (time.time() - 60, os.stat(b.ruta).st_mtime))
+        assert not cache.obtener('xlsx', {'anio': 2020}, self.escribir(b'a')).generado
+        cache.obtener('xlsx', {'anio': 2022}, self.escribir(b'c'))
+        assert os.path.exists(a.ruta) and not os.path.exists(b.ruta)
+
+        # Un archivo expirado se vuelve a generar
+        antiguo = time.time() - 7200
+        os.utime(a.ruta, (antiguo, antiguo))
+        assert cache.obtener('xlsx', {'anio': 2020}, self.escribir(b'a2')).generado
+        with open(a.ruta, 'rb') as archivo:
+            assert archivo.read() == b'a2'
+
+        assert cache.estadisticas()['desalojados'] == 1
+        assert not [nombre for nombre in os.listdir(tmp_path) if nombre.endswith('.tmp')]
+
+    def test_no_desaloja_el_archivo_devuelto(self, app, db_session, tmp_path):
+        """Un archivo que por sí solo excede los límites se devuelve igual."""
+        cache = ExportCache(str(tmp_path), max_entradas=1, max_bytes=4)
+        a = cache.obtener('xlsx', {'anio': 2020}, self.escribir(b'a'))
+        b = cache.obtener('xlsx', {'anio': 2021}, self.escribir(b'grande'))
+        assert os.path.exists(b.ruta) and not os.path.exists(a.ruta)
+
+
+class TestExportJobs:
+    """Cola de exportaciones en segundo plano."""
+
+    def test_maximo_de_exportaciones_simultaneas(self, app, monkeypatch):
+        en_curso = []
+        maximo = []
+        lock = threading.Lock()
+
+        def exportar(controlador, filtro):
+            with lock:
+                en_curso.append(filtro)
+                maximo.append(len(en_curso))
+            time.sleep(0.05)
+            with lock:
+                en_curso.remove(filtro)
+            if filtro.anio_inicio == 2000:
+                raise ValueError('falla')
+            return 'artefacto', f'{filtro.anio_inicio}.xlsx'
+
+        monkeypatch.setattr(ReportController, 'export_excel_cached', exportar)
+        servicio = ExportJobService(app, max_concurrentes=2)
+
+        jobs = [servicio.encolar({'anio': anio}) for anio in range(2000, 2006)]
+        # Los mismos filtros sin terminar reutilizan el trabajo
+        assert servicio.encolar({'anio': 2005}) is jobs[-1]
+
+        assert all(job.esperar(timeout=10) for job in jobs)
+        assert max(maximo) <= 2
+        assert jobs[0].status == ExportJob.ERROR and jobs[0].error == 'falla'
+        assert [job.filename for job in jobs[1:]] == [f'{anio}.xlsx' for anio in range(2001, 2006)]
+        assert servicio.obtener(jobs[1].job_id).status == ExportJob.COMPLETADO
+
+
+class TestDeltaExport:
+    """Exportaciones incrementales con marca de agua (since)."""
+
+    @staticmethod
+    def exportar(since=None):
+        bloques, filename, _, marca = ReportController().export_stream({}, 'jsonl', since=since)
+        registros = [json.loads(linea) for linea in ''.join(bloques).splitlines()]
+        return registros, marca, filename
+
+    def test_solo_cambios_despues_de_la_marca(self, app, db_session, articulos, catalogs):
+        todos, marca, _ = self.exportar()
+        assert len(todos) == 4
+
+        redes = Articulo.query.filter_by(titulo='Redes neuronales').one()
+        grafos = Articulo.query.filter_by(titulo='Grafos').one()
+        sensores = Articulo.query.filter_by(titulo='Redes de sensores').one()
+        redes.titulo = 'Redes neuronales profundas'
+        grafos.activo = False
+        db_session.add(ArticuloIndexacion(articulo_id=sensores.id,
+                                          indexacion_id=catalogs['indexacion'].id))
+        db_session.commit()
+
+        cambios, siguiente, filename = self.exportar(since=marca)
+        assert filename.startswith('articulos_cambios_')
+        assert {r['titulo']: r['activo'] for r in cambios} == {
+            'Redes neuronales profundas': True, 'Grafos': False, 'Redes de sensores': True
+        }
+        assert cambios[-1]['id'] == sensores.id  # en orden de cambio
+        assert siguiente != marca
+
+        # Sin cambios: nada nuevo y la misma marca
+        assert self.exportar(since=siguiente)[:2] == ([], siguiente)
+
+        # Autores (incluidos los borrados masivos) marcan solo a su artículo
+        autor = Autor(nombre='Ana', apellidos='Pérez')
+        db_session.add(autor)
+        db_session.flush()
+        sensores.agregar_autor(autor)
+        db_session.commit()
+        cambios, siguiente, _ = self.exportar(since=siguiente)
+        assert [r['id'] for r in cambios] == [sensores.id]
+        assert cambios[0]['autores'] == 'Ana Pérez'
+
+        ArticuloAutor.query.filter_by(articulo_id=sensores.id).delete()
+        ArticuloIndexacion.query.filter_by(articulo_id=sensores.id).delete()
+        db_session.commit()
+        cambios, _, _ = self.exportar(since=siguiente)
+        assert [(r['id'], r['autores'], r['indexaciones']) for r in cambios] == [
+            (sensores.id, None, None)
+        ]
+
+    def test_since_con_fecha_o_invalido(self, app, db_session, articulos):
+        registros, _, _ = self.exportar(since='2000-01-01T00:00:00Z')
+        assert len(registros) == 5  # incluye el artículo inactivo
+        assert self.exportar(since='2999-01-01')[0] == []
+
+        with pytest.raises(MarcaInvalida):
+            self.exportar(since='ayer')
+
+
+class TestExcelImport:
+    """Importación por lotes desde la plantilla del CA y desde la exportación."""
+
+    ENCABEZADOS = ['Tipo de producción', 'Título del artículo', 'Autor(es) participante(s)',
+                   'Registro del autor', 'Título de la revista', 'Editorial', 'ISSN', 'Volumen',
+                   'Número', 'Página inicial', 'Página final', 'Año', 'País', 'LGAC', 'Indexación',
+                   'Estado actual', 'Descripción', 'Dirección electrónica',
+                   'Propósito del artículo', 'Considera para curriculum del CA',
+                   'Nombre del congreso', 'DOI']
+
+    @staticmethod
+    def libro(tmp_path, encabezados, filas, titulo=None):
+        wb = Workbook()
+        ws = wb.active
+        if titulo:
+            ws.append([titulo])
+        ws.append(encabezados)
+        for fila in filas:
+            ws.append(fila)
+        ruta = tmp_path / 'importacion.xlsx'
+        wb.save(ruta)
+        return str(ruta)
+
+    @staticmethod
+    def fila(titulo, autores='Ana Pérez, Luis Gómez', estado='Publicado', anio=2024,
+             doi=None, **extra):
+        valores = {
+            'Tipo de producción': 'Artículo científico', 'Título del artículo': titulo,
+            'Autor(es) participante(s)': autores, 'Título de la revista': 'Revista de Cómputo',
+            'ISSN': '12345678', 'Volumen': 'Vol. 12', 'Número': 'No. 3', 'Página inicial': 10,
+            'Página final': 20.0, 'Año': anio, 'País': 'Mexico', 'LGAC': 'LGAC de prueba',
+            'Indexación': 'scopus', 'Estado actual': estado, 'Considera para curriculum del CA': 'Sí',
+            'DOI': doi,
+        }
+        valores.update(extra)
+        return [valores.get(encabezado) for encabezado in TestExcelImport.ENCABEZADOS]
+
+    def test_importa_plantilla_del_ca(self, app, db_session, catalogs, tmp_path):
+        existente = Articulo(titulo='Artículo previo', tipo_produccion_id=catalogs['tipo'].id,
+                             estado_id=catalogs['estado'].id, doi='10.1000/previo')
+        db_session.add(existente)
+        db_session.commit()
+
+        ruta = self.libro(tmp_path, self.ENCABEZADOS + ['Notas'], [
+            self.fila('Redes neuronales', **{'Registro del autor': 'R-1'}),
+            self.fila('Título corregido', autores='Ana Perez', doi='https://doi.org/10.1000/PREVIO'),
+            [],
+            self.fila('Sin estado', estado='Desconocido', anio='dos mil'),
+            self.fila('Redes  neuronales.', autores='Luis Gómez; Marta Ruiz', anio=2023),
+        ], titulo='Producción académica del CA')
+
+        resultado = ExcelImportService(tamano_lote=10).importar(ruta)
+
+        assert (resultado['total'], resultado['creados'], resultado['actualizados']) == (4, 1, 2)
+        assert (resultado['autores_nuevos'], resultado['revistas_nuevas']) == (3, 1)
+        assert resultado['columnas_ignoradas'] == ['Notas']
+        assert [error['fila'] for error in resultado['errores']] == [6]
+        assert len(resultado['errores'][0]['errores']) == 2
+
+        # La segunda fila con la misma huella de título actualiza el artículo
+        redes = Articulo.query.filter_by(anio_publicacion=2023).one()
+        assert redes.titulo == 'Redes neuronales.'
+        assert redes.autores_display == 'Luis Gómez, Marta Ruiz'
+        assert redes.archivo_origen == 'importacion.xlsx'
+        assert (redes.volumen, redes.numero, redes.pagina_fin) == ('12', '3', 20)
+        assert redes.revista.issn == '1234-5678'
+        assert redes.revista.pais_id == catalogs['pais'].id
+        assert [ai.indexacion_id for ai in redes.articulo_indexaciones] == [catalogs['indexacion'].id]
+        assert redes.completo is True
+
+        previo = db_session.get(Articulo, existente.id)
+        assert (previo.titulo, previo.doi) == ('Título corregido', '10.1000/PREVIO')
+        assert previo.autores_display == 'Ana Pérez'
+        assert Autor.query.filter_by(registro='R-1').one().nombre_completo == 'Ana Pérez'
+        assert Revista.query.count() == 1
+
+    def test_autores_sin_grados(self, app, db_session, catalogs, tmp_path):
+        """Los grados del ejemplo de docs/MAPEO_EXCEL.md no forman parte del nombre."""
+        juan = Autor(nombre='Juan', apellidos='Pérez')
+        juan.actualizar_nombre_normalizado()
+        db_session.add(juan)
+        db_session.commit()
+
+        ruta = self.libro(tmp_path, self.ENCABEZADOS, [
+            self.fila('Deep Learning in Medicine', autores='Dr. Juan Pérez, Dra. Ana López'),
+            self.fila('Otro artículo', autores='López, Dra. Ana; Mtro. Luis Gómez'),
+        ])
+        resultado = ExcelImportService().importar(ruta)
+
+        assert (resultado['creados'], resultado['autores_nuevos']) == (2, 2)
+        articulo = Articulo.query.filter_by(titulo='Deep Learning in Medicine').one()
+        assert articulo.autores_display == 'Juan Pérez, Ana López'
+        assert ArticuloAutor.query.filter_by(articulo_id=articulo.id, orden=1).one().autor_id == juan.id
+        otro = Articulo.query.filter_by(titulo='Otro artículo').one()
+        assert otro.autores_display == 'Ana López, Luis Gómez'
+
+    def test_reimportar_exportacion(self, app, db_session, articulos, catalogs, tmp_path):
+        """El archivo exportado se importa sin duplicar artículos."""
+        ruta = tmp_path / 'exportacion.xlsx'
+        with open(ruta, 'wb') as destino:
+            ExcelService().generate(Articulo.query.order_by(Articulo.id), destino=destino)
+
+        resultado = ExcelImportService().importar(str(ruta))
+
+        assert resultado['errores'] == []
+        assert (resultado['creados'], resultado['actualizados']) == (0, 5)
+        assert 'ID' in resultado['columnas_ignoradas']
+        assert Articulo.query.count() == 5
+
+    def test_reemplazo_de_autores_solo_recalcula_el_lote(self, app, db_session, catalogs,
+                                                         tmp_path, capturar_consultas):
+        """Reemplazar los autores de un lote no recalcula autores_display de otros artículos."""
+        otro = Autor(nombre='Otro', apellidos='Autor')
+        db_session.add(otro)
+        for i in range(30):
+            articulo = Articulo(titulo=f'Ajeno {i}', tipo_produccion_id=catalogs['tipo'].id,
+                                estado_id=catalogs['estado'].id)
+            db_session.add(articulo)
+            articulo.agregar_autor(otro)
+        db_session.commit()
+        ruta = self.libro(tmp_path, self.ENCABEZADOS, [
+            self.fila(f'Artículo {i}', doi=f'10.1000/{i}') for i in range(3)
+        ])
+        ExcelImportService().importar(ruta)
+
+        ruta = self.libro(tmp_path, self.ENCABEZADOS, [
+            self.fila(f'Artículo {i}', autores='Luis Gómez', doi=f'10.1000/{i}',
+                      **{'Registro del autor': 'R-1'})
+            for i in range(3)
+        ])
+        with capturar_consultas(contiene='SELECT articulos.id, articulos.autores_display') as consultas:
+            resultado = ExcelImportService().importar(ruta)
+        assert (resultado['actualizados'], resultado['errores']) == (3, [])
+        assert consultas and all('WHERE' in consulta for consulta in consultas)
+        assert all(len(parametros) <= 3 for parametros in consultas.parametros)
+        assert Articulo.query.filter_by(titulo='Artículo 0').one().autores_display == 'Luis Gómez'
+        assert Articulo.query.filter_by(titulo='Ajeno 0').one().autores_display == 'Otro Autor'
+
+    def test_consultas_fijas_por_lote(self, app, db_session, catalogs, tmp_path,
+                                      capturar_consultas):
+        """Las consultas de lectura dependen del número de lotes, no de filas."""
+        def importar(cantidad, inicio):
+            ruta = self.libro(tmp_path, self.ENCABEZADOS, [
+                self.fila(f'Artículo {i}', autores=f'Autor {chr(65 + i % 26)} Pérez',
+                          doi=f'10.1000/{i}')
+                for i in range(inicio, inicio + cantidad)
+            ])
+            g.pop('_versiones_tabla', None)
+            with capturar_consultas(solo_lecturas=True) as consultas:
+                resultado = ExcelImportService(tamano_lote=100).importar(ruta)
+            assert resultado['errores'] == []
+            return resultado, len(consultas)
+
+        importar(30, 0)  # crea la revista, los autores y calienta el caché de catálogos
+        resultado, pocas = importar(10, 100)
+        assert resultado['creados'] == 10
+        resultado, muchas = importar(60, 200)
+        assert resultado['creados'] == 60
+        assert muchas == pocas
+
+        # Reimportar actualiza en vez de duplicar
+        resultado, _ = importar(60, 200)
+        assert (resultado['creados'], resultado['actualizados']) == (0, 60)
+        assert Articulo.query.count() == 100
+
+    def test_archivo_invalido(self, app, catalogs, tmp_path):
+        ruta = tmp_path / 'no_es_excel.xlsx'
+        ruta.write_text('hola')
+        with pytest.raises(ValueError):
+            ExcelImportService().importar(str(ruta))
+
+        with pytest.raises(ValueError, match='Estado actual'):
+            ExcelImportService().importar(self.libro(tmp_path, ['Título del artículo',
+                                                                'Tipo de producción'], []))
+
+
+class TestCurriculumBundle:
+    """Un libro por miembro del CA en un solo ZIP."""
+
+    @staticmethod
+    def crear(db_session, catalogs, titulo, autores, para_curriculum=True, anio=2024):
+        articulo = Articulo(titulo=titulo, tipo_produccion_id=catalogs['tipo'].id,
+                            estado_id=catalogs['estado'].id, anio_publicacion=anio,
+                            para_curriculum=para_curriculum)
+        db_session.add(articulo)
+        for autor in autores:
+            articulo.agregar_autor(autor)
+        return articulo
+
+    @pytest.fixture(autouse=True)
+    def _capturar_consultas(self, capturar_consultas):
+        self.capturar_consultas = capturar_consultas
+
+    def exportar(self, filtros=None):
+        g.pop('_versiones_tabla', None)
+        with self.capturar_consultas(solo_lecturas=True) as consultas:
+            bloques, filename = ReportController().export_curriculum_bundle(filtros)
+            contenido = b''.join(bloques)
+
+        libros = {}
+        with zipfile.ZipFile(io.BytesIO(contenido)) as zip_file:
+            for nombre in zip_file.namelist():
+                wb = load_workbook(io.BytesIO(zip_file.read(nombre)))
+                hoja = wb['Artículos Académicos']
+                libros[nombre] = {
+                    'titulos': [fila[1] for fila in hoja.iter_rows(min_row=2, values_only=True)],
+                    'autor': dict(wb['Información del Reporte'].iter_rows(values_only=True))['Autor:'],
+                }
+        return filename, libros, len(consultas)
+
+    def test_un_libro_por_miembro_en_paralelo(self, app, db_session, catalogs):
+        app.config['CURRICULUM_MAX_PROCESSES'] = 1
+        ana = Autor(nombre='Ana', apellidos='Pérez', es_miembro_ca=True)
+        luis = Autor(nombre='Luis', apellidos='Gómez', es_miembro_ca=True)
+        externo = Autor(nombre='Eva', apellidos='Ruiz')
+        db_session.add_all([ana, luis, externo])
+        db_session.flush()
+        self.crear(db_session, catalogs, 'Conjunto', [ana, luis], anio=2025)
+        self.crear(db_session, catalogs, 'Solo Ana', [ana, externo])
+        self.crear(db_session, catalogs, 'No curricular', [luis], para_curriculum=False)
+        self.crear(db_session, catalogs, 'Externo', [externo])
+        db_session.commit()
+
+        _, _, consultas = self.exportar()  # calienta el caché de catálogos
+        _, _, consultas = self.exportar()
+
+        # Los libros se construyen en procesos aparte con el mismo resultado
+        app.config['CURRICULUM_MAX_PROCESSES'] = 2
+        filename, libros, _ = self.exportar()
+        app.config['CURRICULUM_MAX_PROCESSES'] = 1
+
+        assert filename.startswith('curriculum_ca_') and filename.endswith('.zip')
+        assert libros == {
+            f'curriculum_{luis.id}_Gomez_Luis.xlsx': {'titulos': ['Conjunto'], 'autor': 'Luis Gómez'},
+            f'curriculum_{ana.id}_Perez_Ana.xlsx': {'titulos': ['Conjunto', 'Solo Ana'],
+                                                    'autor': 'Ana Pérez'},
+        }
+
+        # Un miembro más con artículos no agrega consultas
+        rosa = Autor(nombre='Rosa', apellidos='Díaz', es_miembro_ca=True)
+        db_session.add(rosa)
+        db_session.flush()
+        self.crear(db_session, catalogs, 'De Rosa', [rosa])
+        db_session.commit()
+        _, libros, con_otro = self.exportar()
+        assert len(libros) == 3
+        assert con_otro == consultas
+
+        # autor_id limita los miembros; los filtros se aplican a sus artículos
+        _, libros, _ = self.exportar({'autor_ids': [ana.id], 'anio_inicio': 2025})
+        assert list(libros.values()) == [{'titulos': ['Conjunto'], 'autor': 'Ana Pérez'}]
+
+
+class TestBibliografia:
+    """Exportación BibTeX y RIS por flujo."""
+
+    @pytest.fixture(autouse=True)
+    def _capturar_consultas(self, capturar_consultas):
+        self.capturar_consultas = capturar_consultas
+
+    def exportar(self, formato, filtros=None):
+        g.pop('_versiones_tabla', None)
+        with self.capturar_consultas(solo_lecturas=True) as consultas:
+            bloques, filename, mimetype, _ = ReportController().export_stream(filtros, formato)
+            texto = ''.join(bloques)
+        return texto, filename, len(consultas)
+
+    def test_bibtex_y_ris(self, app, db_session, catalogs):
+        revista = Revista(nombre='Revista de Cómputo', issn='1234-5678')
+        ana = Autor(nombre='Ana', apellidos='Pérez')
+        luis = Autor(nombre='Luis', apellidos='Gómez')
+        db_session.add_all([revista, ana, luis])
+        db_session.flush()
+        articulo = Articulo(titulo='Redes & grafos al 100%', tipo_produccion_id=catalogs['tipo'].id,
+                            estado_id=catalogs['estado'].id, anio_publicacion=2024,
+                            revista_id=revista.id, issn='1234-5678', volumen='12', numero='3',
+                            pagina_inicio=10, pagina_fin=25, doi='10.1000/xyz_1')
+        congreso = Articulo(titulo='Ponencia', tipo_produccion_id=catalogs['tipo'].id,
+                            estado_id=catalogs['estado'].id, anio_publicacion=2023,
+                            nombre_congreso='Congreso Nacional')
+        db_session.add_all([articulo, congreso])
+        articulo.agregar_autor(luis)
+        articulo.agregar_autor(ana)
+        congreso.agregar_autor(ana)
+        db_session.commit()
+
+        texto, filename, _ = self.exportar('bibtex')
+        assert filename.endswith('.bib')
+        entradas = texto.strip().split('\n\n')
+        assert len(entradas) == 2
+        assert entradas[0].splitlines() == [
+            f'@article{{gomez2024_{articulo.id},',
+            r'  title = {{Redes \& grafos al 100\%}},',
+            '  author = {Gómez, Luis and Pérez, Ana},',
+            '  journal = {Revista de Cómputo},',
+            '  year = {2024},',
+            '  volume = {12},',
+            '  number = {3},',
+            '  pages = {10--25},',
+            '  issn = {1234-5678},',
+            '  doi = {10.1000/xyz_1},',
+            '}',
+        ]
+        assert entradas[1].startswith(f'@inproceedings{{perez2023_{congreso.id},')
+        assert '  booktitle = {Congreso Nacional},' in entradas[1]
+
+        texto, filename, _ = self.exportar('ris', {'anio': 2024})
+        assert filename.endswith('.ris')
+        assert texto.splitlines() == [
+            'TY  - JOUR', f'ID  - {articulo.id}', 'TI  - Redes & grafos al 100%',
+            'AU  - Gómez, Luis', 'AU  - Pérez, Ana', 'PY  - 2024', 'T2  - Revista de Cómputo',
+            'VL  - 12', 'IS  - 3', 'SP  - 10', 'EP  - 25', 'SN  - 1234-5678',
+            'DO  - 10.1000/xyz_1', 'ER  - ', '',
+        ]
+
+    def test_consultas_fijas_por_lote(self, app, db_session, catalogs, monkeypatch):
+        """Los autores se precargan con una consulta por lote, no por artículo."""
+        autores = [Autor(nombre=f'Autor{i}', apellidos='Prueba') for i in range(3)]
+        db_session.add_all(autores)
+        db_session.flush()
+
+        def crear(cantidad):
+            for i in range(cantidad):
+                articulo = Articulo(titulo=f'Artículo {i}', tipo_produccion_id=catalogs['tipo'].id,
+                                    estado_id=catalogs['estado'].id, anio_publicacion=2024)
+                db_session.add(articulo)
+                for autor in autores:
+                    articulo.agregar_autor(autor)
+            db_session.commit()
+
+        crear(2)
+        self.exportar('ris')  # calienta el caché de catálogos
+        _, _, pocas = self.exportar('ris')
+        crear(8)
+        texto, _, muchas = self.exportar('ris')
+        assert muchas == pocas
+        assert texto.count('AU  - ') == 30
+
+        # Con lotes de 4 artículos: 3 lotes; sin revistas, cada lote extra
+        # suma la consulta de indexaciones y la de autores
+        monkeypatch.setattr(ReportController, 'TAMANO_LOTE', 4)
+        _, _, por_lotes = self.exportar('bibtex')
+        assert por_lotes == muchas + 2 * 2
+
+
+class TestBibliografiaImport:
+    """Importación masiva de BibTeX, RIS y Crossref JSON."""
+
+    BIBTEX = r"""@string{rc = "Revista de C{\'o}mputo"}
+
+@article{perez2024,
+  title = {Redes \& grafos},
+  author = {P{\'e}rez, Ana and Luis G{\'o}mez},
+  journal = rc,
+  year = {2024},
+  volume = {12},
+  pages = {10--25},
+  issn = {12345678},
+  doi = {https://doi.org/10.1000/ABC},
+}
+
+@inproceedings{gomez2023,
+  title = {Una ponencia},
+  author = {{Grupo de Redes}},
+  booktitle = {Congreso Nacional},
+  year = 2023,
+}
+
+@article{sin_titulo,
+  author = {Pérez, Ana},
+  year = {2022},
+}
+"""
+
+    @staticmethod
+    def archivo(tmp_path, nombre, contenido):
+        ruta = tmp_path / nombre
+        ruta.write_text(contenido, encoding='utf-8')
+        return str(ruta)
+
+    def test_autores_solo_por_coincidencia_exacta(self, app, db_session, catalogs, tmp_path):
+        dora = Autor(nombre='Dora', apellidos='Mora')
+        gonzalez = Autor(nombre='Francisco', apellidos='González Ximénez')
+        for autor in (dora, gonzalez):
+            autor.actualizar_nombre_normalizado()
+        db_session.add_all([dora, gonzalez])
+        db_session.commit()
+
+        bibtex = "@article{mora2024,\n  title = {Fon{\\'e}tica},\n" \
+            "  author = {Mora, Dar{\\'i}o and Gonzales Jimenez, Francisco},\n  year = {2024},\n}\n"
+        resultado = BibliografiaImportService().importar(self.archivo(tmp_path, 'refs.bib', bibtex))
+        assert (resultado['creados'], resultado['autores_nuevos']) == (1, 2)
+
+        articulo = Articulo.query.filter_by(titulo='Fonética').one()
+        assert articulo.autores_display == 'Darío Mora, Francisco Gonzales Jimenez'
+        ids = {aa.autor_id for aa in ArticuloAutor.query.filter_by(articulo_id=articulo.id)}
+        assert not ids & {dora.id, gonzalez.id}
+
+    def test_importa_bibtex(self, app, db_session, catalogs, tmp_path):
+        ana = Autor(nombre='Ana', apellidos='Pérez')
+        ana.actualizar_nombre_normalizado()
+        db_session.add_all([ana, Revista(nombre='Otra revista', issn='1234-5678')])
+        db_session.commit()
+
+        ruta = self.archivo(tmp_path, 'refs.bib', self.BIBTEX)
+        resultado = BibliografiaImportService().importar(ruta)
+        assert (resultado['total'], resultado['creados'], resultado['duplicados']) == (3, 2, 0)
+        assert [error['registro'] for error in resultado['errores']] == [21]
+        assert resultado['revistas_nuevas'] == 0
+
+        articulo = Articulo.query.filter_by(titulo='Redes & grafos').one()
+        assert articulo.doi == '10.1000/ABC'
+        assert (articulo.pagina_inicio, articulo.pagina_fin) == (10, 25)
+        assert articulo.revista.nombre == 'Otra revista'  # por ISSN
+        assert ArticuloAutor.query.filter_by(articulo_id=articulo.id, orden=1).one().autor_id == ana.id
+        assert articulo.autores_display == 'Ana Pérez, Luis Gómez'
+        assert articulo.huella_titulo == 'redes grafos'
+        assert articulo.archivo_origen == 'refs.bib'
+
+        ponencia = Articulo.query.filter_by(titulo='Una ponencia').one()
+        assert ponencia.tipo.nombre == 'Conference paper'
+        assert ponencia.nombre_congreso == 'Congreso Nacional'
+        assert ponencia.autores_display == 'Grupo de Redes'
+
+        # Reimportar: todo se detecta como duplicado y no se crean autores
+        autores = Autor.query.count()
+        resultado = BibliografiaImportService().importar(ruta)
+        assert (resultado['creados'], resultado['duplicados']) == (0, 2)
+        assert Autor.query.count() == autores
+
+    def test_duplicados_por_doi_y_huella(self, app, db_session, catalogs, tmp_path):
+        db_session.add_all([
+            Articulo(titulo='Otro título', tipo_produccion_id=catalogs['tipo'].id,
+                     estado_id=catalogs['estado'].id, doi='10.1000/existe'),
+            Articulo(titulo='Título  ya   CARGADO', tipo_produccion_id=catalogs['tipo'].id,
+                     estado_id=catalogs['estado'].id),
+        ])
+        db_session.commit()
+
+        ris = '''TY  - JOUR
+TI  - Coincide por DOI
+AU  - Pérez, Ana
+DO  - 10.1000/EXISTE
+ER  - 
+
+TY  - JOUR
+TI  - Título ya cargado.
+AU  - Pérez, Ana
+ER  - 
+
+TY  - JOUR
+TI  - Nuevo
+AU  - Pérez, Ana
+T2  - Revista Nueva
+SN  - 8765-4321
+SP  - 3
+EP  - 9
+PY  - 2021
+ER  - 
+
+TY  - JOUR
+TI  - NUEVO
+ER  - 
+'''
+        resultado = BibliografiaImportService().importar(self.archivo(tmp_path, 'refs.ris', ris))
+        assert (resultado['total'], resultado['creados'], resultado['duplicados']) == (4, 1, 3)
+        assert (resultado['autores_nuevos'], resultado['revistas_nuevas']) == (1, 1)
+
+        nuevo = Articulo.query.filter_by(titulo='Nuevo').one()
+        assert nuevo.revista.issn == '8765-4321'
+        assert (nuevo.anio_publicacion, nuevo.pagina_inicio, nuevo.pagina_fin) == (2021, 3, 9)
+
+    def test_consultas_fijas_por_lote(self, app, db_session, catalogs, tmp_path,
+                                      capturar_consultas):
+        """Los duplicados se buscan con una sola consulta por lote."""
+        def ris(cantidad, inicio=0):
+            return ''.join(f'TY  - JOUR\nTI  - Referencia {i}\nAU  - Pérez, Ana\n'
+                           f'DO  - 10.1000/{i}\nER  - \n\n'
+                           for i in range(inicio, inicio + cantidad))
+
+        def contar(contenido):
+            with capturar_consultas(solo_lecturas=True) as consultas:
+                resultado = BibliografiaImportService(tamano_lote=10).importar(
+                    self.archivo(tmp_path, 'refs.ris', contenido))
+            return resultado, len(consultas)
+
+        contar(ris(1))  # crea el autor y calienta el caché de catálogos
+        resultado, pocas = contar(ris(10, 100))
+        assert resultado['creados'] == 10
+        resultado, muchas = contar(ris(10, 200))
+        assert muchas == pocas
+        # Cada lote extra suma las mismas consultas (duplicados, catálogos
+        # expirados por el commit y autores_display), no una por referencia
+        resultado, dos_lotes = contar(ris(20, 300))
+        assert resultado['creados'] == 20
+        resultado, tres_lotes = contar(ris(30, 400))
+        assert tres_lotes - dos_lotes == dos_lotes - muchas <= 5
+
+    def test_importa_crossref(self, app, db_session, catalogs, tmp_path):
+        obras = {'status': 'ok', 'message': {'items': [
+            {'title': ['Obra de <i>Crossref</i>'], 'DOI': '10.1000/CR1',
+             'author': [{'given': 'Ana', 'family': 'Pérez'}, {'name': 'Consorcio'}],
+             'container-title': ['Revista de Cómputo'], 'ISSN': ['1234-5678'],
+             'issued': {'date-parts': [[2020, 5]]}, 'volume': '3', 'page': '1-8',
+             'type': 'journal-article'},
+            {'title': [], 'DOI': '10.1000/CR2'},
+        ]}}
+        ruta = self.archivo(tmp_path, 'obras.json', json.dumps(obras))
+        resultado = BibliografiaImportService().importar(ruta)
+        assert (resultado['total'], resultado['creados']) == (2, 1)
+        assert [error['registro'] for error in resultado['errores']] == [2]
+
+        articulo = Articulo.query.filter_by(doi='10.1000/CR1').one()
+        assert articulo.titulo == 'Obra de Crossref'
+        assert articulo.anio_publicacion == 2020
+        assert articulo.autores_display == 'Ana Pérez, Consorcio'
+
+        with pytest.raises(ValueError):
+            BibliografiaImportService().importar(ruta, formato='endnote')
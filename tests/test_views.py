@@ -3,6 +3,7 @@ Tests para las vistas (routes) de artículos.
 """
 import pytest
 from flask import url_for
+from app.controllers import ArticleController
 from app.models import Articulo, Autor, TipoProduccion, Estado
 
 
@@ -53,10 +54,33 @@ class TestArticleViews:
             response = client.get(url_for('articles.index', page=1, per_page=10))
             assert response.status_code == 200
             
-            # Página 2
-            response = client.get(url_for('articles.index', page=2, per_page=10))
+            # Página siguiente por cursor
+            pagination, _ = ArticleController.get_page(per_page=10)
+            response = client.get(url_for('articles.index', cursor=pagination.next_cursor, per_page=10))
             assert response.status_code == 200
     
+    def test_index_muestra_facetas(self, client, app, db_session, catalogs):
+        """Test de facetas con enlaces para filtrar el listado."""
+        with app.app_context():
+            for anio in (2021, 2022, 2022):
+                db_session.add(Articulo(
+                    titulo=f'Facet {anio}',
+                    tipo_produccion_id=catalogs['tipo'].id,
+                    estado_id=catalogs['estado'].id,
+                    anio_publicacion=anio
+                ))
+            db_session.commit()
+            
+            response = client.get(url_for('articles.index'))
+            assert response.status_code == 200
+            assert b'anio=2022' in response.data
+            assert b'(2)' in response.data
+            
+            response = client.get(url_for('articles.index', anio=2021))
+            assert response.status_code == 200
+            assert b'Facet 2021' in response.data
+            assert b'Facet 2022' not in response.data
+    
     def test_new_route_get(self, client, app, db_session, catalogs):
         """Test de ruta para mostrar formulario de nuevo artículo."""
         with app.app_context():
@@ -312,6 +336,270 @@ class TestArticleViews:
             assert response.status_code == 200
             # Verificar que retorna resultados filtrados
     
+    def test_index_filtro_multiple_y_exportacion(self, client, app, db_session, catalogs):
+        """Varios tipos a la vez; la vista previa usa los mismos parámetros que la lista."""
+        with app.app_context():
+            congreso = TipoProduccion.query.filter_by(nombre='Conference paper').one()
+            for titulo, tipo in (('Artículo de revista', catalogs['tipo']),
+                                 ('Artículo de congreso', congreso)):
+                db_session.add(Articulo(titulo=titulo, tipo_produccion_id=tipo.id,
+                                        estado_id=catalogs['estado'].id, anio_publicacion=2024))
+            db_session.commit()
+            
+            tipos = [catalogs['tipo'].id, congreso.id]
+            response = client.get(url_for('articles.index', tipo_id=tipos))
+            assert response.status_code == 200
+            assert 'Artículo de revista' in response.data.decode('utf-8')
+            assert 'Artículo de congreso' in response.data.decode('utf-8')
+            
+            response = client.get(url_for('articles.export_preview', tipo_id=tipos, anio=2024))
+            assert response.get_json()['total'] == 2
+            response = client.get(url_for('articles.export_preview', tipo_id=catalogs['tipo'].id))
+            assert response.get_json()['total'] == 1
+    
+    def test_exportacion_en_cache_con_etag(self, client, app, db_session, catalogs):
+        """Una exportación repetida sale del caché y responde 304 con el mismo ETag."""
+        with app.app_context():
+            db_session.add(Articulo(titulo='Exportable', tipo_produccion_id=catalogs['tipo'].id,
+                                    estado_id=catalogs['estado'].id, anio_publicacion=2024))
+            db_session.commit()
+            
+            url = url_for('articles.export_excel', anio=2024)
+            primera = client.get(url)
+            assert primera.status_code == 200
+            assert primera.headers['Content-Disposition'].startswith('attachment')
+            etag = primera.headers['ETag']
+            
+            segunda = client.get(url, headers={'If-None-Match': etag})
+            assert segunda.status_code == 304
+            
+            misma = client.get(url_for('reports.export_excel', anio=2024))
+            assert misma.status_code == 200 and misma.headers['ETag'] == etag
+            
+            stats = client.get(url_for('reports.export_cache')).get_json()
+            assert stats['fallos'] == 1 and stats['aciertos'] == 2
+            assert stats['entradas'] == 1
+            
+            # Cualquier cambio en los datos produce otra versión
+            db_session.add(Articulo(titulo='Otro', tipo_produccion_id=catalogs['tipo'].id,
+                                    estado_id=catalogs['estado'].id, anio_publicacion=2024))
+            db_session.commit()
+            tercera = client.get(url, headers={'If-None-Match': etag})
+            assert tercera.status_code == 200 and tercera.headers['ETag'] != etag
+    
+    def test_exportacion_en_segundo_plano(self, client, app, db_session, catalogs):
+        """La petición solo encola; el archivo se descarga cuando el trabajo termina."""
+        from app.services.export_jobs import get_export_jobs
+        with app.app_context():
+            db_session.add(Articulo(titulo='En cola', tipo_produccion_id=catalogs['tipo'].id,
+                                    estado_id=catalogs['estado'].id, anio_publicacion=2024))
+            db_session.commit()
+            
+            response = client.post(url_for('articles.export_job_create', anio=2024))
+            assert response.status_code == 202
+            datos = response.get_json()
+            assert datos['status'] in ('pendiente', 'procesando', 'completado')
+            
+            assert get_export_jobs().obtener(datos['job_id']).esperar(timeout=30)
+            estado = client.get(datos['status_url']).get_json()
+            assert estado['status'] == 'completado'
+            assert estado['filename'].endswith('.xlsx')
+            
+            descarga = client.get(datos['download_url'])
+            assert descarga.status_code == 200
+            assert descarga.headers['Content-Disposition'].startswith('attachment')
+            
+            assert client.get(url_for('articles.export_job_status', job_id='export_x')).status_code == 404
+    
+    def test_descarga_de_exportacion_desalojada(self, client, app, db_session, catalogs):
+        """Si el caché desalojó el archivo se responde 410 y se vuelve a generar."""
+        import os
+        from app.services.export_jobs import get_export_jobs
+        with app.app_context():
+            db_session.add(Articulo(titulo='Desalojada', tipo_produccion_id=catalogs['tipo'].id,
+                                    estado_id=catalogs['estado'].id, anio_publicacion=2024))
+            db_session.commit()
+            
+            datos = client.post(url_for('articles.export_job_create', anio=2024)).get_json()
+            job = get_export_jobs().obtener(datos['job_id'])
+            assert job.esperar(timeout=30)
+            os.remove(job.artefacto.ruta)
+            
+            response = client.get(datos['download_url'])
+            assert response.status_code == 410
+            nuevo = response.get_json()
+            assert nuevo['job_id'] != datos['job_id']
+            
+            assert get_export_jobs().obtener(nuevo['job_id']).esperar(timeout=30)
+            assert client.get(nuevo['download_url']).status_code == 200
+    
+    def test_exportacion_directa_no_retiene_el_worker(self, client, app, db_session, catalogs,
+                                                      monkeypatch):
+        """Si la exportación no termina a tiempo se responde 202 con el trabajo."""
+        import threading
+        from app.controllers.report_controller import ReportController
+        from app.services.export_jobs import get_export_jobs
+        
+        liberar = threading.Event()
+        original = ReportController.export_excel_cached
+        
+        def lenta(controlador, filtro):
+            liberar.wait(10)
+            return original(controlador, filtro)
+        
+        monkeypatch.setattr(ReportController, 'export_excel_cached', lenta)
+        with app.app_context():
+            app.config['EXPORT_SYNC_TIMEOUT'] = 0.05
+            db_session.add(Articulo(titulo='Lenta', tipo_produccion_id=catalogs['tipo'].id,
+                                    estado_id=catalogs['estado'].id, anio_publicacion=2024))
+            db_session.commit()
+            
+            for endpoint in ('articles.export_excel', 'reports.export_excel'):
+                response = client.get(url_for(endpoint, anio=2024))
+                assert response.status_code == 202
+                datos = response.get_json()
+                assert datos['status'] in ('pendiente', 'procesando')
+            
+            liberar.set()
+            assert get_export_jobs().obtener(datos['job_id']).esperar(timeout=30)
+            descarga = client.get(datos['download_url'])
+            assert descarga.status_code == 200
+            assert descarga.headers['Content-Disposition'].startswith('attachment')
+    
+    def test_exportacion_csv_y_jsonl_por_flujo(self, client, app, db_session, catalogs):
+        """CSV y JSON Lines usan los mismos filtros y se envían como flujo."""
+        import csv
+        import io
+        import json
+        with app.app_context():
+            for titulo, anio in (('Uno, con coma', 2024), ('Dos', 2024), ('Tres', 2020)):
+                db_session.add(Articulo(titulo=titulo, tipo_produccion_id=catalogs['tipo'].id,
+                                        estado_id=catalogs['estado'].id, anio_publicacion=anio))
+            db_session.commit()
+            
+            response = client.get(url_for('articles.export_excel', format='csv', anio=2024))
+            assert response.status_code == 200
+            assert response.is_streamed
+            assert response.mimetype == 'text/csv'
+            assert '.csv' in response.headers['Content-Disposition']
+            filas = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+            assert sorted(fila['titulo'] for fila in filas) == ['Dos', 'Uno, con coma']
+            assert filas[0]['tipo_produccion'] == 'Artículo científico'
+            assert filas[0]['para_curriculum'] == 'true'
+            
+            response = client.get(url_for('articles.export_excel', format='jsonl'))
+            registros = [json.loads(linea) for linea in response.get_data(as_text=True).splitlines()]
+            assert len(registros) == 3
+            marca = response.headers['X-Watermark']
+            
+            response = client.get(url_for('articles.export_excel', format='jsonl', since=marca))
+            assert response.get_data(as_text=True) == ''
+            assert response.headers['X-Watermark'] == marca
+            response = client.get(url_for('articles.export_excel', format='csv', since='ayer'))
+            assert response.status_code == 400
+            assert registros[0]['estado'] == 'Publicado' and registros[0]['lgac'] is None
+            
+            runner = app.test_cli_runner()
+            resultado = runner.invoke(args=['export-articles', '--format', 'jsonl',
+                                            '-f', 'anio=2020'])
+            assert resultado.exit_code == 0
+            assert [json.loads(linea)['titulo'] for linea in resultado.stdout.splitlines()] == ['Tres']
+    
+    def test_exportacion_bibtex_y_ris(self, client, app, db_session, catalogs):
+        """BibTeX y RIS se envían como flujo con su tipo MIME."""
+        with app.app_context():
+            db_session.add(Articulo(titulo='Citado', tipo_produccion_id=catalogs['tipo'].id,
+                                    estado_id=catalogs['estado'].id, anio_publicacion=2024))
+            db_session.commit()
+
+            response = client.get(url_for('articles.export_excel', format='bibtex'))
+            assert response.status_code == 200
+            assert response.is_streamed
+            assert response.mimetype == 'application/x-bibtex'
+            assert '.bib' in response.headers['Content-Disposition']
+            assert response.get_data(as_text=True).startswith('@article{articulo2024_')
+
+            response = client.get(url_for('articles.export_excel', format='ris'))
+            assert response.mimetype == 'application/x-research-info-systems'
+            assert response.get_data(as_text=True).splitlines()[:3] == [
+                'TY  - JOUR', f'ID  - {Articulo.query.one().id}', 'TI  - Citado'
+            ]
+
+    def test_importacion_desde_excel(self, client, app, db_session, catalogs):
+        """La hoja se importa y los errores se reportan por fila."""
+        import io
+        from openpyxl import Workbook
+        wb = Workbook()
+        wb.active.append(['Título del artículo', 'Tipo de producción', 'Estado actual',
+                          'Autor(es) participante(s)', 'Año'])
+        wb.active.append(['Importado', 'Artículo científico', 'Publicado', 'Ana Pérez', 2024])
+        wb.active.append(['Con error', 'Artículo científico', 'Publicado', 'Ana Pérez', 1800])
+        archivo = io.BytesIO()
+        wb.save(archivo)
+        archivo.seek(0)
+
+        with app.app_context():
+            response = client.post(url_for('articles.import_excel'),
+                                   data={'archivo': (archivo, 'produccion.xlsx')},
+                                   content_type='multipart/form-data')
+            assert response.status_code == 200
+            datos = response.get_json()
+            assert (datos['creados'], [e['fila'] for e in datos['errores']]) == (1, [3])
+            articulo = Articulo.query.filter_by(titulo='Importado').one()
+            assert articulo.autores_display == 'Ana Pérez'
+            assert articulo.archivo_origen == 'produccion.xlsx'
+
+            response = client.post(url_for('articles.import_excel'),
+                                   data={'archivo': (io.BytesIO(b'x'), 'produccion.csv')},
+                                   content_type='multipart/form-data')
+            assert response.status_code == 400
+
+    def test_importacion_de_referencias(self, client, app, db_session, catalogs):
+        """Las referencias se importan con dedupe y errores por registro."""
+        import io
+        ris = ('TY  - JOUR\nTI  - Referencia\nAU  - Pérez, Ana\nDO  - 10.1000/ref\nER  - \n\n'
+               'TY  - JOUR\nTI  - Referencia\nER  - \n\n'
+               'TY  - JOUR\nAU  - Pérez, Ana\nER  - \n').encode('utf-8')
+        with app.app_context():
+            response = client.post(url_for('articles.import_references'),
+                                   data={'archivo': (io.BytesIO(ris), 'refs.ris')},
+                                   content_type='multipart/form-data')
+            assert response.status_code == 200
+            datos = response.get_json()
+            assert (datos['creados'], datos['duplicados']) == (1, 1)
+            assert [e['registro'] for e in datos['errores']] == [11]
+            articulo = Articulo.query.filter_by(doi='10.1000/ref').one()
+            assert articulo.autores_display == 'Ana Pérez'
+            assert articulo.archivo_origen == 'refs.ris'
+
+            response = client.post(url_for('articles.import_references'),
+                                   data={'archivo': (io.BytesIO(b'x'), 'refs.xlsx')},
+                                   content_type='multipart/form-data')
+            assert response.status_code == 400
+
+    def test_paquete_de_curriculums(self, client, app, db_session, catalogs):
+        """El ZIP de currículums del CA se envía como flujo."""
+        import io
+        import zipfile
+        from app.models import Autor
+        with app.app_context():
+            app.config['CURRICULUM_MAX_PROCESSES'] = 1
+            autor = Autor(nombre='Ana', apellidos='Pérez', es_miembro_ca=True)
+            articulo = Articulo(titulo='Curricular', tipo_produccion_id=catalogs['tipo'].id,
+                                estado_id=catalogs['estado'].id)
+            db_session.add_all([autor, articulo])
+            db_session.flush()
+            articulo.agregar_autor(autor)
+            db_session.commit()
+
+            response = client.get(url_for('reports.export_curriculum', anio_inicio=2000))
+            assert response.status_code == 200
+            assert response.is_streamed
+            assert response.mimetype == 'application/zip'
+            assert '.zip' in response.headers['Content-Disposition']
+            with zipfile.ZipFile(io.BytesIO(response.get_data())) as zip_file:
+                assert zip_file.namelist() == [f'curriculum_{autor.id}_Perez_Ana.xlsx']
+
     def test_index_with_search_query(self, client, app, db_session, catalogs):
         """Test de búsqueda por texto en lista."""
         with app.app_context():
@@ -333,3 +621,150 @@ class TestArticleViews:
             response = client.get(url_for('articles.index', query='Machine'))
             
             assert response.status_code == 200
+
+
+class TestCargaRelaciones:
+    """Las vistas cargan sus relaciones en un número fijo de consultas."""
+    
+    def _crear_articulos(self, db_session, catalogs, cantidad):
+        from app.models import ArticuloAutor
+        
+        creados = []
+        for i in range(cantidad):
+            articulo = Articulo(
+                titulo=f'Carga {i}',
+                tipo_produccion_id=catalogs['tipo'].id,
+                estado_id=catalogs['estado'].id
+            )
+            autor = Autor(nombre=f'Autor{i}', apellidos='Prueba')
+            db_session.add_all([articulo, autor])
+            db_session.flush()
+            db_session.add(ArticuloAutor(articulo_id=articulo.id, autor_id=autor.id, orden=1))
+            creados.append(articulo)
+        db_session.commit()
+        return creados
+    
+    def test_listado_no_crece_con_los_articulos(self, client, app, db_session, catalogs,
+                                                capturar_consultas):
+        """Test: El listado hace las mismas consultas con 2 o con 12 artículos."""
+        with app.app_context():
+            # Primera petición: llena los cachés de catálogos
+            self._crear_articulos(db_session, catalogs, 1)
+            client.get(url_for('articles.index'))
+            
+            self._crear_articulos(db_session, catalogs, 1)
+            with capturar_consultas() as pocas:
+                client.get(url_for('articles.index'))
+            
+            self._crear_articulos(db_session, catalogs, 10)
+            with capturar_consultas() as muchas:
+                client.get(url_for('articles.index'))
+            
+            assert len(muchas) == len(pocas)
+    
+    def test_detalle_carga_autores(self, client, app, db_session, catalogs, capturar_consultas):
+        """Test: El detalle muestra los autores sin consultas por autor."""
+        from app.models import ArticuloAutor
+        
+        with app.app_context():
+            articulo = self._crear_articulos(db_session, catalogs, 1)[0]
+            for i in range(3):
+                autor = Autor(nombre=f'Coautor{i}', apellidos='Extra')
+                db_session.add(autor)
+                db_session.flush()
+                db_session.add(ArticuloAutor(articulo_id=articulo.id, autor_id=autor.id, orden=i + 2))
+            db_session.commit()
+            articulo_id = articulo.id
+            db_session.expunge_all()
+            
+            with capturar_consultas() as consultas:
+                respuesta = client.get(url_for('articles.show', id=articulo_id))
+            
+            assert respuesta.status_code == 200
+            assert b'Coautor2' in respuesta.data
+            assert len(consultas) <= 8
+    
+    def test_perfil_bloquea_relaciones_no_previstas(self, app, db_session, catalogs):
+        """Test: El perfil de listado no permite cargas perezosas por artículo."""
+        from sqlalchemy.exc import InvalidRequestError
+        
+        with app.app_context():
+            self._crear_articulos(db_session, catalogs, 1)
+            db_session.expunge_all()
+            
+            articulo = Articulo.query.options(*Articulo.opciones_carga('listado')).first()
+            assert articulo.estado.nombre == catalogs['estado'].nombre
+            with pytest.raises(InvalidRequestError):
+                articulo.articulo_autores
+            
+            with pytest.raises(ValueError):
+                Articulo.opciones_carga('inexistente')
+
+
+class TestAutorAutocomplete:
+    """Tests para el autocompletado remoto de autores."""
+    
+    def _crear_autores(self, db_session, catalogs):
+        """Crea autores con distinto número de artículos."""
+        frida = Autor(nombre='Frida', apellidos='Compañ Ramírez')
+        francisco = Autor(nombre='Francisco', apellidos='Comparán Pantoja')
+        otro = Autor(nombre='Ana', apellidos='López')
+        for autor in (frida, francisco, otro):
+            autor.actualizar_nombre_normalizado()
+        db_session.add_all([frida, francisco, otro])
+        db_session.flush()
+        
+        articulo = Articulo(
+            titulo='Artículo de prueba',
+            tipo_produccion_id=catalogs['tipo'].id,
+            estado_id=catalogs['estado'].id
+        )
+        db_session.add(articulo)
+        db_session.flush()
+        articulo.agregar_autor(francisco, orden=1)
+        db_session.commit()
+        
+        return frida, francisco, otro
+    
+    def test_autocomplete_por_prefijo(self, client, app, db_session, catalogs):
+        """Los prefijos de varias palabras se combinan y ordenan por artículos."""
+        with app.app_context():
+            frida, francisco, _ = self._crear_autores(db_session, catalogs)
+            
+            response = client.get(url_for('catalogs.autocomplete_autores', q='comp fr'))
+            
+            assert response.status_code == 200
+            data = response.get_json()
+            assert data['total'] == 2
+            assert [r['id'] for r in data['results']] == [francisco.id, frida.id]
+            assert data['results'][0]['num_articulos'] == 1
+            
+            # Sin acentos y con un solo prefijo
+            data = client.get(url_for('catalogs.autocomplete_autores', q='lop')).get_json()
+            assert [r['text'] for r in data['results']] == ['Ana López']
+    
+    def test_autocomplete_paginacion(self, client, app, db_session, catalogs):
+        """El autocompletado pagina resultados."""
+        with app.app_context():
+            self._crear_autores(db_session, catalogs)
+            
+            data = client.get(url_for('catalogs.autocomplete_autores',
+                                      q='comp', per_page=1, page=2)).get_json()
+            
+            assert data['page'] == 2
+            assert len(data['results']) == 1
+            assert data['has_more'] is False
+    
+    def test_autocomplete_se_actualiza_al_crear_autor(self, client, app, db_session, catalogs):
+        """El índice se invalida al confirmar un autor nuevo."""
+        with app.app_context():
+            self._crear_autores(db_session, catalogs)
+            client.get(url_for('catalogs.autocomplete_autores', q='zav'))
+            
+            nuevo = Autor(nombre='Luis', apellidos='Zavala')
+            nuevo.actualizar_nombre_normalizado()
+            db_session.add(nuevo)
+            db_session.commit()
+            
+            data = client.get(url_for('catalogs.autocomplete_autores', q='zav')).get_json()
+            assert [r['id'] for r in data['results']] == [nuevo.id]